@@ -9,8 +9,10 @@ Ce fichier est conservé pour compatibilité. La nouvelle architecture DDD est d
 - presentation/ : Point d'entrée (main)
 """
 
+import sys
+
 # Import de la nouvelle architecture
 from presentation.main import main
 
 if __name__ == '__main__':
-    main()
+    main(sys.argv[1:])
@@ -0,0 +1,140 @@
+"""
+Extension d'une liste d'artistes à leurs artistes similaires
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Union
+from domain.entities import Artist
+from domain.errors import NotFoundError, TransientError
+from domain.progress import IProgressReporter, NullProgressReporter
+from domain.repositories import ISpotifyRepository
+
+
+class RelatedArtistExpander:
+    """
+    Parcours en largeur borné du graphe des artistes similaires
+    
+    Chaque niveau est demandé en parallèle ; un artiste déjà rencontré
+    (artiste de départ compris) n'est jamais ajouté ni exploré deux fois.
+    Le repository met les listes d'artistes similaires en cache : une
+    nouvelle extension des mêmes artistes ne fait presque aucun appel.
+    
+    Un artiste inexistant n'a aucun artiste similaire ; les échecs
+    passagers d'un niveau sont relancés par passes successives (attente
+    doublée à chaque passe, ou délai Retry-After s'il est plus long) ;
+    toute autre erreur, ou un échec passager persistant, interrompt
+    l'extension.
+    """
+    
+    # Attente maximale avant une relance (secondes)
+    MAX_RETRY_DELAY = 60.0
+    
+    def __init__(
+        self,
+        spotify_repo: ISpotifyRepository,
+        depth: int = 1,
+        fan_out: int = 3,
+        max_artists: int = 200,
+        max_workers: int = 8,
+        progress: Optional[IProgressReporter] = None,
+        retry_rounds: int = 2,
+        retry_backoff: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Args:
+            spotify_repo: Repository Spotify
+            depth: Nombre de niveaux parcourus (1 : similaires des artistes de départ)
+            fan_out: Artistes ajoutés au plus par artiste exploré
+            max_artists: Nombre maximum d'artistes ajoutés au total
+            max_workers: Demandes d'artistes similaires menées en parallèle
+            progress: Suivi de progression (silencieux par défaut)
+            retry_rounds: Nombre de passes de relance des échecs passagers
+            retry_backoff: Attente avant la première relance (secondes), doublée à chaque passe
+            sleep: Fonction d'attente (injectable pour les tests)
+        """
+        self.spotify_repo = spotify_repo
+        self.depth = depth
+        self.fan_out = fan_out
+        self.max_artists = max_artists
+        self.max_workers = max(1, max_workers)
+        self.progress = progress or NullProgressReporter()
+        self.retry_rounds = retry_rounds
+        self.retry_backoff = retry_backoff
+        self._sleep = sleep
+    
+    def expand(self, seeds: List[Artist]) -> List[Artist]:
+        """
+        Artistes similaires aux artistes de départ
+        
+        Args:
+            seeds: Artistes de départ (ceux sans ID Spotify sont ignorés)
+        
+        Returns:
+            Artistes ajoutés, dans l'ordre du parcours (niveau par niveau,
+            puis dans l'ordre des artistes explorés)
+        
+        Raises:
+            SpotifyError: Erreur non relançable, ou échec passager persistant
+        """
+        visited = set()
+        frontier = []
+        for artist in seeds:
+            if artist.spotify_id and artist.spotify_id not in visited:
+                visited.add(artist.spotify_id)
+                frontier.append(artist)
+        
+        added: List[Artist] = []
+        for _ in range(self.depth):
+            if not frontier or len(added) >= self.max_artists:
+                break
+            neighbours = self._related_level(frontier)
+            frontier = []
+            for related in neighbours:
+                taken = 0
+                for artist in related:
+                    if taken >= self.fan_out or len(added) >= self.max_artists:
+                        break
+                    if not artist.spotify_id or artist.spotify_id in visited:
+                        continue
+                    visited.add(artist.spotify_id)
+                    added.append(artist)
+                    frontier.append(artist)
+                    taken += 1
+        return added
+    
+    def _related_level(self, frontier: List[Artist]) -> List[List[Artist]]:
+        """Artistes similaires de chaque artiste d'un niveau, échecs passagers relancés"""
+        neighbours = self._fetch(frontier, self.max_workers)
+        workers = self.max_workers
+        for round_index in range(self.retry_rounds):
+            failed = [i for i, related in enumerate(neighbours) if isinstance(related, TransientError)]
+            if not failed:
+                break
+            workers = max(1, workers // 2)
+            delay = self.retry_backoff * (2 ** round_index)
+            retry_after = [getattr(neighbours[i], 'retry_after', None) or 0.0 for i in failed]
+            delay = min(max([delay] + retry_after), self.MAX_RETRY_DELAY)
+            self.progress.debug(f"  🔁 Relance de {len(failed)} demande(s) d'artistes similaires dans {delay:.1f}s")
+            self._sleep(delay)
+            for i, related in zip(failed, self._fetch([frontier[i] for i in failed], workers)):
+                neighbours[i] = related
+        for related in neighbours:
+            if isinstance(related, TransientError):
+                raise related
+        return neighbours
+    
+    def _fetch(self, artists: List[Artist], workers: int) -> List[Union[List[Artist], TransientError]]:
+        """Demandes d'artistes similaires menées en parallèle"""
+        with ThreadPoolExecutor(max_workers=min(workers, len(artists))) as executor:
+            return list(executor.map(self._related, artists))
+    
+    def _related(self, artist: Artist) -> Union[List[Artist], TransientError]:
+        """Artistes similaires d'un artiste (aucun s'il est inexistant, l'erreur si elle est passagère)"""
+        try:
+            return self.spotify_repo.get_related_artists(artist)
+        except NotFoundError as e:
+            self.progress.debug(f"  ✗  Artistes similaires de {artist.found_name or artist.name}: {str(e)}")
+            return []
+        except TransientError as e:
+            return e
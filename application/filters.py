@@ -0,0 +1,191 @@
+"""
+Filtrage des artistes avant la recherche de leurs morceaux, et des
+morceaux avant l'écriture de la playlist
+"""
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from domain.entities import Artist, Track
+from domain.membership import EXACT_INDEX_LIMIT, MembershipIndex, PlaylistIndex, build_membership_index, playlist_set_key
+from domain.progress import IProgressReporter, NullProgressReporter
+from domain.repositories import IMembershipIndexRepository, ISpotifyRepository
+
+
+@dataclass
+class ArtistFilter:
+    """
+    Critères de sélection des artistes, évalués avant toute demande de top tracks
+    
+    Les genres sont comparés sans tenir compte de la casse, par
+    sous-chaîne : « metal » retient « death metal » comme « metalcore ».
+    Une popularité inconnue ne fait pas écarter l'artiste.
+    """
+    # Genres dont l'artiste doit avoir au moins un (aucun : tous les genres)
+    include_genres: List[str] = field(default_factory=list)
+    # Genres qui écartent l'artiste
+    exclude_genres: List[str] = field(default_factory=list)
+    # Popularité minimale (0 à 100)
+    min_popularity: Optional[int] = None
+    
+    @staticmethod
+    def _matches(genres: List[str], terms: List[str]) -> bool:
+        """Vrai si l'un des genres contient l'un des termes"""
+        return any(term.casefold() in genre.casefold() for genre in genres for term in terms)
+    
+    def accepts(self, artist: Artist) -> bool:
+        """Vrai si l'artiste satisfait tous les critères"""
+        if self.include_genres and not self._matches(artist.genres, self.include_genres):
+            return False
+        if self.exclude_genres and self._matches(artist.genres, self.exclude_genres):
+            return False
+        if self.min_popularity is not None and artist.popularity is not None:
+            return artist.popularity >= self.min_popularity
+        return True
+
+
+class TrackFilter(ABC):
+    """Étape de filtrage des morceaux, appliquée après la recherche et avant l'écriture"""
+    
+    # Nom de l'étape dans le rapport d'exécution
+    name = 'filter'
+    
+    @abstractmethod
+    def apply(self, tracks: List[Track]) -> List[Track]:  # pragma: no cover
+        """
+        Filtre les morceaux
+        
+        Args:
+            tracks: Morceaux dans l'ordre de la playlist
+        
+        Returns:
+            Morceaux conservés, dans le même ordre
+        """
+        pass
+    
+    def false_positive_rate(self) -> float:
+        """
+        Probabilité estimée qu'un morceau ait été retiré à tort par le dernier apply
+        
+        Returns:
+            0 pour un filtrage exact
+        """
+        return 0.0
+
+
+class PlaylistExclusionFilter(TrackFilter):
+    """
+    Exclut les morceaux déjà présents dans d'autres playlists
+    
+    Les playlists exclues partagent un seul index d'appartenance (voir
+    domain.membership), dont la taille dépend du nombre total de morceaux :
+    au-delà de exact_limit, c'est un filtre de Bloom. L'index est
+    enregistré avec la version (snapshot_id) de chaque playlist ; un seul
+    parcours de la liste des playlists du compte dit s'il est à jour, et
+    il n'est reconstruit que si l'une d'elles a changé.
+    
+    Le filtre peut être partagé entre des travaux simultanés (mode
+    service) : l'index est chargé ou reconstruit par un seul d'entre eux,
+    les autres attendent puis réutilisent le résultat.
+    """
+    
+    name = 'excluded_playlists'
+    
+    def __init__(
+        self,
+        spotify_repo: ISpotifyRepository,
+        index_repo: IMembershipIndexRepository,
+        playlist_names: List[str],
+        progress: Optional[IProgressReporter] = None,
+        exact_limit: int = EXACT_INDEX_LIMIT
+    ):
+        """
+        Args:
+            spotify_repo: Repository Spotify
+            index_repo: Repository des index enregistrés
+            playlist_names: Noms des playlists dont les morceaux sont exclus
+            progress: Suivi de progression (silencieux par défaut)
+            exact_limit: Morceaux (toutes playlists confondues) au-delà
+                desquels l'index est un filtre de Bloom
+        """
+        self.spotify_repo = spotify_repo
+        self.index_repo = index_repo
+        self.playlist_names = playlist_names
+        self.progress = progress or NullProgressReporter()
+        self.exact_limit = exact_limit
+        # Index déjà chargés (mode service : pas de relecture du disque à chaque travail)
+        self._loaded: Dict[str, PlaylistIndex] = {}
+        self._lock = threading.Lock()
+        # Taux de faux positifs du dernier apply, propre à chaque thread (travaux simultanés)
+        self._last_apply = threading.local()
+    
+    def index(self) -> Optional[MembershipIndex]:
+        """
+        Index à jour des playlists exclues
+        
+        Returns:
+            Index commun des playlists trouvées (une playlist introuvable est
+            signalée puis ignorée), None si aucune n'a été trouvée
+        """
+        with self._lock:
+            return self._current_index()
+    
+    def _current_index(self) -> Optional[MembershipIndex]:
+        """Charge ou reconstruit l'index (appelé sous le verrou)"""
+        playlists = self.spotify_repo.find_playlists(self.playlist_names)
+        missing = [name for name in self.playlist_names if name not in playlists]
+        if missing:
+            self.progress.warning(f"  ⚠️  Playlist(s) à exclure introuvable(s): {', '.join(missing)}")
+        if not playlists:
+            return None
+        
+        snapshots = {playlist.spotify_id: playlist.snapshot_id for playlist in playlists.values()}
+        key = playlist_set_key(snapshots)
+        entry = self._loaded.get(key) or self.index_repo.load(key)
+        if entry is None or not entry.is_current(snapshots):
+            uris: List[Optional[str]] = []
+            for playlist in playlists.values():
+                uris.extend(self.spotify_repo.get_playlist_track_uris(playlist.spotify_id, playlist.snapshot_id))
+            entry = PlaylistIndex(key, snapshots, build_membership_index(uris, self.exact_limit))
+            self.index_repo.save(entry)
+            self.progress.debug(
+                f"  ✓  Index des playlists exclues reconstruit ({len(entry.index)} morceau(x), {entry.index.kind})"
+            )
+        self._loaded[key] = entry
+        return entry.index
+    
+    def apply(self, tracks: List[Track]) -> List[Track]:
+        """Retire les morceaux présents dans au moins une playlist exclue"""
+        index = self.index()
+        self._last_apply.false_positive_rate = index.false_positive_rate if index is not None else 0.0
+        if index is None:
+            return list(tracks)
+        return [track for track in tracks if track.uri not in index]
+    
+    def false_positive_rate(self) -> float:
+        """Taux de faux positifs de l'index utilisé par le dernier apply (filtre de Bloom)"""
+        return getattr(self._last_apply, 'false_positive_rate', 0.0)
+
+
+class SavedTracksFilter(TrackFilter):
+    """
+    Exclut les morceaux enregistrés dans la bibliothèque de l'utilisateur
+    
+    Le repository interroge la bibliothèque par lots et met les réponses
+    en cache : une nouvelle exécution sur les mêmes morceaux ne fait
+    presque aucun appel.
+    """
+    
+    name = 'saved_tracks'
+    
+    def __init__(self, spotify_repo: ISpotifyRepository):
+        """
+        Args:
+            spotify_repo: Repository Spotify
+        """
+        self.spotify_repo = spotify_repo
+    
+    def apply(self, tracks: List[Track]) -> List[Track]:
+        """Retire les morceaux enregistrés dans la bibliothèque"""
+        saved = self.spotify_repo.saved_tracks_contains([track.spotify_id for track in tracks])
+        return [track for track in tracks if not saved.get(track.spotify_id, False)]
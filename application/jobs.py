@@ -0,0 +1,204 @@
+"""
+File de travaux de création de playlists pour le mode service
+"""
+import itertools
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, Deque, Dict, List, Optional, Set
+from application.report import RunReport
+
+
+class JobStatus(str, Enum):
+    """État d'un travail"""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+
+
+class QueueFullError(Exception):
+    """La file d'attente a atteint sa taille maximale"""
+
+
+@dataclass
+class PlaylistJob:
+    """Demande de création ou de synchronisation d'une playlist"""
+    job_id: str
+    playlist_name: str
+    artists_file: Optional[str] = None
+    artists: Optional[List[str]] = None
+    max_tracks_per_artist: int = 10
+    order_by_features: bool = False
+    status: JobStatus = JobStatus.QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    report: Optional[RunReport] = None
+    error: Optional[str] = None
+    
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+    
+    def to_dict(self, include_report: bool = False) -> dict:
+        """Représentation JSON de l'état du travail"""
+        data = {
+            'job_id': self.job_id,
+            'playlist_name': self.playlist_name,
+            'status': self.status.value,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'playlist_url': self.report.playlist_url if self.report else None,
+            'outcome': self.report.outcome if self.report else None,
+            'error': self.error,
+        }
+        if include_report and self.report is not None:
+            data['report'] = self.report.to_dict()
+        return data
+
+
+class JobQueue:
+    """
+    File d'attente bornée exécutée par un nombre fixe de threads
+    
+    Les travaux sont traités dans l'ordre d'arrivée, à deux exceptions
+    près : deux travaux visant la même playlist ne s'exécutent jamais en
+    même temps (le second attend la fin du premier), et un travail ne
+    peut pas être soumis si max_pending travaux attendent déjà.
+    """
+    
+    def __init__(
+        self,
+        runner: Callable[[PlaylistJob], RunReport],
+        max_concurrent: int = 1,
+        max_pending: int = 16,
+        max_history: int = 100
+    ):
+        """
+        Initialise la file
+        
+        Args:
+            runner: Fonction exécutant un travail et retournant son rapport
+            max_concurrent: Nombre de travaux exécutés en parallèle
+            max_pending: Nombre maximum de travaux en attente
+            max_history: Nombre de travaux terminés conservés pour consultation
+        """
+        self.runner = runner
+        self.max_concurrent = max_concurrent
+        self.max_pending = max_pending
+        self.max_history = max_history
+        self._condition = threading.Condition()
+        self._pending: Deque[PlaylistJob] = deque()
+        self._jobs: 'OrderedDict[str, PlaylistJob]' = OrderedDict()
+        self._running_playlists: Set[str] = set()
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+    
+    def start(self) -> None:
+        """Démarre les threads d'exécution"""
+        for index in range(self.max_concurrent):
+            thread = threading.Thread(target=self._work, name=f'playlist-job-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Arrête les threads une fois le travail en cours terminé"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+    
+    def submit(self, playlist_name: str, **options) -> PlaylistJob:
+        """
+        Ajoute un travail à la file
+        
+        Args:
+            playlist_name: Nom de la playlist à créer ou synchroniser
+            **options: artists_file, artists, max_tracks_per_artist, order_by_features
+        
+        Returns:
+            Travail en attente
+        
+        Raises:
+            QueueFullError: Si max_pending travaux attendent déjà
+        """
+        with self._condition:
+            if len(self._pending) >= self.max_pending:
+                raise QueueFullError(f"{len(self._pending)} travail(aux) déjà en attente")
+            job = PlaylistJob(job_id=uuid.uuid4().hex[:12], playlist_name=playlist_name, **options)
+            self._pending.append(job)
+            self._jobs[job.job_id] = job
+            self._forget_old_jobs()
+            self._condition.notify_all()
+            return job
+    
+    def get(self, job_id: str) -> Optional[PlaylistJob]:
+        """Travail correspondant à l'identifiant, s'il est encore connu"""
+        with self._condition:
+            return self._jobs.get(job_id)
+    
+    def jobs(self) -> List[PlaylistJob]:
+        """Travaux connus, du plus récent au plus ancien"""
+        with self._condition:
+            return list(reversed(self._jobs.values()))
+    
+    def counts(self) -> Dict[str, int]:
+        """Nombre de travaux par état"""
+        with self._condition:
+            counts = {status.value: 0 for status in JobStatus}
+            for job in self._jobs.values():
+                counts[job.status.value] += 1
+            return counts
+    
+    def _work(self) -> None:
+        """Boucle d'un thread d'exécution"""
+        while True:
+            with self._condition:
+                job = self._next_job()
+                while job is None and not self._stopping:
+                    self._condition.wait()
+                    job = self._next_job()
+                if job is None:
+                    return
+                job.status = JobStatus.RUNNING
+                job.started_at = time.time()
+                self._running_playlists.add(job.playlist_name)
+            
+            report, status, error = None, JobStatus.FAILED, None
+            try:
+                report = self.runner(job)
+                status = JobStatus.SUCCEEDED if report.playlist_url else JobStatus.FAILED
+                error = report.error
+            except Exception as e:
+                error = str(e)
+            
+            with self._condition:
+                job.report, job.status, job.error = report, status, error
+                job.finished_at = time.time()
+                self._running_playlists.discard(job.playlist_name)
+                self._forget_old_jobs()
+                self._condition.notify_all()
+    
+    def _next_job(self) -> Optional[PlaylistJob]:
+        """Retire le premier travail dont la playlist n'est pas déjà en cours"""
+        if self._stopping:
+            return None
+        for index, job in enumerate(self._pending):
+            if job.playlist_name not in self._running_playlists:
+                del self._pending[index]
+                return job
+        return None
+    
+    def _forget_old_jobs(self) -> None:
+        """Oublie les travaux terminés les plus anciens au-delà de max_history"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in itertools.islice(finished, max(0, len(finished) - self.max_history)):
+            del self._jobs[job_id]
@@ -0,0 +1,269 @@
+"""
+Ordonnancement des morceaux d'une playlist à partir de leurs caractéristiques audio
+"""
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Tuple
+import numpy as np
+from domain.entities import Track, TrackFeatures
+
+
+def space_artists(tracks: List[Track]) -> List[Track]:
+    """
+    Évite que deux morceaux consécutifs soient du même artiste
+    
+    Lorsqu'un morceau suit un morceau du même artiste, le prochain morceau
+    d'un autre artiste est avancé à sa place ; l'ordre relatif des autres
+    morceaux est conservé. Si aucun autre artiste n'est disponible, la
+    séquence est laissée telle quelle.
+    
+    Args:
+        tracks: Morceaux ordonnés
+    
+    Returns:
+        Nouvelle liste de morceaux
+    """
+    spaced = list(tracks)
+    for i in range(1, len(spaced)):
+        previous_artist = spaced[i - 1].artist
+        if previous_artist is None or spaced[i].artist != previous_artist:
+            continue
+        for j in range(i + 1, len(spaced)):
+            if spaced[j].artist != previous_artist:
+                spaced.insert(i, spaced.pop(j))
+                break
+    return spaced
+
+
+class TrackOrderer(ABC):
+    """Stratégie d'ordonnancement des morceaux d'une playlist"""
+    
+    @abstractmethod
+    def order(self, tracks: List[Track], features: Dict[str, TrackFeatures]) -> List[Track]:  # pragma: no cover
+        """
+        Ordonne les morceaux
+        
+        Args:
+            tracks: Morceaux dans l'ordre d'origine
+            features: Caractéristiques audio indexées par ID de morceau
+        
+        Returns:
+            Morceaux réordonnés
+        """
+        pass
+
+
+class EnergyRampOrderer(TrackOrderer):
+    """
+    Montée progressive en énergie, regroupée par tranches de tempo
+    
+    Les morceaux sont triés par palier d'énergie croissant puis, à énergie
+    comparable, par tranche de tempo pour limiter les ruptures de rythme.
+    Les morceaux sans caractéristiques sont placés à la fin dans leur ordre
+    d'origine.
+    """
+    
+    def __init__(self, energy_steps: int = 10, tempo_bucket_size: float = 20.0):
+        """
+        Initialise l'ordonnanceur
+        
+        Args:
+            energy_steps: Nombre de paliers d'énergie (énergie entre 0 et 1)
+            tempo_bucket_size: Largeur d'une tranche de tempo (BPM)
+        """
+        self.energy_steps = energy_steps
+        self.tempo_bucket_size = tempo_bucket_size
+    
+    def order(self, tracks: List[Track], features: Dict[str, TrackFeatures]) -> List[Track]:
+        """Ordonne les morceaux par énergie croissante et tranche de tempo"""
+        with_features = [track for track in tracks if track.spotify_id in features]
+        without_features = [track for track in tracks if track.spotify_id not in features]
+        
+        def sort_key(track: Track):
+            track_features = features[track.spotify_id]
+            energy_step = min(int(track_features.energy * self.energy_steps), self.energy_steps - 1)
+            tempo_bucket = int(track_features.tempo // self.tempo_bucket_size)
+            return energy_step, tempo_bucket, track_features.energy
+        
+        # sorted() est stable : à clé égale, l'ordre d'origine est conservé
+        ordered = sorted(with_features, key=sort_key) + without_features
+        return space_artists(ordered)
+
+
+class SmoothTransitionOrderer(TrackOrderer):
+    """
+    Séquenceur glouton « plus proche voisin » sur une matrice de caractéristiques
+    
+    Les morceaux sont triés par énergie croissante puis découpés en blocs ;
+    dans chaque bloc, le morceau suivant est celui dont les caractéristiques
+    (énergie, tempo, valence, dansabilité) sont les plus proches du morceau
+    courant, en écartant les artistes joués dans les `artist_spacing`
+    derniers morceaux. Les distances de tous les blocs sont calculées en une
+    seule passe NumPy ; chaque étape se limite ensuite à un argmin masqué
+    sur une ligne du bloc. Le choix glouton dépend du morceau précédent :
+    cette boucle, une itération par morceau, reste en Python et domine le
+    temps d'exécution (de l'ordre de 60 à 90 ms pour 10 000 morceaux,
+    voir benchmarks/bench_ordering.py). Les morceaux sans caractéristiques
+    sont placés à la fin dans leur ordre d'origine.
+    """
+    
+    # Tempo de référence pour ramener le BPM à l'échelle des autres caractéristiques
+    TEMPO_SCALE = 200.0
+    
+    def __init__(
+        self,
+        artist_spacing: int = 1,
+        block_size: int = 128,
+        weights: Tuple[float, float, float, float] = (1.0, 1.0, 0.5, 0.5)
+    ):
+        """
+        Initialise le séquenceur
+        
+        Args:
+            artist_spacing: Nombre de morceaux minimum entre deux morceaux d'un même artiste
+            block_size: Taille des blocs d'énergie dans lesquels la recherche est faite
+            weights: Poids de l'énergie, du tempo, de la valence et de la dansabilité
+        """
+        self.artist_spacing = artist_spacing
+        self.block_size = block_size
+        self.weights = weights
+    
+    def feature_matrix(self, features: List[TrackFeatures]) -> np.ndarray:
+        """Construit la matrice pondérée (n x 4) des caractéristiques"""
+        matrix = np.array(
+            [[f.energy, f.tempo / self.TEMPO_SCALE, f.valence, f.danceability] for f in features],
+            dtype=np.float64
+        ).reshape(-1, 4)
+        return matrix * np.asarray(self.weights, dtype=np.float64)
+    
+    def order(self, tracks: List[Track], features: Dict[str, TrackFeatures]) -> List[Track]:
+        """Ordonne les morceaux par transitions douces entre caractéristiques voisines"""
+        track_features = [features.get(track.spotify_id) for track in tracks]
+        with_features = [track for track, f in zip(tracks, track_features) if f is not None]
+        without_features = [track for track, f in zip(tracks, track_features) if f is None]
+        if not with_features:
+            return without_features
+        
+        matrix = self.feature_matrix([f for f in track_features if f is not None])
+        artist_codes: Dict[str, int] = {}
+        codes = np.array(
+            [-1 if track.artist is None else artist_codes.setdefault(track.artist, len(artist_codes))
+             for track in with_features],
+            dtype=np.int64
+        )
+        sequence = self._sequence(matrix, codes)
+        return [with_features[i] for i in sequence] + without_features
+    
+    def _sequence(self, matrix: np.ndarray, codes: np.ndarray) -> List[int]:
+        """Calcule l'ordre des lignes de la matrice"""
+        ramp = np.argsort(matrix[:, 0], kind='stable')
+        code_list = codes.tolist()
+        sequence: List[int] = []
+        # Artistes des derniers morceaux placés (code -1 : artiste inconnu, jamais écarté)
+        recent: Deque[int] = deque(maxlen=max(1, self.artist_spacing))
+        
+        for block_start, distances in self._block_distances(matrix, ramp):
+            block = ramp[block_start:block_start + len(distances)]
+            block_list = block.tolist()
+            block_codes = codes[block]
+            
+            if sequence:
+                costs = self._squared_distances(matrix[sequence[-1]][None, :], matrix[block])[0]
+            else:
+                costs = np.zeros(len(block))
+            
+            for _ in range(len(block_list)):
+                choice = int(costs.argmin())
+                code = code_list[block_list[choice]]
+                if self.artist_spacing > 0 and code != -1 and code in recent:
+                    allowed = np.where(np.isin(block_codes, [code for code in recent if code != -1]), np.inf, costs)
+                    alternative = int(allowed.argmin())
+                    # Sinon, contrainte d'espacement impossible à respecter dans ce bloc
+                    if allowed[alternative] != np.inf:
+                        choice = alternative
+                
+                # Les morceaux placés sont exclus des prochaines recherches
+                distances[:, choice] = np.inf
+                costs = distances[choice]
+                placed = block_list[choice]
+                sequence.append(placed)
+                recent.append(code_list[placed])
+        
+        return sequence
+    
+    def _block_distances(self, matrix: np.ndarray, ramp: np.ndarray) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Matrices de distances de tous les blocs de la rampe d'énergie
+        
+        Les blocs complets sont calculés en une seule opération sur un
+        tableau (blocs x taille x taille) ; le dernier bloc, incomplet,
+        séparément.
+        """
+        full = len(ramp) // self.block_size * self.block_size
+        if full:
+            points = matrix[ramp[:full]].reshape(-1, self.block_size, matrix.shape[1])
+            for index, distances in enumerate(self._squared_distances(points, points)):
+                yield index * self.block_size, distances
+        if full < len(ramp):
+            points = matrix[ramp[full:]]
+            yield full, self._squared_distances(points, points)
+    
+    @staticmethod
+    def _squared_distances(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Distances euclidiennes au carré entre les lignes de deux matrices (ou piles de matrices)"""
+        distances = None
+        for column in range(left.shape[-1]):
+            difference = left[..., :, column, None] - right[..., None, :, column]
+            np.multiply(difference, difference, out=difference)
+            if distances is None:
+                distances = difference
+            else:
+                distances += difference
+        return distances
+
+
+class NaiveSmoothTransitionOrderer(SmoothTransitionOrderer):
+    """
+    Implémentation de référence en Python pur du séquenceur
+    
+    Même algorithme que SmoothTransitionOrderer, à base de boucles sur les
+    objets Track ; conservée pour les tests d'équivalence et le benchmark.
+    """
+    
+    def order(self, tracks: List[Track], features: Dict[str, TrackFeatures]) -> List[Track]:
+        """Ordonne les morceaux par transitions douces entre caractéristiques voisines"""
+        with_features = [track for track in tracks if track.spotify_id in features]
+        without_features = [track for track in tracks if track.spotify_id not in features]
+        
+        def vector(track: Track) -> List[float]:
+            f = features[track.spotify_id]
+            values = [f.energy, f.tempo / self.TEMPO_SCALE, f.valence, f.danceability]
+            return [value * weight for value, weight in zip(values, self.weights)]
+        
+        def distance(a: List[float], b: List[float]) -> float:
+            return sum((x - y) * (x - y) for x, y in zip(a, b))
+        
+        ramp = sorted(with_features, key=lambda track: vector(track)[0])
+        last_position: Dict[str, int] = {}
+        ordered: List[Track] = []
+        
+        for block_start in range(0, len(ramp), self.block_size):
+            remaining = ramp[block_start:block_start + self.block_size]
+            while remaining:
+                position = len(ordered)
+                
+                def cost(track: Track) -> float:
+                    return distance(vector(ordered[-1]), vector(track)) if ordered else 0.0
+                
+                allowed = [
+                    track for track in remaining
+                    if track.artist is None
+                    or position - last_position.get(track.artist, -(self.artist_spacing + 1)) > self.artist_spacing
+                ]
+                current = min(allowed or remaining, key=cost)
+                remaining.remove(current)
+                if current.artist is not None:
+                    last_position[current.artist] = position
+                ordered.append(current)
+        
+        return ordered + without_features
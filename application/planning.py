@@ -0,0 +1,195 @@
+"""
+Planification puis application des écritures d'une playlist
+
+La planification fait toutes les lectures (recherche des playlists par
+leur nom, lecture de leur contenu actuel) et calcule les différences ;
+l'application n'enchaîne que des écritures par lots. Entre les deux, le
+plan peut être affiché (simulation) ou refusé s'il touche trop de
+morceaux.
+
+Un contenu plus grand que la limite d'une playlist est réparti entre
+plusieurs parties numérotées : chaque partie a son propre plan, et les
+parties sont planifiées puis écrites en parallèle.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from domain.entities import Playlist
+from domain.errors import NotFoundError
+from domain.playlist_diff import PlaylistDiff, compute_playlist_diff
+from domain.playlist_plan import PLAYLIST_TRACK_LIMIT, PlaylistPlan, shard_name, split_shards
+from domain.repositories import ISpotifyRepository
+
+
+class PlaylistPlanner:
+    """Calcule le plan d'écriture d'une playlist (et de ses parties) puis l'applique"""
+    
+    # Parties supplémentaires cherchées à chaque parcours des playlists du compte
+    LOOKAHEAD = 4
+    
+    def __init__(self, spotify_repo: ISpotifyRepository, track_limit: int = PLAYLIST_TRACK_LIMIT):
+        """
+        Args:
+            spotify_repo: Repository Spotify
+            track_limit: Nombre maximum de morceaux par playlist
+        """
+        self.spotify_repo = spotify_repo
+        self.track_limit = track_limit
+    
+    def shard_count(self, desired: List[str]) -> int:
+        """Nombre de parties nécessaires au contenu souhaité"""
+        return len(split_shards(desired, self.track_limit))
+    
+    def find_shards(self, playlist_name: str, count: int) -> List[Optional[str]]:
+        """
+        Recherche les parties d'une playlist par leur nom
+        
+        Args:
+            playlist_name: Nom de la playlist (première partie)
+            count: Nombre de parties nécessaires
+        
+        Returns:
+            ID (ou None) des count parties, suivis des ID des parties
+            existantes au-delà (restes d'un contenu plus grand)
+        """
+        names = [shard_name(playlist_name, index) for index in range(count + 1)]
+        ids: List[Optional[str]] = []
+        while True:
+            found = self.spotify_repo.find_playlists_by_name(names)
+            ids.extend(found.get(name) for name in names)
+            # Les parties au-delà de count sont cherchées tant qu'elles existent
+            if ids[-1] is None:
+                break
+            names = [shard_name(playlist_name, len(ids) + index) for index in range(self.LOOKAHEAD)]
+        while len(ids) > count and ids[-1] is None:
+            ids.pop()
+        return ids
+    
+    def plan(
+        self,
+        playlist_name: str,
+        desired: List[str],
+        description: str,
+        playlist_id: Optional[str] = None,
+        update_details: bool = True,
+        snapshot_id: Optional[str] = None
+    ) -> PlaylistPlan:
+        """
+        Calcule les opérations qui amènent une playlist au contenu souhaité
+        
+        Args:
+            playlist_name: Nom de la playlist
+            desired: URIs souhaitées, dans l'ordre
+            description: Description de la playlist
+            playlist_id: ID de la playlist existante (None : à créer)
+            update_details: Réécrire la description d'une playlist existante
+            snapshot_id: Version actuelle de la playlist, si elle vient d'être lue
+        
+        Returns:
+            Plan à appliquer ; une playlist supprimée entre-temps est à créer
+        """
+        current: List[Optional[str]] = []
+        if playlist_id is not None:
+            try:
+                current = self.spotify_repo.get_playlist_track_uris(playlist_id, snapshot_id)
+            except NotFoundError:
+                # Playlist supprimée depuis qu'elle a été repérée
+                playlist_id = None
+        
+        if playlist_id is None:
+            return PlaylistPlan(
+                playlist_name=playlist_name,
+                description=description,
+                desired=list(desired),
+                diff=PlaylistDiff(desired=list(desired))
+            )
+        return PlaylistPlan(
+            playlist_name=playlist_name,
+            description=description,
+            desired=list(desired),
+            playlist_id=playlist_id,
+            current_count=len(current),
+            diff=compute_playlist_diff(current, desired),
+            update_details=update_details
+        )
+    
+    def plan_shards(
+        self,
+        playlist_name: str,
+        desired: List[str],
+        description: str,
+        playlist_ids: List[Optional[str]],
+        update_details: bool = True,
+        max_workers: int = 1,
+        snapshot_ids: Optional[Dict[str, str]] = None
+    ) -> List[PlaylistPlan]:
+        """
+        Planifie chaque partie du contenu souhaité
+        
+        Les parties existantes au-delà du nombre nécessaire sont vidées
+        (sans être supprimées) ; une partie déjà vide n'est pas réécrite.
+        
+        Args:
+            playlist_name: Nom de la playlist (première partie)
+            desired: URIs souhaitées, dans l'ordre
+            description: Description de la playlist
+            playlist_ids: ID connus des parties, dans l'ordre (None : à créer)
+            update_details: Réécrire la description des parties existantes
+            max_workers: Parties lues en parallèle
+            snapshot_ids: Version actuelle des parties qui viennent d'être lues
+        
+        Returns:
+            Un plan par partie, dans l'ordre des parties
+        """
+        shards = split_shards(desired, self.track_limit)
+        count = len(shards)
+        snapshot_ids = snapshot_ids or {}
+        jobs = []
+        for index in range(max(count, len(playlist_ids))):
+            playlist_id = playlist_ids[index] if index < len(playlist_ids) else None
+            name = shard_name(playlist_name, index)
+            if index < count:
+                part = description if count == 1 else f"{description} - partie {index + 1}/{count}"
+                jobs.append((name, shards[index], part, playlist_id, update_details, snapshot_ids.get(playlist_id)))
+            elif playlist_id is not None:
+                jobs.append((name, [], description, playlist_id, False, snapshot_ids.get(playlist_id)))
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as executor:
+            return list(executor.map(lambda job: self.plan(*job), jobs))
+    
+    def apply(self, plan: PlaylistPlan) -> str:
+        """
+        Applique un plan (écritures uniquement)
+        
+        Returns:
+            ID de la playlist écrite
+        """
+        if plan.creates:
+            playlist_id = self.spotify_repo.create_playlist(
+                Playlist(name=plan.playlist_name, description=plan.description)
+            )
+            self.spotify_repo.replace_playlist_tracks(playlist_id, plan.desired)
+            return playlist_id
+        
+        playlist_id = plan.playlist_id
+        # Description d'abord : la dernière écriture est celle du contenu,
+        # dont la version (snapshot_id) est conservée avec la copie locale
+        if plan.update_details:
+            self.spotify_repo.update_playlist(
+                playlist_id,
+                Playlist(name=plan.playlist_name, description=plan.description, spotify_id=playlist_id)
+            )
+        if plan.diff.prefer_replace:
+            self.spotify_repo.replace_playlist_tracks(playlist_id, plan.desired)
+        elif not plan.diff.is_empty:
+            self.spotify_repo.apply_playlist_diff(playlist_id, plan.diff)
+        return playlist_id
+    
+    def apply_all(self, plans: List[PlaylistPlan], max_workers: int = 1) -> List[str]:
+        """
+        Applique les plans des parties, en parallèle
+        
+        Returns:
+            ID des playlists écrites, dans l'ordre des plans
+        """
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(plans)))) as executor:
+            return list(executor.map(self.apply, plans))
@@ -0,0 +1,140 @@
+"""
+Rapport d'exécution de la création d'une playlist
+"""
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import ClassVar, Dict, Iterable, Iterator, List, Optional
+from domain.entities import ArtistSearchResult
+from domain.profiling import IPhaseObserver
+
+
+@dataclass
+class ArtistReport:
+    """Issue et durée de la recherche d'un artiste (0 tentative : repris de l'état précédent)"""
+    artist_name: str
+    outcome: str
+    track_count: int
+    latency: float
+    attempts: int = 1
+    found_name: Optional[str] = None
+    error: Optional[str] = None
+    
+    @classmethod
+    def from_result(cls, result: ArtistSearchResult) -> 'ArtistReport':
+        """Construit l'entrée du rapport à partir d'un résultat de recherche"""
+        return cls(
+            artist_name=result.artist_name,
+            outcome=result.reason,
+            track_count=len(result.tracks),
+            latency=round(result.latency, 6),
+            attempts=result.attempts,
+            found_name=result.found_name,
+            error=str(result.error) if result.error else None
+        )
+
+
+@dataclass
+class RunReport:
+    """
+    Rapport lisible par une machine d'une exécution complète
+    
+    Les durées des phases sont en secondes. Les phases possibles sont
+    load, resolve, retry, expand, filter, order, playlist_lookup,
+    clear_diff et write ; une phase non atteinte est absente. La lecture
+    du fichier se fait au fil de la recherche : son temps est compté dans
+    load et retiré de resolve. expanded donne le nombre d'artistes
+    similaires ajoutés (inclus dans artists), filtered le nombre de morceaux retirés par
+    chaque étape de filtrage, false_positive_rates le taux de faux positifs
+    estimé des étapes approximatives (index en filtre de Bloom). plans résume le plan d'écriture de chaque
+    partie de la playlist (une seule sous la limite d'une playlist) ; une
+    simulation se termine par l'issue 'planned', un plan refusé car trop
+    important par l'issue 'blocked'. error décrit l'erreur qui a fait
+    échouer l'exécution, ou l'une de ses étapes facultatives (artistes
+    similaires d'un rafraîchissement).
+    
+    Un observateur éventuel (observe) est prévenu du début et de la fin de
+    chaque phase ; il ne fait pas partie du rapport sérialisé.
+    """
+    playlist_name: str
+    started_at: str
+    outcome: str = 'pending'
+    playlist_url: Optional[str] = None
+    duration: float = 0.0
+    track_count: int = 0
+    phases: Dict[str, float] = field(default_factory=dict)
+    artists: List[ArtistReport] = field(default_factory=list)
+    api: Dict[str, int] = field(default_factory=dict)
+    plans: List[dict] = field(default_factory=list)
+    expanded: int = 0
+    filtered: Dict[str, int] = field(default_factory=dict)
+    false_positive_rates: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+    
+    # Hors des champs du rapport : remplacé par instance dans observe
+    _observer: ClassVar[Optional[IPhaseObserver]] = None
+    
+    def observe(self, observer: Optional[IPhaseObserver]) -> None:
+        """Prévient observer du début et de la fin des phases suivantes"""
+        self._observer = observer
+    
+    @property
+    def retries(self) -> int:
+        """Nombre de recherches d'artistes relancées"""
+        return sum(max(0, artist.attempts - 1) for artist in self.artists)
+    
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Mesure la durée d'un bloc et l'ajoute à la phase name"""
+        observer = self._observer
+        if observer is not None:
+            observer.phase_started(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+            if observer is not None:
+                observer.phase_finished(name)
+    
+    def add_time(self, name: str, seconds: float) -> None:
+        """Ajoute une durée à une phase"""
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+    
+    def timed(self, name: str, iterable: Iterable) -> Iterator:
+        """Parcourt iterable en comptant le temps passé à produire chaque élément"""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add_time(name, time.perf_counter() - start)
+                return
+            self.add_time(name, time.perf_counter() - start)
+            yield item
+    
+    def to_dict(self) -> dict:
+        """Représentation sérialisable en JSON, avec un résumé des issues"""
+        data = asdict(self)
+        data['phases'] = {name: round(seconds, 6) for name, seconds in self.phases.items()}
+        data['duration'] = round(self.duration, 6)
+        outcomes: Dict[str, int] = {}
+        for artist in self.artists:
+            outcomes[artist.outcome] = outcomes.get(artist.outcome, 0) + 1
+        data['summary'] = {
+            'artists': len(self.artists),
+            'outcomes': outcomes,
+            'retries': self.retries,
+        }
+        return data
+    
+    def write_json(self, path: str) -> None:
+        """Écrit le rapport dans un fichier JSON"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
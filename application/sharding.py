@@ -0,0 +1,149 @@
+"""
+Résolution des artistes répartie sur plusieurs processus
+
+Pour les catalogues de plusieurs dizaines de milliers d'artistes, un seul
+processus est limité par le décodage JSON et la comparaison des noms
+(GIL). La liste est découpée en tranches contiguës confiées à un pool de
+processus : chaque processus crée son propre repository Spotify (client,
+connexions, pool de threads) et enregistre ses résolutions dans le cache
+persistant d'artistes partagé. Le processus parent réassemble les
+résultats dans l'ordre d'entrée.
+"""
+import itertools
+import os
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from application.filters import ArtistFilter
+from application.use_cases import SearchArtistTracksUseCase
+from domain.entities import ArtistSearchResult
+from domain.errors import SpotifyError
+from domain.repositories import IArtistResolver, ISpotifyRepository
+
+# État propre à chaque processus de résolution
+_worker_repository: Optional[ISpotifyRepository] = None
+
+
+def _init_worker(repository_factory: Callable[[], ISpotifyRepository]) -> None:
+    """Crée le repository du processus (une seule fois par processus)"""
+    global _worker_repository
+    _worker_repository = repository_factory()
+
+
+def _resolve_shard(
+    artist_names: List[str],
+    max_tracks: int,
+    threads: int,
+    artist_filter: Optional[ArtistFilter] = None
+) -> Tuple[List[ArtistSearchResult], Dict[str, int]]:
+    """
+    Résout une tranche d'artistes dans un processus de résolution
+    
+    Returns:
+        Résultats dans l'ordre de la tranche et compteurs d'utilisation de la tranche
+    """
+    stats_before = _worker_repository.get_stats()
+    search = SearchArtistTracksUseCase(_worker_repository, artist_filter=artist_filter).search
+    if threads > 1:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(executor.map(lambda name: search(name, max_tracks), artist_names))
+    else:
+        results = [search(name, max_tracks) for name in artist_names]
+    
+    for result in results:
+        # Seules les erreurs du domaine sont transmises telles quelles au parent
+        if result.error is not None and not isinstance(result.error, SpotifyError):
+            result.error = SpotifyError(str(result.error))
+    
+    stats = {
+        key: value - stats_before.get(key, 0)
+        for key, value in _worker_repository.get_stats().items()
+        if value != stats_before.get(key, 0)
+    }
+    return results, stats
+
+
+class ShardedArtistResolver(IArtistResolver):
+    """
+    Résout les artistes par tranches dans un pool de processus
+    
+    Le pool est créé à la première résolution et conservé jusqu'à close()
+    (les relances réutilisent les processus déjà connectés). Au plus
+    2 x processes tranches sont en attente à un instant donné, la liste
+    d'artistes étant consommée au fil de l'eau.
+    """
+    
+    def __init__(
+        self,
+        repository_factory: Callable[[], ISpotifyRepository],
+        processes: Optional[int] = None,
+        shard_size: int = 200,
+        threads: int = 1,
+        artist_filter: Optional[ArtistFilter] = None
+    ):
+        """
+        Args:
+            repository_factory: Crée le repository connecté de chaque processus
+                (fonction de niveau module ou functools.partial, transmise par pickle)
+            processes: Nombre de processus (nombre de cœurs par défaut)
+            shard_size: Nombre d'artistes par tranche
+            threads: Recherches menées en parallèle dans chaque processus
+            artist_filter: Critères de genre et de popularité (transmis par pickle)
+        """
+        self.repository_factory = repository_factory
+        self.processes = processes or os.cpu_count() or 1
+        self.shard_size = shard_size
+        self.threads = threads
+        self.artist_filter = artist_filter
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._stats: Counter = Counter()
+    
+    def resolve(self, artist_names: Iterable[str], max_tracks: int) -> Iterator[ArtistSearchResult]:
+        """
+        Résout les artistes, tranche par tranche
+        
+        Yields:
+            Résultat de chaque artiste, dans l'ordre d'entrée
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                initializer=_init_worker,
+                initargs=(self.repository_factory,)
+            )
+        
+        names = iter(artist_names)
+        pending: deque = deque()
+        while True:
+            shard = list(itertools.islice(names, self.shard_size))
+            if shard:
+                pending.append(self._executor.submit(
+                    _resolve_shard, shard, max_tracks, self.threads, self.artist_filter
+                ))
+            if pending and (not shard or len(pending) >= 2 * self.processes):
+                yield from self._collect(pending.popleft().result())
+            if not shard and not pending:
+                return
+    
+    def _collect(self, shard_result: Tuple[List[ArtistSearchResult], Dict[str, int]]) -> List[ArtistSearchResult]:
+        """Cumule les compteurs d'une tranche et retourne ses résultats"""
+        results, stats = shard_result
+        self._stats.update(stats)
+        return results
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Compteurs cumulés de tous les processus (appels à l'API, caches)"""
+        return dict(self._stats)
+    
+    def close(self) -> None:
+        """Arrête les processus de résolution"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
+    def __enter__(self) -> 'ShardedArtistResolver':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
@@ -1,22 +1,53 @@
 """
 Use Cases - Logique applicative
 """
-from typing import List, Optional
-from domain.entities import Artist, Track, Playlist
-from domain.repositories import ISpotifyRepository, IArtistFileRepository
+import dataclasses
+import time
+from collections import deque
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from domain.canonical import canonical_artist_key
+from domain.entities import (
+    Artist,
+    ArtistSearchResult,
+    RefreshState,
+    ResolvedArtist,
+    SearchStatus,
+    Track,
+)
+from domain.playlist_plan import PLAYLIST_TRACK_LIMIT, PlaylistPlan
+from domain.profiling import IPhaseObserver
+from domain.progress import IProgressReporter, NullProgressReporter
+from domain.repositories import IArtistResolver, ISpotifyRepository, IArtistFileRepository, IRefreshStateRepository
+from application.expansion import RelatedArtistExpander
+from application.filters import ArtistFilter, TrackFilter
+from application.ordering import TrackOrderer, SmoothTransitionOrderer
+from application.planning import PlaylistPlanner
+from application.report import ArtistReport, RunReport
 
 
 class SearchArtistTracksUseCase:
     """Use case pour rechercher les morceaux d'un artiste"""
     
-    def __init__(self, spotify_repo: ISpotifyRepository):
+    def __init__(
+        self,
+        spotify_repo: ISpotifyRepository,
+        progress: Optional[IProgressReporter] = None,
+        artist_filter: Optional[ArtistFilter] = None
+    ):
         """
         Initialise le use case
         
         Args:
             spotify_repo: Repository Spotify
+            progress: Suivi de progression (silencieux par défaut)
+            artist_filter: Critères de genre et de popularité ; un artiste
+                écarté ne coûte aucune demande de top tracks
         """
         self.spotify_repo = spotify_repo
+        self.progress = progress or NullProgressReporter()
+        self.artist_filter = artist_filter
     
     def execute(self, artist_name: str, max_tracks: int = 10) -> List[Track]:
         """
@@ -29,40 +60,160 @@ class SearchArtistTracksUseCase:
         Returns:
             Liste des morceaux trouvés
         """
+        return self.search(artist_name, max_tracks).tracks
+    
+    def search(self, artist_name: str, max_tracks: int = 10) -> ArtistSearchResult:
+        """
+        Recherche un artiste et qualifie l'issue de la recherche
+        
+        Contrairement à execute, distingue un artiste introuvable d'une
+        erreur (passagère ou non) survenue pendant la recherche.
+        
+        Args:
+            artist_name: Nom de l'artiste à rechercher
+            max_tracks: Nombre maximum de morceaux à récupérer
+        
+        Returns:
+            Résultat de la recherche (statut, morceaux, erreur éventuelle)
+        """
+        start = time.perf_counter()
+        result = self._search(artist_name, max_tracks)
+        result.latency = time.perf_counter() - start
+        return result
+    
+    def _search(self, artist_name: str, max_tracks: int) -> ArtistSearchResult:
+        """Recherche l'artiste puis ses top tracks"""
+        artist_name_clean = artist_name.strip()
         try:
-            artist_name_clean = artist_name.strip()
             artist = self.spotify_repo.find_artist(artist_name_clean)
             
             if not artist:
-                print(f"  ⚠️  Artiste non trouvé: {artist_name}")
-                return []
+                self.progress.debug(f"  ⚠️  Artiste non trouvé: {artist_name}")
+                return ArtistSearchResult(artist_name, SearchStatus.NOT_FOUND)
             
             # Si le nom trouvé est différent, l'afficher
-            if artist.found_name and artist.found_name.lower() != artist_name_clean.lower():
-                print(f"  ℹ️  Trouvé sous le nom: {artist.found_name}")
-            
-            # Récupérer les top tracks
-            tracks = self.spotify_repo.get_artist_top_tracks(artist, max_tracks)
-            
-            if not tracks:
-                print(f"  ⚠️  Aucun morceau trouvé pour: {artist_name}")
-                return []
+            if artist.found_name and canonical_artist_key(artist.found_name) != canonical_artist_key(artist_name_clean):
+                self.progress.debug(f"  ℹ️  Trouvé sous le nom: {artist.found_name}")
             
-            print(f"  ✓  Trouvé {len(tracks)} morceau(x) pour: {artist.found_name or artist_name_clean}")
+            return self._top_tracks(artist_name, artist, max_tracks)
+        
+        except Exception as e:
+            self.progress.debug(f"  ✗  Erreur pour {artist_name}: {str(e)}")
+            return ArtistSearchResult(artist_name, SearchStatus.ERROR, error=e)
+    
+    def search_known(self, artist: Artist, max_tracks: int = 10) -> ArtistSearchResult:
+        """
+        Récupère les morceaux d'un artiste déjà identifié, sans recherche par nom
+        
+        Args:
+            artist: Artiste avec son ID Spotify (artiste similaire, …)
+            max_tracks: Nombre maximum de morceaux à récupérer
+        
+        Returns:
+            Résultat de la recherche (statut, morceaux, erreur éventuelle)
+        """
+        start = time.perf_counter()
+        try:
+            result = self._top_tracks(artist.name, artist, max_tracks)
+        except Exception as e:
+            self.progress.debug(f"  ✗  Erreur pour {artist.name}: {str(e)}")
+            result = ArtistSearchResult(artist.name, SearchStatus.ERROR, error=e, spotify_id=artist.spotify_id)
+        result.latency = time.perf_counter() - start
+        return result
+    
+    def _top_tracks(self, artist_name: str, artist: Artist, max_tracks: int) -> ArtistSearchResult:
+        """Récupère les top tracks d'un artiste identifié, s'il satisfait les critères"""
+        identified = dict(
+            found_name=artist.found_name, spotify_id=artist.spotify_id,
+            genres=list(artist.genres), popularity=artist.popularity
+        )
+        if self.artist_filter is not None and not self.artist_filter.accepts(artist):
+            self.progress.debug(f"  ⊘  Écarté (genre ou popularité): {artist.found_name or artist_name.strip()}")
+            return ArtistSearchResult(artist_name, SearchStatus.FILTERED, **identified)
+        
+        tracks = self.spotify_repo.get_artist_top_tracks(artist, max_tracks)
+        
+        if not tracks:
+            self.progress.debug(f"  ⚠️  Aucun morceau trouvé pour: {artist_name}")
+            return ArtistSearchResult(artist_name, SearchStatus.NO_TRACKS, **identified)
+        
+        self.progress.debug(f"  ✓  Trouvé {len(tracks)} morceau(x) pour: {artist.found_name or artist_name.strip()}")
+        return ArtistSearchResult(artist_name, SearchStatus.FOUND, tracks, **identified)
+
+
+class OrderTracksByFeaturesUseCase:
+    """Use case pour ordonner les morceaux selon leurs caractéristiques audio"""
+    
+    def __init__(
+        self,
+        spotify_repo: ISpotifyRepository,
+        orderer: Optional[TrackOrderer] = None,
+        progress: Optional[IProgressReporter] = None
+    ):
+        """
+        Initialise le use case
+        
+        Args:
+            spotify_repo: Repository Spotify
+            orderer: Stratégie d'ordonnancement (transitions douces par défaut)
+            progress: Suivi de progression (silencieux par défaut)
+        """
+        self.spotify_repo = spotify_repo
+        self.orderer = orderer or SmoothTransitionOrderer()
+        self.progress = progress or NullProgressReporter()
+    
+    def execute(self, tracks: List[Track]) -> List[Track]:
+        """
+        Enrichit les morceaux avec leurs caractéristiques audio et les ordonne
+        
+        L'enrichissement est optionnel : en cas d'erreur ou sans
+        caractéristiques disponibles, l'ordre d'origine est conservé.
+        
+        Args:
+            tracks: Morceaux dans l'ordre d'origine
+        
+        Returns:
+            Morceaux ordonnés
+        """
+        if not tracks:
             return tracks
-            
+        
+        try:
+            features = self.spotify_repo.get_tracks_audio_features(tracks)
         except Exception as e:
-            print(f"  ✗  Erreur pour {artist_name}: {str(e)}")
-            return []
+            self.progress.warning(f"  ⚠️  Caractéristiques audio indisponibles, ordre conservé: {str(e)}")
+            return tracks
+        
+        if not features:
+            self.progress.warning("  ⚠️  Aucune caractéristique audio trouvée, ordre conservé")
+            return tracks
+        
+        self.progress.info(f"  ✓  {len(features)}/{len(tracks)} morceau(x) analysé(s)")
+        return self.orderer.order(tracks, features)
 
 
 class CreatePlaylistFromArtistsUseCase:
     """Use case pour créer une playlist à partir d'une liste d'artistes"""
     
+    # Attente maximale avant une relance, même si l'API demande plus longtemps
+    MAX_RETRY_DELAY = 60.0
+    
     def __init__(
         self,
         spotify_repo: ISpotifyRepository,
-        artist_file_repo: IArtistFileRepository
+        artist_file_repo: IArtistFileRepository,
+        retry_rounds: int = 2,
+        retry_backoff: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep,
+        progress: Optional[IProgressReporter] = None,
+        resolver: Optional[IArtistResolver] = None,
+        dry_run: bool = False,
+        max_changes: Optional[int] = None,
+        playlist_track_limit: int = PLAYLIST_TRACK_LIMIT,
+        track_filters: Optional[List[TrackFilter]] = None,
+        expander: Optional[RelatedArtistExpander] = None,
+        artist_filter: Optional[ArtistFilter] = None,
+        profiler: Optional[IPhaseObserver] = None
     ):
         """
         Initialise le use case
@@ -70,17 +221,52 @@ class CreatePlaylistFromArtistsUseCase:
         Args:
             spotify_repo: Repository Spotify
             artist_file_repo: Repository de fichiers d'artistes
+            retry_rounds: Nombre de passes de relance des échecs passagers
+            retry_backoff: Attente avant la première relance (secondes), doublée à chaque passe
+            sleep: Fonction d'attente (remplaçable dans les tests)
+            progress: Suivi de progression (silencieux par défaut)
+            resolver: Résolution des artistes hors du processus (multi-processus) ;
+                par défaut, les recherches sont menées par un pool de threads
+            dry_run: Afficher le plan d'écriture de la playlist sans l'appliquer
+            max_changes: Nombre maximal de morceaux touchés dans une playlist
+                existante (au-delà, le plan n'est pas appliqué)
+            playlist_track_limit: Morceaux par playlist ; au-delà, le contenu
+                est réparti entre des parties numérotées (« Nom (part 2) »)
+            track_filters: Étapes de filtrage appliquées aux morceaux avant
+                l'ordonnancement et l'écriture (exclusion de playlists, …)
+            expander: Ajout des artistes similaires aux artistes trouvés
+                (désactivé par défaut)
+            artist_filter: Critères de genre et de popularité appliqués avant
+                la demande des top tracks (à transmettre aussi au résolveur)
+            profiler: Observateur prévenu du début et de la fin de chaque
+                phase (profilage ; aucun par défaut)
         """
         self.spotify_repo = spotify_repo
         self.artist_file_repo = artist_file_repo
-        self.search_use_case = SearchArtistTracksUseCase(spotify_repo)
+        self.resolver = resolver
+        self.dry_run = dry_run
+        self.max_changes = max_changes
+        self.planner = PlaylistPlanner(spotify_repo, playlist_track_limit)
+        self.track_filters = track_filters or []
+        self.expander = expander
+        self.profiler = profiler
+        self.retry_rounds = retry_rounds
+        self.retry_backoff = retry_backoff
+        self._sleep = sleep
+        self.progress = progress or NullProgressReporter()
+        self.search_use_case = SearchArtistTracksUseCase(
+            spotify_repo, progress=self.progress, artist_filter=artist_filter
+        )
+        self.order_use_case = OrderTracksByFeaturesUseCase(spotify_repo, progress=self.progress)
     
     def execute(
         self,
         playlist_name: str,
         artists_file: str = 'hellfest_2026_artists.txt',
         max_tracks_per_artist: int = 10,
-        require_confirmation: bool = True
+        require_confirmation: bool = True,
+        order_by_features: bool = False,
+        max_workers: int = 1
     ) -> Optional[str]:
         """
         Crée une playlist à partir d'une liste d'artistes
@@ -90,91 +276,767 @@ class CreatePlaylistFromArtistsUseCase:
             artists_file: Fichier contenant la liste des artistes
             max_tracks_per_artist: Nombre maximum de morceaux par artiste
             require_confirmation: Demander confirmation avant de créer
-            
+            order_by_features: Ordonner les morceaux selon leurs caractéristiques audio
+            max_workers: Nombre de recherches d'artistes menées en parallèle
+        
         Returns:
             URL de la playlist créée ou None en cas d'erreur
         """
+        return self.run(
+            playlist_name,
+            artists_file=artists_file,
+            max_tracks_per_artist=max_tracks_per_artist,
+            require_confirmation=require_confirmation,
+            order_by_features=order_by_features,
+            max_workers=max_workers
+        ).playlist_url
+    
+    def run(
+        self,
+        playlist_name: str,
+        artists_file: str = 'hellfest_2026_artists.txt',
+        max_tracks_per_artist: int = 10,
+        require_confirmation: bool = True,
+        order_by_features: bool = False,
+        max_workers: int = 1,
+        report_path: Optional[str] = None
+    ) -> RunReport:
+        """
+        Crée une playlist et rend compte de l'exécution
+        
+        Mêmes paramètres que execute ; le rapport détaille la durée de
+        chaque phase, l'issue et la durée de recherche de chaque artiste,
+        les appels à l'API, les succès et échecs des caches et les relances.
+        
+        Args:
+            report_path: Fichier JSON où écrire le rapport (optionnel)
+        
+        Returns:
+            Rapport d'exécution (playlist_url vaut None en cas d'échec)
+        """
+        report = RunReport(
+            playlist_name=playlist_name,
+            started_at=datetime.now(timezone.utc).isoformat(timespec='seconds')
+        )
+        report.observe(self.profiler)
+        stats_before = self._get_stats()
+        start = time.perf_counter()
+        try:
+            self._create_playlist(
+                report, playlist_name, artists_file, max_tracks_per_artist,
+                require_confirmation, order_by_features, max_workers
+            )
+        finally:
+            report.duration = time.perf_counter() - start
+            stats_after = self._get_stats()
+            report.api = {
+                key: value - stats_before.get(key, 0)
+                for key, value in stats_after.items()
+                if value != stats_before.get(key, 0)
+            }
+            if report_path:
+                report.write_json(report_path)
+                self.progress.info(f"📊 Rapport d'exécution écrit dans {report_path}")
+        return report
+    
+    def _get_stats(self) -> Dict[str, int]:
+        """Compteurs du repository, cumulés avec ceux du résolveur éventuel"""
+        stats = dict(self.spotify_repo.get_stats())
+        if self.resolver is not None:
+            for key, value in self.resolver.get_stats().items():
+                stats[key] = stats.get(key, 0) + value
+        return stats
+    
+    def _create_playlist(
+        self,
+        report: RunReport,
+        playlist_name: str,
+        artists_file: str,
+        max_tracks_per_artist: int,
+        require_confirmation: bool,
+        order_by_features: bool,
+        max_workers: int
+    ) -> None:
+        """Enchaîne les phases de la création en complétant le rapport"""
         # Charger la liste des artistes
-        print("\n📋 Chargement de la liste des artistes...")
-        artist_names = self.artist_file_repo.load_artists(artists_file)
-        print(f"✓  {len(artist_names)} artiste(s) chargé(s)")
+        self.progress.info("\n📋 Chargement de la liste des artistes...")
+        artist_names: Iterable[str] = self.artist_file_repo.iter_artists(artists_file)
+        total: Optional[int] = None
         
-        # Demander confirmation
+        # Demander confirmation (la liste est alors chargée entièrement pour être comptée)
         if require_confirmation:
-            print(f"\n📝 Vous allez créer une playlist avec {len(artist_names)} groupes")
-            print(f"   Chaque groupe aura jusqu'à {max_tracks_per_artist} morceaux populaires")
+            with report.phase('load'):
+                artist_names = list(artist_names)
+            total = len(artist_names)
+            self.progress.info(f"✓  {total} artiste(s) chargé(s)")
+            self.progress.info(f"\n📝 Vous allez créer une playlist avec {total} groupes")
+            self.progress.info(f"   Chaque groupe aura jusqu'à {max_tracks_per_artist} morceaux populaires")
             response = input("\nContinuer ? (o/n): ").lower()
             if response != 'o':
-                print("❌ Opération annulée")
-                return None
+                self.progress.warning("❌ Opération annulée")
+                report.outcome = 'cancelled'
+                return
         
-        # Rechercher les morceaux pour chaque artiste
-        print("\n🔍 Recherche des morceaux...")
-        all_tracks = []
-        found_count = 0
+        # Rechercher les morceaux pour chaque artiste, au fil de la lecture du fichier
+        self.progress.info("\n🔍 Recherche des morceaux...")
+        load_before = report.phases.get('load', 0.0)
+        with report.phase('resolve'):
+            results = list(self._search_artists(
+                report.timed('load', artist_names), max_tracks_per_artist, max_workers, total
+            ))
+        report.add_time('resolve', load_before - report.phases['load'])
         
-        for i, artist_name in enumerate(artist_names, 1):
-            print(f"\n[{i}/{len(artist_names)}] Recherche: {artist_name}")
-            tracks = self.search_use_case.execute(artist_name, max_tracks_per_artist)
-            if tracks:
-                all_tracks.extend(tracks)
-                found_count += 1
+        # Relancer les échecs passagers après la passe principale
+        with report.phase('retry'):
+            recovered = self._retry_failed(results, max_tracks_per_artist, max_workers)
         
-        print("\n✓  Recherche terminée:")
-        print(f"   - {found_count}/{len(artist_names)} artistes trouvés")
-        print(f"   - {len(all_tracks)} morceaux au total")
+        # Ajouter les artistes similaires (parcours borné du graphe des artistes)
+        if self.expander is not None:
+            try:
+                with report.phase('expand'):
+                    related = self._expand_artists(results, max_tracks_per_artist, max_workers)
+            except Exception as e:
+                self.progress.error(f"\n❌ Erreur lors de la recherche des artistes similaires: {str(e)}")
+                report.artists = [ArtistReport.from_result(result) for result in results]
+                report.outcome = 'failed'
+                report.error = str(e)
+                return
+            report.expanded = len(related)
+            results.extend(related)
+        
+        report.artists = [ArtistReport.from_result(result) for result in results]
+        all_tracks = [track for result in results for track in result.tracks]
+        artist_count = len(results)
+        found_count = sum(1 for result in results if result.tracks)
+        skipped = [result for result in results if not result.tracks]
+        
+        self.progress.info("\n✓  Recherche terminée:")
+        self.progress.info(f"   - {found_count}/{artist_count} artistes trouvés")
+        if recovered:
+            self.progress.info(f"   - {recovered} artiste(s) récupéré(s) lors des relances")
+        self.progress.info(f"   - {len(all_tracks)} morceaux au total")
+        self._report_skipped(skipped)
         
         if not all_tracks:
-            print("\n❌ Aucun morceau trouvé. Impossible de créer la playlist.")
+            self.progress.error("\n❌ Aucun morceau trouvé. Impossible de créer la playlist.")
+            report.outcome = 'no_tracks'
+            return
+        
+        # Filtrer les morceaux (playlists exclues, …)
+        try:
+            all_tracks = self._filter_tracks(report, all_tracks)
+        except Exception as e:
+            self.progress.error(f"\n❌ Erreur lors du filtrage des morceaux: {str(e)}")
+            report.outcome = 'failed'
+            report.error = str(e)
+            return
+        if not all_tracks:
+            self.progress.error("\n❌ Tous les morceaux ont été filtrés. Impossible de créer la playlist.")
+            report.outcome = 'no_tracks'
+            return
+        
+        # Ordonner les morceaux (énergie, tempo, alternance des artistes)
+        if order_by_features:
+            self.progress.info("\n🎚️  Analyse des caractéristiques audio...")
+            with report.phase('order'):
+                all_tracks = self.order_use_case.execute(all_tracks)
+        report.track_count = len(all_tracks)
+        
+        # Planifier puis appliquer les écritures de la playlist
+        self.progress.info("\n📝 Création/mise à jour de la playlist...")
+        try:
+            self._write_playlist(
+                report, playlist_name, [track.uri for track in all_tracks],
+                self._description(artist_count), max_workers
+            )
+        except Exception as e:
+            self.progress.error(f"\n❌ Erreur lors de la création de la playlist: {str(e)}")
+            report.outcome = 'failed'
+            report.error = str(e)
+    
+    def _expand_artists(
+        self,
+        results: List[ArtistSearchResult],
+        max_tracks: int,
+        max_workers: int
+    ) -> List[ArtistSearchResult]:
+        """
+        Recherche les morceaux des artistes similaires aux artistes trouvés
+        
+        Returns:
+            Résultat de chaque artiste ajouté, dans l'ordre du parcours
+        """
+        self.progress.info("\n🔗 Recherche des artistes similaires...")
+        seeds = [
+            Artist(name=result.artist_name, spotify_id=result.spotify_id, found_name=result.found_name)
+            for result in results if result.spotify_id
+        ]
+        related = self.expander.expand(seeds)
+        expanded = list(self._search_known_artists(related, max_tracks, max_workers, "🔗 Artistes similaires"))
+        self.progress.info(f"✓  {len(expanded)} artiste(s) similaire(s) ajouté(s)")
+        return expanded
+    
+    def _filter_tracks(self, report: RunReport, tracks: List[Track]) -> List[Track]:
+        """
+        Applique les étapes de filtrage dans l'ordre
+        
+        Le nombre de morceaux retirés par chaque étape est noté dans le
+        rapport (filtered), la durée totale dans la phase filter. Une
+        étape approximative est signalée avec son taux de faux positifs
+        (false_positive_rates).
+        """
+        if not self.track_filters:
+            return tracks
+        with report.phase('filter'):
+            for track_filter in self.track_filters:
+                before = len(tracks)
+                tracks = track_filter.apply(tracks)
+                report.filtered[track_filter.name] = before - len(tracks)
+                rate = track_filter.false_positive_rate()
+                if rate:
+                    report.false_positive_rates[track_filter.name] = rate
+                    self.progress.warning(
+                        f"  ⚠️  Filtrage approximatif ({track_filter.name}, filtre de Bloom) : "
+                        f"environ {rate:.2%} de faux positifs"
+                    )
+        removed = sum(report.filtered.values())
+        if removed:
+            self.progress.info(f"   - {removed} morceau(x) filtré(s), {len(tracks)} conservé(s)")
+        return tracks
+    
+    def _write_playlist(
+        self,
+        report: RunReport,
+        playlist_name: str,
+        desired: List[str],
+        description: str,
+        max_workers: int = 1,
+        playlist_ids: Optional[List[Optional[str]]] = None,
+        update_details: bool = True,
+        snapshot_ids: Optional[Dict[str, str]] = None
+    ) -> Optional[List[str]]:
+        """
+        Planifie les écritures, puis les applique sauf simulation ou refus
+        
+        Au-delà de la limite d'une playlist, le contenu est réparti entre
+        des parties numérotées, planifiées et écrites en parallèle. Les
+        lectures sont comptées dans playlist_lookup (recherche par nom) et
+        clear_diff (contenu actuel et différence), les écritures dans
+        write. Un plan qui touche plus de max_changes morceaux des
+        playlists existantes n'est pas appliqué (issue 'blocked').
+        
+        Args:
+            playlist_ids: ID connus des parties (recherchées par nom s'il en manque)
+            snapshot_ids: Version actuelle des parties qui viennent d'être lues
+                (le contenu n'est pas comparé à la copie locale au prix d'un
+                nouvel appel)
+        
+        Returns:
+            ID des parties écrites, None si le plan n'a pas été appliqué
+        """
+        count = self.planner.shard_count(desired)
+        known = list(playlist_ids or [])
+        if len(known) < count or None in known[:count]:
+            with report.phase('playlist_lookup'):
+                found = self.planner.find_shards(playlist_name, count)
+            known = [
+                (known[i] if i < len(known) else None) or (found[i] if i < len(found) else None)
+                for i in range(max(len(known), len(found)))
+            ]
+        if known and known[0] is not None:
+            self.progress.info(f"  ✓  Playlist existante trouvée: {playlist_name}")
+        with report.phase('clear_diff'):
+            plans = self.planner.plan_shards(
+                playlist_name, desired, description, known,
+                update_details=update_details, max_workers=max_workers, snapshot_ids=snapshot_ids
+            )
+        report.plans = [plan.to_dict() for plan in plans]
+        
+        if self.dry_run:
+            self.progress.info("\n🔎 Simulation, aucune écriture :")
+            self._describe_plans(plans)
+            report.outcome = 'planned'
+            return None
+        
+        changes = sum(plan.change_count for plan in plans if not plan.creates)
+        if self.max_changes is not None and changes > self.max_changes:
+            message = f"Plan refusé : {changes} morceaux touchés (maximum {self.max_changes})"
+            self.progress.error(f"\n⛔ {message}")
+            self._describe_plans(plans)
+            report.outcome = 'blocked'
+            report.error = message
             return None
         
-        # Créer ou mettre à jour la playlist
-        print("\n📝 Création/mise à jour de la playlist...")
-        description = f"Playlist avec les groupes du Hellfest 2026 ({len(artist_names)} groupes)"
+        calls = sum(plan.estimated_calls for plan in plans)
+        self.progress.info(f"\n🎵 Écriture de {count} playlist(s) ({calls} appel(s))...")
+        with report.phase('write'):
+            ids = self.planner.apply_all(plans, max_workers)
         
+        created = plans[0].creates
+        report.outcome = 'created' if created else 'updated'
+        report.playlist_url = f"https://open.spotify.com/playlist/{ids[0]}"
+        if created:
+            self.progress.info("\n🎉 Playlist créée avec succès !")
+        else:
+            self.progress.info("\n🎉 Playlist mise à jour avec succès !")
+        for plan, playlist_id in zip(plans[:count], ids):
+            self.progress.info(f"🔗 {plan.playlist_name}: https://open.spotify.com/playlist/{playlist_id}")
+        return ids[:count]
+    
+    def _describe_plans(self, plans: List[PlaylistPlan]) -> None:
+        """Affiche le plan de chaque partie"""
+        for plan in plans:
+            for line in plan.describe():
+                self.progress.info(f"   - {line}")
+    
+    @staticmethod
+    def _description(artist_count: int) -> str:
+        """Description de la playlist"""
+        return f"Playlist avec les groupes du Hellfest 2026 ({artist_count} groupes)"
+    
+    def _search_artists(
+        self,
+        artist_names: Iterable[str],
+        max_tracks: int,
+        max_workers: int,
+        total: Optional[int] = None,
+        label: str = "🔍 Recherche"
+    ) -> Iterator[ArtistSearchResult]:
+        """
+        Recherche les morceaux de chaque artiste, éventuellement en parallèle
+        
+        Les artistes sont consommés au fil de l'eau : au plus 2 x max_workers
+        recherches sont en attente à un instant donné, et les résultats sont
+        produits dans l'ordre d'entrée.
+        
+        Args:
+            artist_names: Noms d'artistes (liste ou itérateur)
+            max_tracks: Nombre maximum de morceaux par artiste
+            max_workers: Nombre de recherches menées en parallèle
+            total: Nombre total d'artistes s'il est connu (affichage)
+            label: Libellé de la tâche dans le suivi de progression
+        
+        Yields:
+            Résultat de la recherche de chaque artiste, dans l'ordre d'entrée
+        """
+        self.progress.start(label, total)
         try:
-            # Vérifier si la playlist existe déjà
-            existing_playlist_id = self.spotify_repo.find_playlist_by_name(playlist_name)
-            is_update = existing_playlist_id is not None
-            
-            if existing_playlist_id:
-                print(f"  ✓  Playlist existante trouvée: {playlist_name}")
-                print("  🗑️  Vidage de la playlist...")
-                self.spotify_repo.clear_playlist(existing_playlist_id)
-                
-                playlist = Playlist(
-                    name=playlist_name,
-                    description=description,
-                    spotify_id=existing_playlist_id
-                )
-                self.spotify_repo.update_playlist(existing_playlist_id, playlist)
-                playlist_id = existing_playlist_id
-            else:
-                playlist = Playlist(
-                    name=playlist_name,
-                    description=description
-                )
-                playlist_id = self.spotify_repo.create_playlist(playlist)
-            
-            if is_update:
-                print(f"✓  Playlist mise à jour: {playlist_name}")
-            else:
-                print(f"✓  Playlist créée: {playlist_name}")
+            for result in self._iter_search_results(artist_names, max_tracks, max_workers):
+                self.progress.advance(result.artist_name)
+                yield result
+        finally:
+            self.progress.finish()
+    
+    def _iter_search_results(
+        self,
+        artist_names: Iterable[str],
+        max_tracks: int,
+        max_workers: int
+    ) -> Iterator[ArtistSearchResult]:
+        """Recherches par le résolveur, en série, ou en parallèle avec une fenêtre bornée"""
+        if self.resolver is not None:
+            yield from self.resolver.resolve(artist_names, max_tracks)
+            return
+        
+        if max_workers <= 1:
+            for artist_name in artist_names:
+                yield self.search_use_case.search(artist_name, max_tracks)
+            return
+        
+        pending: deque = deque()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for artist_name in artist_names:
+                pending.append(executor.submit(self.search_use_case.search, artist_name, max_tracks))
+                if len(pending) >= 2 * max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    
+    def _search_known_artists(
+        self,
+        artists: List[Artist],
+        max_tracks: int,
+        max_workers: int,
+        label: str
+    ) -> Iterator[ArtistSearchResult]:
+        """Morceaux d'artistes déjà identifiés (par leur ID), en parallèle, dans l'ordre d'entrée"""
+        self.progress.start(label, len(artists))
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                for result in executor.map(lambda artist: self.search_use_case.search_known(artist, max_tracks), artists):
+                    self.progress.advance(result.artist_name)
+                    yield result
+        finally:
+            self.progress.finish()
+    
+    def _search_targets(
+        self,
+        targets: List[Union[str, Artist]],
+        max_tracks: int,
+        max_workers: int,
+        label: str = "🔍 Recherche"
+    ) -> List[ArtistSearchResult]:
+        """Recherche par nom (str) ou par ID (Artist identifié), résultats dans l'ordre d'entrée"""
+        results: List[Optional[ArtistSearchResult]] = [None] * len(targets)
+        by_name = [i for i, target in enumerate(targets) if isinstance(target, str)]
+        by_id = [i for i, target in enumerate(targets) if not isinstance(target, str)]
+        names = [targets[i] for i in by_name]
+        for i, result in zip(by_name, self._search_artists(names, max_tracks, max_workers, len(names), label)):
+            results[i] = result
+        if by_id:
+            known = [targets[i] for i in by_id]
+            for i, result in zip(by_id, self._search_known_artists(known, max_tracks, max_workers, label)):
+                results[i] = result
+        return results
+    
+    def _retry_failed(
+        self,
+        results: List[ArtistSearchResult],
+        max_tracks: int,
+        max_workers: int,
+        targets: Optional[List[Union[str, Artist]]] = None
+    ) -> int:
+        """
+        Relance les recherches en échec passager, par passes successives
+        
+        Chaque passe attend d'abord (attente doublée à chaque passe, ou
+        délai Retry-After demandé par l'API s'il est plus long) puis relance
+        les artistes concernés avec un parallélisme réduit de moitié. Les
+        résultats remplacent les échecs à leur position d'origine.
+        
+        Args:
+            results: Résultats de la passe principale, modifiés sur place
+            max_tracks: Nombre maximum de morceaux par artiste
+            max_workers: Parallélisme de la passe principale
+            targets: Nom ou artiste identifié à l'origine de chaque résultat
+                (par défaut, les artistes sont relancés par leur nom)
+        
+        Returns:
+            Nombre d'artistes récupérés
+        """
+        recovered = 0
+        workers = max_workers
+        for round_index in range(self.retry_rounds):
+            failed = [i for i, result in enumerate(results) if result.retryable]
+            if not failed:
+                break
             
-            # Ajouter les morceaux
-            print("\n🎵 Ajout des morceaux à la playlist...")
-            self.spotify_repo.add_tracks_to_playlist(playlist_id, all_tracks)
+            workers = max(1, workers // 2)
+            delay = self.retry_backoff * (2 ** round_index)
+            retry_after = [getattr(results[i].error, 'retry_after', None) or 0.0 for i in failed]
+            delay = min(max([delay] + retry_after), self.MAX_RETRY_DELAY)
+            self.progress.info(f"\n🔁 Relance {round_index + 1}/{self.retry_rounds} de {len(failed)} artiste(s) "
+                               f"dans {delay:.1f}s ({workers} en parallèle)...")
+            self._sleep(delay)
             
-            playlist_url = f"https://open.spotify.com/playlist/{playlist_id}"
-            if is_update:
-                print("\n🎉 Playlist mise à jour avec succès !")
+            retried = [targets[i] if targets else results[i].artist_name for i in failed]
+            for i, result in zip(failed, self._search_targets(retried, max_tracks, workers, "🔁 Relance")):
+                result.attempts = results[i].attempts + 1
+                results[i] = result
+                if result.tracks:
+                    recovered += 1
+        return recovered
+    
+    def _report_skipped(self, skipped: List[ArtistSearchResult]) -> None:
+        """Affiche les artistes ignorés, regroupés par motif"""
+        if not skipped:
+            return
+        
+        labels = {
+            'not_found': 'introuvable(s)',
+            'no_tracks': 'sans morceau',
+            'filtered': 'écarté(s) par genre ou popularité',
+            'transient': 'erreur passagère',
+            'rate_limited': 'limite de requêtes',
+            'auth': "erreur d'authentification",
+            'resource_not_found': 'ressource inexistante',
+        }
+        by_reason: Dict[str, List[str]] = {}
+        for result in skipped:
+            by_reason.setdefault(result.reason, []).append(result.artist_name)
+        
+        self.progress.warning(f"   - {len(skipped)} artiste(s) ignoré(s):")
+        for reason, names in by_reason.items():
+            self.progress.warning(f"     · {labels.get(reason, 'erreur')} ({len(names)}): {', '.join(names)}")
+        retryable = sum(1 for result in skipped if result.retryable)
+        if retryable:
+            self.progress.warning(f"   - {retryable} échec(s) passager(s), à relancer")
+
+
+class RefreshPlaylistUseCase(CreatePlaylistFromArtistsUseCase):
+    """
+    Use case de rafraîchissement incrémental d'une playlist
+    
+    Compare le fichier d'artistes à l'état du dernier rafraîchissement :
+    seuls les artistes nouveaux ou dont les morceaux ont dépassé max_age
+    sont interrogés (par leur ID s'ils sont déjà identifiés), puis seule la
+    différence avec le contenu actuel de la playlist est écrite. Sans
+    changement (même fichier, morceaux récents, même contenu), seule la
+    version de chaque partie de la playlist est demandée : une modification
+    faite dans Spotify depuis le dernier passage est ainsi corrigée.
+    """
+    
+    def __init__(
+        self,
+        spotify_repo: ISpotifyRepository,
+        artist_file_repo: IArtistFileRepository,
+        state_repo: IRefreshStateRepository,
+        max_age: float = 7 * 24 * 3600,
+        clock: Callable[[], float] = time.time,
+        **options
+    ):
+        """
+        Initialise le use case
+        
+        Args:
+            spotify_repo: Repository Spotify
+            artist_file_repo: Repository de fichiers d'artistes
+            state_repo: Repository de l'état des rafraîchissements
+            max_age: Âge maximal des top tracks d'un artiste avant de les redemander (secondes)
+            clock: Horloge (remplaçable dans les tests)
+            **options: Options de CreatePlaylistFromArtistsUseCase (relances, progression)
+        """
+        super().__init__(spotify_repo, artist_file_repo, **options)
+        self.state_repo = state_repo
+        self.max_age = max_age
+        self._clock = clock
+    
+    def _create_playlist(
+        self,
+        report: RunReport,
+        playlist_name: str,
+        artists_file: str,
+        max_tracks_per_artist: int,
+        require_confirmation: bool,
+        order_by_features: bool,
+        max_workers: int
+    ) -> None:
+        """Rafraîchit la playlist (exécution planifiée : pas de confirmation)"""
+        now = self._clock()
+        state = self.state_repo.load(playlist_name)
+        
+        # Charger les artistes : inutile de relire un fichier inchangé
+        with report.phase('load'):
+            fingerprint = self.artist_file_repo.fingerprint(artists_file)
+            if state is not None and fingerprint is not None and fingerprint == state.file_fingerprint:
+                names = [artist.name for artist in state.artists]
             else:
-                print("\n🎉 Playlist créée avec succès !")
-            print(f"🔗 {playlist_url}")
-            
-            return playlist_url
-            
+                names = list(self.artist_file_repo.iter_artists(artists_file))
+        
+        # Reprendre les artistes connus dont les morceaux sont récents
+        previous: Dict[str, ResolvedArtist] = {}
+        if state is not None:
+            same_settings = state.max_tracks_per_artist == max_tracks_per_artist
+            for artist in state.artists:
+                previous[canonical_artist_key(artist.name)] = (
+                    artist if same_settings else dataclasses.replace(artist, fetched_at=0.0)
+                )
+        
+        entries: List[Optional[ResolvedArtist]] = []
+        stale: List[int] = []
+        for i, name in enumerate(names):
+            entry = previous.get(canonical_artist_key(name))
+            if entry is None or now - entry.fetched_at > self.max_age:
+                stale.append(i)
+            entries.append(dataclasses.replace(entry, name=name) if entry else None)
+        
+        self.progress.info(
+            f"\n🔄 {len(names)} artiste(s) : {len(names) - len(stale)} à jour, {len(stale)} à interroger"
+        )
+        
+        # Interroger uniquement les artistes nouveaux ou périmés (par leur ID s'ils sont identifiés)
+        targets = [self._refresh_target(entries[i], names[i]) for i in stale]
+        with report.phase('resolve'):
+            results = self._search_targets(targets, max_tracks_per_artist, max_workers)
+        with report.phase('retry'):
+            self._retry_failed(results, max_tracks_per_artist, max_workers, targets)
+        
+        reports: Dict[int, ArtistReport] = {}
+        for i, result in zip(stale, results):
+            reports[i] = ArtistReport.from_result(result)
+            if result.status != SearchStatus.ERROR:
+                entries[i] = self._resolved(names[i], result, now)
+            elif entries[i] is None:
+                # Échec sans état précédent : l'artiste sera interrogé au prochain passage
+                entries[i] = ResolvedArtist(name=names[i])
+            # Sinon, les morceaux précédents sont conservés jusqu'au prochain passage
+        report.artists = [reports.get(i) or self._cached_report(entry) for i, entry in enumerate(entries)]
+        self._report_skipped([result for result in results if not result.tracks])
+        
+        # Ajouter les artistes similaires, repris eux aussi de l'état tant qu'ils sont récents
+        related: List[ResolvedArtist] = []
+        if self.expander is not None:
+            try:
+                with report.phase('expand'):
+                    related, related_reports = self._refresh_related(
+                        entries, state, now, max_tracks_per_artist, max_workers
+                    )
+                report.expanded = len(related)
+                report.artists.extend(related_reports)
+            except Exception as e:
+                # Les artistes similaires précédents sont conservés jusqu'au prochain passage
+                self.progress.warning(f"   - Artistes similaires non rafraîchis: {str(e)}")
+                report.error = str(e)
+                related = list(state.related) if state else []
+        
+        all_tracks = [track for entry in entries + related for track in entry.tracks]
+        new_state = RefreshState(
+            playlist_name=playlist_name,
+            file_fingerprint=fingerprint,
+            max_tracks_per_artist=max_tracks_per_artist,
+            playlist_id=state.playlist_id if state else None,
+            shard_ids=state.shard_ids if state else [],
+            track_uris=state.track_uris if state else [],
+            artists=entries,
+            updated_at=now,
+            snapshot_ids=dict(state.snapshot_ids) if state else {},
+            related=related
+        )
+        try:
+            all_tracks = self._filter_tracks(report, all_tracks)
+            if order_by_features and all_tracks:
+                with report.phase('order'):
+                    all_tracks = self.order_use_case.execute(all_tracks)
+            report.track_count = len(all_tracks)
+            desired = [track.uri for track in all_tracks]
+            self._sync_playlist(report, new_state, state, desired, len(entries) + len(related), max_workers)
         except Exception as e:
-            print(f"\n❌ Erreur lors de la création de la playlist: {str(e)}")
-            return None
-
+            self.progress.error(f"\n❌ Erreur lors du rafraîchissement de la playlist: {str(e)}")
+            report.outcome = 'failed'
+            report.error = str(e)
+        # Les artistes résolus sont conservés même si l'écriture a échoué
+        self.state_repo.save(new_state)
+    
+    def _refresh_target(self, entry: Optional[ResolvedArtist], name: str) -> Union[str, Artist]:
+        """Artiste identifié à interroger par son ID, ou nom à rechercher"""
+        if entry is None or not entry.spotify_id:
+            return name
+        if entry.popularity is None and self.search_use_case.artist_filter is not None:
+            # Métadonnées absentes de l'état : la recherche par nom les fournit aux critères
+            return name
+        return entry.to_artist()
+    
+    @staticmethod
+    def _resolved(name: str, result: ArtistSearchResult, now: float) -> ResolvedArtist:
+        """Entrée de l'état pour un artiste interrogé lors de ce passage"""
+        return ResolvedArtist(
+            name=name,
+            spotify_id=result.spotify_id,
+            found_name=result.found_name,
+            tracks=result.tracks,
+            fetched_at=now,
+            genres=result.genres,
+            popularity=result.popularity
+        )
+    
+    @staticmethod
+    def _cached_report(entry: ResolvedArtist) -> ArtistReport:
+        """Entrée du rapport pour un artiste repris de l'état précédent (0 tentative)"""
+        return ArtistReport(
+            artist_name=entry.name,
+            outcome=SearchStatus.FOUND.value if entry.tracks else SearchStatus.NO_TRACKS.value,
+            track_count=len(entry.tracks),
+            latency=0.0,
+            attempts=0,
+            found_name=entry.found_name
+        )
+    
+    def _refresh_related(
+        self,
+        entries: List[ResolvedArtist],
+        state: Optional[RefreshState],
+        now: float,
+        max_tracks: int,
+        max_workers: int
+    ) -> Tuple[List[ResolvedArtist], List[ArtistReport]]:
+        """
+        Artistes similaires des artistes identifiés
+        
+        Les listes d'artistes similaires sont en cache dans le repository ;
+        seuls les artistes similaires nouveaux ou périmés sont interrogés,
+        par leur ID.
+        
+        Returns:
+            Entrées de l'état et du rapport, dans l'ordre du parcours
+        """
+        seeds = [entry.to_artist() for entry in entries if entry.spotify_id]
+        artists = self.expander.expand(seeds)
+        previous: Dict[str, ResolvedArtist] = {}
+        if state is not None and state.max_tracks_per_artist == max_tracks:
+            previous = {entry.spotify_id: entry for entry in state.related if entry.spotify_id}
+        
+        related: List[Optional[ResolvedArtist]] = [previous.get(artist.spotify_id) for artist in artists]
+        stale = [i for i, entry in enumerate(related) if entry is None or now - entry.fetched_at > self.max_age]
+        results = self._search_known_artists(
+            [artists[i] for i in stale], max_tracks, max_workers, "🔗 Artistes similaires"
+        )
+        reports: Dict[int, ArtistReport] = {}
+        for i, result in zip(stale, results):
+            reports[i] = ArtistReport.from_result(result)
+            if result.status != SearchStatus.ERROR:
+                related[i] = self._resolved(artists[i].name, result, now)
+            elif related[i] is None:
+                related[i] = ResolvedArtist(
+                    name=artists[i].name, spotify_id=artists[i].spotify_id, found_name=artists[i].found_name
+                )
+        self.progress.info(f"✓  {len(artists)} artiste(s) similaire(s), {len(stale)} interrogé(s)")
+        return related, [reports.get(i) or self._cached_report(entry) for i, entry in enumerate(related)]
+    
+    def _sync_playlist(
+        self,
+        report: RunReport,
+        new_state: RefreshState,
+        state: Optional[RefreshState],
+        desired: List[str],
+        artist_count: int,
+        max_workers: int
+    ) -> None:
+        """Écrit dans chaque partie de la playlist la différence avec son contenu actuel"""
+        playlist_name = new_state.playlist_name
+        playlist_id = new_state.playlist_id
+        
+        current: Dict[str, str] = {}
+        if playlist_id is not None and desired == new_state.track_uris:
+            current = self._remote_snapshots(new_state)
+            if self._unchanged_remotely(new_state, current):
+                self.progress.info("✓  Playlist déjà à jour, aucune écriture")
+                report.outcome = 'unchanged'
+                report.playlist_url = f"https://open.spotify.com/playlist/{playlist_id}"
+                return
+            self.progress.info("↻  Playlist modifiée depuis le dernier passage, resynchronisation")
+        
+        if not desired:
+            self.progress.error("\n❌ Aucun morceau trouvé. Playlist laissée en l'état.")
+            report.outcome = 'no_tracks'
+            return
+        
+        ids = self._write_playlist(
+            report, playlist_name, desired, self._description(artist_count), max_workers,
+            playlist_ids=[playlist_id] + new_state.shard_ids if playlist_id else None,
+            update_details=state is None or len(state.artists) + len(state.related) != artist_count,
+            snapshot_ids=current
+        )
+        if ids is None:
+            return
+        
+        new_state.playlist_id = ids[0]
+        new_state.shard_ids = ids[1:]
+        new_state.track_uris = desired
+        new_state.snapshot_ids = self._remote_snapshots(new_state)
+    
+    def _remote_snapshots(self, state: RefreshState) -> Dict[str, str]:
+        """Version actuelle de chaque partie de la playlist (une partie sans version est absente)"""
+        snapshots: Dict[str, str] = {}
+        for part_id in [state.playlist_id] + state.shard_ids:
+            snapshot_id = self.spotify_repo.get_playlist_snapshot_id(part_id)
+            if snapshot_id is not None:
+                snapshots[part_id] = snapshot_id
+        return snapshots
+    
+    @staticmethod
+    def _unchanged_remotely(state: RefreshState, current: Dict[str, str]) -> bool:
+        """Vrai si aucune partie de la playlist n'a changé depuis la dernière écriture"""
+        return all(
+            part_id in state.snapshot_ids and current.get(part_id) == state.snapshot_ids[part_id]
+            for part_id in [state.playlist_id] + state.shard_ids
+        )
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark du séquenceur de playlist : NumPy contre implémentation naïve
+
+Usage :
+    python -m benchmarks.bench_ordering [nombre_de_morceaux ...]
+"""
+import random
+import sys
+import time
+from typing import Dict, List, Tuple
+from domain.entities import Track, TrackFeatures
+from application.ordering import SmoothTransitionOrderer, NaiveSmoothTransitionOrderer, TrackOrderer
+
+
+def generate_tracks(count: int, seed: int = 42) -> Tuple[List[Track], Dict[str, TrackFeatures]]:
+    """Génère des morceaux aléatoires (10 morceaux par artiste en moyenne)"""
+    rng = random.Random(seed)
+    artist_count = max(1, count // 10)
+    tracks = [
+        Track(uri=f'spotify:track:{i}', name=f'Track {i}', artist=f'Artist {rng.randrange(artist_count)}')
+        for i in range(count)
+    ]
+    features = {
+        track.spotify_id: TrackFeatures(
+            track_id=track.spotify_id,
+            energy=rng.random(),
+            tempo=rng.uniform(60.0, 200.0),
+            valence=rng.random(),
+            danceability=rng.random()
+        )
+        for track in tracks
+    }
+    return tracks, features
+
+
+def measure(orderer: TrackOrderer, tracks: List[Track], features: Dict[str, TrackFeatures]) -> Tuple[float, List[Track]]:
+    """Retourne la durée (secondes) et le résultat d'un ordonnancement"""
+    start = time.perf_counter()
+    ordered = orderer.order(tracks, features)
+    return time.perf_counter() - start, ordered
+
+
+def main(sizes: List[int]) -> None:
+    """Compare les deux implémentations pour chaque taille"""
+    print(f"{'morceaux':>10} {'numpy (ms)':>12} {'naïf (ms)':>12} {'gain':>8} {'identique':>10}")
+    for size in sizes:
+        tracks, features = generate_tracks(size)
+        numpy_time, numpy_order = measure(SmoothTransitionOrderer(), tracks, features)
+        naive_time, naive_order = measure(NaiveSmoothTransitionOrderer(), tracks, features)
+        print(
+            f"{size:>10} {numpy_time * 1000:>12.1f} {naive_time * 1000:>12.1f} "
+            f"{naive_time / numpy_time:>7.1f}x {str(numpy_order == naive_order):>10}"
+        )
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 5000, 10000])
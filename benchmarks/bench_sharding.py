@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la résolution multi-processus : débit selon le nombre de processus
+
+Résout un catalogue d'artistes fictifs contre le faux serveur local avec
+1 à N processus (N : nombre de cœurs par défaut), chacun avec son propre
+client et son pool de threads. Le cache d'artistes est vidé entre deux
+mesures pour que chaque artiste soit réellement recherché. Le faux
+serveur tourne dans le processus du benchmark : au-delà de quelques
+processus, c'est lui qui limite le débit mesuré.
+
+Usage :
+    python -m benchmarks.bench_sharding [artistes] [processus max] [threads par processus]
+"""
+import functools
+import os
+import sys
+import tempfile
+import time
+import spotipy
+from application.sharding import ShardedArtistResolver
+from benchmarks.fake_spotify import FakeSpotifyServer
+from infrastructure.config import SpotifyConfig
+from infrastructure.spotify_repository import create_catalog_repository
+from infrastructure.transport import build_session
+
+
+def fake_client(config: SpotifyConfig) -> spotipy.Spotify:
+    """Client de chaque processus : token fictif, session partagée du processus"""
+    return spotipy.Spotify(auth='fake-token', requests_session=build_session(config))
+
+
+def run(config: SpotifyConfig, names: list, processes: int, threads: int) -> dict:
+    """Résout le catalogue avec le nombre de processus donné"""
+    factory = functools.partial(create_catalog_repository, config, fake_client)
+    start = time.perf_counter()
+    with ShardedArtistResolver(factory, processes=processes, shard_size=100, threads=threads) as resolver:
+        results = list(resolver.resolve(names, max_tracks=10))
+        stats = resolver.get_stats()
+    return {
+        'duration': time.perf_counter() - start,
+        'found': sum(1 for result in results if result.tracks),
+        'calls': stats.get('api_calls', 0),
+    }
+
+
+def main(artists: int, max_processes: int, threads: int) -> None:
+    """Affiche la durée et le débit pour 1 à max_processes processus"""
+    names = [f"Artist {i}" for i in range(artists)]
+    print(f"{artists} artistes, {threads} threads par processus")
+    print(f"{'processus':>9} {'trouvés':>8} {'appels':>7} {'durée (s)':>10} {'artistes/s':>11} {'accélération':>13}")
+    
+    baseline = None
+    with FakeSpotifyServer(latency=0.005) as server:
+        for processes in range(1, max_processes + 1):
+            with tempfile.TemporaryDirectory() as cache_dir:
+                config = SpotifyConfig()
+                config.api_prefix = server.prefix
+                config.data_cache_dir = cache_dir
+                config.max_workers = threads
+                config.pool_size = threads + 1
+                # Le faux serveur n'impose aucune limite : pas d'attente de budget
+                config.client_budget = 0
+                result = run(config, names, processes, threads)
+            baseline = baseline or result['duration']
+            print(
+                f"{processes:>9} {result['found']:>8} {result['calls']:>7} {result['duration']:>10.2f} "
+                f"{artists / result['duration']:>11.0f} {baseline / result['duration']:>12.2f}x"
+            )
+
+
+if __name__ == '__main__':
+    arguments = [int(arg) for arg in sys.argv[1:]]
+    main(*(arguments + [4000, os.cpu_count() or 1, 8][len(arguments):]))
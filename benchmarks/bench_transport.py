@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark du transport HTTP : connexions ouvertes (poignées de main) par exécution
+
+Compare, contre le faux serveur local, le client spotipy par défaut
+(pool de 10 connexions), un client sans session et le client construit
+avec la session partagée dimensionnée sur le nombre de workers. Les
+requêtes sont envoyées par vagues, comme les phases d'une exécution
+(recherche, top tracks, relances) : entre deux vagues, un pool trop
+petit ferme les connexions en surnombre qu'il faut rouvrir ensuite.
+
+Usage :
+    python -m benchmarks.bench_transport [requêtes] [workers] [vagues]
+"""
+import sys
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+import spotipy
+from benchmarks.fake_spotify import FakeSpotifyServer
+from infrastructure.config import SpotifyConfig
+from infrastructure.transport import build_session
+
+
+def run(server: FakeSpotifyServer, client: spotipy.Spotify, requests_count: int, workers: int, waves: int) -> dict:
+    """Exécute les recherches en parallèle et relève les compteurs du serveur"""
+    client.prefix = server.prefix
+    server.stats.reset()
+    wave_size = max(1, requests_count // waves)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for wave_start in range(0, requests_count, wave_size):
+            list(executor.map(
+                lambda i: client.search(q=f'artist:Artist {i}', type='artist', limit=5),
+                range(wave_start, min(wave_start + wave_size, requests_count))
+            ))
+    return {
+        'duration': time.perf_counter() - start,
+        'requests': server.stats.requests,
+        'connections': server.stats.connections,
+    }
+
+
+def main(requests_count: int, workers: int, waves: int) -> None:
+    """Affiche les connexions ouvertes par scénario"""
+    config = SpotifyConfig()
+    config.max_workers = workers
+    config.pool_size = workers + 1
+    
+    scenarios = {
+        'sans session': lambda: spotipy.Spotify(auth='fake-token', requests_session=False),
+        'spotipy par défaut': lambda: spotipy.Spotify(auth='fake-token'),
+        'session partagée': lambda: spotipy.Spotify(auth='fake-token', requests_session=build_session(config)),
+    }
+    
+    print(f"{requests_count} requêtes, {workers} workers, {waves} vagues")
+    print(f"{'scénario':<20} {'requêtes':>9} {'connexions':>11} {'durée (s)':>10}")
+    with FakeSpotifyServer(latency=0.02) as server, warnings.catch_warnings():
+        # urllib3 signale chaque connexion jetée quand le pool par défaut est plein
+        warnings.simplefilter('ignore')
+        for label, factory in scenarios.items():
+            result = run(server, factory(), requests_count, workers, waves)
+            print(f"{label:<20} {result['requests']:>9} {result['connections']:>11} {result['duration']:>10.2f}")
+
+
+if __name__ == '__main__':
+    arguments = [int(arg) for arg in sys.argv[1:]]
+    main(*(arguments + [1000, 32, 10][len(arguments):]))
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'écriture d'une playlist : lots séquentiels ou parallèles
+
+Remplace, contre le faux serveur local, le contenu d'une playlist avec
+une écriture par lot après l'autre puis avec des lots insérés en
+parallèle à leur position. Le faux serveur refuse, comme l'API, une
+insertion au-delà de la fin de la playlist : les lots refusés sont
+comptés (conflits) puis terminés séquentiellement. L'ordre final est
+vérifié dans les deux cas.
+
+Usage :
+    python -m benchmarks.bench_writes [morceaux] [workers] [latence]
+"""
+import sys
+import time
+import spotipy
+from benchmarks.fake_spotify import FakeSpotifyServer
+from infrastructure.config import SpotifyConfig
+from infrastructure.spotify_repository import SpotifyRepository
+
+
+def run(server: FakeSpotifyServer, uris: list, workers: int) -> dict:
+    """Remplace le contenu d'une nouvelle playlist et relève durée, requêtes et conflits"""
+    config = SpotifyConfig()
+    config.write_workers = workers
+    config.pool_size = workers + 1
+    repo = SpotifyRepository(config)
+    repo._client = spotipy.Spotify(auth='fake-token', requests_session=repo._session)
+    repo._client.prefix = server.prefix
+    playlist_id = server.playlists.create(f'Benchmark {workers}', '')['id']
+    
+    server.stats.reset()
+    start = time.perf_counter()
+    repo.replace_playlist_tracks(playlist_id, uris)
+    duration = time.perf_counter() - start
+    assert server.playlists.playlists[playlist_id]['items'] == uris, "ordre final incorrect"
+    return {
+        'duration': duration,
+        'requests': server.stats.requests,
+        'conflicts': repo.get_stats().get('write_conflicts', 0),
+    }
+
+
+def main(track_count: int, workers: int, latency: float) -> None:
+    """Affiche la durée de l'écriture séquentielle et de l'écriture parallèle"""
+    uris = [f'spotify:track:{i:022d}' for i in range(track_count)]
+    print(f"{track_count} morceaux, {workers} workers, latence {latency * 1000:.0f} ms")
+    print(f"{'mode':<12} {'durée (s)':>10} {'requêtes':>9} {'conflits':>9}")
+    with FakeSpotifyServer(latency=latency) as server:
+        for label, count in (('séquentiel', 1), ('parallèle', workers)):
+            result = run(server, uris, count)
+            print(f"{label:<12} {result['duration']:>10.3f} {result['requests']:>9} {result['conflicts']:>9}")
+
+
+if __name__ == '__main__':
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 8,
+        float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+    )
@@ -0,0 +1,274 @@
+"""
+Faux serveur d'API Spotify local pour les benchmarks
+
+Répond aux endpoints de recherche d'artistes, d'artistes similaires, de
+top tracks, de caractéristiques audio et de bibliothèque avec des données
+déterministes, gère en mémoire les playlists d'un utilisateur fictif, et
+compte les connexions TCP ouvertes par les clients (chacune correspondrait à une poignée de main
+TLS en production).
+"""
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+def _artist_id(name: str) -> str:
+    """ID d'artiste déterministe dérivé du nom"""
+    return hashlib.sha1(name.casefold().encode('utf-8')).hexdigest()[:22]
+
+
+class FakeApiError(Exception):
+    """Requête refusée par le faux serveur (statut HTTP et message)"""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class _FakeSpotifyHandler(BaseHTTPRequestHandler):
+    """Gestionnaire HTTP/1.1 (connexions persistantes)"""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def setup(self):
+        # Un gestionnaire est créé par connexion TCP acceptée
+        super().setup()
+        self.server.stats.record_connection()
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_GET(self):
+        self._handle('GET')
+    
+    def do_POST(self):
+        self._handle('POST')
+    
+    def do_PUT(self):
+        self._handle('PUT')
+    
+    def do_DELETE(self):
+        self._handle('DELETE')
+    
+    def _handle(self, method: str) -> None:
+        self.server.stats.record_request()
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        
+        length = int(self.headers.get('Content-Length') or 0)
+        payload = json.loads(self.rfile.read(length)) if length else {}
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        parts = url.path.strip('/').split('/')[1:]
+        try:
+            body = self._route(method, parts, query, payload)
+        except FakeApiError as e:
+            self._send(e.status, {'error': {'status': e.status, 'message': e.message}})
+            return
+        if body is None:
+            self._send(404, {'error': {'status': 404, 'message': 'Not found'}})
+        else:
+            self._send(201 if method == 'POST' and parts[-1] == 'playlists' else 200, body)
+    
+    def _route(self, method: str, parts: list, query: dict, payload: dict) -> Optional[dict]:
+        """Réponse de l'endpoint demandé (None s'il est inconnu)"""
+        playlists: FakePlaylists = self.server.playlists
+        if method == 'GET' and parts == ['search']:
+            name = query.get('q', '').replace('artist:', '')
+            return {'artists': {'items': [{
+                'id': _artist_id(name),
+                'name': name,
+                'genres': ['metal'],
+                'popularity': 50,
+            }]}}
+        if method == 'GET' and len(parts) == 3 and parts[2] == 'top-tracks':
+            artist_id = parts[1]
+            return {'tracks': [
+                {
+                    'uri': f'spotify:track:{artist_id[:16]}{i:06d}',
+                    'name': f'Track {i}',
+                    'artists': [{'name': artist_id}],
+                }
+                for i in range(10)
+            ]}
+        if method == 'GET' and len(parts) == 3 and parts[2] == 'related-artists':
+            # Graphe fictif : 20 artistes similaires déterministes par artiste
+            names = [f'{parts[1][:8]} related {i}' for i in range(20)]
+            return {'artists': [
+                {'id': _artist_id(name), 'name': name, 'genres': ['metal'], 'popularity': 40}
+                for name in names
+            ]}
+        if method == 'GET' and parts == ['audio-features']:
+            return {'audio_features': [
+                {'id': track_id, 'energy': (i % 10) / 10, 'tempo': 100.0 + i % 60, 'valence': 0.5, 'danceability': 0.5}
+                for i, track_id in enumerate(query.get('ids', '').split(','))
+            ]}
+        if method == 'GET' and parts == ['me']:
+            return {'id': FakePlaylists.USER_ID, 'display_name': 'Benchmark'}
+        if method == 'GET' and parts in (['me', 'tracks', 'contains'], ['me', 'library', 'contains']):
+            # Bibliothèque fictive : un morceau sur deux environ est enregistré
+            # (me/tracks/contains reçoit des IDs, me/library/contains des URIs)
+            items = (query.get('ids') or query.get('uris', '')).split(',')
+            return [
+                int(hashlib.sha1(item.rsplit(':', 1)[-1].encode('utf-8')).hexdigest(), 16) % 2 == 0
+                for item in items
+            ]
+        if method == 'GET' and parts == ['me', 'playlists']:
+            return playlists.page(int(query.get('offset', 0)), int(query.get('limit', 50)))
+        if method == 'POST' and len(parts) == 3 and parts[0] == 'users' and parts[2] == 'playlists':
+            return playlists.create(payload.get('name', ''), payload.get('description', ''))
+        if parts[:1] == ['playlists'] and len(parts) >= 2:
+            return playlists.handle(method, parts[1], parts[2:], query, payload)
+        return None
+    
+    def _send(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class FakePlaylists:
+    """Playlists de l'utilisateur fictif, conservées en mémoire"""
+    
+    USER_ID = 'benchmark-user'
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.playlists: Dict[str, dict] = {}
+    
+    def page(self, offset: int, limit: int) -> dict:
+        """Page de la liste des playlists de l'utilisateur"""
+        with self._lock:
+            items = [
+                {'id': playlist_id, 'name': playlist['name'], 'snapshot_id': self._snapshot(playlist)}
+                for playlist_id, playlist in self.playlists.items()
+            ]
+        return {'items': items[offset:offset + limit], 'next': 'more' if offset + limit < len(items) else None}
+    
+    def create(self, name: str, description: str) -> dict:
+        with self._lock:
+            playlist_id = hashlib.sha1(f'{name}-{len(self.playlists)}'.encode('utf-8')).hexdigest()[:22]
+            self.playlists[playlist_id] = {'name': name, 'description': description, 'items': [], 'version': 1}
+            return {'id': playlist_id, 'name': name}
+    
+    def handle(self, method: str, playlist_id: str, rest: list, query: dict, payload: dict) -> Optional[dict]:
+        """Lecture et modification d'une playlist (détails ou morceaux)"""
+        with self._lock:
+            playlist = self.playlists.get(playlist_id)
+            if playlist is None:
+                return None
+            items = playlist['items']
+            if not rest and method == 'GET':
+                return {'id': playlist_id, 'name': playlist['name'], 'snapshot_id': self._snapshot(playlist)}
+            if not rest and method == 'PUT':
+                playlist.update({key: payload[key] for key in ('name', 'description') if key in payload})
+                return {}
+            if rest not in (['tracks'], ['items']):
+                return None
+            if method == 'GET':
+                offset, limit = int(query.get('offset', 0)), int(query.get('limit', 100))
+                return {
+                    'items': [{'track': {'uri': uri}} for uri in items[offset:offset + limit]],
+                    'next': 'more' if offset + limit < len(items) else None,
+                }
+            if method == 'POST':
+                # Ajout : liste d'URIs et position en paramètre, ou objet {uris, position}
+                uris = payload if isinstance(payload, list) else payload['uris']
+                position = query.get('position', None if isinstance(payload, list) else payload.get('position'))
+                position = len(items) if position is None else int(position)
+                if position > len(items):
+                    raise FakeApiError(400, 'Index out of bounds')
+                items[position:position] = uris
+            elif method == 'PUT':
+                items[:] = payload['uris']
+            elif method == 'DELETE':
+                removals = payload.get('items') or payload.get('tracks') or []
+                if all('positions' in track for track in removals):
+                    positions = {position for track in removals for position in track['positions']}
+                    items[:] = [uri for position, uri in enumerate(items) if position not in positions]
+                else:
+                    uris = {track['uri'] for track in removals}
+                    items[:] = [uri for uri in items if uri not in uris]
+            playlist['version'] += 1
+            return {'snapshot_id': self._snapshot(playlist)}
+    
+    @staticmethod
+    def _snapshot(playlist: dict) -> str:
+        return f"snapshot-{playlist['version']}"
+
+
+class _FakeSpotifyHTTPServer(ThreadingHTTPServer):
+    """Serveur multi-thread acceptant de nombreuses connexions simultanées"""
+    
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class ServerStats:
+    """Compteurs de connexions et de requêtes du serveur"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+    
+    def record_connection(self) -> None:
+        with self._lock:
+            self.connections += 1
+    
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+    
+    def reset(self) -> None:
+        with self._lock:
+            self.connections = 0
+            self.requests = 0
+
+
+class FakeSpotifyServer:
+    """
+    Serveur local démarré dans un thread, utilisable comme context manager
+    
+    Usage :
+        with FakeSpotifyServer(latency=0.005) as server:
+            client.prefix = server.prefix
+    """
+    
+    def __init__(self, latency: float = 0.0):
+        """
+        Args:
+            latency: Délai artificiel ajouté à chaque réponse (secondes)
+        """
+        self.latency = latency
+        self.stats = ServerStats()
+        self.playlists = FakePlaylists()
+        self._server: Optional[_FakeSpotifyHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def prefix(self) -> str:
+        """Préfixe d'API à donner au client spotipy"""
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/v1/'
+    
+    def __enter__(self) -> 'FakeSpotifyServer':
+        self._server = _FakeSpotifyHTTPServer(('127.0.0.1', 0), _FakeSpotifyHandler)
+        self._server.stats = self.stats
+        self._server.latency = self.latency
+        self._server.playlists = self.playlists
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
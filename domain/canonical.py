@@ -0,0 +1,66 @@
+"""
+Canonicalisation des noms d'artistes
+
+Deux noms qui ne diffèrent que par la casse, les accents des lettres
+latines, la ponctuation, les espaces ou un article « The » initial
+produisent la même clé. Les signes diacritiques des autres écritures
+distinguent des lettres (が et か, й et и) : ils sont conservés.
+"""
+import re
+import unicodedata
+
+# Lettres sans décomposition Unicode vers une lettre de base
+_SPECIAL_LETTERS = str.maketrans({
+    'ø': 'o',
+    'æ': 'ae',
+    'œ': 'oe',
+    'đ': 'd',
+    'ł': 'l',
+    'þ': 'th',
+    'ı': 'i',
+})
+# Ponctuation supprimée sans séparer les mots (Guns N' Roses, A.F.I.)
+_JOINING_PUNCTUATION = {"'", "’", "`", "."}
+_LEADING_ARTICLE = re.compile(r'^the\s+')
+_TRAILING_ARTICLE = re.compile(r'\s+the$')
+
+
+def _strip_latin_diacritics(text: str) -> str:
+    """Retire les signes diacritiques des seules lettres latines"""
+    characters = []
+    latin = False
+    for char in unicodedata.normalize('NFKD', text):
+        if unicodedata.combining(char):
+            if latin:
+                continue
+        else:
+            latin = 'LATIN' in unicodedata.name(char, '')
+        characters.append(char)
+    return unicodedata.normalize('NFC', ''.join(characters))
+
+
+def canonical_artist_key(name: str) -> str:
+    """
+    Calcule la clé canonique d'un nom d'artiste
+    
+    Args:
+        name: Nom d'artiste tel que saisi
+    
+    Returns:
+        Clé stable (minuscules, sans accents ni ponctuation)
+    """
+    text = unicodedata.normalize('NFKC', name).casefold()
+    text = _strip_latin_diacritics(text)
+    text = text.translate(_SPECIAL_LETTERS).replace('&', ' and ').replace('+', ' and ')
+    
+    characters = []
+    for char in text:
+        if char in _JOINING_PUNCTUATION:
+            continue
+        category = unicodedata.category(char)
+        characters.append(' ' if category[0] in ('P', 'S', 'Z') else char)
+    text = ' '.join(''.join(characters).split())
+    
+    # « The Hu », « Hu, The » et « Hu » désignent le même groupe
+    without_article = _TRAILING_ARTICLE.sub('', _LEADING_ARTICLE.sub('', text))
+    return without_article or text or ' '.join(name.casefold().split())
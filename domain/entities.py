@@ -2,7 +2,8 @@
 Entités du domaine
 """
 from dataclasses import dataclass, field
-from typing import List, Optional
+from enum import Enum
+from typing import Dict, List, Optional
 
 
 @dataclass
@@ -11,6 +12,9 @@ class Artist:
     name: str
     spotify_id: Optional[str] = None
     found_name: Optional[str] = None  # Nom trouvé sur Spotify si différent
+    # Métadonnées reçues avec la recherche (sans appel supplémentaire)
+    genres: List[str] = field(default_factory=list)
+    popularity: Optional[int] = None
 
 
 @dataclass
@@ -19,6 +23,21 @@ class Track:
     uri: str
     name: Optional[str] = None
     artist: Optional[str] = None
+    
+    @property
+    def spotify_id(self) -> str:
+        """Identifiant Spotify extrait de l'URI (spotify:track:<id>)"""
+        return self.uri.rsplit(':', 1)[-1]
+
+
+@dataclass
+class TrackFeatures:
+    """Caractéristiques audio d'un morceau (utilisées pour l'ordonnancement)"""
+    track_id: str
+    energy: float
+    tempo: float
+    valence: float = 0.0
+    danceability: float = 0.0
 
 
 @dataclass
@@ -28,4 +47,80 @@ class Playlist:
     description: str
     spotify_id: Optional[str] = None
     tracks: List[Track] = field(default_factory=list)
+    # Version du contenu (change à chaque modification des morceaux)
+    snapshot_id: Optional[str] = None
+
+
+class SearchStatus(str, Enum):
+    """Issue de la recherche des morceaux d'un artiste"""
+    FOUND = 'found'
+    NOT_FOUND = 'not_found'
+    NO_TRACKS = 'no_tracks'
+    FILTERED = 'filtered'
+    ERROR = 'error'
+
+
+@dataclass
+class ArtistSearchResult:
+    """Résultat de la recherche des morceaux d'un artiste"""
+    artist_name: str
+    status: SearchStatus
+    tracks: List[Track] = field(default_factory=list)
+    found_name: Optional[str] = None
+    error: Optional[Exception] = None
+    spotify_id: Optional[str] = None
+    latency: float = 0.0
+    attempts: int = 1
+    # Métadonnées de l'artiste identifié (critères de genre et de popularité)
+    genres: List[str] = field(default_factory=list)
+    popularity: Optional[int] = None
+    
+    @property
+    def retryable(self) -> bool:
+        """Vrai si l'échec est passager et mérite une nouvelle tentative"""
+        return bool(getattr(self.error, 'retryable', False))
+    
+    @property
+    def reason(self) -> str:
+        """Motif lisible de l'issue (statut, ou type d'erreur)"""
+        if self.status == SearchStatus.ERROR:
+            return getattr(self.error, 'kind', 'error')
+        return self.status.value
+
+
+@dataclass
+class ResolvedArtist:
+    """Artiste résolu lors d'un rafraîchissement, avec ses morceaux"""
+    name: str
+    spotify_id: Optional[str] = None
+    found_name: Optional[str] = None
+    tracks: List[Track] = field(default_factory=list)
+    fetched_at: float = 0.0
+    genres: List[str] = field(default_factory=list)
+    # None : métadonnées inconnues (état enregistré par une version précédente)
+    popularity: Optional[int] = None
+    
+    def to_artist(self) -> Artist:
+        """Artiste identifié, interrogeable par son ID sans recherche par nom"""
+        return Artist(
+            name=self.name, spotify_id=self.spotify_id, found_name=self.found_name,
+            genres=list(self.genres), popularity=self.popularity
+        )
 
+
+@dataclass
+class RefreshState:
+    """État d'une playlist après son dernier rafraîchissement"""
+    playlist_name: str
+    file_fingerprint: Optional[str]
+    max_tracks_per_artist: int
+    playlist_id: Optional[str] = None
+    track_uris: List[str] = field(default_factory=list)
+    artists: List[ResolvedArtist] = field(default_factory=list)
+    updated_at: float = 0.0
+    # ID des parties suivantes (« Nom (part 2) », …) d'un contenu réparti
+    shard_ids: List[str] = field(default_factory=list)
+    # Version (snapshot_id) de chaque partie après la dernière écriture
+    snapshot_ids: Dict[str, str] = field(default_factory=dict)
+    # Artistes similaires ajoutés (extension), avec leurs morceaux
+    related: List[ResolvedArtist] = field(default_factory=list)
@@ -0,0 +1,53 @@
+"""
+Erreurs du domaine
+
+Les repositories traduisent les erreurs techniques (HTTP, réseau) en ces
+types pour que les use cases distinguent une panne passagère d'un
+artiste réellement introuvable.
+"""
+from typing import Optional
+
+
+class SpotifyError(Exception):
+    """Erreur d'accès à Spotify non relançable"""
+    
+    kind = 'error'
+    retryable = False
+
+
+class TransientError(SpotifyError):
+    """Erreur passagère (délai dépassé, connexion perdue, erreur 5xx)"""
+    
+    kind = 'transient'
+    retryable = True
+
+
+class RateLimitedError(TransientError):
+    """Limite de requêtes atteinte (HTTP 429)"""
+    
+    kind = 'rate_limited'
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        """
+        Args:
+            message: Description de l'erreur
+            retry_after: Délai d'attente demandé par l'API (secondes)
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+    
+    def __reduce__(self):
+        # Le délai est conservé quand l'erreur traverse une frontière de processus
+        return type(self), (str(self), self.retry_after)
+
+
+class AuthError(SpotifyError):
+    """Authentification refusée ou token invalide (HTTP 401/403)"""
+    
+    kind = 'auth'
+
+
+class NotFoundError(SpotifyError):
+    """Ressource inexistante (HTTP 404)"""
+    
+    kind = 'resource_not_found'
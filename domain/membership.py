@@ -0,0 +1,169 @@
+"""
+Index d'appartenance des morceaux d'un ensemble de playlists
+
+Un index répond à « ce morceau est-il dans l'une des playlists ? » sans
+les relire. Sous exact_limit morceaux (toutes playlists confondues),
+l'index est l'ensemble exact des URIs ; au-delà, c'est un filtre de
+Bloom : environ 1,8 Ko par millier de morceaux au lieu d'une centaine de
+kilo-octets de chaînes, au prix de rares faux positifs (un morceau absent
+déclaré présent, avec la probabilité false_positive_rate), jamais de faux
+négatif.
+"""
+import base64
+import hashlib
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+# Nombre de morceaux (toutes playlists confondues) au-delà duquel l'index
+# devient un filtre de Bloom : réservé aux très grandes bibliothèques, pour
+# qu'une collection ordinaire soit filtrée sans aucun faux positif
+EXACT_INDEX_LIMIT = 200_000
+# Probabilité de faux positif visée par les filtres de Bloom
+FALSE_POSITIVE_RATE = 0.001
+
+
+class MembershipIndex(ABC):
+    """Ensemble de morceaux interrogeable par URI"""
+    
+    kind = 'index'
+    # Probabilité qu'une URI absente soit déclarée présente (0 : index exact)
+    false_positive_rate = 0.0
+    
+    @abstractmethod
+    def __contains__(self, uri: str) -> bool:  # pragma: no cover
+        pass
+    
+    @abstractmethod
+    def to_dict(self) -> dict:  # pragma: no cover
+        """Représentation sérialisable en JSON"""
+        pass
+    
+    @staticmethod
+    def from_dict(data: dict) -> 'MembershipIndex':
+        """Reconstruit un index à partir de sa représentation JSON"""
+        if data['kind'] == BloomFilter.kind:
+            return BloomFilter(data['size'], data['hashes'], base64.b64decode(data['bits']), data['count'])
+        return ExactIndex(data['uris'])
+
+
+class ExactIndex(MembershipIndex):
+    """Ensemble exact des URIs"""
+    
+    kind = 'set'
+    
+    def __init__(self, uris: Iterable[str]):
+        self._uris = frozenset(uris)
+    
+    def __contains__(self, uri: str) -> bool:
+        return uri in self._uris
+    
+    def __len__(self) -> int:
+        return len(self._uris)
+    
+    def to_dict(self) -> dict:
+        return {'kind': self.kind, 'uris': sorted(self._uris)}
+
+
+class BloomFilter(MembershipIndex):
+    """Filtre de Bloom : size bits, hashes positions par URI (double hachage)"""
+    
+    kind = 'bloom'
+    
+    def __init__(self, size: int, hashes: int, bits: Optional[bytes] = None, count: int = 0):
+        """
+        Args:
+            size: Nombre de bits du filtre
+            hashes: Nombre de positions testées par URI
+            bits: Contenu du filtre (vide par défaut)
+            count: Nombre d'URIs ajoutées
+        """
+        self.size = size
+        self.hashes = hashes
+        self.bits = bytearray(bits) if bits is not None else bytearray(-(-size // 8))
+        self.count = count
+    
+    @classmethod
+    def for_capacity(cls, capacity: int, false_positive_rate: float = FALSE_POSITIVE_RATE) -> 'BloomFilter':
+        """Filtre dimensionné pour capacity URIs au taux de faux positifs visé"""
+        capacity = max(1, capacity)
+        size = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        hashes = max(1, round(size / capacity * math.log(2)))
+        return cls(size, hashes)
+    
+    def _positions(self, uri: str) -> List[int]:
+        digest = hashlib.blake2b(uri.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+    
+    def add(self, uri: str) -> None:
+        for position in self._positions(uri):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def __contains__(self, uri: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(uri))
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    @property
+    def false_positive_rate(self) -> float:
+        """Probabilité estimée qu'une URI absente soit déclarée présente"""
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+    
+    def to_dict(self) -> dict:
+        return {
+            'kind': self.kind,
+            'size': self.size,
+            'hashes': self.hashes,
+            'count': self.count,
+            'bits': base64.b64encode(bytes(self.bits)).decode('ascii'),
+        }
+
+
+def build_membership_index(uris: Iterable[Optional[str]], exact_limit: int = EXACT_INDEX_LIMIT) -> MembershipIndex:
+    """
+    Construit l'index des URIs de playlists (éléments indisponibles ignorés)
+    
+    Args:
+        uris: URIs des morceaux
+        exact_limit: Nombre de morceaux au-delà duquel un filtre de Bloom est construit
+    
+    Returns:
+        Index exact, ou filtre de Bloom pour un grand nombre de morceaux
+    """
+    unique = {uri for uri in uris if uri}
+    if len(unique) <= exact_limit:
+        return ExactIndex(unique)
+    bloom = BloomFilter.for_capacity(len(unique))
+    for uri in unique:
+        bloom.add(uri)
+    return bloom
+
+
+def playlist_set_key(playlist_ids: Iterable[str]) -> str:
+    """Identifiant stable d'un ensemble de playlists (indépendant de l'ordre)"""
+    joined = '\n'.join(sorted(set(playlist_ids)))
+    return hashlib.blake2b(joined.encode('utf-8'), digest_size=8).hexdigest()
+
+
+@dataclass
+class PlaylistIndex:
+    """Index commun d'un ensemble de playlists, valable pour une version (snapshot_id) de chacune"""
+    key: str
+    snapshots: Dict[str, Optional[str]]
+    index: MembershipIndex
+    
+    def is_current(self, snapshots: Dict[str, Optional[str]]) -> bool:
+        """Vrai si aucune playlist n'a changé (une version inconnue n'est jamais à jour)"""
+        return None not in snapshots.values() and self.snapshots == snapshots
+    
+    def to_dict(self) -> dict:
+        return {'key': self.key, 'snapshots': self.snapshots, 'index': self.index.to_dict()}
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'PlaylistIndex':
+        return cls(data['key'], dict(data['snapshots']), MembershipIndex.from_dict(data['index']))
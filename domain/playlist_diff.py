@@ -0,0 +1,108 @@
+"""
+Différence entre le contenu actuel d'une playlist et le contenu souhaité
+
+Le calcul est purement local : il produit les suppressions par position et
+les insertions par position qui transforment la playlist actuelle en la
+playlist souhaitée, dans l'ordre exact, en touchant le moins de morceaux
+possible.
+"""
+import difflib
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+# Nombre maximum de morceaux par appel d'écriture de l'API
+WRITE_BATCH_SIZE = 100
+
+
+def _batch_count(count: int, batch_size: int) -> int:
+    return -(-count // batch_size)
+
+
+@dataclass
+class PlaylistDiff:
+    """
+    Opérations à appliquer à une playlist
+    
+    Les suppressions sont exprimées par position dans la playlist actuelle
+    et doivent être appliquées en premier ; les insertions sont exprimées
+    par position dans la playlist souhaitée et appliquées ensuite dans
+    l'ordre croissant des positions (chaque lot fait au plus batch_size
+    morceaux).
+    """
+    removals: List[Tuple[int, Optional[str]]] = field(default_factory=list)
+    insertions: List[Tuple[int, List[str]]] = field(default_factory=list)
+    desired: List[str] = field(default_factory=list)
+    batch_size: int = WRITE_BATCH_SIZE
+    
+    @property
+    def is_empty(self) -> bool:
+        return not self.removals and not self.insertions
+    
+    @property
+    def estimated_calls(self) -> int:
+        """Nombre d'appels d'écriture de l'application incrémentale"""
+        return _batch_count(len(self.removals), self.batch_size) + len(self.insertions)
+    
+    @property
+    def replace_calls(self) -> int:
+        """Nombre d'appels d'écriture d'un remplacement complet"""
+        return max(1, _batch_count(len(self.desired), self.batch_size))
+    
+    @property
+    def prefer_replace(self) -> bool:
+        """
+        Vrai si remplacer tout le contenu est préférable à la différence
+        
+        C'est le cas quand le remplacement coûte moins d'appels, ou quand un
+        élément indisponible (sans URI) doit être retiré : il ne peut pas
+        être désigné par son URI.
+        """
+        if self.is_empty:
+            return False
+        if any(uri is None for _, uri in self.removals):
+            return True
+        return self.replace_calls < self.estimated_calls
+
+
+def compute_playlist_diff(
+    current: List[Optional[str]],
+    desired: List[str],
+    batch_size: int = WRITE_BATCH_SIZE
+) -> PlaylistDiff:
+    """
+    Calcule les opérations transformant current en desired
+    
+    Args:
+        current: URIs actuellement dans la playlist, dans l'ordre
+        desired: URIs souhaitées, dans l'ordre
+        batch_size: Nombre maximum de morceaux par insertion
+    
+    Returns:
+        Différence à appliquer (vide si les deux listes sont identiques)
+    """
+    diff = PlaylistDiff(desired=list(desired), batch_size=batch_size)
+    if current == desired:
+        return diff
+    
+    matcher = difflib.SequenceMatcher(None, current, desired, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag in ('delete', 'replace'):
+            diff.removals.extend((i, current[i]) for i in range(i1, i2))
+        if tag in ('insert', 'replace'):
+            for start in range(j1, j2, batch_size):
+                diff.insertions.append((start, desired[start:min(start + batch_size, j2)]))
+    return diff
+
+
+def apply_playlist_diff(current: List[Optional[str]], diff: PlaylistDiff) -> List[Optional[str]]:
+    """
+    Applique localement une différence (copie locale d'une playlist, tests)
+    
+    Returns:
+        Contenu de la playlist après application
+    """
+    removed = {position for position, _ in diff.removals}
+    result = [uri for position, uri in enumerate(current) if position not in removed]
+    for position, uris in diff.insertions:
+        result[position:position] = uris
+    return result
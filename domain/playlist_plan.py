@@ -0,0 +1,121 @@
+"""
+Plan d'écriture d'une playlist
+
+Le plan est calculé avant toute modification : il indique si la playlist
+est créée ou réutilisée, les morceaux retirés et ajoutés (par position),
+le changement de détails et le nombre d'appels d'écriture estimé. Il peut
+être affiché sans être appliqué (simulation), puis appliqué sous forme
+d'écritures par lots, sans aucune lecture.
+
+Au-delà de PLAYLIST_TRACK_LIMIT morceaux, le contenu est réparti entre
+plusieurs playlists numérotées (« Nom (part 2) », …), chacune avec son
+propre plan.
+"""
+from dataclasses import dataclass, field
+from typing import List, Optional
+from domain.playlist_diff import PlaylistDiff
+
+# Nombre maximum de morceaux d'une playlist Spotify
+PLAYLIST_TRACK_LIMIT = 10000
+
+
+def shard_name(playlist_name: str, index: int) -> str:
+    """Nom de la partie index (0 : la playlist elle-même)"""
+    return playlist_name if index == 0 else f"{playlist_name} (part {index + 1})"
+
+
+def split_shards(uris: List[str], limit: int = PLAYLIST_TRACK_LIMIT) -> List[List[str]]:
+    """Découpe le contenu en parties d'au plus limit morceaux (au moins une partie)"""
+    return [uris[i:i + limit] for i in range(0, len(uris), limit)] or [[]]
+
+
+@dataclass
+class PlaylistPlan:
+    """
+    Opérations prévues sur une playlist
+    
+    playlist_id vaut None si la playlist doit être créée ; diff est alors
+    vide et le contenu souhaité est écrit en entier.
+    """
+    playlist_name: str
+    description: str
+    desired: List[str] = field(default_factory=list)
+    playlist_id: Optional[str] = None
+    current_count: int = 0
+    diff: PlaylistDiff = field(default_factory=PlaylistDiff)
+    update_details: bool = False
+    
+    @property
+    def creates(self) -> bool:
+        return self.playlist_id is None
+    
+    @property
+    def replace(self) -> bool:
+        """Vrai si tout le contenu est réécrit (création ou remplacement moins coûteux)"""
+        return self.creates or self.diff.prefer_replace
+    
+    @property
+    def removed_count(self) -> int:
+        return self.current_count if self.replace and not self.creates else len(self.diff.removals)
+    
+    @property
+    def added_count(self) -> int:
+        if self.replace:
+            return len(self.desired)
+        return sum(len(uris) for _, uris in self.diff.insertions)
+    
+    @property
+    def change_count(self) -> int:
+        """Nombre de morceaux touchés (retirés ou ajoutés)"""
+        return self.removed_count + self.added_count
+    
+    @property
+    def is_empty(self) -> bool:
+        """Vrai si la playlist existe et n'a besoin d'aucune écriture"""
+        return not self.creates and self.diff.is_empty and not self.update_details
+    
+    @property
+    def estimated_calls(self) -> int:
+        """Nombre d'appels d'écriture de l'application du plan"""
+        calls = 1 if self.creates or self.update_details else 0
+        if self.replace:
+            calls += self.diff.replace_calls
+        else:
+            calls += self.diff.estimated_calls
+        return calls
+    
+    def describe(self) -> List[str]:
+        """Lignes lisibles du plan (affichage de la simulation)"""
+        if self.creates:
+            lines = [f"Créer la playlist « {self.playlist_name} »"]
+        else:
+            lines = [f"Réutiliser la playlist « {self.playlist_name} » ({self.playlist_id}, {self.current_count} morceaux)"]
+        if self.replace:
+            if not self.creates:
+                lines.append(f"Retirer les {self.current_count} morceaux actuels")
+            lines.append(f"Écrire {len(self.desired)} morceaux")
+        elif self.diff.is_empty:
+            lines.append("Contenu inchangé")
+        else:
+            lines.append(f"Retirer {len(self.diff.removals)} morceau(x)")
+            for position, uris in self.diff.insertions:
+                lines.append(f"Ajouter {len(uris)} morceau(x) en position {position}")
+        if self.update_details:
+            lines.append(f"Description : {self.description}")
+        lines.append(f"Appels d'écriture estimés : {self.estimated_calls}")
+        return lines
+    
+    def to_dict(self) -> dict:
+        """Résumé sérialisable en JSON (rapport d'exécution)"""
+        return {
+            'playlist_name': self.playlist_name,
+            'playlist_id': self.playlist_id,
+            'creates': self.creates,
+            'replace': self.replace,
+            'current_count': self.current_count,
+            'desired_count': len(self.desired),
+            'removed': self.removed_count,
+            'added': self.added_count,
+            'update_details': self.update_details,
+            'estimated_calls': self.estimated_calls,
+        }
@@ -0,0 +1,22 @@
+"""
+Interface d'observation des phases d'une exécution (port)
+
+Un observateur est prévenu du début et de la fin de chaque phase mesurée
+par le rapport d'exécution (load, resolve, write, …), ce qui permet de
+profiler chaque phase séparément sans modifier la logique applicative.
+"""
+from abc import ABC, abstractmethod
+
+
+class IPhaseObserver(ABC):
+    """Interface pour l'observation des phases d'une exécution"""
+    
+    @abstractmethod
+    def phase_started(self, name: str) -> None:  # pragma: no cover
+        """Début de la phase name"""
+        pass
+    
+    @abstractmethod
+    def phase_finished(self, name: str) -> None:  # pragma: no cover
+        """Fin de la phase name (y compris sur exception)"""
+        pass
@@ -0,0 +1,67 @@
+"""
+Interface de suivi de progression (port)
+
+Les use cases et les repositories signalent leur avancement et leurs
+messages à travers cette interface plutôt qu'avec print(), ce qui permet
+de choisir l'affichage (barre de progression, journalisation, silence)
+sans modifier la logique applicative.
+"""
+import logging
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class IProgressReporter(ABC):
+    """Interface pour le suivi de progression et les messages d'exécution"""
+    
+    @abstractmethod
+    def message(self, text: str, level: int = logging.INFO) -> None:  # pragma: no cover
+        """Émet un message (niveaux de journalisation standard)"""
+        pass
+    
+    @abstractmethod
+    def start(self, label: str, total: Optional[int] = None) -> None:  # pragma: no cover
+        """Commence une tâche de total éléments (None si inconnu)"""
+        pass
+    
+    @abstractmethod
+    def advance(self, detail: str = '', count: int = 1) -> None:  # pragma: no cover
+        """Signale count éléments terminés de la tâche en cours"""
+        pass
+    
+    @abstractmethod
+    def finish(self) -> None:  # pragma: no cover
+        """Termine la tâche en cours"""
+        pass
+    
+    def debug(self, text: str) -> None:
+        """Message de détail (un par élément traité)"""
+        self.message(text, logging.DEBUG)
+    
+    def info(self, text: str) -> None:
+        """Message d'étape"""
+        self.message(text, logging.INFO)
+    
+    def warning(self, text: str) -> None:
+        """Avertissement"""
+        self.message(text, logging.WARNING)
+    
+    def error(self, text: str) -> None:
+        """Erreur"""
+        self.message(text, logging.ERROR)
+
+
+class NullProgressReporter(IProgressReporter):
+    """Suivi silencieux : ignore tous les messages"""
+    
+    def message(self, text: str, level: int = logging.INFO) -> None:
+        pass
+    
+    def start(self, label: str, total: Optional[int] = None) -> None:
+        pass
+    
+    def advance(self, detail: str = '', count: int = 1) -> None:
+        pass
+    
+    def finish(self) -> None:
+        pass
@@ -2,8 +2,10 @@
 Interfaces des repositories (ports)
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from domain.entities import Artist, Track, Playlist
+from typing import Dict, Iterable, Iterator, List, Optional
+from domain.entities import Artist, ArtistSearchResult, Track, TrackFeatures, Playlist, RefreshState
+from domain.membership import PlaylistIndex
+from domain.playlist_diff import PlaylistDiff
 
 
 class ISpotifyRepository(ABC):
@@ -29,11 +31,41 @@ class ISpotifyRepository(ABC):
         """Récupère les morceaux les plus populaires d'un artiste"""
         pass
     
+    @abstractmethod
+    def get_related_artists(self, artist: Artist) -> List[Artist]:  # pragma: no cover
+        """Récupère les artistes similaires à un artiste"""
+        pass
+    
+    @abstractmethod
+    def get_tracks_audio_features(self, tracks: List[Track]) -> Dict[str, TrackFeatures]:  # pragma: no cover
+        """Récupère les caractéristiques audio des morceaux (indexées par ID de morceau)"""
+        pass
+    
+    @abstractmethod
+    def saved_tracks_contains(self, track_ids: List[str]) -> Dict[str, bool]:  # pragma: no cover
+        """Indique quels morceaux sont enregistrés dans la bibliothèque de l'utilisateur (par ID de morceau)"""
+        pass
+    
+    @abstractmethod
+    def get_stats(self) -> Dict[str, int]:  # pragma: no cover
+        """Compteurs d'utilisation (appels à l'API, succès et échecs des caches)"""
+        pass
+    
     @abstractmethod
     def find_playlist_by_name(self, playlist_name: str) -> Optional[str]:  # pragma: no cover
         """Cherche une playlist existante par son nom"""
         pass
     
+    @abstractmethod
+    def find_playlists_by_name(self, playlist_names: List[str]) -> Dict[str, str]:  # pragma: no cover
+        """Cherche plusieurs playlists en un seul parcours (nom -> ID des playlists trouvées)"""
+        pass
+    
+    @abstractmethod
+    def find_playlists(self, playlist_names: List[str]) -> Dict[str, Playlist]:  # pragma: no cover
+        """Cherche plusieurs playlists en un seul parcours (nom -> playlist avec ID et snapshot_id)"""
+        pass
+    
     @abstractmethod
     def create_playlist(self, playlist: Playlist) -> str:  # pragma: no cover
         """Crée une nouvelle playlist"""
@@ -53,6 +85,26 @@ class ISpotifyRepository(ABC):
     def add_tracks_to_playlist(self, playlist_id: str, tracks: List[Track]) -> None:  # pragma: no cover
         """Ajoute des morceaux à une playlist"""
         pass
+    
+    @abstractmethod
+    def get_playlist_track_uris(self, playlist_id: str, snapshot_id: Optional[str] = None) -> List[Optional[str]]:  # pragma: no cover
+        """Lit les URIs des morceaux d'une playlist, dans l'ordre (snapshot_id : version actuelle si elle est connue)"""
+        pass
+    
+    @abstractmethod
+    def get_playlist_snapshot_id(self, playlist_id: str) -> Optional[str]:  # pragma: no cover
+        """Version actuelle (snapshot_id) d'une playlist"""
+        pass
+    
+    @abstractmethod
+    def apply_playlist_diff(self, playlist_id: str, diff: PlaylistDiff) -> None:  # pragma: no cover
+        """Applique une différence (suppressions puis insertions par position)"""
+        pass
+    
+    @abstractmethod
+    def replace_playlist_tracks(self, playlist_id: str, track_uris: List[str]) -> None:  # pragma: no cover
+        """Remplace tout le contenu d'une playlist"""
+        pass
 
 
 class IArtistFileRepository(ABC):
@@ -62,4 +114,55 @@ class IArtistFileRepository(ABC):
     def load_artists(self, filename: str) -> List[str]:  # pragma: no cover
         """Charge la liste des artistes depuis un fichier"""
         pass
+    
+    @abstractmethod
+    def iter_artists(self, filename: str) -> Iterator[str]:  # pragma: no cover
+        """Parcourt les artistes d'un fichier au fil de la lecture"""
+        pass
+    
+    @abstractmethod
+    def fingerprint(self, filename: str) -> Optional[str]:  # pragma: no cover
+        """Empreinte du contenu du fichier (None s'il n'existe pas)"""
+        pass
+
+
+class IRefreshStateRepository(ABC):
+    """Interface pour l'état des rafraîchissements incrémentaux"""
+    
+    @abstractmethod
+    def load(self, playlist_name: str) -> Optional[RefreshState]:  # pragma: no cover
+        """Charge l'état du dernier rafraîchissement d'une playlist"""
+        pass
+    
+    @abstractmethod
+    def save(self, state: RefreshState) -> None:  # pragma: no cover
+        """Enregistre l'état d'un rafraîchissement"""
+        pass
+
 
+class IArtistResolver(ABC):
+    """Interface pour la résolution en masse des artistes (recherche et top tracks)"""
+    
+    @abstractmethod
+    def resolve(self, artist_names: Iterable[str], max_tracks: int) -> Iterator[ArtistSearchResult]:  # pragma: no cover
+        """Résout chaque artiste ; les résultats sont produits dans l'ordre d'entrée"""
+        pass
+    
+    @abstractmethod
+    def get_stats(self) -> Dict[str, int]:  # pragma: no cover
+        """Compteurs d'utilisation cumulés des résolutions"""
+        pass
+
+
+class IMembershipIndexRepository(ABC):
+    """Interface pour les index d'appartenance des playlists exclues"""
+    
+    @abstractmethod
+    def load(self, key: str) -> Optional[PlaylistIndex]:  # pragma: no cover
+        """Charge l'index enregistré d'un ensemble de playlists (voir playlist_set_key)"""
+        pass
+    
+    @abstractmethod
+    def save(self, entry: PlaylistIndex) -> None:  # pragma: no cover
+        """Enregistre l'index d'un ensemble de playlists"""
+        pass
@@ -0,0 +1,54 @@
+"""
+Écriture atomique de fichiers
+
+Le contenu est écrit dans un fichier temporaire au nom unique, dans le
+même répertoire, qui remplace ensuite la cible d'un coup (os.replace) :
+une lecture concurrente voit l'ancien ou le nouveau contenu, jamais un
+fichier partiel, et deux écritures simultanées (fils ou processus) ne
+partagent jamais le même fichier temporaire.
+"""
+import json
+import os
+import tempfile
+from typing import Any
+
+
+def write_atomic(path: str, text: str) -> None:
+    """
+    Remplace le contenu d'un fichier texte (UTF-8)
+    
+    Args:
+        path: Fichier à écrire (son répertoire doit exister)
+        text: Nouveau contenu
+    
+    Raises:
+        OSError: Écriture impossible ; le fichier d'origine est intact
+    """
+    directory, name = os.path.split(path)
+    with tempfile.NamedTemporaryFile(
+        'w', encoding='utf-8', dir=directory or '.', prefix=f'{name}.', suffix='.tmp', delete=False
+    ) as f:
+        temporary = f.name
+        try:
+            f.write(text)
+        except BaseException:
+            f.close()
+            os.remove(temporary)
+            raise
+    try:
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+def write_json_atomic(path: str, data: Any, **options: Any) -> None:
+    """
+    Remplace le contenu d'un fichier JSON
+    
+    Args:
+        path: Fichier à écrire (son répertoire doit exister)
+        data: Valeur sérialisable en JSON
+        **options: Options de json.dumps (ensure_ascii...)
+    """
+    write_atomic(path, json.dumps(data, **options))
@@ -0,0 +1,105 @@
+"""
+Cache persistant clé/valeur au format JSON Lines
+"""
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+from infrastructure.atomic_file import write_atomic
+
+
+class JsonLinesCache:
+    """
+    Cache clé/valeur persistant en ajout seul
+    
+    Chaque écriture ajoute une ligne {"k": clé, "v": valeur} au fichier ;
+    au chargement, la dernière valeur d'une clé l'emporte. Les écritures
+    restent ainsi en O(1) quel que soit le nombre d'entrées.
+    Sans chemin, le cache reste uniquement en mémoire.
+    
+    Lorsque les lignes remplacées (ou illisibles) sont au moins
+    compact_threshold et plus nombreuses que les entrées valides, le
+    chargement réécrit le fichier avec une seule ligne par clé. Le nouveau
+    fichier remplace l'ancien d'un coup (os.replace) : une lecture
+    concurrente voit l'un ou l'autre, jamais un fichier partiel.
+    """
+    
+    def __init__(self, path: Optional[str] = None, compact_threshold: int = 1000):
+        """
+        Initialise le cache
+        
+        Args:
+            path: Chemin du fichier de cache (None pour un cache en mémoire)
+            compact_threshold: Nombre minimal de lignes remplacées avant compaction
+        """
+        self.path = path
+        self.compact_threshold = compact_threshold
+        self._entries: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+    
+    def _load(self) -> Dict[str, Any]:
+        """Charge le fichier de cache à la première utilisation"""
+        if self._entries is None:
+            entries = {}
+            line_count = 0
+            if self.path and os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        line_count += 1
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            # Ligne tronquée (écriture interrompue) : ignorée
+                            continue
+                        entries[record['k']] = record['v']
+            self._entries = entries
+            superseded = line_count - len(entries)
+            if superseded >= self.compact_threshold and superseded > len(entries):
+                self._compact()
+        return self._entries
+    
+    def _compact(self) -> None:
+        """Réécrit le fichier avec la dernière valeur de chaque clé"""
+        try:
+            write_atomic(self.path, self._lines(self._entries))
+        except OSError:
+            # Compaction reportée au prochain chargement ; le fichier actuel reste valide
+            pass
+    
+    @staticmethod
+    def _lines(items: Dict[str, Any]) -> str:
+        """Lignes JSON Lines des entrées"""
+        return ''.join(
+            json.dumps({'k': key, 'v': value}, ensure_ascii=False) + '\n'
+            for key, value in items.items()
+        )
+    
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._load()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Retourne la valeur associée à la clé (ou default)"""
+        with self._lock:
+            return self._load().get(key, default)
+    
+    def set(self, key: str, value: Any) -> None:
+        """Enregistre une valeur"""
+        self.set_many({key: value})
+    
+    def set_many(self, items: Dict[str, Any]) -> None:
+        """Enregistre plusieurs valeurs en une seule écriture"""
+        if not items:
+            return
+        with self._lock:
+            self._load().update(items)
+            if self.path:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(self._lines(items))
@@ -0,0 +1,198 @@
+"""
+Enregistrement et rejeu des échanges HTTP avec l'API Spotify (cassette)
+
+En enregistrement, chaque réponse réelle est ajoutée à un fichier de
+cassette compressé ; en rejeu, les réponses sont servies depuis la
+cassette, sans réseau ni credentials, avec la latence d'origine ou une
+latence mise à l'échelle. Une exécution complète peut ainsi être rejouée
+à l'identique pour la profiler, la mesurer ou servir de test de
+non-régression.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+# En-têtes de réponse conservés (les autres ne sont pas lus par le client)
+KEPT_HEADERS = ('Content-Type', 'Retry-After')
+
+
+class CassetteMissError(requests.exceptions.RequestException):
+    """Requête absente de la cassette rejouée"""
+
+
+def request_key(request: requests.PreparedRequest) -> str:
+    """
+    Clé normalisée d'une requête
+    
+    La clé ne dépend ni de l'hôte (une cassette enregistrée contre l'API
+    réelle se rejoue contre n'importe quel préfixe), ni de l'ordre des
+    paramètres, ni des en-têtes (token d'accès) ; le corps JSON éventuel
+    est normalisé puis réduit à une empreinte.
+    
+    Returns:
+        « MÉTHODE /chemin?paramètres triés [#empreinte du corps] »
+    """
+    url = urlsplit(request.url)
+    path = url.path
+    # Chemin relatif à la version de l'API (/v1/search -> /search)
+    segments = path.strip('/').split('/')
+    if len(segments) > 1 and segments[0].startswith('v') and segments[0][1:].isdigit():
+        path = '/' + '/'.join(segments[1:])
+    query = '&'.join(f'{key}={value}' for key, value in sorted(parse_qsl(url.query, keep_blank_values=True)))
+    key = f'{request.method} {path.rstrip("/")}' + (f'?{query}' if query else '')
+    
+    body = request.body
+    if body:
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True, separators=(',', ':')).encode('utf-8')
+        except ValueError:
+            pass
+        key += '#' + hashlib.sha1(body).hexdigest()[:12]
+    return key
+
+
+class Cassette:
+    """
+    Réponses enregistrées, indexées par clé de requête
+    
+    Le fichier est une suite de membres gzip, un par réponse enregistrée
+    (une ligne JSON chacun) : l'enregistrement est un simple ajout. Une
+    réponse identique à la précédente pour la même clé est enregistrée
+    comme une simple répétition ({"k": clé, "r": 1}). En rejeu, les
+    réponses d'une même clé sont servies dans l'ordre d'enregistrement,
+    la dernière étant répétée ensuite.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Fichier de cassette (créé à l'enregistrement si besoin)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._interactions: Dict[str, List[dict]] = defaultdict(list)
+        self._positions: Dict[str, int] = defaultdict(int)
+        if os.path.exists(path):
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    record = json.loads(line)
+                    records = self._interactions[record['k']]
+                    records.append(records[-1] if record.get('r') and records else record)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(records) for records in self._interactions.values())
+    
+    def next(self, key: str) -> Optional[dict]:
+        """Réponse suivante enregistrée pour la clé (None si la clé est inconnue)"""
+        with self._lock:
+            records = self._interactions.get(key)
+            if not records:
+                return None
+            position = self._positions[key]
+            self._positions[key] = position + 1
+            return records[min(position, len(records) - 1)]
+    
+    def record(self, key: str, status: int, headers: Dict[str, str], body: str, latency: float) -> None:
+        """Ajoute une réponse à la cassette"""
+        record = {'k': key, 's': status, 'h': headers, 'b': body, 't': round(latency, 4)}
+        with self._lock:
+            records = self._interactions[key]
+            repeated = bool(records) and all(records[-1][field] == record[field] for field in ('s', 'h', 'b'))
+            records.append(records[-1] if repeated else record)
+            line = {'k': key, 'r': 1} if repeated else record
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with gzip.open(self.path, 'at', encoding='utf-8') as f:
+                f.write(json.dumps(line, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+
+class CassetteAdapter(BaseAdapter):
+    """
+    Adaptateur requests qui enregistre ou rejoue les échanges
+    
+    En enregistrement, les requêtes passent par l'adaptateur réel (pool
+    de connexions, relances) et leurs réponses sont ajoutées à la
+    cassette. En rejeu, aucune requête ne quitte la machine : une
+    requête absente de la cassette lève CassetteMissError.
+    """
+    
+    RECORD = 'record'
+    REPLAY = 'replay'
+    
+    def __init__(
+        self,
+        cassette: Cassette,
+        mode: str,
+        inner: Optional[BaseAdapter] = None,
+        latency_scale: float = 1.0,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Args:
+            cassette: Cassette lue ou enrichie
+            mode: 'record' ou 'replay'
+            inner: Adaptateur réel (obligatoire en enregistrement)
+            latency_scale: Facteur appliqué à la latence enregistrée (0 : immédiat)
+            sleep: Fonction d'attente (remplaçable dans les tests)
+        
+        Raises:
+            ValueError: Si le mode est inconnu
+        """
+        super().__init__()
+        if mode not in (self.RECORD, self.REPLAY):
+            raise ValueError(f"Mode de cassette inconnu: {mode}")
+        if mode == self.RECORD and inner is None:
+            raise ValueError("L'enregistrement nécessite un adaptateur réel")
+        self.cassette = cassette
+        self.mode = mode
+        self.inner = inner
+        self.latency_scale = latency_scale
+        self._sleep = sleep
+    
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        key = request_key(request)
+        if self.mode == self.REPLAY:
+            return self._replay(request, key)
+        
+        start = time.perf_counter()
+        response = self.inner.send(request, **kwargs)
+        latency = time.perf_counter() - start
+        # Les échanges de tokens (credentials, jetons d'accès) ne sont jamais enregistrés
+        if not urlsplit(request.url).path.rstrip('/').endswith('/api/token'):
+            headers = {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers}
+            self.cassette.record(key, response.status_code, headers, response.text, latency)
+        return response
+    
+    def _replay(self, request: requests.PreparedRequest, key: str) -> requests.Response:
+        record = self.cassette.next(key)
+        if record is None:
+            raise CassetteMissError(f"Requête absente de la cassette: {key}", request=request)
+        if self.latency_scale and record['t']:
+            self._sleep(record['t'] * self.latency_scale)
+        
+        response = requests.Response()
+        response.status_code = record['s']
+        response.headers = CaseInsensitiveDict(record['h'])
+        response._content = record['b'].encode('utf-8')
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        response.reason = 'OK' if record['s'] < 400 else 'Error'
+        return response
+    
+    def close(self) -> None:
+        if self.inner is not None:
+            self.inner.close()
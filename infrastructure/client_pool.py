@@ -0,0 +1,131 @@
+"""
+Répartition des lectures du catalogue entre plusieurs applications Spotify
+
+Chaque application (client_id) a sa propre limite de requêtes : répartir
+les recherches et les top tracks entre plusieurs applications augmente le
+débit total en proportion. Les écritures restent sur le client du compte
+propriétaire des playlists.
+"""
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Sequence
+
+
+class _Budget:
+    """Appels récents et blocage éventuel d'un client"""
+    
+    def __init__(self):
+        self.calls: Deque[float] = deque()
+        self.blocked_until = float('-inf')
+
+
+class ClientDispatcher:
+    """
+    Choisit le client qui dispose du plus grand budget restant
+    
+    Le budget d'un client est le nombre d'appels autorisés par fenêtre
+    glissante, moins les appels qui lui ont été confiés pendant la
+    fenêtre. Un client qui reçoit une limite de requêtes (429) est écarté
+    pendant la durée indiquée par Retry-After. À budget égal, le client
+    le moins récemment choisi l'emporte.
+    
+    Lorsque tous les clients sont bloqués ou ont épuisé leur budget, choose
+    attend que le premier d'entre eux redevienne disponible (fin du
+    blocage ou sortie de son plus ancien appel de la fenêtre) plutôt que
+    de lui confier un appel qui serait refusé par l'API. Un budget de 0
+    désactive la limite : les appels sont seulement répartis.
+    """
+    
+    # Mise à l'écart d'un client limité dont la réponse n'indique pas Retry-After (secondes)
+    DEFAULT_PENALTY = 5.0
+    
+    def __init__(
+        self,
+        budget: int = 100,
+        window: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Args:
+            budget: Appels autorisés par client et par fenêtre (0 : sans limite)
+            window: Durée de la fenêtre glissante (secondes)
+            clock: Horloge monotone (remplaçable dans les tests)
+            sleep: Attente (remplaçable dans les tests)
+        """
+        self.budget = budget
+        self.window = window
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._budgets: Dict[str, _Budget] = {}
+    
+    def remaining(self, label: str) -> int:
+        """Budget restant d'un client dans la fenêtre en cours"""
+        with self._lock:
+            return self._remaining(self._budget(label), self._clock())
+    
+    def choose(self, labels: Sequence[str]) -> str:
+        """
+        Choisit un client et lui impute un appel
+        
+        Args:
+            labels: Clients disponibles (au moins un)
+        
+        Returns:
+            Client choisi : le plus grand budget restant parmi les clients
+            disponibles, après attente si aucun ne l'est
+        """
+        while True:
+            with self._lock:
+                now = self._clock()
+                budgets = [(label, self._budget(label)) for label in labels]
+                available = [(label, budget) for label, budget in budgets if self._ready_at(budget, now) <= now]
+                if available:
+                    label, budget = max(
+                        available,
+                        key=lambda item: (self._remaining(item[1], now), -self._last_call(item[1]))
+                    )
+                    budget.calls.append(now)
+                    return label
+                delay = min(self._ready_at(budget, now) for _, budget in budgets) - now
+            # Attente hors du verrou : les autres threads peuvent pénaliser ou attendre aussi
+            self._sleep(delay)
+    
+    def penalize(self, label: str, retry_after: Optional[float] = None) -> None:
+        """
+        Écarte un client qui a atteint sa limite de requêtes (429)
+        
+        Args:
+            label: Client limité
+            retry_after: Délai indiqué par l'API (DEFAULT_PENALTY secondes à défaut)
+        """
+        with self._lock:
+            budget = self._budget(label)
+            delay = retry_after if retry_after is not None else self.DEFAULT_PENALTY
+            budget.blocked_until = max(budget.blocked_until, self._clock() + delay)
+    
+    def _budget(self, label: str) -> _Budget:
+        if label not in self._budgets:
+            self._budgets[label] = _Budget()
+        return self._budgets[label]
+    
+    def _remaining(self, budget: _Budget, now: float) -> int:
+        """Retire les appels sortis de la fenêtre puis calcule le budget restant"""
+        while budget.calls and budget.calls[0] <= now - self.window:
+            budget.calls.popleft()
+        return self.budget - len(budget.calls)
+    
+    def _ready_at(self, budget: _Budget, now: float) -> float:
+        """Instant à partir duquel le client peut recevoir un appel"""
+        ready_at = budget.blocked_until
+        if self.budget > 0 and self._remaining(budget, now) <= 0:
+            # Le plus ancien appel de la fenêtre libère une place en sortant
+            ready_at = max(ready_at, budget.calls[-self.budget] + self.window)
+        return ready_at
+    
+    @staticmethod
+    def _last_call(budget: _Budget) -> float:
+        return budget.calls[-1] if budget.calls else float('-inf')
+
@@ -2,9 +2,40 @@
 Configuration de l'application
 """
 import os
+from typing import List, Optional, Tuple
 from dotenv import load_dotenv
 
 
+def parse_client_pairs(value: Optional[str]) -> List[Tuple[str, str]]:
+    """
+    Lit une liste d'applications Spotify
+    
+    Args:
+        value: « client_id:client_secret » séparés par des virgules
+    
+    Returns:
+        Liste de couples (client_id, client_secret)
+    
+    Raises:
+        ValueError: Si un élément n'a pas la forme client_id:client_secret
+    """
+    pairs = []
+    for item in (value or '').split(','):
+        item = item.strip()
+        if not item:
+            continue
+        client_id, separator, client_secret = item.partition(':')
+        if not separator or not client_id or not client_secret:
+            raise ValueError(f"Application invalide (attendu client_id:client_secret): {item}")
+        pairs.append((client_id, client_secret))
+    return pairs
+
+
+def parse_names(value: Optional[str]) -> List[str]:
+    """Lit une liste de noms séparés par des virgules (éléments vides ignorés)"""
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+
 class SpotifyConfig:
     """Configuration pour l'authentification Spotify"""
     
@@ -15,8 +46,120 @@ class SpotifyConfig:
         self.redirect_uri = 'http://127.0.0.1:8888/callback'
         self.scope = 'playlist-modify-public playlist-modify-private'
         self.cache_path = '.spotify_cache'
+        self.data_cache_dir = os.getenv('SPOTIFY_DATA_CACHE_DIR', '.simplyplaylist_cache')
+        # Durée de validité d'un artiste introuvable dans le cache d'artistes (1 jour par défaut)
+        self.artist_not_found_ttl = float(os.getenv('SPOTIFY_ARTIST_NOT_FOUND_TTL', str(24 * 3600)))
+        # Rapport d'exécution JSON (désactivé si non défini)
+        self.report_path = os.getenv('SPOTIFY_RUN_REPORT') or None
+        # Suivi de progression : auto, bar, log ou silent
+        self.progress_mode = os.getenv('SPOTIFY_PROGRESS', 'auto')
+        self.log_level = os.getenv('SPOTIFY_LOG_LEVEL', 'INFO').upper()
+        
+        # Applications supplémentaires pour les lectures du catalogue (recherche, top tracks)
+        self.read_clients = parse_client_pairs(os.getenv('SPOTIFY_READ_CLIENTS'))
+        # Appels confiés à chaque application par fenêtre glissante de 30 secondes
+        self.client_budget = int(os.getenv('SPOTIFY_CLIENT_BUDGET', '100'))
+        
+        # Résolution multi-processus des grands catalogues (1 : un seul processus)
+        self.processes = int(os.getenv('SPOTIFY_PROCESSES', '1'))
+        self.shard_size = int(os.getenv('SPOTIFY_SHARD_SIZE', '200'))
+        
+        # Rafraîchissement incrémental : âge maximal des top tracks (7 jours par défaut)
+        self.refresh_max_age = float(os.getenv('SPOTIFY_REFRESH_MAX_AGE', str(7 * 24 * 3600)))
+        
+        # Écriture de la playlist : simulation (plan affiché, rien n'est écrit)
+        # et nombre maximal de morceaux touchés dans une playlist existante
+        self.dry_run = os.getenv('SPOTIFY_DRY_RUN', '0') != '0'
+        max_changes = os.getenv('SPOTIFY_MAX_CHANGES')
+        self.max_changes = int(max_changes) if max_changes else None
+        
+        # Playlists dont les morceaux sont exclus de la playlist créée (noms séparés par des virgules)
+        self.exclude_playlists = parse_names(os.getenv('SPOTIFY_EXCLUDE_PLAYLISTS'))
+        # Exclusion des morceaux enregistrés dans la bibliothèque (réponses en cache 1 jour par défaut)
+        self.exclude_saved = os.getenv('SPOTIFY_EXCLUDE_SAVED', '0') != '0'
+        self.saved_tracks_ttl = float(os.getenv('SPOTIFY_SAVED_TRACKS_TTL', str(24 * 3600)))
+        if self.exclude_saved:
+            # Lecture de la bibliothèque : le compte doit autoriser ce scope supplémentaire
+            self.scope += ' user-library-read'
+        
+        # Sélection des artistes par genre (noms séparés par des virgules) et popularité minimale
+        self.include_genres = parse_names(os.getenv('SPOTIFY_INCLUDE_GENRES'))
+        self.exclude_genres = parse_names(os.getenv('SPOTIFY_EXCLUDE_GENRES'))
+        min_popularity = os.getenv('SPOTIFY_MIN_POPULARITY')
+        self.min_popularity = int(min_popularity) if min_popularity else None
+        
+        # Artistes similaires ajoutés à la playlist (profondeur 0 : désactivé)
+        self.related_depth = int(os.getenv('SPOTIFY_RELATED_DEPTH', '0'))
+        self.related_fan_out = int(os.getenv('SPOTIFY_RELATED_FAN_OUT', '3'))
+        self.related_max_artists = int(os.getenv('SPOTIFY_RELATED_MAX', '200'))
+        
+        # Mode service (API HTTP locale)
+        self.service_host = os.getenv('SPOTIFY_SERVICE_HOST', '127.0.0.1')
+        self.service_port = int(os.getenv('SPOTIFY_SERVICE_PORT', '8890'))
+        self.service_workers = int(os.getenv('SPOTIFY_SERVICE_WORKERS', '1'))
+        self.service_queue_size = int(os.getenv('SPOTIFY_SERVICE_QUEUE_SIZE', '16'))
+        # Seul répertoire d'où les travaux peuvent lire un fichier d'artistes
+        self.service_artists_dir = os.getenv('SPOTIFY_SERVICE_ARTISTS_DIR', '.')
+        
+        # Transport HTTP
+        self.api_prefix = os.getenv('SPOTIFY_API_PREFIX', 'https://api.spotify.com/v1/')
+        self.max_workers = int(os.getenv('SPOTIFY_MAX_WORKERS', '8'))
+        # Lots d'une même playlist insérés en parallèle à leur position (1 : écriture séquentielle)
+        self.write_workers = int(os.getenv('SPOTIFY_WRITE_WORKERS', '1'))
+        # Une connexion par worker, plus une pour les appels du thread principal
+        self.pool_size = int(os.getenv('SPOTIFY_POOL_SIZE', str(self.max_workers + 1)))
+        self.keep_alive = os.getenv('SPOTIFY_KEEP_ALIVE', '1') != '0'
+        self.request_timeout = float(os.getenv('SPOTIFY_REQUEST_TIMEOUT', '10'))
+        self.max_retries = int(os.getenv('SPOTIFY_MAX_RETRIES', '3'))
+        self.backoff_factor = float(os.getenv('SPOTIFY_BACKOFF_FACTOR', '0.3'))
+        
+        # Cassette : enregistrement (record) ou rejeu hors ligne (replay) des échanges HTTP
+        self.cassette_path = os.getenv('SPOTIFY_CASSETTE') or None
+        self.cassette_mode = os.getenv('SPOTIFY_CASSETTE_MODE', 'replay')
+        # Facteur appliqué à la latence enregistrée lors du rejeu (0 : réponses immédiates)
+        self.cassette_latency_scale = float(os.getenv('SPOTIFY_CASSETTE_LATENCY', '1.0'))
+    
+    @property
+    def offline(self) -> bool:
+        """Vrai en rejeu d'une cassette : ni réseau ni credentials"""
+        return bool(self.cassette_path) and self.cassette_mode == 'replay'
     
     def is_valid(self) -> bool:
-        """Vérifie si la configuration est valide"""
-        return bool(self.client_id and self.client_secret)
+        """Vérifie si la configuration est valide (credentials inutiles hors ligne)"""
+        return bool(self.client_id and self.client_secret) or self.offline
+    
+    @property
+    def artist_cache_path(self) -> str:
+        """Fichier de cache des artistes résolus (indexé par clé canonique)"""
+        return os.path.join(self.data_cache_dir, 'artists.jsonl')
+    
+    @property
+    def refresh_state_dir(self) -> str:
+        """Répertoire de l'état des rafraîchissements incrémentaux"""
+        return os.path.join(self.data_cache_dir, 'refresh')
+    
+    @property
+    def exclusion_index_dir(self) -> str:
+        """Répertoire des index d'appartenance des playlists exclues"""
+        return os.path.join(self.data_cache_dir, 'exclusion')
+    
+    @property
+    def saved_tracks_cache_path(self) -> str:
+        """Fichier de cache des morceaux enregistrés (indexé par compte et ID de morceau)"""
+        return os.path.join(self.data_cache_dir, 'saved_tracks.jsonl')
+    
+    @property
+    def related_artists_cache_path(self) -> str:
+        """Fichier de cache des artistes similaires (indexé par ID d'artiste)"""
+        return os.path.join(self.data_cache_dir, 'related_artists.jsonl')
+    
+    @property
+    def playlist_mirror_dir(self) -> str:
+        """Répertoire des copies locales des playlists écrites"""
+        return os.path.join(self.data_cache_dir, 'playlists')
+    
+    @property
+    def audio_features_cache_path(self) -> str:
+        """Fichier de cache des caractéristiques audio des morceaux"""
+        return os.path.join(self.data_cache_dir, 'audio_features.jsonl')
 
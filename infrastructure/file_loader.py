@@ -1,11 +1,53 @@
 """
 Repository pour le chargement des artistes depuis un fichier
 """
+import csv
+import gzip
+import hashlib
+import json
 import os
-from typing import List
+from collections import deque
+from typing import IO, Iterable, Iterator, List, Optional
+from domain.canonical import canonical_artist_key
 from domain.repositories import IArtistFileRepository
 
 
+class BoundedSeenSet:
+    """
+    Ensemble de noms déjà vus à mémoire bornée
+    
+    Seule une empreinte de 8 octets de chaque clé est conservée, et au-delà
+    de max_size entrées les plus anciennes sont oubliées.
+    """
+    
+    def __init__(self, max_size: int = 1_000_000):
+        """
+        Initialise l'ensemble
+        
+        Args:
+            max_size: Nombre maximum d'empreintes conservées
+        """
+        self.max_size = max_size
+        self._digests = set()
+        self._order = deque()
+    
+    def add(self, key: str) -> bool:
+        """
+        Ajoute une clé
+        
+        Returns:
+            True si la clé était nouvelle, False si elle avait déjà été vue
+        """
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+        if digest in self._digests:
+            return False
+        self._digests.add(digest)
+        self._order.append(digest)
+        if len(self._order) > self.max_size:
+            self._digests.discard(self._order.popleft())
+        return True
+
+
 class ArtistFileRepository(IArtistFileRepository):
     """Implémentation du repository de fichiers d'artistes"""
     
@@ -17,30 +59,184 @@ class ArtistFileRepository(IArtistFileRepository):
         "Megadeth",
         "Anthrax"
     ]
+    # Colonnes (CSV) ou clés (JSONL) reconnues comme nom d'artiste
+    ARTIST_FIELDS = ('artist', 'artiste', 'name', 'nom', 'band', 'groupe')
+    # Autres colonnes usuelles d'un export : leur présence signale un en-tête
+    OTHER_FIELDS = (
+        'day', 'jour', 'date', 'time', 'heure', 'stage', 'scene', 'scène',
+        'genre', 'genres', 'country', 'pays', 'id'
+    )
+    
+    def __init__(self, max_seen: int = 1_000_000):
+        """
+        Initialise le repository
+        
+        Args:
+            max_seen: Nombre maximum de noms mémorisés pour la déduplication
+        """
+        self.max_seen = max_seen
     
     def load_artists(self, filename: str = DEFAULT_FILENAME) -> List[str]:
         """
-        Charge la liste des artistes depuis un fichier texte
-        Un artiste par ligne
+        Charge la liste des artistes depuis un fichier
         
         Args:
             filename: Nom du fichier à charger
-            
+        
         Returns:
             Liste des noms d'artistes
         """
+        return list(self.iter_artists(filename))
+    
+    def iter_artists(self, filename: str = DEFAULT_FILENAME) -> Iterator[str]:
+        """
+        Parcourt les artistes d'un fichier au fil de la lecture
+        
+        Formats reconnus selon l'extension : texte (un artiste par ligne,
+        lignes commençant par # ignorées), .csv et .jsonl/.ndjson, chacun
+        éventuellement compressé en .gz. Les noms sont normalisés et
+        dédupliqués sans charger le fichier en mémoire.
+        
+        Args:
+            filename: Nom du fichier à charger
+        
+        Yields:
+            Noms d'artistes, dans l'ordre du fichier
+        """
         if not os.path.exists(filename):
             self._create_example_file(filename)
-            return self.EXAMPLE_ARTISTS.copy()
+            yield from self.EXAMPLE_ARTISTS.copy()
+            return
         
-        artists = []
-        with open(filename, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                # Ignorer les lignes vides et les commentaires
-                if line and not line.startswith('#'):
-                    artists.append(line)
-        return artists
+        with self._open(filename) as f:
+            yield from self.iter_names(self._iter_raw_names(filename, f))
+    
+    def iter_names(self, raw_names: Iterable[str]) -> Iterator[str]:
+        """
+        Normalise et déduplique des noms d'artistes bruts
+        
+        Args:
+            raw_names: Noms tels que lus ou reçus
+        
+        Yields:
+            Noms normalisés, sans doublon, dans l'ordre d'origine
+        """
+        seen = BoundedSeenSet(self.max_seen)
+        for raw_name in raw_names:
+            name = self.normalize_name(raw_name)
+            if name and seen.add(self.dedup_key(name)):
+                yield name
+    
+    def fingerprint(self, filename: str = DEFAULT_FILENAME) -> Optional[str]:
+        """
+        Empreinte SHA-256 du contenu brut du fichier, lu par blocs
+        
+        Returns:
+            Empreinte hexadécimale, None si le fichier n'existe pas
+        """
+        if not os.path.exists(filename):
+            return None
+        digest = hashlib.sha256()
+        with open(filename, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 16), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    @staticmethod
+    def normalize_name(name: str) -> str:
+        """Supprime les espaces superflus d'un nom d'artiste"""
+        return ' '.join(name.split())
+    
+    @staticmethod
+    def dedup_key(name: str) -> str:
+        """Clé utilisée pour détecter les doublons (clé canonique partagée avec le resolver)"""
+        return canonical_artist_key(name)
+    
+    @staticmethod
+    def _base_extension(filename: str) -> str:
+        """Extension du fichier, sans le suffixe .gz"""
+        base = filename[:-3] if filename.lower().endswith('.gz') else filename
+        return os.path.splitext(base)[1].lower()
+    
+    @staticmethod
+    def _open(filename: str) -> IO[str]:
+        """Ouvre le fichier en texte, en le décompressant si nécessaire"""
+        if filename.lower().endswith('.gz'):
+            return gzip.open(filename, 'rt', encoding='utf-8', newline='')
+        return open(filename, 'r', encoding='utf-8', newline='')
+    
+    def _iter_raw_names(self, filename: str, f: IO[str]) -> Iterator[str]:
+        """Sélectionne le lecteur adapté au format du fichier"""
+        extension = self._base_extension(filename)
+        if extension == '.csv':
+            return self._iter_csv(f)
+        if extension in ('.jsonl', '.ndjson'):
+            return self._iter_jsonl(f)
+        return self._iter_text(f)
+    
+    @staticmethod
+    def _iter_text(f: IO[str]) -> Iterator[str]:
+        """Un artiste par ligne"""
+        for line in f:
+            line = line.strip()
+            # Ignorer les lignes vides et les commentaires
+            if line and not line.startswith('#'):
+                yield line
+    
+    def _iter_csv(self, f: IO[str]) -> Iterator[str]:
+        """
+        Colonne d'artiste repérée par l'en-tête, première colonne sinon
+        
+        La première ligne est un en-tête si elle contient une colonne
+        reconnue (ARTIST_FIELDS ou OTHER_FIELDS).
+        
+        Raises:
+            ValueError: Si l'en-tête ne contient aucune colonne d'artiste
+        """
+        column = 0
+        header_checked = False
+        for row in csv.reader(f):
+            if not row or row[0].lstrip().startswith('#'):
+                continue
+            if not header_checked:
+                header_checked = True
+                header = [cell.strip().lower() for cell in row]
+                artist_column = self._find_artist_column(header)
+                if artist_column is not None:
+                    column = artist_column
+                    continue
+                if any(cell in self.OTHER_FIELDS for cell in header):
+                    raise ValueError(
+                        f"En-tête CSV sans colonne d'artiste ({', '.join(row)}) : "
+                        f"nommez-la {', '.join(self.ARTIST_FIELDS)}"
+                    )
+            if column < len(row):
+                yield row[column]
+    
+    def _find_artist_column(self, header: List[str]) -> Optional[int]:
+        """Index de la première colonne d'artiste reconnue dans l'en-tête"""
+        for field in self.ARTIST_FIELDS:
+            if field in header:
+                return header.index(field)
+        return None
+    
+    def _iter_jsonl(self, f: IO[str]) -> Iterator[str]:
+        """Un objet JSON (ou une chaîne JSON) par ligne"""
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, str):
+                yield record
+            elif isinstance(record, dict):
+                for field in self.ARTIST_FIELDS:
+                    if isinstance(record.get(field), str):
+                        yield record[field]
+                        break
     
     def _create_example_file(self, filename: str) -> None:
         """Crée un fichier exemple avec quelques groupes"""
@@ -49,3 +245,31 @@ class ArtistFileRepository(IArtistFileRepository):
             f.write('\n'.join(self.EXAMPLE_ARTISTS))
         print(f"✓  Fichier {filename} créé avec des exemples. Ajoutez vos 183 groupes !")
 
+
+class InlineArtistRepository(ArtistFileRepository):
+    """
+    Artistes fournis directement sous forme de liste
+    
+    Utilisé par le service lorsque la liste accompagne la demande : les
+    noms sont normalisés et dédupliqués comme ceux d'un fichier, et le nom
+    de fichier passé aux méthodes est ignoré.
+    """
+    
+    def __init__(self, names: Iterable[str], max_seen: int = 1_000_000):
+        """
+        Initialise le repository
+        
+        Args:
+            names: Noms d'artistes
+            max_seen: Nombre maximum de noms mémorisés pour la déduplication
+        """
+        super().__init__(max_seen)
+        self.names = list(names)
+    
+    def iter_artists(self, filename: str = ArtistFileRepository.DEFAULT_FILENAME) -> Iterator[str]:
+        """Parcourt les artistes de la liste, normalisés et dédupliqués"""
+        return self.iter_names(self.names)
+    
+    def fingerprint(self, filename: str = ArtistFileRepository.DEFAULT_FILENAME) -> Optional[str]:
+        """Empreinte SHA-256 de la liste"""
+        return hashlib.sha256('\n'.join(self.names).encode('utf-8')).hexdigest()
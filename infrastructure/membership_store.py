@@ -0,0 +1,45 @@
+"""
+Stockage JSON des index d'appartenance des playlists exclues
+"""
+import json
+import os
+import re
+from typing import Optional
+from domain.membership import PlaylistIndex
+from domain.repositories import IMembershipIndexRepository
+from infrastructure.atomic_file import write_json_atomic
+
+
+class JsonMembershipIndexRepository(IMembershipIndexRepository):
+    """Un fichier JSON par ensemble de playlists, remplacé atomiquement à chaque sauvegarde"""
+    
+    def __init__(self, directory: str):
+        """
+        Initialise le repository
+        
+        Args:
+            directory: Répertoire des fichiers d'index
+        """
+        self.directory = directory
+    
+    def path(self, key: str) -> str:
+        """Fichier d'index d'un ensemble de playlists"""
+        return os.path.join(self.directory, f"{re.sub(r'[^A-Za-z0-9_-]', '_', key)}.json")
+    
+    def load(self, key: str) -> Optional[PlaylistIndex]:
+        """
+        Charge l'index enregistré d'un ensemble de playlists
+        
+        Returns:
+            Index enregistré, None s'il n'existe pas ou est illisible
+        """
+        try:
+            with open(self.path(key), 'r', encoding='utf-8') as f:
+                return PlaylistIndex.from_dict(json.load(f))
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+    
+    def save(self, entry: PlaylistIndex) -> None:
+        """Enregistre l'index (écriture dans un fichier temporaire puis remplacement)"""
+        os.makedirs(self.directory, exist_ok=True)
+        write_json_atomic(self.path(entry.key), entry.to_dict())
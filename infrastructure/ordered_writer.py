@@ -0,0 +1,130 @@
+"""
+Écriture parallèle de lots à des positions explicites dans une playlist
+
+Chaque lot est inséré à sa position finale. L'API refuse une insertion
+au-delà de la fin de la playlist : le lot de la position p n'est donc
+accepté qu'une fois tous les lots précédents appliqués, et les lots
+acceptés d'une vague forment toujours un préfixe, dans l'ordre. Les lots
+refusés (conflit de position) sont renvoyés dans une nouvelle vague tant
+que chaque vague en place plusieurs, puis un par un.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+from domain.errors import SpotifyError
+
+
+def is_position_conflict(error: SpotifyError) -> bool:
+    """Vrai pour un refus de la requête (HTTP 400), sans erreur passagère ni d'accès"""
+    return type(error) is SpotifyError
+
+
+@dataclass
+class OrderedWriteResult:
+    """Issue d'une écriture parallèle"""
+    # snapshot_id retourné par chaque lot appliqué, dans l'ordre des lots
+    snapshot_ids: List[Optional[str]] = field(default_factory=list)
+    # Lots refusés puis renvoyés
+    conflicts: int = 0
+    # Erreurs qui laissent le contenu incertain (l'appelant doit le relire)
+    errors: List[SpotifyError] = field(default_factory=list)
+    
+    @property
+    def complete(self) -> bool:
+        """Vrai si tous les lots ont été appliqués à leur position"""
+        return not self.errors
+    
+    @property
+    def snapshot_id(self) -> Optional[str]:
+        """Version de la playlist après le dernier lot (None si l'écriture est incomplète)"""
+        if self.errors or not self.snapshot_ids:
+            return None
+        return self.snapshot_ids[-1]
+
+
+class OrderedBatchWriter:
+    """Envoie des lots d'URIs en parallèle, chacun à sa position"""
+    
+    def __init__(self, max_workers: int = 4, batch_size: int = 100):
+        """
+        Args:
+            max_workers: Lots envoyés simultanément (1 : écriture séquentielle)
+            batch_size: Nombre maximum d'URIs par lot
+        """
+        self.max_workers = max(1, max_workers)
+        self.batch_size = batch_size
+    
+    def write(
+        self,
+        insert: Callable[[List[str], int], Optional[str]],
+        uris: List[str],
+        start: int = 0
+    ) -> OrderedWriteResult:
+        """
+        Insère les URIs à partir de la position start
+        
+        Tous les lots d'une vague sont attendus avant la suivante : aucune
+        écriture n'est encore en cours quand la méthode rend la main. Une
+        erreur autre qu'un conflit de position, ou un lot accepté après un
+        lot refusé, arrête l'écriture et est retournée dans errors.
+        
+        Args:
+            insert: Insère un lot à une position et retourne le snapshot_id
+            uris: URIs à insérer, dans l'ordre
+            start: Position du premier lot (nombre de morceaux déjà écrits)
+        
+        Returns:
+            Snapshots des lots appliqués, conflits et erreurs rencontrés
+        """
+        pending = [
+            (uris[i:i + self.batch_size], start + i)
+            for i in range(0, len(uris), self.batch_size)
+        ]
+        result = OrderedWriteResult()
+        workers = self.max_workers
+        while pending:
+            outcomes = self._wave(insert, pending, workers)
+            landed = 0
+            while landed < len(outcomes) and outcomes[landed][1] is None:
+                landed += 1
+            result.snapshot_ids.extend(snapshot_id for snapshot_id, _ in outcomes[:landed])
+            failed = [error for _, error in outcomes[landed:] if error is not None]
+            uncertain = (
+                any(not is_position_conflict(error) for error in failed)
+                or len(failed) < len(outcomes) - landed
+                # En séquentiel, la position refusée est la fin connue de la playlist
+                or (workers == 1 and failed)
+            )
+            if uncertain:
+                # Erreur d'une autre nature, ou lot accepté hors préfixe : contenu incertain
+                result.errors.extend(failed)
+                return result
+            result.conflicts += len(failed)
+            pending = pending[landed:]
+            # Une vague qui ne place qu'un lot n'apporte plus rien : fin lot par lot
+            if landed <= 1:
+                workers = 1
+        return result
+    
+    @staticmethod
+    def _wave(
+        insert: Callable[[List[str], int], Optional[str]],
+        batches: List[Tuple[List[str], int]],
+        workers: int
+    ) -> List[Tuple[Optional[str], Optional[SpotifyError]]]:
+        """Envoie une vague de lots et retourne (snapshot_id, erreur) de chacun"""
+        def send(batch):
+            try:
+                return insert(*batch), None
+            except SpotifyError as e:
+                return None, e
+        
+        if workers == 1:
+            outcomes = []
+            for batch in batches:
+                outcomes.append(send(batch))
+                if outcomes[-1][1] is not None:
+                    break
+            return outcomes
+        with ThreadPoolExecutor(max_workers=min(workers, len(batches))) as executor:
+            return list(executor.map(send, batches))
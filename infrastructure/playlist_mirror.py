@@ -0,0 +1,63 @@
+"""
+Copie locale du contenu des playlists écrites par l'application
+"""
+import json
+import os
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+from infrastructure.atomic_file import write_json_atomic
+
+
+@dataclass
+class MirroredPlaylist:
+    """Contenu d'une playlist tel qu'écrit, pour une version (snapshot_id)"""
+    snapshot_id: str
+    uris: List[Optional[str]]
+
+
+class PlaylistMirror:
+    """
+    Un fichier JSON par playlist, remplacé atomiquement à chaque sauvegarde
+    
+    L'entrée n'est valable que tant que la playlist reste dans la version
+    enregistrée : toute modification, par l'application ou ailleurs,
+    change son snapshot_id.
+    """
+    
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: Répertoire des copies locales
+        """
+        self.directory = directory
+    
+    def path(self, playlist_id: str) -> str:
+        """Fichier de la copie locale d'une playlist"""
+        return os.path.join(self.directory, f"{re.sub(r'[^A-Za-z0-9_-]', '_', playlist_id)}.json")
+    
+    def load(self, playlist_id: str) -> Optional[MirroredPlaylist]:
+        """
+        Charge la copie locale d'une playlist
+        
+        Returns:
+            Copie enregistrée, None si elle n'existe pas ou est illisible
+        """
+        try:
+            with open(self.path(playlist_id), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return MirroredPlaylist(data['snapshot_id'], data['uris'])
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+    
+    def save(self, playlist_id: str, snapshot_id: str, uris: List[Optional[str]]) -> None:
+        """Enregistre le contenu d'une playlist pour sa version actuelle"""
+        os.makedirs(self.directory, exist_ok=True)
+        write_json_atomic(self.path(playlist_id), {'snapshot_id': snapshot_id, 'uris': uris})
+    
+    def discard(self, playlist_id: str) -> None:
+        """Supprime la copie locale (contenu inconnu après une écriture incomplète)"""
+        try:
+            os.remove(self.path(playlist_id))
+        except FileNotFoundError:
+            pass
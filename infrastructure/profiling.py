@@ -0,0 +1,163 @@
+"""
+Profilage CPU et mémoire de chaque phase d'une exécution
+
+Pendant une phase, cProfile mesure le temps passé dans chaque fonction,
+dans le thread principal comme dans les threads démarrés pendant la phase
+(recherches parallèles, écritures), et tracemalloc suit les allocations.
+À la fin de la phase, le profileur écrit dans le répertoire de sortie :
+
+- NN-phase.prof : statistiques cProfile (lisibles avec pstats ou snakeviz)
+- NN-phase.txt : fonctions les plus coûteuses (temps cumulé)
+- NN-phase.alloc.txt : lignes ayant le plus alloué pendant la phase
+
+puis close écrit summary.json (durée, temps CPU et pic mémoire par phase).
+Les processus du résolveur multi-processus ne sont pas profilés : seul
+leur temps d'attente apparaît, dans la phase resolve.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import List, Optional
+from domain.profiling import IPhaseObserver
+
+
+@dataclass
+class _PhaseState:
+    """Mesures en cours d'une phase"""
+    name: str
+    profile: cProfile.Profile
+    snapshot: tracemalloc.Snapshot
+    memory: int
+    wall: float
+    cpu: float
+    thread_profiles: List[cProfile.Profile] = field(default_factory=list)
+
+
+class PhaseProfiler(IPhaseObserver):
+    """
+    Profileur des phases successives d'une exécution
+    
+    Une phase commencée pendant une autre n'est pas profilée séparément :
+    son coût est compté dans la phase englobante.
+    """
+    
+    # Traces propres au profilage, exclues des sites d'allocation
+    _IGNORED_FILES = (tracemalloc.__file__, cProfile.__file__, pstats.__file__, __file__)
+    
+    def __init__(self, output_dir: str, top: int = 25):
+        """
+        Args:
+            output_dir: Répertoire des profils (créé au besoin)
+            top: Nombre de fonctions et de sites d'allocation listés par phase
+        """
+        self.output_dir = output_dir
+        self.top = top
+        self.summary: List[dict] = []
+        self._current: Optional[_PhaseState] = None
+        self._lock = threading.Lock()
+        self._started_tracing = False
+    
+    def phase_started(self, name: str) -> None:
+        if self._current is not None:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+        self._current = _PhaseState(
+            name=name,
+            profile=cProfile.Profile(),
+            snapshot=self._snapshot(),
+            memory=tracemalloc.get_traced_memory()[0],
+            wall=time.perf_counter(),
+            cpu=time.process_time()
+        )
+        threading.setprofile(self._profile_thread)
+        self._current.profile.enable()
+    
+    def _profile_thread(self, frame, event, arg) -> None:
+        """Premier événement d'un thread démarré pendant la phase : il reçoit son profileur"""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ : un seul profileur actif à la fois (thread principal seul)
+            return
+        with self._lock:
+            if self._current is None:
+                profile.disable()
+                return
+            self._current.thread_profiles.append(profile)
+    
+    def phase_finished(self, name: str) -> None:
+        state = self._current
+        if state is None or state.name != name:
+            return
+        state.profile.disable()
+        threading.setprofile(None)
+        with self._lock:
+            self._current = None
+        wall = time.perf_counter() - state.wall
+        cpu = time.process_time() - state.cpu
+        memory, peak = tracemalloc.get_traced_memory()
+        snapshot = self._snapshot()
+        
+        os.makedirs(self.output_dir, exist_ok=True)
+        prefix = os.path.join(self.output_dir, f'{len(self.summary) + 1:02d}-{name}')
+        self._write_profile(prefix, state)
+        with open(f'{prefix}.alloc.txt', 'w', encoding='utf-8') as f:
+            for stat in snapshot.compare_to(state.snapshot, 'lineno')[:self.top]:
+                f.write(f'{stat}\n')
+        self.summary.append({
+            'phase': name,
+            'wall': round(wall, 6),
+            'cpu': round(cpu, 6),
+            'threads': len(state.thread_profiles),
+            'memory_delta': memory - state.memory,
+            'memory_peak': peak - state.memory,
+        })
+    
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        """Allocations actuelles, sans celles du profilage"""
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, filename) for filename in self._IGNORED_FILES]
+        )
+    
+    def _write_profile(self, prefix: str, state: _PhaseState) -> None:
+        """Statistiques cumulées des threads de la phase (.prof) et leur résumé (.txt)"""
+        text = io.StringIO()
+        stats = pstats.Stats(state.profile, stream=text)
+        for profile in state.thread_profiles:
+            try:
+                stats.add(profile)
+            except TypeError:
+                # Thread sans appel profilé (terminé aussitôt)
+                pass
+        stats.dump_stats(f'{prefix}.prof')
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        with open(f'{prefix}.txt', 'w', encoding='utf-8') as f:
+            f.write(text.getvalue())
+    
+    def close(self) -> str:
+        """
+        Écrit summary.json et arrête le suivi des allocations
+        
+        Returns:
+            Chemin du résumé
+        """
+        if self._current is not None:
+            self.phase_finished(self._current.name)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, 'summary.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'phases': self.summary}, f, indent=2)
+        return path
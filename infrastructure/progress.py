@@ -0,0 +1,227 @@
+"""
+Implémentations du suivi de progression : barre interactive, journalisation, silence
+
+Les rafraîchissements de progression sont limités à un par intervalle
+minimal, pour que les exécutions sur de gros fichiers ne passent pas leur
+temps en écritures sur le terminal.
+"""
+import logging
+import re
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, IO, Optional, Union
+from domain.progress import IProgressReporter, NullProgressReporter
+
+
+class _ThrottledProgressReporter(IProgressReporter, ABC):
+    """Base commune : état de la tâche en cours et limitation des rafraîchissements"""
+    
+    def __init__(self, level: int, min_interval: float, clock: Callable[[], float]):
+        """
+        Args:
+            level: Niveau minimal des messages émis
+            min_interval: Intervalle minimal entre deux rafraîchissements (secondes)
+            clock: Horloge monotone (remplaçable dans les tests)
+        """
+        self.level = level
+        self.min_interval = min_interval
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._label: Optional[str] = None
+        self._total: Optional[int] = None
+        self._done = 0
+        self._detail = ''
+        self._last_render = float('-inf')
+    
+    def start(self, label: str, total: Optional[int] = None) -> None:
+        with self._lock:
+            self._label, self._total, self._done, self._detail = label, total, 0, ''
+            self._last_render = float('-inf')
+            self._render_if_due()
+    
+    def advance(self, detail: str = '', count: int = 1) -> None:
+        with self._lock:
+            if self._label is None:
+                return
+            self._done += count
+            self._detail = detail
+            self._render_if_due()
+    
+    def finish(self) -> None:
+        with self._lock:
+            if self._label is None:
+                return
+            self._render(final=True)
+            self._label = None
+    
+    def _render_if_due(self) -> None:
+        """Rafraîchit l'affichage si l'intervalle minimal est écoulé"""
+        now = self._clock()
+        if now - self._last_render >= self.min_interval:
+            self._last_render = now
+            self._render(final=False)
+    
+    @abstractmethod
+    def _render(self, final: bool) -> None:  # pragma: no cover
+        """Affiche l'état de la tâche en cours"""
+        pass
+
+
+class ProgressBarReporter(_ThrottledProgressReporter):
+    """
+    Barre de progression pour le terminal
+    
+    Sur un terminal, la barre est redessinée sur place et les messages
+    s'affichent au-dessus ; sinon (sortie redirigée), l'avancement est
+    écrit sous forme de lignes, au même rythme limité.
+    """
+    
+    def __init__(
+        self,
+        stream: Optional[IO[str]] = None,
+        level: int = logging.INFO,
+        min_interval: float = 0.1,
+        width: int = 30,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            stream: Flux de sortie (sys.stdout au moment de l'écriture par défaut)
+            level: Niveau minimal des messages affichés
+            min_interval: Intervalle minimal entre deux rafraîchissements (secondes)
+            width: Largeur de la barre (caractères)
+            clock: Horloge monotone (remplaçable dans les tests)
+        """
+        super().__init__(level, min_interval, clock)
+        self._stream = stream
+        self.width = width
+        self._drawn = 0
+    
+    @property
+    def stream(self) -> IO[str]:
+        return self._stream or sys.stdout
+    
+    @property
+    def interactive(self) -> bool:
+        """Vrai si la sortie est un terminal (barre redessinée sur place)"""
+        isatty = getattr(self.stream, 'isatty', None)
+        return bool(isatty and isatty())
+    
+    def message(self, text: str, level: int = logging.INFO) -> None:
+        if level < self.level:
+            return
+        with self._lock:
+            self._clear()
+            self.stream.write(text + '\n')
+            if self._label is not None and self.interactive:
+                self._render(final=False)
+            self.stream.flush()
+    
+    def _render(self, final: bool) -> None:
+        line = self._format_line()
+        if self.interactive:
+            self._clear()
+            self.stream.write(line + ('\n' if final else ''))
+            self._drawn = 0 if final else len(line)
+        else:
+            self.stream.write(line + '\n')
+        self.stream.flush()
+    
+    def _clear(self) -> None:
+        """Efface la barre affichée sur la ligne courante"""
+        if self._drawn:
+            self.stream.write('\r' + ' ' * self._drawn + '\r')
+            self._drawn = 0
+    
+    def _format_line(self) -> str:
+        """Ligne de progression : libellé, barre, compteur et dernier élément"""
+        if self._total:
+            filled = min(self.width, self.width * self._done // self._total)
+            bar = '█' * filled + '░' * (self.width - filled)
+            line = f"{self._label} {bar} {self._done}/{self._total}"
+        else:
+            line = f"{self._label} {self._done}"
+        if self._detail:
+            line += f" · {self._detail}"
+        return line
+
+
+class LoggingProgressReporter(_ThrottledProgressReporter):
+    """
+    Journalisation structurée via le module logging
+    
+    Les symboles de début de message sont retirés, et l'avancement d'une
+    tâche est journalisé au plus une fois par intervalle.
+    """
+    
+    # Émojis et symboles de mise en forme en début de message
+    _DECORATION = re.compile(r'^[^\w\[(«"\']+')
+    
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        level: int = logging.INFO,
+        min_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            logger: Logger cible (logger « simplyplaylist » par défaut)
+            level: Niveau minimal des messages journalisés
+            min_interval: Intervalle minimal entre deux lignes d'avancement (secondes)
+            clock: Horloge monotone (remplaçable dans les tests)
+        """
+        super().__init__(level, min_interval, clock)
+        self.logger = logger or logging.getLogger('simplyplaylist')
+    
+    def message(self, text: str, level: int = logging.INFO) -> None:
+        if level >= self.level and self.logger.isEnabledFor(level):
+            self.logger.log(level, self._DECORATION.sub('', text.strip()))
+    
+    def _render(self, final: bool) -> None:
+        if self.level > logging.INFO or not self.logger.isEnabledFor(logging.INFO):
+            return
+        total = f"/{self._total}" if self._total is not None else ''
+        state = 'terminé' if final else 'en cours'
+        self.logger.info("%s: %d%s (%s)", self._label, self._done, total, state)
+
+
+def create_progress_reporter(
+    mode: str = 'auto',
+    level: Union[int, str] = logging.INFO,
+    stream: Optional[IO[str]] = None
+) -> IProgressReporter:
+    """
+    Construit le suivi de progression demandé
+    
+    Args:
+        mode: 'bar' (barre interactive), 'log' (journalisation), 'silent',
+            ou 'auto' (barre sur un terminal, journalisation sinon)
+        level: Niveau minimal des messages (entier ou nom : DEBUG, INFO...)
+        stream: Flux de la barre de progression (sys.stdout par défaut)
+    
+    Returns:
+        Suivi de progression
+    
+    Raises:
+        ValueError: Si le mode est inconnu
+    """
+    if isinstance(level, str):
+        level = getattr(logging, level.upper(), logging.INFO)
+    
+    if mode == 'auto':
+        isatty = getattr(stream or sys.stdout, 'isatty', None)
+        mode = 'bar' if isatty and isatty() else 'log'
+    
+    if mode == 'silent':
+        return NullProgressReporter()
+    if mode == 'bar':
+        return ProgressBarReporter(stream, level)
+    if mode == 'log':
+        logging.basicConfig(format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+        logger = logging.getLogger('simplyplaylist')
+        logger.setLevel(level)
+        return LoggingProgressReporter(logger, level)
+    raise ValueError(f"Mode de progression inconnu: {mode}")
@@ -0,0 +1,55 @@
+"""
+Stockage JSON de l'état des rafraîchissements incrémentaux
+"""
+import hashlib
+import json
+import os
+import re
+from dataclasses import asdict
+from typing import Optional
+from domain.entities import RefreshState, ResolvedArtist, Track
+from domain.repositories import IRefreshStateRepository
+from infrastructure.atomic_file import write_json_atomic
+
+
+class JsonRefreshStateRepository(IRefreshStateRepository):
+    """Un fichier JSON par playlist, remplacé atomiquement à chaque sauvegarde"""
+    
+    def __init__(self, directory: str):
+        """
+        Initialise le repository
+        
+        Args:
+            directory: Répertoire des fichiers d'état
+        """
+        self.directory = directory
+    
+    def path(self, playlist_name: str) -> str:
+        """Fichier d'état d'une playlist (nom lisible suivi d'une empreinte du nom exact)"""
+        slug = re.sub(r'[^a-z0-9]+', '-', playlist_name.lower()).strip('-')[:40] or 'playlist'
+        digest = hashlib.sha1(playlist_name.encode('utf-8')).hexdigest()[:10]
+        return os.path.join(self.directory, f'{slug}-{digest}.json')
+    
+    def load(self, playlist_name: str) -> Optional[RefreshState]:
+        """
+        Charge l'état du dernier rafraîchissement
+        
+        Returns:
+            État enregistré, None s'il n'existe pas ou est illisible
+        """
+        try:
+            with open(self.path(playlist_name), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for key in ('artists', 'related'):
+                data[key] = [
+                    ResolvedArtist(**dict(artist, tracks=[Track(**track) for track in artist['tracks']]))
+                    for artist in data.get(key, [])
+                ]
+            return RefreshState(**data)
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+    
+    def save(self, state: RefreshState) -> None:
+        """Enregistre l'état (écriture dans un fichier temporaire puis remplacement)"""
+        os.makedirs(self.directory, exist_ok=True)
+        write_json_atomic(self.path(state.playlist_name), asdict(state), ensure_ascii=False)
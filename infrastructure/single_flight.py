@@ -0,0 +1,71 @@
+"""
+Regroupement des appels concurrents identiques (single-flight)
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    """Appel en cours partagé entre plusieurs appelants"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """
+    Partage un appel en cours entre les appelants d'une même clé
+    
+    Le premier appelant exécute la fonction ; les appelants concurrents
+    de la même clé attendent sa fin et reçoivent le même résultat (ou la
+    même exception) sans refaire l'appel.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.shared_count = 0
+    
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """
+        Exécute la fonction, ou attend l'appel déjà en cours pour cette clé
+        
+        Args:
+            key: Clé identifiant la requête
+            function: Fonction sans argument réalisant la requête
+        
+        Returns:
+            Résultat de la fonction
+        
+        Raises:
+            Exception: L'exception levée par la fonction, pour tous les appelants
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                call.followers += 1
+                self.shared_count += 1
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = function()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
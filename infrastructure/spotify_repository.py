@@ -1,26 +1,116 @@
 """
 Repository Spotify - Implémentation des interactions avec l'API Spotify
 """
+import dataclasses
+import time
+import requests
 import spotipy
-from spotipy.oauth2 import SpotifyOAuth
-from typing import List, Optional
-from domain.entities import Artist, Track, Playlist
+from concurrent.futures import ThreadPoolExecutor
+from spotipy.exceptions import SpotifyException
+from spotipy.cache_handler import CacheFileHandler
+from spotipy.oauth2 import SpotifyClientCredentials, SpotifyOAuth
+from typing import Any, Callable, Dict, List, Optional
+from domain.canonical import canonical_artist_key
+from domain.entities import Artist, Track, TrackFeatures, Playlist
+from domain.playlist_diff import PlaylistDiff, compute_playlist_diff
+from domain.playlist_diff import apply_playlist_diff as compute_applied_diff
+from domain.errors import AuthError, NotFoundError, RateLimitedError, SpotifyError, TransientError
+from domain.progress import IProgressReporter, NullProgressReporter
 from domain.repositories import ISpotifyRepository
+from infrastructure.cache import JsonLinesCache
+from infrastructure.client_pool import ClientDispatcher
 from infrastructure.config import SpotifyConfig
+from infrastructure.ordered_writer import OrderedBatchWriter
+from infrastructure.playlist_mirror import PlaylistMirror
+from infrastructure.single_flight import SingleFlight
+from infrastructure.stats import StatsCounter
+from infrastructure.transport import build_session
+
+
+def translate_error(error: Exception) -> SpotifyError:
+    """
+    Traduit une erreur technique (spotipy, requests) en erreur du domaine
+    
+    Args:
+        error: Exception levée par le client HTTP
+    
+    Returns:
+        Erreur typée (passagère, limite de requêtes, authentification, introuvable)
+    """
+    if isinstance(error, SpotifyException):
+        status = error.http_status
+        retry_after = (error.headers or {}).get('Retry-After')
+        if status == 429 and retry_after is None and 'Max Retries' in str(error.msg):
+            # Relances de l'adaptateur épuisées (spotipy en fait un 429 sans en-têtes)
+            return TransientError(str(error))
+        if status == 429:
+            return RateLimitedError(str(error), float(retry_after) if retry_after else None)
+        if status in (401, 403):
+            return AuthError(str(error))
+        if status == 404:
+            return NotFoundError(str(error))
+        if status is None or status >= 500:
+            return TransientError(str(error))
+        return SpotifyError(str(error))
+    return TransientError(str(error))
 
 
 class SpotifyRepository(ISpotifyRepository):
-    """Implémentation du repository Spotify"""
+    """
+    Implémentation du repository Spotify
+    
+    Les lectures du catalogue (recherche, top tracks, caractéristiques
+    audio) sont réparties entre le client du compte et les applications
+    de lecture configurées, selon leur budget restant ; tous les autres
+    appels, dont les écritures, passent par le client du compte
+    propriétaire des playlists.
+    """
+    
+    # Client du compte connecté, seul habilité à écrire
+    OWNER = 'owner'
+    # Nombre maximum d'IDs acceptés par l'endpoint audio-features
+    AUDIO_FEATURES_BATCH_SIZE = 100
+    # Nombre maximum d'IDs acceptés par l'endpoint me/tracks/contains
+    SAVED_TRACKS_BATCH_SIZE = 50
+    # Nombre maximum de morceaux par écriture dans une playlist
+    WRITE_BATCH_SIZE = 100
+    # Seuls champs lus lors du parcours des morceaux d'une playlist
+    PLAYLIST_ITEMS_FIELDS = 'items(track(uri)),next'
+    # Attente avant de renvoyer un appel limité (429) sans Retry-After, et attente maximale
+    RATE_LIMIT_DELAY = 1.0
+    MAX_RATE_LIMIT_DELAY = 60.0
     
-    def __init__(self, config: SpotifyConfig):
+    def __init__(self, config: SpotifyConfig, progress: Optional[IProgressReporter] = None):
         """
         Initialise le repository Spotify
         
         Args:
             config: Configuration Spotify
+            progress: Suivi de progression (silencieux par défaut)
         """
         self.config = config
+        self.progress = progress or NullProgressReporter()
         self._client: Optional[spotipy.Spotify] = None
+        # Session HTTP unique (pool de connexions persistantes) pour tous les appels
+        self._session = build_session(config)
+        self._artist_cache = JsonLinesCache(config.artist_cache_path)
+        self._audio_features_cache = JsonLinesCache(config.audio_features_cache_path)
+        self._saved_tracks_cache = JsonLinesCache(config.saved_tracks_cache_path)
+        self._related_artists_cache = JsonLinesCache(config.related_artists_cache_path)
+        # Les recherches concurrentes identiques partagent une seule requête
+        self._single_flight = SingleFlight()
+        self._stats = StatsCounter()
+        self._dispatcher = ClientDispatcher(budget=config.client_budget)
+        self._read_clients: Dict[str, spotipy.Spotify] = {}
+        # Identifiant du compte connecté, mémorisé pour les créations de playlist
+        self._user_id: Optional[str] = None
+        # Lots d'une même playlist écrits en parallèle, chacun à sa position (désactivé par défaut)
+        self._writer = OrderedBatchWriter(config.write_workers, self.WRITE_BATCH_SIZE)
+        # Dernière version (snapshot_id) connue des playlists écrites
+        self._snapshot_ids: Dict[str, str] = {}
+        # Copie locale des playlists écrites, et dernier contenu lu de chaque playlist
+        self._mirror = PlaylistMirror(config.playlist_mirror_dir)
+        self._contents: Dict[str, List[Optional[str]]] = {}
     
     def connect(self) -> None:
         """
@@ -29,6 +119,12 @@ class SpotifyRepository(ISpotifyRepository):
         Raises:
             Exception: Si l'authentification échoue
         """
+        if self.config.offline:
+            self._client = self._offline_client()
+            self._read_clients = {}
+            self.progress.info(f"✓  Rejeu hors ligne de la cassette {self.config.cassette_path}")
+            return
+        
         auth_manager = SpotifyOAuth(
             client_id=self.config.client_id,
             client_secret=self.config.client_secret,
@@ -36,38 +132,176 @@ class SpotifyRepository(ISpotifyRepository):
             scope=self.config.scope,
             cache_path=self.config.cache_path,
             open_browser=True,
-            show_dialog=True
+            show_dialog=True,
+            requests_session=self._session,
+            requests_timeout=self.config.request_timeout
         )
         
         # Vérifier si on a déjà un token en cache
         token_info = auth_manager.get_cached_token()
         if token_info:
-            print("✓  Token d'authentification trouvé dans le cache")
+            self.progress.info("✓  Token d'authentification trouvé dans le cache")
             # Vérifier si le token est expiré
             if auth_manager.is_token_expired(token_info):
-                print("⚠️  Token expiré, nouvelle authentification nécessaire...")
+                self.progress.warning("⚠️  Token expiré, nouvelle authentification nécessaire...")
                 token_info = None
         
         if not token_info:
-            print("\n📱 Authentification requise...")
-            print("   Le navigateur va s'ouvrir automatiquement.")
-            print("   ⚠️  IMPORTANT: Après avoir autorisé, vous serez redirigé vers une page.")
-            print("   Cette page peut afficher une erreur - c'est NORMAL !")
-            print("   Revenez simplement ici et attendez quelques secondes...")
-            print("\n   ⏳ En attente de l'autorisation...")
+            self.progress.info("\n📱 Authentification requise...")
+            self.progress.info("   Le navigateur va s'ouvrir automatiquement.")
+            self.progress.info("   ⚠️  IMPORTANT: Après avoir autorisé, vous serez redirigé vers une page.")
+            self.progress.info("   Cette page peut afficher une erreur - c'est NORMAL !")
+            self.progress.info("   Revenez simplement ici et attendez quelques secondes...")
+            self.progress.info("\n   ⏳ En attente de l'autorisation...")
         
         try:
-            self._client = spotipy.Spotify(auth_manager=auth_manager)
+            self._client = spotipy.Spotify(
+                auth_manager=auth_manager,
+                requests_session=self._session,
+                requests_timeout=self.config.request_timeout
+            )
+            self._client.prefix = self.config.api_prefix
             # Tester la connexion
             self._client.current_user()
+            self._read_clients = self._connect_read_clients()
         except Exception as e:
-            print(f"\n❌ Erreur lors de l'authentification: {str(e)}")
-            print("\n💡 Si l'application reste bloquée:")
-            print("   1. Autorisez l'application dans le navigateur")
-            print("   2. Attendez 10-15 secondes")
-            print("   3. Si ça ne fonctionne pas, appuyez sur Ctrl+C et réessayez")
+            self.progress.error(f"\n❌ Erreur lors de l'authentification: {str(e)}")
+            self.progress.info("\n💡 Si l'application reste bloquée:")
+            self.progress.info("   1. Autorisez l'application dans le navigateur")
+            self.progress.info("   2. Attendez 10-15 secondes")
+            self.progress.info("   3. Si ça ne fonctionne pas, appuyez sur Ctrl+C et réessayez")
             raise
     
+    def connect_catalog(self, client: Optional[spotipy.Spotify] = None) -> None:
+        """
+        Connexion en lecture seule au catalogue, sans compte utilisateur
+        
+        Utilisée par les processus de résolution : la recherche et les top
+        tracks ne nécessitent qu'une authentification client credentials,
+        sans ouvrir de navigateur. Les écritures ne sont pas possibles.
+        
+        Args:
+            client: Client à utiliser (client credentials de l'application par défaut)
+        """
+        self._client = client or self._catalog_client(self.config.client_id, self.config.client_secret)
+        self._client.prefix = self.config.api_prefix
+        self._read_clients = self._connect_read_clients()
+    
+    def _offline_client(self) -> spotipy.Spotify:
+        """Client du rejeu d'une cassette : token fictif, aucun échange d'authentification"""
+        client = spotipy.Spotify(
+            auth='cassette',
+            requests_session=self._session,
+            requests_timeout=self.config.request_timeout
+        )
+        client.prefix = self.config.api_prefix
+        return client
+    
+    def _catalog_client(self, client_id: str, client_secret: str) -> spotipy.Spotify:
+        """Client authentifié par client credentials, avec son propre cache de token"""
+        if self.config.offline:
+            return self._offline_client()
+        auth_manager = SpotifyClientCredentials(
+            client_id=client_id,
+            client_secret=client_secret,
+            cache_handler=CacheFileHandler(cache_path=f"{self.config.cache_path}-{client_id}"),
+            requests_session=self._session,
+            requests_timeout=self.config.request_timeout
+        )
+        client = spotipy.Spotify(
+            auth_manager=auth_manager,
+            requests_session=self._session,
+            requests_timeout=self.config.request_timeout
+        )
+        client.prefix = self.config.api_prefix
+        return client
+    
+    def _connect_read_clients(self) -> Dict[str, spotipy.Spotify]:
+        """
+        Crée un client par application de lecture configurée
+        
+        Les lectures du catalogue ne nécessitent pas de compte utilisateur :
+        chaque application s'authentifie par client credentials, avec son
+        propre cache de token.
+        """
+        clients = {
+            client_id: self._catalog_client(client_id, client_secret)
+            for client_id, client_secret in self.config.read_clients
+        }
+        if clients:
+            self.progress.info(f"✓  {len(clients)} application(s) supplémentaire(s) pour les lectures")
+        return clients
+    
+    def _read(self, method: str, *args, **kwargs) -> Any:
+        """
+        Exécute une lecture du catalogue sur le client au plus grand budget restant
+        
+        Un client limité (429) est écarté pendant la durée indiquée par
+        l'API et la lecture est aussitôt confiée à un autre client ; si
+        chaque client a été limité, l'erreur est propagée pour que
+        l'appelant puisse relancer.
+        """
+        owner = self._spotify_client
+        labels = [self.OWNER, *self._read_clients]
+        for attempt in range(len(labels)):
+            label = self._dispatcher.choose(labels)
+            client = owner if label == self.OWNER else self._read_clients[label]
+            self._stats.increment(f"api_calls.client.{label}")
+            try:
+                return self._call_once(getattr(client, method), *args, **kwargs)
+            except RateLimitedError as e:
+                self._dispatcher.penalize(label, e.retry_after)
+                if attempt == len(labels) - 1:
+                    raise
+    
+    def _call(self, operation: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Exécute un appel du compte connecté, renvoyé après une limite de requêtes
+        
+        Spotify refuse un appel limité (429) sans le traiter : il est renvoyé
+        après le délai Retry-After (écritures comprises), au plus
+        max_retries fois.
+        
+        Raises:
+            SpotifyError: Erreur typée selon le statut HTTP ou l'erreur réseau
+        """
+        for attempt in range(self.config.max_retries + 1):
+            try:
+                return self._call_once(operation, *args, **kwargs)
+            except RateLimitedError as e:
+                if attempt == self.config.max_retries:
+                    raise
+                time.sleep(min(e.retry_after or self.RATE_LIMIT_DELAY, self.MAX_RATE_LIMIT_DELAY))
+    
+    def _call_once(self, operation: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Exécute un appel à l'API en traduisant les erreurs techniques
+        
+        Chaque appel est compté, au total et par méthode du client.
+        
+        Raises:
+            SpotifyError: Erreur typée selon le statut HTTP ou l'erreur réseau
+        """
+        self._stats.increment('api_calls')
+        self._stats.increment(f"api_calls.{getattr(operation, '__name__', 'other')}")
+        try:
+            return operation(*args, **kwargs)
+        except (SpotifyException, requests.exceptions.RequestException) as e:
+            raise translate_error(e) from e
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Compteurs d'utilisation depuis la création du repository
+        
+        Returns:
+            Appels à l'API (api_calls, api_calls.<méthode>), succès et échecs
+            des caches (cache_hits.<cache>, cache_misses.<cache>) et requêtes
+            partagées entre appelants concurrents (coalesced)
+        """
+        stats = self._stats.snapshot()
+        stats['coalesced'] = self._single_flight.shared_count
+        return stats
+    
     @property
     def _spotify_client(self) -> spotipy.Spotify:
         """Retourne le client Spotify (se connecte si nécessaire)"""
@@ -77,49 +311,95 @@ class SpotifyRepository(ISpotifyRepository):
     
     def get_current_user(self) -> dict:
         """Récupère les informations de l'utilisateur actuel"""
-        return self._spotify_client.current_user()
+        user = self._spotify_client.current_user()
+        self._user_id = user.get('id')
+        return user
     
     def find_artist(self, artist_name: str) -> Optional[Artist]:
         """
         Recherche un artiste sur Spotify
         
+        Les résultats sont mis en cache par clé canonique du nom : les
+        variantes d'un même nom (casse, accents, ponctuation, « The »)
+        ne déclenchent qu'une seule recherche, y compris lorsqu'elles
+        sont demandées en même temps par plusieurs threads.
+        
         Args:
             artist_name: Nom de l'artiste à rechercher
         
         Returns:
             Entité Artist si trouvé, None sinon
+        
+        Raises:
+            SpotifyError: Si la recherche échoue (erreur typée)
         """
         artist_name_clean = artist_name.strip()
+        key = canonical_artist_key(artist_name_clean)
+        artist = self._single_flight.do(('artist', key), lambda: self._resolve_artist(artist_name_clean, key))
+        # Le résultat partagé porte le nom demandé par l'appelant qui a fait la requête
+        if artist is not None and artist.name != artist_name_clean:
+            artist = dataclasses.replace(artist, name=artist_name_clean)
+        return artist
+    
+    def _resolve_artist(self, artist_name_clean: str, key: str) -> Optional[Artist]:
+        """
+        Résout un artiste depuis le cache ou l'API de recherche
+        
+        Un artiste introuvable est mis en cache pendant artist_not_found_ttl
+        secondes seulement : il peut apparaître dans le catalogue plus tard.
+        """
+        now = time.time()
+        cached = self._artist_cache.get(key)
+        if cached is not None and 'not_found_at' in cached:
+            if now - cached['not_found_at'] < self.config.artist_not_found_ttl:
+                self._stats.increment('cache_hits.artists')
+                return None
+        # Une entrée antérieure à l'enregistrement des genres est redemandée
+        elif cached is not None and 'genres' in cached:
+            self._stats.increment('cache_hits.artists')
+            return Artist(
+                name=artist_name_clean,
+                spotify_id=cached['spotify_id'],
+                found_name=cached['found_name'],
+                genres=cached['genres'],
+                popularity=cached['popularity']
+            )
+        
+        self._stats.increment('cache_misses.artists')
+        # Une recherche en erreur lève une exception et n'est donc pas mise en cache
+        artist = self._search_artist(artist_name_clean, key)
+        self._artist_cache.set(key, {
+            'spotify_id': artist.spotify_id,
+            'found_name': artist.found_name,
+            'genres': artist.genres,
+            'popularity': artist.popularity,
+        } if artist else {'not_found_at': now})
+        return artist
+    
+    def _search_artist(self, artist_name_clean: str, key: str) -> Optional[Artist]:
+        """Interroge l'API de recherche"""
         search_queries = [
             f'artist:{artist_name_clean}',
             artist_name_clean,
         ]
         
         for query in search_queries:
-            try:
-                results = self._spotify_client.search(q=query, type='artist', limit=5)
-                
-                if not results['artists']['items']:
-                    continue
-                
-                # Chercher une correspondance exacte
-                for item in results['artists']['items']:
-                    if item['name'].lower() == artist_name_clean.lower():
-                        return Artist(
-                            name=artist_name_clean,
-                            spotify_id=item['id'],
-                            found_name=item['name']
-                        )
-                
-                # Si pas de correspondance exacte, prendre le premier résultat
-                first_item = results['artists']['items'][0]
-                return Artist(
-                    name=artist_name_clean,
-                    spotify_id=first_item['id'],
-                    found_name=first_item['name']
-                )
-            except Exception:
+            results = self._read('search', q=query, type='artist', limit=5)
+            
+            if not results['artists']['items']:
                 continue
+            
+            # Chercher une correspondance exacte (à la clé canonique près),
+            # sinon prendre le premier résultat
+            items = results['artists']['items']
+            item = next((item for item in items if canonical_artist_key(item['name']) == key), items[0])
+            return Artist(
+                name=artist_name_clean,
+                spotify_id=item['id'],
+                found_name=item['name'],
+                genres=item.get('genres') or [],
+                popularity=item.get('popularity')
+            )
         
         return None
     
@@ -133,27 +413,171 @@ class SpotifyRepository(ISpotifyRepository):
         
         Returns:
             Liste des morceaux
+        
+        Raises:
+            SpotifyError: Si la requête échoue (erreur typée)
         """
         if not artist.spotify_id:
             return []
         
-        try:
-            top_tracks = self._spotify_client.artist_top_tracks(artist.spotify_id)
-            
-            if not top_tracks['tracks']:
-                return []
-            
-            tracks = []
-            for track_data in top_tracks['tracks'][:max_tracks]:
-                tracks.append(Track(
-                    uri=track_data['uri'],
-                    name=track_data['name'],
-                    artist=track_data['artists'][0]['name'] if track_data['artists'] else None
-                ))
-            
-            return tracks
-        except Exception:
+        tracks = self._single_flight.do(
+            ('top_tracks', artist.spotify_id, max_tracks),
+            lambda: self._fetch_top_tracks(artist.spotify_id, max_tracks)
+        )
+        return list(tracks)
+    
+    def _fetch_top_tracks(self, artist_id: str, max_tracks: int) -> List[Track]:
+        """Interroge l'API des top tracks d'un artiste"""
+        top_tracks = self._read('artist_top_tracks', artist_id)
+        
+        tracks = []
+        for track_data in top_tracks['tracks'][:max_tracks]:
+            tracks.append(Track(
+                uri=track_data['uri'],
+                name=track_data['name'],
+                artist=track_data['artists'][0]['name'] if track_data['artists'] else None
+            ))
+        
+        return tracks
+    
+    def get_related_artists(self, artist: Artist) -> List[Artist]:
+        """
+        Récupère les artistes similaires à un artiste
+        
+        Les listes d'artistes similaires sont mises en cache par ID
+        d'artiste ; des demandes concurrentes pour un même artiste ne
+        déclenchent qu'une seule requête.
+        
+        Args:
+            artist: Entité Artist
+        
+        Returns:
+            Artistes similaires, dans l'ordre retourné par l'API
+        
+        Raises:
+            SpotifyError: Si la requête échoue (erreur typée)
+        """
+        if not artist.spotify_id:
             return []
+        
+        related = self._single_flight.do(
+            ('related', artist.spotify_id),
+            lambda: self._resolve_related_artists(artist.spotify_id)
+        )
+        return [
+            Artist(
+                name=item['name'], spotify_id=item['id'], found_name=item['name'],
+                genres=item['genres'], popularity=item['popularity']
+            )
+            for item in related
+        ]
+    
+    def _resolve_related_artists(self, artist_id: str) -> List[dict]:
+        """Liste des artistes similaires depuis le cache ou l'API"""
+        cached = self._related_artists_cache.get(artist_id)
+        # Une liste antérieure à l'enregistrement des genres est redemandée
+        if cached is not None and all('genres' in item for item in cached):
+            self._stats.increment('cache_hits.related_artists')
+            return cached
+        
+        self._stats.increment('cache_misses.related_artists')
+        results = self._read('artist_related_artists', artist_id)
+        related = [
+            {
+                'id': item['id'],
+                'name': item['name'],
+                'genres': item.get('genres') or [],
+                'popularity': item.get('popularity'),
+            }
+            for item in results['artists']
+        ]
+        self._related_artists_cache.set(artist_id, related)
+        return related
+    
+    def get_tracks_audio_features(self, tracks: List[Track]) -> Dict[str, TrackFeatures]:
+        """
+        Récupère les caractéristiques audio des morceaux
+        
+        Les morceaux absents du cache sont demandés par lots de
+        AUDIO_FEATURES_BATCH_SIZE ; les réponses (y compris les morceaux
+        sans caractéristiques) sont mises en cache par ID de morceau.
+        
+        Args:
+            tracks: Liste des morceaux
+        
+        Returns:
+            Dictionnaire {ID de morceau: TrackFeatures} des morceaux analysés
+        """
+        track_ids = list(dict.fromkeys(track.spotify_id for track in tracks))
+        missing_ids = [track_id for track_id in track_ids if track_id not in self._audio_features_cache]
+        self._stats.increment('cache_hits.audio_features', len(track_ids) - len(missing_ids))
+        self._stats.increment('cache_misses.audio_features', len(missing_ids))
+        
+        batch_size = self.AUDIO_FEATURES_BATCH_SIZE
+        for i in range(0, len(missing_ids), batch_size):
+            batch = missing_ids[i:i + batch_size]
+            results = self._read('audio_features', batch) or []
+            entries = {track_id: None for track_id in batch}
+            for data in results:
+                if data and data.get('id') in entries:
+                    entries[data['id']] = {
+                        'energy': data['energy'],
+                        'tempo': data['tempo'],
+                        'valence': data.get('valence', 0.0),
+                        'danceability': data.get('danceability', 0.0),
+                    }
+            self._audio_features_cache.set_many(entries)
+        
+        features = {}
+        for track_id in track_ids:
+            data = self._audio_features_cache.get(track_id)
+            if data:
+                features[track_id] = TrackFeatures(track_id=track_id, **data)
+        return features
+    
+    def saved_tracks_contains(self, track_ids: List[str]) -> Dict[str, bool]:
+        """
+        Indique quels morceaux sont enregistrés dans la bibliothèque du compte connecté
+        
+        Les réponses, positives comme négatives, sont mises en cache par
+        compte et par ID de morceau pendant saved_tracks_ttl secondes. Les
+        morceaux absents du cache (ou expirés) sont demandés par lots de
+        SAVED_TRACKS_BATCH_SIZE, envoyés en parallèle (max_workers).
+        
+        Args:
+            track_ids: IDs des morceaux
+        
+        Returns:
+            Dictionnaire {ID de morceau: enregistré ou non}
+        """
+        if self._user_id is None:
+            self._user_id = self._call(self._spotify_client.current_user)['id']
+        now = time.time()
+        track_ids = list(dict.fromkeys(track_ids))
+        saved = {}
+        for track_id in track_ids:
+            entry = self._saved_tracks_cache.get(f'{self._user_id}:{track_id}')
+            if entry is not None and now - entry['at'] < self.config.saved_tracks_ttl:
+                saved[track_id] = entry['saved']
+        missing_ids = [track_id for track_id in track_ids if track_id not in saved]
+        self._stats.increment('cache_hits.saved_tracks', len(saved))
+        self._stats.increment('cache_misses.saved_tracks', len(missing_ids))
+        
+        batch_size = self.SAVED_TRACKS_BATCH_SIZE
+        batches = [missing_ids[i:i + batch_size] for i in range(0, len(missing_ids), batch_size)]
+        if batches:
+            client = self._spotify_client
+            with ThreadPoolExecutor(max_workers=min(self.config.max_workers, len(batches))) as executor:
+                answers = list(executor.map(
+                    lambda batch: self._call(client.current_user_saved_tracks_contains, batch), batches
+                ))
+            entries = {}
+            for batch, flags in zip(batches, answers):
+                for track_id, flag in zip(batch, flags):
+                    saved[track_id] = bool(flag)
+                    entries[f'{self._user_id}:{track_id}'] = {'saved': bool(flag), 'at': now}
+            self._saved_tracks_cache.set_many(entries)
+        return {track_id: saved[track_id] for track_id in track_ids}
     
     def find_playlist_by_name(self, playlist_name: str) -> Optional[str]:
         """
@@ -165,23 +589,57 @@ class SpotifyRepository(ISpotifyRepository):
         Returns:
             ID de la playlist si trouvée, None sinon
         """
-        playlists = []
+        return self.find_playlists_by_name([playlist_name]).get(playlist_name)
+    
+    def find_playlists_by_name(self, playlist_names: List[str]) -> Dict[str, str]:
+        """
+        Cherche plusieurs playlists en un seul parcours des playlists du compte
+        
+        Args:
+            playlist_names: Noms des playlists à chercher
+        
+        Returns:
+            ID de chaque playlist trouvée (première playlist de ce nom), par nom
+        """
+        return {name: playlist.spotify_id for name, playlist in self.find_playlists(playlist_names).items()}
+    
+    def find_playlists(self, playlist_names: List[str]) -> Dict[str, Playlist]:
+        """
+        Cherche plusieurs playlists en un seul parcours des playlists du compte
+        
+        La liste des playlists donne aussi la version (snapshot_id) de
+        chacune : aucune lecture supplémentaire n'est nécessaire pour
+        savoir si leur contenu a changé.
+        
+        Args:
+            playlist_names: Noms des playlists à chercher
+        
+        Returns:
+            Chaque playlist trouvée (première playlist de ce nom), par nom
+        """
+        wanted = set(playlist_names)
+        found: Dict[str, Playlist] = {}
         offset = 0
         limit = 50
         
-        while True:
-            results = self._spotify_client.current_user_playlists(limit=limit, offset=offset)
-            playlists.extend(results['items'])
+        # L'endpoint ne filtre pas les champs : on arrête de paginer dès que toutes les playlists sont trouvées
+        while wanted:
+            results = self._call(self._spotify_client.current_user_playlists, limit=limit, offset=offset)
+            for playlist in results['items']:
+                if playlist['name'] in wanted:
+                    found[playlist['name']] = Playlist(
+                        name=playlist['name'],
+                        description=playlist.get('description') or '',
+                        spotify_id=playlist['id'],
+                        snapshot_id=playlist.get('snapshot_id')
+                    )
+                    wanted.discard(playlist['name'])
             if results['next']:
                 offset += limit
             else:
                 break
         
-        for playlist in playlists:
-            if playlist['name'] == playlist_name:
-                return playlist['id']
-        
-        return None
+        return found
     
     def create_playlist(self, playlist: Playlist) -> str:
         """
@@ -193,9 +651,11 @@ class SpotifyRepository(ISpotifyRepository):
         Returns:
             ID de la playlist créée
         """
-        user_id = self._spotify_client.current_user()['id']
-        created = self._spotify_client.user_playlist_create(
-            user=user_id,
+        if self._user_id is None:
+            self._user_id = self._call(self._spotify_client.current_user)['id']
+        created = self._call(
+            self._spotify_client.user_playlist_create,
+            user=self._user_id,
             name=playlist.name,
             description=playlist.description,
             public=True
@@ -210,40 +670,230 @@ class SpotifyRepository(ISpotifyRepository):
             playlist_id: ID de la playlist
             playlist: Entité Playlist avec les nouvelles données
         """
-        self._spotify_client.playlist_change_details(playlist_id, description=playlist.description)
+        self._call(self._spotify_client.playlist_change_details, playlist_id, description=playlist.description)
     
-    def clear_playlist(self, playlist_id: str) -> None:
+    def get_playlist_track_uris(self, playlist_id: str, snapshot_id: Optional[str] = None) -> List[Optional[str]]:
         """
-        Vide une playlist de tous ses morceaux
+        Lit le contenu d'une playlist
+        
+        Pour une playlist écrite par l'application, un seul appel léger
+        (snapshot_id) suffit tant qu'elle n'a pas changé depuis la dernière
+        écriture : la copie locale est alors utilisée sans lecture paginée.
         
         Args:
-            playlist_id: ID de la playlist à vider
+            playlist_id: ID de la playlist
+            snapshot_id: Version actuelle de la playlist si l'appelant vient
+                de la lire (aucun appel supplémentaire pour la comparer)
+        
+        Returns:
+            URIs des morceaux dans l'ordre de la playlist (None pour un
+            élément indisponible, afin que les positions restent exactes)
         """
-        tracks = []
+        mirrored = self._mirror.load(playlist_id)
+        if mirrored is not None:
+            if snapshot_id is None:
+                snapshot_id = self.get_playlist_snapshot_id(playlist_id)
+            if snapshot_id == mirrored.snapshot_id:
+                self._stats.increment('cache_hits.playlist_mirror')
+                self._contents[playlist_id] = mirrored.uris
+                return list(mirrored.uris)
+            self._stats.increment('cache_misses.playlist_mirror')
+        
+        uris = self._read_playlist_track_uris(playlist_id)
+        self._contents[playlist_id] = uris
+        return list(uris)
+    
+    def get_playlist_snapshot_id(self, playlist_id: str) -> Optional[str]:
+        """
+        Version actuelle d'une playlist (un appel léger, sans ses morceaux)
+        
+        Args:
+            playlist_id: ID de la playlist
+        
+        Returns:
+            snapshot_id de la playlist, None s'il est absent de la réponse
+        """
+        details = self._call(self._spotify_client.playlist, playlist_id, fields='snapshot_id')
+        return self._snapshot_of(details)
+    
+    def _read_playlist_track_uris(self, playlist_id: str) -> List[Optional[str]]:
+        """Lecture paginée du contenu d'une playlist"""
+        uris: List[Optional[str]] = []
         offset = 0
         limit = 100
         
         while True:
-            results = self._spotify_client.playlist_items(playlist_id, limit=limit, offset=offset)
+            results = self._call(
+                self._spotify_client.playlist_items,
+                playlist_id,
+                fields=self.PLAYLIST_ITEMS_FIELDS,
+                limit=limit,
+                offset=offset,
+                additional_types=('track',)
+            )
             items = results['items']
             if not items:
                 break
             
-            track_uris = [item['track']['uri'] for item in items if item['track']]
-            if track_uris:
-                tracks.extend(track_uris)
+            uris.extend(item['track']['uri'] if item['track'] else None for item in items)
             
             if results['next']:
                 offset += limit
             else:
                 break
         
+        return uris
+    
+    def clear_playlist(self, playlist_id: str) -> None:
+        """
+        Vide une playlist de tous ses morceaux
+        
+        Args:
+            playlist_id: ID de la playlist à vider
+        """
+        tracks = [uri for uri in self.get_playlist_track_uris(playlist_id) if uri]
+        
         if tracks:
             batch_size = 100
             for i in range(0, len(tracks), batch_size):
                 batch = tracks[i:i + batch_size]
-                self._spotify_client.playlist_remove_all_occurrences_of_items(playlist_id, batch)
-            print(f"  ✓  {len(tracks)} morceau(x) supprimé(s) de la playlist existante")
+                self._call(self._spotify_client.playlist_remove_all_occurrences_of_items, playlist_id, batch)
+            self._forget_contents(playlist_id)
+            self.progress.info(f"  ✓  {len(tracks)} morceau(x) supprimé(s) de la playlist existante")
+    
+    def apply_playlist_diff(self, playlist_id: str, diff: PlaylistDiff) -> None:
+        """
+        Applique une différence calculée sur le contenu actuel de la playlist
+        
+        Les suppressions sont envoyées par lots en partant de la fin de la
+        playlist (les positions des lots suivants restent ainsi valables),
+        puis les insertions dans l'ordre croissant des positions.
+        
+        Args:
+            playlist_id: ID de la playlist
+            diff: Différence (voir domain.playlist_diff)
+        """
+        removals = sorted(diff.removals, reverse=True)
+        for i in range(0, len(removals), diff.batch_size):
+            batch = removals[i:i + diff.batch_size]
+            self._record_snapshot(playlist_id, self._snapshot_of(self._call(
+                self._spotify_client.playlist_remove_specific_occurrences_of_items,
+                playlist_id,
+                [{'uri': uri, 'positions': [position]} for position, uri in batch]
+            )))
+        
+        for position, uris in diff.insertions:
+            self._record_snapshot(playlist_id, self._insert_batch(playlist_id, uris, position))
+        
+        if not diff.is_empty:
+            # Contenu écrit : le dernier contenu lu, transformé par la différence
+            current = self._contents.get(playlist_id)
+            if current is not None:
+                self._save_contents(playlist_id, compute_applied_diff(current, diff))
+            else:
+                self._forget_contents(playlist_id)
+            added = sum(len(uris) for _, uris in diff.insertions)
+            self.progress.info(f"  ✓  {len(removals)} morceau(x) retiré(s), {added} ajouté(s)")
+    
+    def replace_playlist_tracks(self, playlist_id: str, track_uris: List[str]) -> None:
+        """
+        Remplace tout le contenu d'une playlist
+        
+        Le premier lot remplace le contenu, les suivants sont ajoutés en fin
+        de playlist, un par un et dans l'ordre. Avec SPOTIFY_WRITE_WORKERS
+        supérieur à 1, ils sont insérés en parallèle à leur position (voir
+        infrastructure.ordered_writer) ; les lots refusés pour conflit de
+        position sont renvoyés, puis écrits un par un. Si une écriture
+        échoue autrement, le contenu réellement écrit est relu et seule la
+        différence restante est écrite : l'ordre final est toujours celui
+        de track_uris.
+        
+        Args:
+            playlist_id: ID de la playlist
+            track_uris: URIs des morceaux, dans l'ordre
+        """
+        try:
+            if self._writer.max_workers > 1:
+                self._write_at_positions(playlist_id, track_uris)
+            else:
+                self._write_in_order(playlist_id, track_uris)
+        except SpotifyError as e:
+            self.progress.warning(f"  ⚠️  Écriture interrompue ({e}), relecture de la playlist")
+            self._complete_sequentially(playlist_id, track_uris)
+        self._save_contents(playlist_id, list(track_uris))
+        self.progress.info(f"  ✓  Contenu de la playlist remplacé ({len(track_uris)} morceau(x))")
+    
+    def _write_in_order(self, playlist_id: str, track_uris: List[str]) -> None:
+        """Remplace le contenu par le premier lot puis ajoute les suivants en fin de playlist"""
+        batch_size = self.WRITE_BATCH_SIZE
+        self._record_snapshot(playlist_id, self._snapshot_of(
+            self._call(self._spotify_client.playlist_replace_items, playlist_id, track_uris[:batch_size])
+        ))
+        for i in range(batch_size, len(track_uris), batch_size):
+            self._record_snapshot(playlist_id, self._snapshot_of(
+                self._call(self._spotify_client.playlist_add_items, playlist_id, track_uris[i:i + batch_size])
+            ))
+    
+    def _write_at_positions(self, playlist_id: str, track_uris: List[str]) -> None:
+        """Remplace le contenu par le premier lot puis insère les suivants en parallèle à leur position"""
+        batch_size = self.WRITE_BATCH_SIZE
+        self._record_snapshot(playlist_id, self._snapshot_of(
+            self._call(self._spotify_client.playlist_replace_items, playlist_id, track_uris[:batch_size])
+        ))
+        result = self._writer.write(
+            lambda batch, position: self._insert_batch(playlist_id, batch, position),
+            track_uris[batch_size:],
+            start=batch_size
+        )
+        self._stats.increment('write_conflicts', result.conflicts)
+        if not result.complete:
+            raise result.errors[0]
+        self._record_snapshot(playlist_id, result.snapshot_id)
+    
+    def _insert_batch(self, playlist_id: str, uris: List[str], position: int) -> Optional[str]:
+        """Insère un lot à une position et retourne la version (snapshot_id) de la playlist"""
+        response = self._call(self._spotify_client.playlist_add_items, playlist_id, uris, position=position)
+        return self._snapshot_of(response)
+    
+    @staticmethod
+    def _snapshot_of(response: Optional[dict]) -> Optional[str]:
+        """snapshot_id retourné par une écriture (None si absent)"""
+        snapshot_id = (response or {}).get('snapshot_id')
+        return snapshot_id if isinstance(snapshot_id, str) else None
+    
+    def _record_snapshot(self, playlist_id: str, snapshot_id: Optional[str]) -> None:
+        """Mémorise la version d'une playlist après une écriture séquentielle"""
+        if snapshot_id is not None:
+            self._snapshot_ids[playlist_id] = snapshot_id
+    
+    def _save_contents(self, playlist_id: str, uris: List[Optional[str]]) -> None:
+        """
+        Enregistre le contenu écrit avec la version retournée par la dernière écriture
+        
+        Sans version connue, la copie locale est supprimée : une version
+        plus ancienne que le contenu ne peut pas être enregistrée avec lui.
+        """
+        snapshot_id = self._snapshot_ids.get(playlist_id)
+        if snapshot_id is None:
+            self._forget_contents(playlist_id)
+            return
+        self._contents[playlist_id] = uris
+        self._mirror.save(playlist_id, snapshot_id, uris)
+    
+    def _forget_contents(self, playlist_id: str) -> None:
+        """Oublie le contenu d'une playlist modifiée sans qu'il soit connu"""
+        self._contents.pop(playlist_id, None)
+        self._mirror.discard(playlist_id)
+    
+    def _complete_sequentially(self, playlist_id: str, track_uris: List[str]) -> None:
+        """Relit la playlist après une écriture interrompue et écrit la différence restante, lot par lot"""
+        self._snapshot_ids.pop(playlist_id, None)
+        self._forget_contents(playlist_id)
+        diff = compute_playlist_diff(self.get_playlist_track_uris(playlist_id), track_uris, self.WRITE_BATCH_SIZE)
+        if not diff.prefer_replace:
+            self.apply_playlist_diff(playlist_id, diff)
+            return
+        self._write_in_order(playlist_id, track_uris)
     
     def add_tracks_to_playlist(self, playlist_id: str, tracks: List[Track]) -> None:
         """
@@ -257,6 +907,26 @@ class SpotifyRepository(ISpotifyRepository):
         batch_size = 100
         for i in range(0, len(track_uris), batch_size):
             batch = track_uris[i:i + batch_size]
-            self._spotify_client.playlist_add_items(playlist_id, batch)
-            print(f"  ✓  Ajouté {len(batch)} morceau(x) à la playlist")
+            self._call(self._spotify_client.playlist_add_items, playlist_id, batch)
+            self._forget_contents(playlist_id)
+            self.progress.debug(f"  ✓  Ajouté {len(batch)} morceau(x) à la playlist")
+        self.progress.info(f"  ✓  {len(track_uris)} morceau(x) ajouté(s) à la playlist")
+
 
+def create_catalog_repository(
+    config: SpotifyConfig,
+    client_factory: Optional[Callable[[SpotifyConfig], spotipy.Spotify]] = None
+) -> SpotifyRepository:
+    """
+    Crée un repository connecté en lecture seule au catalogue
+    
+    Destiné aux processus de résolution (voir application.sharding), à
+    transmettre sous la forme functools.partial(create_catalog_repository, config).
+    
+    Args:
+        config: Configuration Spotify
+        client_factory: Fonction de niveau module créant le client (faux serveur des benchmarks)
+    """
+    repository = SpotifyRepository(config)
+    repository.connect_catalog(client_factory(config) if client_factory else None)
+    return repository
@@ -0,0 +1,25 @@
+"""
+Compteurs d'utilisation de l'API (appels, cache) partagés entre threads
+"""
+import threading
+from collections import Counter
+from typing import Dict
+
+
+class StatsCounter:
+    """Compteurs nommés incrémentés depuis plusieurs threads"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+    
+    def increment(self, key: str, count: int = 1) -> None:
+        """Ajoute count au compteur key"""
+        if count:
+            with self._lock:
+                self._counts[key] += count
+    
+    def snapshot(self) -> Dict[str, int]:
+        """Copie des compteurs à l'instant présent"""
+        with self._lock:
+            return dict(self._counts)
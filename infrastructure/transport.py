@@ -0,0 +1,77 @@
+"""
+Transport HTTP partagé pour les appels à l'API Spotify
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from infrastructure.cassette import Cassette, CassetteAdapter
+from infrastructure.config import SpotifyConfig
+
+# Codes HTTP relancés automatiquement par l'adaptateur. Le 429 n'en fait
+# pas partie : le repository le reçoit avec son en-tête Retry-After et
+# peut confier l'appel à une autre application au lieu d'attendre.
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+# Méthodes relancées sur erreur serveur (sans effet si la requête a déjà été appliquée)
+IDEMPOTENT_METHODS = frozenset(['GET'])
+# Hôtes joints par la session (API et authentification) : un pool chacun
+POOL_HOSTS = 2
+
+
+def build_session(config: SpotifyConfig) -> requests.Session:
+    """
+    Crée la session HTTP partagée par le client Spotify et l'authentification
+    
+    Le pool de connexions est dimensionné sur le nombre de workers pour
+    que chaque thread réutilise une connexion déjà ouverte (pas de
+    nouvelle poignée de main TLS) ; lorsqu'il est plein, les threads
+    attendent une connexion libre plutôt que d'en ouvrir une jetable.
+    L'API et le serveur d'authentification ont chacun leur pool : un
+    renouvellement de jeton ne ferme pas les connexions à l'API.
+    
+    Seules les lectures sont relancées sur erreur serveur : une écriture
+    peut avoir été appliquée avant l'erreur, la rejouer la doublerait.
+    Relances épuisées, la dernière réponse est retournée telle quelle
+    (statut et en-têtes réels) plutôt qu'une erreur « Max Retries ».
+    
+    Avec une cassette configurée (SPOTIFY_CASSETTE), les échanges sont
+    enregistrés au passage, ou rejoués sans réseau.
+    
+    Args:
+        config: Configuration Spotify
+    
+    Returns:
+        Session requests configurée
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=config.max_retries,
+        connect=None,
+        read=False,
+        allowed_methods=IDEMPOTENT_METHODS,
+        status=config.max_retries,
+        backoff_factor=config.backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        # Sans quoi urllib3 relance tout 429 accompagné de Retry-After
+        respect_retry_after_header=False,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=POOL_HOSTS,
+        pool_maxsize=config.pool_size,
+        max_retries=retry,
+        pool_block=True
+    )
+    if config.cassette_path:
+        adapter = CassetteAdapter(
+            Cassette(config.cassette_path),
+            config.cassette_mode,
+            inner=adapter,
+            latency_scale=config.cassette_latency_scale
+        )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    # Réponses JSON compressées (5 à 10 fois plus petites)
+    session.headers['Accept-Encoding'] = 'gzip'
+    if not config.keep_alive:
+        session.headers['Connection'] = 'close'
+    return session
@@ -1,15 +1,104 @@
 """
 Point d'entrée de l'application
 """
+import argparse
+import functools
+import sys
+from typing import List, Optional
 import spotipy.exceptions
 from infrastructure.config import SpotifyConfig
-from infrastructure.spotify_repository import SpotifyRepository
+from infrastructure.spotify_repository import SpotifyRepository, create_catalog_repository
 from infrastructure.file_loader import ArtistFileRepository
+from infrastructure.membership_store import JsonMembershipIndexRepository
+from infrastructure.profiling import PhaseProfiler
+from infrastructure.progress import create_progress_reporter
+from application.expansion import RelatedArtistExpander
+from application.filters import ArtistFilter, PlaylistExclusionFilter, SavedTracksFilter, TrackFilter
+from application.sharding import ShardedArtistResolver
 from application.use_cases import CreatePlaylistFromArtistsUseCase
+from domain.progress import IProgressReporter
+from domain.repositories import ISpotifyRepository
 
 
-def main():
-    """Fonction principale"""
+def create_artist_filter(config: SpotifyConfig) -> Optional[ArtistFilter]:
+    """Critères de sélection des artistes (genres, popularité), None s'il n'y en a aucun"""
+    if not (config.include_genres or config.exclude_genres or config.min_popularity is not None):
+        return None
+    return ArtistFilter(
+        include_genres=config.include_genres,
+        exclude_genres=config.exclude_genres,
+        min_popularity=config.min_popularity
+    )
+
+
+def create_artist_resolver(config: SpotifyConfig) -> Optional[ShardedArtistResolver]:
+    """Résolveur multi-processus si SPOTIFY_PROCESSES > 1, None sinon"""
+    if config.processes <= 1:
+        return None
+    return ShardedArtistResolver(
+        functools.partial(create_catalog_repository, config),
+        processes=config.processes,
+        shard_size=config.shard_size,
+        threads=config.max_workers,
+        artist_filter=create_artist_filter(config)
+    )
+
+
+def create_track_filters(
+    config: SpotifyConfig,
+    spotify_repo: ISpotifyRepository,
+    progress: IProgressReporter
+) -> List[TrackFilter]:
+    """Étapes de filtrage configurées (SPOTIFY_EXCLUDE_PLAYLISTS, SPOTIFY_EXCLUDE_SAVED)"""
+    filters: List[TrackFilter] = []
+    if config.exclude_playlists:
+        filters.append(PlaylistExclusionFilter(
+            spotify_repo,
+            JsonMembershipIndexRepository(config.exclusion_index_dir),
+            config.exclude_playlists,
+            progress=progress
+        ))
+    if config.exclude_saved:
+        filters.append(SavedTracksFilter(spotify_repo))
+    return filters
+
+
+def create_artist_expander(
+    config: SpotifyConfig,
+    spotify_repo: ISpotifyRepository,
+    progress: IProgressReporter
+) -> Optional[RelatedArtistExpander]:
+    """Extension aux artistes similaires si SPOTIFY_RELATED_DEPTH > 0, None sinon"""
+    if config.related_depth <= 0:
+        return None
+    return RelatedArtistExpander(
+        spotify_repo,
+        depth=config.related_depth,
+        fan_out=config.related_fan_out,
+        max_artists=config.related_max_artists,
+        max_workers=config.max_workers,
+        progress=progress
+    )
+
+
+def parse_arguments(argv: List[str]) -> argparse.Namespace:
+    """Options de la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Création de playlist Hellfest 2026 sur Spotify")
+    parser.add_argument(
+        '--profile', nargs='?', const='profiles', default=None, metavar='DIR',
+        help="Profiler chaque phase (CPU et allocations) et écrire les profils dans DIR (défaut : profiles)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Fonction principale
+    
+    Args:
+        argv: Arguments de la ligne de commande (aucun par défaut)
+    """
+    arguments = parse_arguments(argv or [])
     print("=" * 60)
     print("🎸 Création de playlist Hellfest 2026 sur Spotify 🎸")
     print("=" * 60)
@@ -31,7 +120,8 @@ def main():
     print("\n🔐 Connexion à Spotify...")
     try:
         print("   ⏳ Initialisation de l'authentification...")
-        spotify_repo = SpotifyRepository(config)
+        progress = create_progress_reporter(config.progress_mode, config.log_level)
+        spotify_repo = SpotifyRepository(config, progress=progress)
         spotify_repo.connect()
         print("   ⏳ Vérification de l'authentification...")
         user = spotify_repo.get_current_user()
@@ -57,13 +147,31 @@ def main():
     
     # Créer la playlist
     artist_file_repo = ArtistFileRepository()
-    use_case = CreatePlaylistFromArtistsUseCase(spotify_repo, artist_file_repo)
-    use_case.execute(
-        playlist_name="Hellfest 2026 - Tous les groupes",
-        max_tracks_per_artist=10
+    resolver = create_artist_resolver(config)
+    profiler = PhaseProfiler(arguments.profile) if arguments.profile else None
+    use_case = CreatePlaylistFromArtistsUseCase(
+        spotify_repo, artist_file_repo, progress=progress, resolver=resolver,
+        dry_run=config.dry_run, max_changes=config.max_changes,
+        track_filters=create_track_filters(config, spotify_repo, progress),
+        expander=create_artist_expander(config, spotify_repo, progress),
+        artist_filter=create_artist_filter(config),
+        profiler=profiler
     )
+    try:
+        use_case.run(
+            playlist_name="Hellfest 2026 - Tous les groupes",
+            max_tracks_per_artist=10,
+            max_workers=config.max_workers,
+            report_path=config.report_path
+        )
+    finally:
+        if resolver is not None:
+            resolver.close()
+        if profiler is not None:
+            summary = profiler.close()
+            print(f"\n🔬 Profils des phases écrits dans {arguments.profile} (résumé : {summary})")
 
 
 if __name__ == '__main__':  # pragma: no cover
-    main()
+    main(sys.argv[1:])
 
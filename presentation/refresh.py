@@ -0,0 +1,72 @@
+"""
+Rafraîchissement incrémental de la playlist, pour une exécution planifiée
+
+Seuls les artistes nouveaux ou dont les morceaux sont plus anciens que
+SPOTIFY_REFRESH_MAX_AGE sont interrogés, et seule la différence avec le
+contenu actuel de la playlist est écrite. L'état du dernier passage est
+conservé dans le répertoire de cache (sous-répertoire refresh).
+
+Usage :
+    python -m presentation.refresh
+"""
+from application.use_cases import RefreshPlaylistUseCase
+from infrastructure.config import SpotifyConfig
+from infrastructure.file_loader import ArtistFileRepository
+from infrastructure.progress import create_progress_reporter
+from infrastructure.refresh_state import JsonRefreshStateRepository
+from infrastructure.spotify_repository import SpotifyRepository
+from presentation.main import (
+    create_artist_expander,
+    create_artist_filter,
+    create_artist_resolver,
+    create_track_filters
+)
+
+
+PLAYLIST_NAME = "Hellfest 2026 - Tous les groupes"
+
+
+def main():
+    """Rafraîchit la playlist sans interaction"""
+    config = SpotifyConfig()
+    if not config.is_valid():
+        print("\n❌ Erreur: CLIENT_ID et CLIENT_SECRET doivent être définis dans le fichier .env")
+        return
+    
+    progress = create_progress_reporter(config.progress_mode, config.log_level)
+    spotify_repo = SpotifyRepository(config, progress=progress)
+    spotify_repo.connect()
+    # Identifiant du compte résolu une fois, avant les travaux parallèles qui en ont besoin
+    user = spotify_repo.get_current_user()
+    progress.info(f"✓  Connecté en tant que: {user['display_name']}")
+    
+    # Mêmes résolveur, critères et extension qu'une exécution complète
+    resolver = create_artist_resolver(config)
+    use_case = RefreshPlaylistUseCase(
+        spotify_repo,
+        ArtistFileRepository(),
+        JsonRefreshStateRepository(config.refresh_state_dir),
+        max_age=config.refresh_max_age,
+        progress=progress,
+        resolver=resolver,
+        dry_run=config.dry_run,
+        max_changes=config.max_changes,
+        track_filters=create_track_filters(config, spotify_repo, progress),
+        expander=create_artist_expander(config, spotify_repo, progress),
+        artist_filter=create_artist_filter(config)
+    )
+    try:
+        use_case.run(
+            playlist_name=PLAYLIST_NAME,
+            max_tracks_per_artist=10,
+            require_confirmation=False,
+            max_workers=config.max_workers,
+            report_path=config.report_path
+        )
+    finally:
+        if resolver is not None:
+            resolver.close()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
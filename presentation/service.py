@@ -0,0 +1,346 @@
+"""
+Mode service : API HTTP locale de création de playlists
+
+Le service s'authentifie une seule fois puis garde en mémoire le client
+Spotify, son pool de connexions et les caches d'artistes et de
+caractéristiques audio : les travaux successifs profitent des caches
+chauds au lieu de repartir de zéro à chaque exécution.
+
+Endpoints :
+    POST /jobs          Soumet un travail (JSON : playlist_name, artists_file
+                        ou artists, max_tracks_per_artist, order_by_features)
+                        avec l'en-tête Content-Type: application/json
+    GET  /jobs          Liste les travaux connus
+    GET  /jobs/<id>     État d'un travail et son rapport d'exécution
+    GET  /health        État du service et nombre de travaux par état
+
+Le service n'a pas d'authentification : une soumission sans
+Content-Type: application/json est refusée, ce qu'une page web ne peut
+pas envoyer à un autre site sans l'accord du serveur (requête
+préliminaire CORS, jamais acceptée ici). Les fichiers d'artistes sont
+limités à un répertoire et doivent exister.
+
+Usage :
+    python -m presentation.service
+"""
+import functools
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from application.expansion import RelatedArtistExpander
+from application.filters import ArtistFilter, TrackFilter
+from application.jobs import JobQueue, PlaylistJob, QueueFullError
+from application.report import RunReport
+from application.use_cases import CreatePlaylistFromArtistsUseCase
+from domain.progress import IProgressReporter
+from domain.repositories import ISpotifyRepository
+from infrastructure.config import SpotifyConfig
+from infrastructure.file_loader import ArtistFileRepository, InlineArtistRepository
+from infrastructure.progress import create_progress_reporter
+from infrastructure.spotify_repository import SpotifyRepository
+from presentation.main import create_artist_expander, create_artist_filter, create_track_filters
+
+
+# Taille maximale du corps d'une requête (liste d'artistes incluse)
+MAX_BODY_SIZE = 10 * 1024 * 1024
+
+
+class RequestTooLargeError(ValueError):
+    """Corps de requête au-delà de MAX_BODY_SIZE (HTTP 413)"""
+
+
+class PlaylistJobRunner:
+    """Exécute un travail avec le repository Spotify partagé (caches chauds)"""
+    
+    def __init__(
+        self,
+        spotify_repo: ISpotifyRepository,
+        progress: IProgressReporter,
+        max_workers: int = 1,
+        track_filters: Optional[List[TrackFilter]] = None,
+        expander: Optional[RelatedArtistExpander] = None,
+        artist_filter: Optional[ArtistFilter] = None,
+        progress_factory: Optional[Callable[[], IProgressReporter]] = None
+    ):
+        """
+        Args:
+            spotify_repo: Repository Spotify partagé entre tous les travaux
+            progress: Suivi de progression (utilisé par chaque travail sans progress_factory)
+            max_workers: Recherches d'artistes menées en parallèle par travail
+            track_filters: Étapes de filtrage partagées (index chargés une seule fois)
+            expander: Extension aux artistes similaires (optionnelle)
+            artist_filter: Critères de genre et de popularité (optionnels)
+            progress_factory: Crée le suivi de progression propre à chaque
+                travail (les tâches de travaux simultanés ne se mélangent pas)
+        """
+        self.spotify_repo = spotify_repo
+        self.progress = progress
+        self.progress_factory = progress_factory
+        self.max_workers = max_workers
+        self.track_filters = track_filters or []
+        self.expander = expander
+        self.artist_filter = artist_filter
+        self.file_repo = ArtistFileRepository()
+    
+    def __call__(self, job: PlaylistJob) -> RunReport:
+        if job.artists is None and not (job.artists_file and os.path.isfile(job.artists_file)):
+            # Jamais de fichier d'exemple en mode service : il écraserait la playlist
+            raise FileNotFoundError(f"Fichier d'artistes introuvable: {job.artists_file}")
+        artist_repo = InlineArtistRepository(job.artists) if job.artists is not None else self.file_repo
+        progress = self.progress_factory() if self.progress_factory is not None else self.progress
+        use_case = CreatePlaylistFromArtistsUseCase(
+            self.spotify_repo, artist_repo, progress=progress,
+            track_filters=self.track_filters, expander=self.expander, artist_filter=self.artist_filter
+        )
+        progress.info(f"▶️  Travail {job.job_id}: {job.playlist_name}")
+        return use_case.run(
+            playlist_name=job.playlist_name,
+            artists_file=job.artists_file,
+            max_tracks_per_artist=job.max_tracks_per_artist,
+            require_confirmation=False,
+            order_by_features=job.order_by_features,
+            max_workers=self.max_workers
+        )
+
+
+def resolve_artists_file(path: str, artists_dir: str) -> str:
+    """
+    Chemin d'un fichier d'artistes existant dans artists_dir
+    
+    Args:
+        path: Chemin demandé, relatif à artists_dir
+        artists_dir: Seul répertoire autorisé
+    
+    Returns:
+        Chemin réel du fichier
+    
+    Raises:
+        ValueError: Si le fichier est hors du répertoire ou n'existe pas
+    """
+    root = os.path.realpath(artists_dir)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f"artists_file doit se trouver dans {artists_dir}")
+    if not os.path.isfile(resolved):
+        raise ValueError(f"Fichier d'artistes introuvable: {path}")
+    return resolved
+
+
+def parse_job_request(body: Any, artists_dir: str = '.') -> Dict[str, Any]:
+    """
+    Valide le corps JSON d'une demande de travail
+    
+    Args:
+        body: Corps JSON décodé
+        artists_dir: Répertoire des fichiers d'artistes autorisés
+    
+    Returns:
+        Arguments de JobQueue.submit
+    
+    Raises:
+        ValueError: Si la demande est invalide
+    """
+    if not isinstance(body, dict):
+        raise ValueError("Le corps de la requête doit être un objet JSON")
+    playlist_name = body.get('playlist_name')
+    if not isinstance(playlist_name, str) or not playlist_name.strip():
+        raise ValueError("playlist_name est obligatoire")
+    
+    artists_file = body.get('artists_file')
+    artists = body.get('artists')
+    if (artists_file is None) == (artists is None):
+        raise ValueError("Indiquez soit artists_file, soit artists")
+    if artists_file is not None and not isinstance(artists_file, str):
+        raise ValueError("artists_file doit être un chemin")
+    if artists is not None and not (isinstance(artists, list) and all(isinstance(a, str) for a in artists)):
+        raise ValueError("artists doit être une liste de noms")
+    if artists_file is not None:
+        artists_file = resolve_artists_file(artists_file, artists_dir)
+    
+    max_tracks = body.get('max_tracks_per_artist', 10)
+    if not isinstance(max_tracks, int) or isinstance(max_tracks, bool) or not 1 <= max_tracks <= 10:
+        raise ValueError("max_tracks_per_artist doit être compris entre 1 et 10")
+    
+    return {
+        'playlist_name': playlist_name.strip(),
+        'artists_file': artists_file,
+        'artists': artists,
+        'max_tracks_per_artist': max_tracks,
+        'order_by_features': bool(body.get('order_by_features', False)),
+    }
+
+
+class PlaylistServiceHandler(BaseHTTPRequestHandler):
+    """Gestionnaire HTTP de l'API des travaux"""
+    
+    protocol_version = 'HTTP/1.1'
+    server_version = 'SimplyPlaylist'
+    
+    def log_message(self, format, *args):
+        self.server.progress.debug(f"{self.address_string()} {format % args}")
+    
+    def do_GET(self):
+        queue: JobQueue = self.server.queue
+        parts = self.path.split('?')[0].strip('/').split('/')
+        if parts == ['health']:
+            self._send(200, {'status': 'ok', 'jobs': queue.counts()})
+        elif parts == ['jobs']:
+            self._send(200, {'jobs': [job.to_dict() for job in queue.jobs()]})
+        elif len(parts) == 2 and parts[0] == 'jobs':
+            job = queue.get(parts[1])
+            if job is None:
+                self._send(404, {'error': 'Travail inconnu'})
+            else:
+                self._send(200, job.to_dict(include_report=True))
+        else:
+            self._send(404, {'error': 'Ressource inconnue'})
+    
+    def do_POST(self):
+        if self.path.split('?')[0].strip('/') != 'jobs':
+            self._send(404, {'error': 'Ressource inconnue'})
+            return
+        content_type = (self.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+        if content_type != 'application/json':
+            # Protection contre les soumissions venues d'une page web (CSRF)
+            self._send(415, {'error': 'Content-Type: application/json requis'})
+            return
+        try:
+            options = parse_job_request(self._read_json(), self.server.artists_dir)
+            job = self.server.queue.submit(**options)
+        except RequestTooLargeError as e:
+            self._send(413, {'error': str(e)})
+            return
+        except ValueError as e:
+            self._send(400, {'error': str(e)})
+            return
+        except QueueFullError as e:
+            self._send(429, {'error': str(e)})
+            return
+        self._send(202, job.to_dict(), {'Location': f'/jobs/{job.job_id}'})
+    
+    def _read_json(self) -> Any:
+        """
+        Lit et décode le corps JSON de la requête
+        
+        Raises:
+            RequestTooLargeError: Content-Length au-delà de MAX_BODY_SIZE
+            ValueError: Content-Length invalide ou corps JSON invalide
+        """
+        header = (self.headers.get('Content-Length') or '0').strip()
+        if not (header.isascii() and header.isdigit()):
+            # Corps de taille inconnue : la connexion ne peut pas être réutilisée
+            self.close_connection = True
+            raise ValueError("En-tête Content-Length invalide")
+        length = int(header)
+        if length > MAX_BODY_SIZE:
+            # Corps non lu : la connexion ne peut pas être réutilisée
+            self.close_connection = True
+            raise RequestTooLargeError("Requête trop volumineuse")
+        try:
+            return json.loads(self.rfile.read(length) or b'null')
+        except ValueError:
+            raise ValueError("Corps JSON invalide")
+    
+    def _send(self, status: int, body: dict, headers: Optional[Dict[str, str]] = None) -> None:
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class PlaylistService:
+    """
+    Serveur HTTP et file de travaux, utilisable comme context manager
+    
+    Usage :
+        with PlaylistService(queue, progress, ('127.0.0.1', 8890)) as service:
+            service.serve_forever()
+    """
+    
+    def __init__(
+        self,
+        queue: JobQueue,
+        progress: IProgressReporter,
+        address: Tuple[str, int],
+        artists_dir: str = '.'
+    ):
+        """
+        Args:
+            queue: File de travaux (démarrée et arrêtée avec le service)
+            progress: Suivi de progression
+            address: Adresse d'écoute (hôte, port ; port 0 pour un port libre)
+            artists_dir: Seul répertoire d'où lire les fichiers d'artistes
+        """
+        self.queue = queue
+        self.progress = progress
+        self.address = address
+        self.artists_dir = artists_dir
+        self._server: Optional[ThreadingHTTPServer] = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+    
+    def __enter__(self) -> 'PlaylistService':
+        self._server = ThreadingHTTPServer(self.address, PlaylistServiceHandler)
+        self._server.daemon_threads = True
+        self._server.queue = self.queue
+        self._server.progress = self.progress
+        self._server.artists_dir = self.artists_dir
+        self.queue.start()
+        return self
+    
+    def serve_forever(self) -> None:
+        """Traite les requêtes jusqu'à l'arrêt du serveur"""
+        self._server.serve_forever()
+    
+    def shutdown(self) -> None:
+        """Arrête le traitement des requêtes (depuis un autre thread)"""
+        self._server.shutdown()
+    
+    def __exit__(self, *exc_info) -> None:
+        self._server.server_close()
+        self.queue.shutdown()
+
+
+def main():
+    """Démarre le service après une authentification unique"""
+    config = SpotifyConfig()
+    if not config.is_valid():
+        print("\n❌ Erreur: CLIENT_ID et CLIENT_SECRET doivent être définis dans le fichier .env")
+        return
+    
+    progress = create_progress_reporter(config.progress_mode, config.log_level)
+    spotify_repo = SpotifyRepository(config, progress=progress)
+    spotify_repo.connect()
+    user = spotify_repo.get_current_user()
+    progress.info(f"✓  Connecté en tant que: {user['display_name']}")
+    
+    queue = JobQueue(
+        PlaylistJobRunner(
+            spotify_repo, progress, config.max_workers,
+            track_filters=create_track_filters(config, spotify_repo, progress),
+            expander=create_artist_expander(config, spotify_repo, progress),
+            artist_filter=create_artist_filter(config),
+            progress_factory=functools.partial(create_progress_reporter, config.progress_mode, config.log_level)
+        ),
+        max_concurrent=config.service_workers,
+        max_pending=config.service_queue_size
+    )
+    address = (config.service_host, config.service_port)
+    with PlaylistService(queue, progress, address, config.service_artists_dir) as service:
+        progress.info(f"🎧 Service à l'écoute sur {service.url}")
+        try:
+            service.serve_forever()
+        except KeyboardInterrupt:
+            progress.info("\n⏹️  Arrêt du service")
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main()
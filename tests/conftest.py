@@ -0,0 +1,10 @@
+"""
+Configuration commune des tests
+"""
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_data_cache(tmp_path, monkeypatch):
+    """Redirige les caches persistants vers un répertoire temporaire"""
+    monkeypatch.setenv('SPOTIFY_DATA_CACHE_DIR', str(tmp_path / 'cache'))
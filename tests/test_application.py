@@ -1,10 +1,68 @@
 """
 Tests pour la couche application (use cases)
 """
+import json
+import logging
+import threading
+import time
 import pytest
-from unittest.mock import Mock, patch
-from domain.entities import Artist, Track, Playlist
-from application.use_cases import SearchArtistTracksUseCase, CreatePlaylistFromArtistsUseCase
+from unittest.mock import Mock, call, patch
+from domain.entities import Artist, ArtistSearchResult, Track, TrackFeatures, Playlist, SearchStatus
+from domain.errors import AuthError, NotFoundError, RateLimitedError, SpotifyError, TransientError
+from domain.membership import BloomFilter, playlist_set_key
+from domain.profiling import IPhaseObserver
+from domain.progress import NullProgressReporter
+from application.ordering import (
+    EnergyRampOrderer,
+    SmoothTransitionOrderer,
+    NaiveSmoothTransitionOrderer,
+    space_artists
+)
+from application.expansion import RelatedArtistExpander
+from application.filters import ArtistFilter, PlaylistExclusionFilter, SavedTracksFilter
+from application.jobs import JobQueue, JobStatus, QueueFullError
+from application.report import RunReport
+from application.sharding import ShardedArtistResolver
+from application.use_cases import (
+    SearchArtistTracksUseCase,
+    CreatePlaylistFromArtistsUseCase,
+    OrderTracksByFeaturesUseCase,
+    RefreshPlaylistUseCase
+)
+
+
+class RecordingProgress(NullProgressReporter):
+    """Suivi de progression qui mémorise les messages et l'avancement"""
+    
+    def __init__(self):
+        self.messages = []
+        self.advanced = []
+    
+    def message(self, text, level=logging.INFO):
+        self.messages.append((text, level))
+    
+    def advance(self, detail='', count=1):
+        self.advanced.append(detail)
+
+
+class FakeCatalogRepository:
+    """Catalogue déterministe utilisé par les processus de résolution"""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def find_artist(self, name):
+        self.calls += 1
+        if name == "Boom":
+            raise ValueError("réponse illisible")
+        return Artist(name=name, spotify_id=name.lower(), popularity=int(name[-2:]) if name[-2:].isdigit() else None)
+    
+    def get_artist_top_tracks(self, artist, max_tracks):
+        self.calls += 1
+        return [Track(uri=f"spotify:track:{artist.spotify_id}{i}") for i in range(max_tracks)]
+    
+    def get_stats(self):
+        return {'api_calls': self.calls}
 
 
 class TestSearchArtistTracksUseCase:
@@ -79,6 +137,41 @@ class TestSearchArtistTracksUseCase:
         tracks = use_case.execute("Search Name")
         
         assert len(tracks) == 1
+    
+    def test_search_statuses(self):
+        """Test des statuts distinguant introuvable, sans morceau et trouvé"""
+        mock_repo = Mock()
+        mock_repo.find_artist.side_effect = lambda name: None if name == "Ghost" else Artist(name=name, spotify_id=name)
+        mock_repo.get_artist_top_tracks.side_effect = lambda artist, max_tracks: (
+            [] if artist.name == "Silent" else [Track(uri="spotify:track:1")]
+        )
+        use_case = SearchArtistTracksUseCase(mock_repo)
+        
+        assert use_case.search("Ghost").status == SearchStatus.NOT_FOUND
+        assert use_case.search("Silent").status == SearchStatus.NO_TRACKS
+        assert use_case.search("Band").status == SearchStatus.FOUND
+    
+    def test_search_transient_error(self):
+        """Test qu'une erreur passagère est signalée comme relançable"""
+        mock_repo = Mock()
+        mock_repo.find_artist.side_effect = TransientError("timeout")
+        
+        result = SearchArtistTracksUseCase(mock_repo).search("Test Artist")
+        
+        assert result.status == SearchStatus.ERROR
+        assert result.reason == 'transient'
+        assert result.retryable is True
+        assert result.tracks == []
+    
+    def test_search_auth_error_not_retryable(self):
+        """Test qu'une erreur d'authentification n'est pas relançable"""
+        mock_repo = Mock()
+        mock_repo.find_artist.side_effect = AuthError("token expired")
+        
+        result = SearchArtistTracksUseCase(mock_repo).search("Test Artist")
+        
+        assert result.reason == 'auth'
+        assert result.retryable is False
 
 
 class TestCreatePlaylistFromArtistsUseCase:
@@ -88,6 +181,7 @@ class TestCreatePlaylistFromArtistsUseCase:
     def mock_repos(self):
         """Crée des mocks pour les repositories"""
         spotify_repo = Mock()
+        spotify_repo.get_stats.return_value = {}
         file_repo = Mock()
         return spotify_repo, file_repo
     
@@ -95,7 +189,7 @@ class TestCreatePlaylistFromArtistsUseCase:
     def use_case(self, mock_repos):
         """Crée un use case avec des mocks"""
         spotify_repo, file_repo = mock_repos
-        return CreatePlaylistFromArtistsUseCase(spotify_repo, file_repo)
+        return CreatePlaylistFromArtistsUseCase(spotify_repo, file_repo, sleep=Mock())
     
     @patch('builtins.input', return_value='o')
     def test_execute_success(self, mock_input, use_case, mock_repos, tmp_path):
@@ -105,14 +199,14 @@ class TestCreatePlaylistFromArtistsUseCase:
         test_file = tmp_path / "test_artists.txt"
         test_file.write_text("Test Artist")
         
-        file_repo.load_artists.return_value = ["Test Artist"]
+        file_repo.iter_artists.return_value = iter(["Test Artist"])
         
         mock_artist = Artist(name="Test Artist", spotify_id="artist_id")
         mock_tracks = [Track(uri="spotify:track:1")]
         
         spotify_repo.find_artist.return_value = mock_artist
         spotify_repo.get_artist_top_tracks.return_value = mock_tracks
-        spotify_repo.find_playlist_by_name.return_value = None
+        spotify_repo.find_playlists_by_name.return_value = {}
         spotify_repo.create_playlist.return_value = "playlist123"
         
         url = use_case.execute(
@@ -124,6 +218,8 @@ class TestCreatePlaylistFromArtistsUseCase:
         
         assert url == 'https://open.spotify.com/playlist/playlist123'
         spotify_repo.create_playlist.assert_called_once()
+        spotify_repo.find_playlists_by_name.assert_called_once()
+        spotify_repo.replace_playlist_tracks.assert_called_once_with("playlist123", ["spotify:track:1"])
     
     @patch('builtins.input', return_value='n')
     def test_execute_cancelled(self, mock_input, use_case, mock_repos, tmp_path):
@@ -132,7 +228,7 @@ class TestCreatePlaylistFromArtistsUseCase:
         
         test_file = tmp_path / "test_artists.txt"
         test_file.write_text("Test Artist")
-        file_repo.load_artists.return_value = ["Test Artist"]
+        file_repo.iter_artists.return_value = iter(["Test Artist"])
         
         url = use_case.execute(
             playlist_name="Test Playlist",
@@ -148,7 +244,7 @@ class TestCreatePlaylistFromArtistsUseCase:
         
         test_file = tmp_path / "test_artists.txt"
         test_file.write_text("Unknown Artist")
-        file_repo.load_artists.return_value = ["Unknown Artist"]
+        file_repo.iter_artists.return_value = iter(["Unknown Artist"])
         
         spotify_repo.find_artist.return_value = None
         
@@ -166,14 +262,15 @@ class TestCreatePlaylistFromArtistsUseCase:
         
         test_file = tmp_path / "test_artists.txt"
         test_file.write_text("Test Artist")
-        file_repo.load_artists.return_value = ["Test Artist"]
+        file_repo.iter_artists.return_value = iter(["Test Artist"])
         
         mock_artist = Artist(name="Test Artist", spotify_id="artist_id")
         mock_tracks = [Track(uri="spotify:track:1")]
         
         spotify_repo.find_artist.return_value = mock_artist
         spotify_repo.get_artist_top_tracks.return_value = mock_tracks
-        spotify_repo.find_playlist_by_name.return_value = "existing_playlist_id"
+        spotify_repo.find_playlists_by_name.return_value = {"Test Playlist": "existing_playlist_id"}
+        spotify_repo.get_playlist_track_uris.return_value = ["spotify:track:old"]
         
         url = use_case.execute(
             playlist_name="Test Playlist",
@@ -182,8 +279,74 @@ class TestCreatePlaylistFromArtistsUseCase:
         )
         
         assert url == 'https://open.spotify.com/playlist/existing_playlist_id'
-        spotify_repo.clear_playlist.assert_called_once_with("existing_playlist_id")
+        spotify_repo.replace_playlist_tracks.assert_called_once_with("existing_playlist_id", ["spotify:track:1"])
         spotify_repo.update_playlist.assert_called_once()
+        spotify_repo.clear_playlist.assert_not_called()
+    
+    def test_execute_order_by_features(self, use_case, mock_repos):
+        """Test que les morceaux sont ordonnés avant l'ajout à la playlist"""
+        spotify_repo, file_repo = mock_repos
+        file_repo.iter_artists.return_value = iter(["Test Artist"])
+        
+        tracks = [Track(uri="spotify:track:1"), Track(uri="spotify:track:2")]
+        spotify_repo.find_artist.return_value = Artist(name="Test Artist", spotify_id="artist_id")
+        spotify_repo.get_artist_top_tracks.return_value = tracks
+        spotify_repo.get_tracks_audio_features.return_value = {
+            "1": TrackFeatures(track_id="1", energy=0.9, tempo=120.0),
+            "2": TrackFeatures(track_id="2", energy=0.1, tempo=120.0),
+        }
+        spotify_repo.find_playlists_by_name.return_value = {}
+        spotify_repo.create_playlist.return_value = "playlist123"
+        
+        use_case.execute(
+            playlist_name="Test Playlist",
+            require_confirmation=False,
+            order_by_features=True
+        )
+        
+        added = spotify_repo.replace_playlist_tracks.call_args[0][1]
+        assert added == ["spotify:track:2", "spotify:track:1"]
+    
+    def test_execute_concurrent_keeps_input_order(self, use_case, mock_repos):
+        """Test que la recherche parallèle conserve l'ordre du fichier"""
+        spotify_repo, file_repo = mock_repos
+        artist_names = [f"Artist {i}" for i in range(20)]
+        file_repo.iter_artists.return_value = iter(artist_names)
+        
+        spotify_repo.find_artist.side_effect = lambda name: Artist(name=name, spotify_id=name)
+        spotify_repo.get_artist_top_tracks.side_effect = lambda artist, max_tracks: [
+            Track(uri=f"spotify:track:{artist.spotify_id}")
+        ]
+        spotify_repo.find_playlists_by_name.return_value = {}
+        spotify_repo.create_playlist.return_value = "playlist123"
+        
+        use_case.execute(
+            playlist_name="Test Playlist",
+            require_confirmation=False,
+            max_workers=4
+        )
+        
+        added = spotify_repo.replace_playlist_tracks.call_args[0][1]
+        assert added == [f"spotify:track:{name}" for name in artist_names]
+    
+    def test_execute_concurrent_progress_in_order(self, mock_repos):
+        """Test que l'avancement est signalé une fois par artiste, dans l'ordre"""
+        spotify_repo, file_repo = mock_repos
+        artist_names = [f"Artist {i}" for i in range(20)]
+        file_repo.iter_artists.return_value = iter(artist_names)
+        spotify_repo.find_artist.side_effect = lambda name: Artist(name=name, spotify_id=name)
+        spotify_repo.get_artist_top_tracks.return_value = [Track(uri="spotify:track:1")]
+        spotify_repo.find_playlists_by_name.return_value = {}
+        progress = RecordingProgress()
+        use_case = CreatePlaylistFromArtistsUseCase(spotify_repo, file_repo, progress=progress)
+        
+        use_case.execute(playlist_name="Test Playlist", require_confirmation=False, max_workers=4)
+        
+        assert progress.advanced == artist_names
+        # Les détails par artiste sont émis au niveau DEBUG
+        found = [text for text, level in progress.messages if "Trouvé 1 morceau(x)" in text]
+        assert len(found) == 20
+        assert all(level == logging.DEBUG for text, level in progress.messages if "Trouvé 1" in text)
     
     def test_execute_with_exception(self, use_case, mock_repos, tmp_path):
         """Test de gestion d'exception lors de la création"""
@@ -191,14 +354,14 @@ class TestCreatePlaylistFromArtistsUseCase:
         
         test_file = tmp_path / "test_artists.txt"
         test_file.write_text("Test Artist")
-        file_repo.load_artists.return_value = ["Test Artist"]
+        file_repo.iter_artists.return_value = iter(["Test Artist"])
         
         mock_artist = Artist(name="Test Artist", spotify_id="artist_id")
         mock_tracks = [Track(uri="spotify:track:1")]
         
         spotify_repo.find_artist.return_value = mock_artist
         spotify_repo.get_artist_top_tracks.return_value = mock_tracks
-        spotify_repo.find_playlist_by_name.side_effect = Exception("API Error")
+        spotify_repo.find_playlists_by_name.side_effect = Exception("API Error")
         
         url = use_case.execute(
             playlist_name="Test Playlist",
@@ -207,4 +370,1108 @@ class TestCreatePlaylistFromArtistsUseCase:
         )
         
         assert url is None
+    
+    def test_execute_reports_skipped_artists(self, mock_repos):
+        """Test du récapitulatif des artistes ignorés et de leur motif"""
+        spotify_repo, file_repo = mock_repos
+        progress = RecordingProgress()
+        use_case = CreatePlaylistFromArtistsUseCase(spotify_repo, file_repo, sleep=Mock(), progress=progress)
+        file_repo.iter_artists.return_value = iter(["Band", "Ghost", "Flaky"])
+        
+        def find_artist(name):
+            if name == "Flaky":
+                raise RateLimitedError("429", retry_after=1)
+            return None if name == "Ghost" else Artist(name=name, spotify_id=name)
+        
+        spotify_repo.find_artist.side_effect = find_artist
+        spotify_repo.get_artist_top_tracks.return_value = [Track(uri="spotify:track:1")]
+        spotify_repo.find_playlists_by_name.return_value = {}
+        spotify_repo.create_playlist.return_value = "playlist123"
+        
+        use_case.execute(playlist_name="Test Playlist", require_confirmation=False)
+        
+        output = "\n".join(text for text, level in progress.messages if level == logging.WARNING)
+        assert "2 artiste(s) ignoré(s)" in output
+        assert "introuvable(s) (1): Ghost" in output
+        assert "limite de requêtes (1): Flaky" in output
+        assert "1 échec(s) passager(s)" in output
+        # La limite de requêtes est relancée à chaque passe, après Retry-After
+        assert spotify_repo.find_artist.call_args_list.count((("Flaky",),)) == 3
+        assert [c.args[0] for c in use_case._sleep.call_args_list] == [1.0, 2.0]
+    
+    def test_execute_retries_transient_failures_in_order(self, use_case, mock_repos):
+        """Test que les artistes récupérés à la relance gardent leur position"""
+        spotify_repo, file_repo = mock_repos
+        artist_names = ["A", "B", "C", "D"]
+        file_repo.iter_artists.return_value = iter(artist_names)
+        failures = {"B": 1, "C": 2}
+        
+        def find_artist(name):
+            if failures.get(name):
+                failures[name] -= 1
+                raise TransientError("timeout")
+            return Artist(name=name, spotify_id=name)
+        
+        spotify_repo.find_artist.side_effect = find_artist
+        spotify_repo.get_artist_top_tracks.side_effect = lambda artist, max_tracks: [
+            Track(uri=f"spotify:track:{artist.spotify_id}")
+        ]
+        spotify_repo.find_playlists_by_name.return_value = {}
+        spotify_repo.create_playlist.return_value = "playlist123"
+        
+        use_case.execute(playlist_name="Test Playlist", require_confirmation=False, max_workers=4)
+        
+        added = spotify_repo.replace_playlist_tracks.call_args[0][1]
+        assert added == [f"spotify:track:{name}" for name in artist_names]
+    
+    def test_run_report(self, use_case, mock_repos, tmp_path):
+        """Test du rapport d'exécution : phases, artistes, appels et relances"""
+        spotify_repo, file_repo = mock_repos
+        file_repo.iter_artists.return_value = iter(["A", "Ghost", "Flaky"])
+        failures = {"Flaky": 1}
+        
+        def find_artist(name):
+            if failures.get(name):
+                failures[name] -= 1
+                raise TransientError("timeout")
+            return None if name == "Ghost" else Artist(name=name, spotify_id=name)
+        
+        spotify_repo.find_artist.side_effect = find_artist
+        spotify_repo.get_artist_top_tracks.return_value = [Track(uri="spotify:track:1")]
+        spotify_repo.find_playlists_by_name.return_value = {"Test Playlist": "existing"}
+        spotify_repo.get_playlist_track_uris.return_value = []
+        spotify_repo.get_stats.side_effect = [
+            {'api_calls': 10, 'cache_hits.artists': 4},
+            {'api_calls': 17, 'cache_hits.artists': 4, 'cache_misses.artists': 3},
+        ]
+        report_file = tmp_path / "reports" / "run.json"
+        
+        report = use_case.run(
+            playlist_name="Test Playlist",
+            require_confirmation=False,
+            report_path=str(report_file)
+        )
+        
+        assert report.outcome == 'updated'
+        assert report.playlist_url == 'https://open.spotify.com/playlist/existing'
+        assert set(report.phases) == {'load', 'resolve', 'retry', 'playlist_lookup', 'clear_diff', 'write'}
+        assert [(a.artist_name, a.outcome, a.attempts) for a in report.artists] == [
+            ("A", 'found', 1), ("Ghost", 'not_found', 1), ("Flaky", 'found', 2)
+        ]
+        assert report.retries == 1
+        assert report.api == {'api_calls': 7, 'cache_misses.artists': 3}
+        
+        data = json.loads(report_file.read_text(encoding='utf-8'))
+        assert data['summary'] == {'artists': 3, 'outcomes': {'found': 2, 'not_found': 1}, 'retries': 1}
+        assert data['track_count'] == 2
+    
+    def test_run_notifies_profiler(self, use_case, mock_repos):
+        """Test que l'observateur est prévenu du début et de la fin de chaque phase"""
+        spotify_repo, file_repo = mock_repos
+        file_repo.iter_artists.return_value = iter(["A"])
+        spotify_repo.find_artist.return_value = Artist(name="A", spotify_id="a")
+        spotify_repo.get_artist_top_tracks.return_value = [Track(uri="spotify:track:1")]
+        spotify_repo.find_playlists_by_name.return_value = {"Test Playlist": "existing"}
+        spotify_repo.get_playlist_track_uris.return_value = []
+        events = []
+        
+        class RecordingObserver(IPhaseObserver):
+            def phase_started(self, name):
+                events.append(('start', name))
+            
+            def phase_finished(self, name):
+                events.append(('end', name))
+        
+        use_case.profiler = RecordingObserver()
+        report = use_case.run(playlist_name="Test Playlist", require_confirmation=False)
+        
+        # La lecture du fichier au fil de la recherche est observée dans resolve
+        phases = ['resolve', 'retry', 'playlist_lookup', 'clear_diff', 'write']
+        assert events == [(event, name) for name in phases for event in ('start', 'end')]
+        assert set(report.phases) == {'load', *phases}
+        assert '_observer' not in report.to_dict()
+    
+    def test_dry_run_makes_no_write(self, mock_repos):
+        """Test que la simulation affiche le plan sans écrire dans la playlist"""
+        spotify_repo, file_repo = mock_repos
+        file_repo.iter_artists.return_value = iter(["A"])
+        spotify_repo.find_artist.return_value = Artist(name="A", spotify_id="a")
+        spotify_repo.get_artist_top_tracks.return_value = [Track(uri="spotify:track:1")]
+        spotify_repo.find_playlists_by_name.return_value = {"Test Playlist": "existing"}
+        spotify_repo.get_playlist_track_uris.return_value = ["spotify:track:1", "spotify:track:old"]
+        progress = RecordingProgress()
+        use_case = CreatePlaylistFromArtistsUseCase(
+            spotify_repo, file_repo, sleep=Mock(), progress=progress, dry_run=True
+        )
+        
+        report = use_case.run(playlist_name="Test Playlist", require_confirmation=False)
+        
+        assert report.outcome == 'planned'
+        assert report.playlist_url is None
+        assert report.plans[0]['removed'] == 1 and report.plans[0]['added'] == 0
+        assert report.plans[0]['estimated_calls'] == 2
+        assert 'write' not in report.phases
+        for method in ('create_playlist', 'replace_playlist_tracks', 'apply_playlist_diff', 'update_playlist'):
+            getattr(spotify_repo, method).assert_not_called()
+        assert any("Retirer 1 morceau(x)" in message for message, _ in progress.messages)
+    
+    def test_large_change_is_blocked(self, mock_repos):
+        """Test qu'un plan touchant trop de morceaux d'une playlist existante est refusé"""
+        spotify_repo, file_repo = mock_repos
+        file_repo.iter_artists.return_value = iter(["A"])
+        spotify_repo.find_artist.return_value = Artist(name="A", spotify_id="a")
+        spotify_repo.get_artist_top_tracks.return_value = [Track(uri="spotify:track:1")]
+        spotify_repo.find_playlists_by_name.return_value = {"Test Playlist": "existing"}
+        spotify_repo.get_playlist_track_uris.return_value = [f"spotify:track:old{i}" for i in range(50)]
+        use_case = CreatePlaylistFromArtistsUseCase(spotify_repo, file_repo, sleep=Mock(), max_changes=10)
+        
+        report = use_case.run(playlist_name="Test Playlist", require_confirmation=False)
+        
+        assert report.outcome == 'blocked'
+        assert "51" in report.error
+        spotify_repo.replace_playlist_tracks.assert_not_called()
+        spotify_repo.update_playlist.assert_not_called()
+    
+    @patch('builtins.input', return_value='n')
+    def test_run_report_cancelled(self, mock_input, use_case, mock_repos):
+        """Test du rapport d'une exécution annulée"""
+        spotify_repo, file_repo = mock_repos
+        file_repo.iter_artists.return_value = iter(["A"])
+        
+        report = use_case.run(playlist_name="Test Playlist")
+        
+        assert report.outcome == 'cancelled'
+        assert report.playlist_url is None
+        assert list(report.phases) == ['load']
+    
+    def test_execute_does_not_retry_permanent_failures(self, use_case, mock_repos):
+        """Test qu'une erreur non passagère n'est pas relancée"""
+        spotify_repo, file_repo = mock_repos
+        file_repo.iter_artists.return_value = iter(["A"])
+        spotify_repo.find_artist.side_effect = AuthError("token expired")
+        
+        url = use_case.execute(playlist_name="Test Playlist", require_confirmation=False)
+        
+        assert url is None
+        spotify_repo.find_artist.assert_called_once()
+        use_case._sleep.assert_not_called()
+    
+    
+    
+    def test_execute_shards_beyond_track_limit(self, mock_repos):
+        """Test que le contenu est réparti entre des parties numérotées"""
+        spotify_repo, file_repo = mock_repos
+        file_repo.iter_artists.return_value = iter(["A", "B", "C"])
+        spotify_repo.find_artist.side_effect = lambda name: Artist(name=name, spotify_id=name.lower())
+        spotify_repo.get_artist_top_tracks.side_effect = lambda artist, max_tracks: [
+            Track(uri=f"spotify:track:{artist.spotify_id}{i}") for i in range(2)
+        ]
+        spotify_repo.find_playlists_by_name.return_value = {}
+        spotify_repo.create_playlist.side_effect = lambda playlist: playlist.name
+        use_case = CreatePlaylistFromArtistsUseCase(spotify_repo, file_repo, playlist_track_limit=4)
+        
+        report = use_case.run(playlist_name="P", require_confirmation=False, max_workers=2)
+        
+        assert report.outcome == 'created'
+        assert report.playlist_url == "https://open.spotify.com/playlist/P"
+        assert [plan['playlist_name'] for plan in report.plans] == ["P", "P (part 2)"]
+        writes = {call[0][0]: call[0][1] for call in spotify_repo.replace_playlist_tracks.call_args_list}
+        assert writes == {
+            "P": ["spotify:track:a0", "spotify:track:a1", "spotify:track:b0", "spotify:track:b1"],
+            "P (part 2)": ["spotify:track:c0", "spotify:track:c1"],
+        }
+    
+    def test_execute_empties_leftover_shard(self, mock_repos):
+        """Test qu'une partie devenue inutile est vidée sans être supprimée"""
+        spotify_repo, file_repo = mock_repos
+        file_repo.iter_artists.return_value = iter(["A"])
+        spotify_repo.find_artist.return_value = Artist(name="A", spotify_id="a")
+        spotify_repo.get_artist_top_tracks.return_value = [Track(uri="spotify:track:1")]
+        spotify_repo.find_playlists_by_name.side_effect = lambda names: {
+            name: name for name in names if name in ("P", "P (part 2)")
+        }
+        spotify_repo.get_playlist_track_uris.side_effect = lambda playlist_id, snapshot_id=None: (
+            ["spotify:track:1"] if playlist_id == "P" else ["spotify:track:old"]
+        )
+        use_case = CreatePlaylistFromArtistsUseCase(spotify_repo, file_repo, playlist_track_limit=4)
+        
+        report = use_case.run(playlist_name="P", require_confirmation=False)
+        
+        assert report.outcome == 'updated'
+        spotify_repo.apply_playlist_diff.assert_called_once()
+        playlist_id, diff = spotify_repo.apply_playlist_diff.call_args[0]
+        assert playlist_id == "P (part 2)"
+        assert diff.removals == [(0, "spotify:track:old")]
+        spotify_repo.create_playlist.assert_not_called()
+
+
+class TestShardedArtistResolver:
+    """Tests pour ShardedArtistResolver (résolution multi-processus)"""
+    
+    def test_results_in_input_order(self):
+        """Test que les tranches résolues par plusieurs processus sont réassemblées dans l'ordre"""
+        names = [f"Artist {i:02d}" for i in range(25)] + ["Boom"]
+        
+        with ShardedArtistResolver(FakeCatalogRepository, processes=2, shard_size=4, threads=2) as resolver:
+            results = list(resolver.resolve(iter(names), max_tracks=2))
+            stats = resolver.get_stats()
+        
+        assert [result.artist_name for result in results] == names
+        assert results[3].tracks[0].uri == "spotify:track:artist 030"
+        assert results[-1].status == SearchStatus.ERROR
+        # Une erreur quelconque d'un processus est transmise comme erreur du domaine
+        assert isinstance(results[-1].error, SpotifyError)
+        assert stats['api_calls'] == 25 * 2 + 1
+    
+    def test_artist_filter_applied_in_workers(self):
+        """Test que les critères sont transmis aux processus et évitent les top tracks"""
+        names = [f"Artist {i:02d}" for i in range(25)]
+        
+        with ShardedArtistResolver(
+            FakeCatalogRepository, processes=2, shard_size=10, artist_filter=ArtistFilter(min_popularity=20)
+        ) as resolver:
+            results = list(resolver.resolve(iter(names), max_tracks=2))
+            stats = resolver.get_stats()
+        
+        assert [result.status for result in results] == [SearchStatus.FILTERED] * 20 + [SearchStatus.FOUND] * 5
+        assert stats['api_calls'] == 25 + 5
+    
+    def test_use_case_delegates_to_resolver(self, tmp_path):
+        """Test que le use case délègue la recherche au résolveur et cumule ses compteurs"""
+        spotify_repo = Mock()
+        spotify_repo.get_stats.return_value = {}
+        spotify_repo.find_playlists_by_name.return_value = {}
+        spotify_repo.create_playlist.return_value = "pl1"
+        file_repo = Mock()
+        file_repo.iter_artists.return_value = iter(["A", "B"])
+        resolver = Mock()
+        resolver.get_stats.side_effect = [{}, {'api_calls': 4}]
+        resolver.resolve.side_effect = lambda names, max_tracks: iter([
+            ArtistSearchResult(name, SearchStatus.FOUND, [Track(uri=f"spotify:track:{name}")]) for name in names
+        ])
+        use_case = CreatePlaylistFromArtistsUseCase(spotify_repo, file_repo, sleep=Mock(), resolver=resolver)
+        
+        report = use_case.run(playlist_name="Test Playlist", require_confirmation=False, max_workers=4)
+        
+        assert report.track_count == 2
+        spotify_repo.find_artist.assert_not_called()
+        assert report.api == {'api_calls': 4}
+
+
+class InMemoryRefreshStateRepository:
+    """État de rafraîchissement conservé en mémoire"""
+    
+    def __init__(self):
+        self.states = {}
+    
+    def load(self, playlist_name):
+        return self.states.get(playlist_name)
+    
+    def save(self, state):
+        self.states[state.playlist_name] = state
+
+
+class TestRefreshPlaylistUseCase:
+    """Tests pour RefreshPlaylistUseCase (rafraîchissement incrémental)"""
+    
+    @pytest.fixture
+    def clock(self):
+        return Mock(return_value=1000.0)
+    
+    @pytest.fixture
+    def repos(self):
+        """Repository Spotify simulé : un morceau par artiste"""
+        spotify_repo = Mock()
+        spotify_repo.get_stats.return_value = {}
+        spotify_repo.find_artist.side_effect = lambda name: Artist(name=name, spotify_id=name.lower())
+        spotify_repo.get_artist_top_tracks.side_effect = lambda artist, max_tracks: [
+            Track(uri=f"spotify:track:{artist.spotify_id}")
+        ]
+        spotify_repo.find_playlists_by_name.return_value = {}
+        spotify_repo.create_playlist.return_value = "pl1"
+        spotify_repo.get_playlist_snapshot_id.return_value = "snap1"
+        file_repo = Mock()
+        file_repo.fingerprint.return_value = "v1"
+        file_repo.iter_artists.side_effect = lambda filename: iter(["A", "B"])
+        return spotify_repo, file_repo
+    
+    @pytest.fixture
+    def use_case(self, repos, clock):
+        spotify_repo, file_repo = repos
+        return RefreshPlaylistUseCase(
+            spotify_repo, file_repo, InMemoryRefreshStateRepository(),
+            max_age=100, clock=clock, sleep=Mock()
+        )
+    
+    @staticmethod
+    def api_calls(spotify_repo):
+        """Appels au repository Spotify, hors lecture des statistiques"""
+        return [call for call in spotify_repo.method_calls if call[0] != 'get_stats']
+    
+    def test_first_run_creates_playlist(self, use_case, repos):
+        """Test que le premier passage crée la playlist avec tous les artistes"""
+        spotify_repo, _ = repos
+        
+        report = use_case.run(playlist_name="Test Playlist")
+        
+        assert report.outcome == 'created'
+        spotify_repo.replace_playlist_tracks.assert_called_once_with("pl1", ["spotify:track:a", "spotify:track:b"])
+        state = use_case.state_repo.load("Test Playlist")
+        assert state.playlist_id == "pl1"
+        assert state.track_uris == ["spotify:track:a", "spotify:track:b"]
+    
+    def test_unchanged_refresh_only_checks_snapshot(self, use_case, repos, clock):
+        """Test qu'un rafraîchissement sans changement ne demande que la version de la playlist"""
+        spotify_repo, file_repo = repos
+        use_case.run(playlist_name="Test Playlist")
+        spotify_repo.reset_mock()
+        file_repo.iter_artists.reset_mock()
+        clock.return_value = 1050.0
+        
+        report = use_case.run(playlist_name="Test Playlist")
+        
+        assert report.outcome == 'unchanged'
+        assert report.playlist_url == "https://open.spotify.com/playlist/pl1"
+        assert self.api_calls(spotify_repo) == [call.get_playlist_snapshot_id("pl1")]
+        file_repo.iter_artists.assert_not_called()
+        assert [artist.attempts for artist in report.artists] == [0, 0]
+    
+    def test_remote_edit_is_resynced(self, use_case, repos, clock):
+        """Test qu'une playlist modifiée dans Spotify est corrigée même sans changement local"""
+        spotify_repo, _ = repos
+        use_case.run(playlist_name="Test Playlist")
+        spotify_repo.reset_mock()
+        spotify_repo.get_playlist_snapshot_id.side_effect = ["edited", "snap2"]
+        spotify_repo.get_playlist_track_uris.return_value = ["spotify:track:b"]
+        clock.return_value = 1050.0
+        
+        report = use_case.run(playlist_name="Test Playlist")
+        
+        assert report.outcome == 'updated'
+        diff = spotify_repo.apply_playlist_diff.call_args[0][1]
+        assert diff.insertions == [(0, ["spotify:track:a"])]
+        spotify_repo.find_artist.assert_not_called()
+        assert use_case.state_repo.load("Test Playlist").snapshot_ids == {"pl1": "snap2"}
+        # La version lue avant l'écriture est transmise à la lecture du contenu, sans nouvel appel
+        spotify_repo.get_playlist_track_uris.assert_called_once_with("pl1", "edited")
+        assert spotify_repo.get_playlist_snapshot_id.call_count == 2
+    
+    def test_new_artist_only_is_queried(self, use_case, repos):
+        """Test que seul un artiste ajouté au fichier est interrogé"""
+        spotify_repo, file_repo = repos
+        use_case.run(playlist_name="Test Playlist")
+        spotify_repo.reset_mock()
+        spotify_repo.get_playlist_track_uris.return_value = ["spotify:track:a", "spotify:track:b"]
+        file_repo.fingerprint.return_value = "v2"
+        file_repo.iter_artists.side_effect = lambda filename: iter(["A", "C", "B"])
+        
+        report = use_case.run(playlist_name="Test Playlist")
+        
+        assert report.outcome == 'updated'
+        spotify_repo.find_artist.assert_called_once_with("C")
+        diff = spotify_repo.apply_playlist_diff.call_args[0][1]
+        assert diff.removals == []
+        assert diff.insertions == [(1, ["spotify:track:c"])]
+        spotify_repo.create_playlist.assert_not_called()
+    
+    def test_stale_tracks_are_refetched(self, use_case, repos, clock):
+        """Test que les morceaux plus anciens que max_age sont redemandés"""
+        spotify_repo, _ = repos
+        use_case.run(playlist_name="Test Playlist")
+        spotify_repo.reset_mock()
+        clock.return_value = 1200.0
+        
+        report = use_case.run(playlist_name="Test Playlist")
+        
+        assert report.outcome == 'unchanged'
+        # Les artistes déjà identifiés sont interrogés par leur ID, sans recherche par nom
+        spotify_repo.find_artist.assert_not_called()
+        assert [call.args[0].spotify_id for call in spotify_repo.get_artist_top_tracks.call_args_list] == ["a", "b"]
+        assert use_case.state_repo.load("Test Playlist").artists[0].fetched_at == 1200.0
+    
+    def test_stale_artist_without_metadata_is_searched_when_filtered(self, repos, clock):
+        """Test qu'un artiste sans genres ni popularité connus est recherché si des critères s'appliquent"""
+        spotify_repo, file_repo = repos
+        state_repo = InMemoryRefreshStateRepository()
+        RefreshPlaylistUseCase(spotify_repo, file_repo, state_repo, max_age=100, clock=clock).run(playlist_name="P")
+        spotify_repo.reset_mock()
+        clock.return_value = 1200.0
+        use_case = RefreshPlaylistUseCase(
+            spotify_repo, file_repo, state_repo, max_age=100, clock=clock,
+            artist_filter=ArtistFilter(exclude_genres=["pop"])
+        )
+        
+        use_case.run(playlist_name="P")
+        
+        assert spotify_repo.find_artist.call_count == 2
+    
+    def test_related_artists_are_refreshed(self, repos, clock):
+        """Test que l'extension aux artistes similaires est reprise de l'état tant qu'elle est récente"""
+        spotify_repo, file_repo = repos
+        expander = Mock()
+        expander.expand.return_value = [Artist(name="R", spotify_id="r", popularity=50)]
+        use_case = RefreshPlaylistUseCase(
+            spotify_repo, file_repo, InMemoryRefreshStateRepository(),
+            max_age=100, clock=clock, expander=expander
+        )
+        
+        report = use_case.run(playlist_name="P")
+        
+        assert report.expanded == 1
+        spotify_repo.replace_playlist_tracks.assert_called_once_with(
+            "pl1", ["spotify:track:a", "spotify:track:b", "spotify:track:r"]
+        )
+        assert [entry.spotify_id for entry in use_case.state_repo.load("P").related] == ["r"]
+        
+        spotify_repo.reset_mock()
+        clock.return_value = 1050.0
+        report = use_case.run(playlist_name="P")
+        
+        assert report.outcome == 'unchanged'
+        spotify_repo.get_artist_top_tracks.assert_not_called()
+        assert [artist.attempts for artist in report.artists] == [0, 0, 0]
+    
+    def test_failed_expansion_keeps_previous_related(self, repos, clock):
+        """Test qu'une extension en échec conserve les artistes similaires précédents et figure au rapport"""
+        spotify_repo, file_repo = repos
+        expander = Mock()
+        expander.expand.return_value = [Artist(name="R", spotify_id="r", popularity=50)]
+        use_case = RefreshPlaylistUseCase(
+            spotify_repo, file_repo, InMemoryRefreshStateRepository(),
+            max_age=100, clock=clock, expander=expander
+        )
+        use_case.run(playlist_name="P")
+        expander.expand.side_effect = TransientError("boom")
+        clock.return_value = 1200.0
+        
+        report = use_case.run(playlist_name="P")
+        
+        assert report.error == "boom"
+        assert report.outcome == 'unchanged'
+        assert [entry.spotify_id for entry in use_case.state_repo.load("P").related] == ["r"]
+    
+    def test_failed_artist_keeps_previous_tracks(self, use_case, repos, clock):
+        """Test qu'un artiste en erreur conserve ses morceaux précédents"""
+        spotify_repo, _ = repos
+        use_case.run(playlist_name="Test Playlist")
+        clock.return_value = 1200.0
+        spotify_repo.get_artist_top_tracks.side_effect = AuthError("token expired")
+        
+        report = use_case.run(playlist_name="Test Playlist")
+        
+        assert report.outcome == 'unchanged'
+        assert use_case.state_repo.load("Test Playlist").artists[0].fetched_at == 1000.0
+    
+    def test_deleted_playlist_is_recreated(self, use_case, repos):
+        """Test qu'une playlist supprimée depuis le dernier passage est recréée"""
+        spotify_repo, file_repo = repos
+        use_case.run(playlist_name="Test Playlist")
+        file_repo.fingerprint.return_value = "v2"
+        file_repo.iter_artists.side_effect = lambda filename: iter(["A"])
+        spotify_repo.get_playlist_track_uris.side_effect = NotFoundError("deleted")
+        spotify_repo.create_playlist.return_value = "pl2"
+        
+        report = use_case.run(playlist_name="Test Playlist")
+        
+        assert report.outcome == 'created'
+        assert use_case.state_repo.load("Test Playlist").playlist_id == "pl2"
+    
+    def test_shards_are_diffed_separately(self, repos):
+        """Test que chaque partie est comparée à son propre contenu au rafraîchissement"""
+        spotify_repo, file_repo = repos
+        spotify_repo.create_playlist.side_effect = lambda playlist: playlist.name
+        use_case = RefreshPlaylistUseCase(
+            spotify_repo, file_repo, InMemoryRefreshStateRepository(),
+            max_age=100, clock=Mock(return_value=1000.0), sleep=Mock(), playlist_track_limit=1
+        )
+        use_case.run(playlist_name="P")
+        assert use_case.state_repo.load("P").shard_ids == ["P (part 2)"]
+        spotify_repo.reset_mock()
+        spotify_repo.get_playlist_track_uris.side_effect = lambda playlist_id, snapshot_id=None: (
+            ["spotify:track:a"] if playlist_id == "P" else ["spotify:track:b"]
+        )
+        file_repo.fingerprint.return_value = "v2"
+        file_repo.iter_artists.side_effect = lambda filename: iter(["A", "C"])
+        
+        report = use_case.run(playlist_name="P")
+        
+        assert report.outcome == 'updated'
+        spotify_repo.find_playlists_by_name.assert_not_called()
+        assert spotify_repo.get_playlist_track_uris.call_count == 2
+        # Seule la partie modifiée est réécrite
+        spotify_repo.replace_playlist_tracks.assert_called_once_with("P (part 2)", ["spotify:track:c"])
+        spotify_repo.apply_playlist_diff.assert_not_called()
+
+
+class TestEnergyRampOrderer:
+    """Tests pour EnergyRampOrderer et space_artists"""
+    
+    def test_order_by_energy_then_tempo(self):
+        """Test de la montée en énergie et du regroupement par tempo"""
+        tracks = [
+            Track(uri="spotify:track:a", artist="A"),
+            Track(uri="spotify:track:b", artist="B"),
+            Track(uri="spotify:track:c", artist="C"),
+            Track(uri="spotify:track:d", artist="D"),
+        ]
+        features = {
+            "a": TrackFeatures(track_id="a", energy=0.95, tempo=180.0),
+            "b": TrackFeatures(track_id="b", energy=0.22, tempo=160.0),
+            "c": TrackFeatures(track_id="c", energy=0.25, tempo=90.0),
+            "d": TrackFeatures(track_id="d", energy=1.0, tempo=100.0),
+        }
+        
+        ordered = EnergyRampOrderer().order(tracks, features)
+        
+        assert [track.spotify_id for track in ordered] == ["c", "b", "d", "a"]
+    
+    def test_tracks_without_features_at_end(self):
+        """Test que les morceaux sans caractéristiques sont placés à la fin"""
+        tracks = [Track(uri="spotify:track:x", artist="X"), Track(uri="spotify:track:a", artist="A")]
+        features = {"a": TrackFeatures(track_id="a", energy=0.5, tempo=120.0)}
+        
+        ordered = EnergyRampOrderer().order(tracks, features)
+        
+        assert [track.spotify_id for track in ordered] == ["a", "x"]
+    
+    def test_space_artists(self):
+        """Test qu'un même artiste n'est pas joué deux fois de suite"""
+        tracks = [
+            Track(uri="spotify:track:1", artist="A"),
+            Track(uri="spotify:track:2", artist="A"),
+            Track(uri="spotify:track:3", artist="A"),
+            Track(uri="spotify:track:4", artist="B"),
+            Track(uri="spotify:track:5", artist="C"),
+            Track(uri="spotify:track:6"),
+            Track(uri="spotify:track:7"),
+        ]
+        
+        spaced = space_artists(tracks)
+        
+        assert [track.artist for track in spaced] == ["A", "B", "A", "C", "A", None, None]
+    
+    def test_space_artists_single_artist(self):
+        """Test qu'une séquence d'un seul artiste est laissée telle quelle"""
+        tracks = [Track(uri=f"spotify:track:{i}", artist="A") for i in range(3)]
+        assert space_artists(tracks) == tracks
+
+
+class TestSmoothTransitionOrderer:
+    """Tests pour SmoothTransitionOrderer"""
+    
+    @staticmethod
+    def _tracks(count, artist_count):
+        """Génère des morceaux et caractéristiques déterministes"""
+        tracks = [
+            Track(uri=f"spotify:track:{i}", artist=None if i % 9 == 0 else f"A{i % artist_count}")
+            for i in range(count)
+        ]
+        features = {
+            track.spotify_id: TrackFeatures(
+                track_id=track.spotify_id,
+                energy=((i * 37) % 101) / 100,
+                tempo=60 + (i * 53) % 140,
+                valence=((i * 11) % 17) / 16,
+                danceability=((i * 7) % 13) / 12
+            )
+            for i, track in enumerate(tracks)
+        }
+        return tracks, features
+    
+    def test_matches_naive_implementation(self):
+        """Test que l'implémentation vectorisée produit le même ordre que la référence"""
+        tracks, features = self._tracks(300, 40)
+        orderer = SmoothTransitionOrderer(block_size=64)
+        naive = NaiveSmoothTransitionOrderer(block_size=64)
+        
+        assert orderer.order(tracks, features) == naive.order(tracks, features)
+    
+    def test_smooth_transitions(self):
+        """Test que le plus proche voisin est choisi à chaque étape"""
+        tracks = [Track(uri=f"spotify:track:{i}", artist=str(i)) for i in range(4)]
+        features = {
+            "0": TrackFeatures(track_id="0", energy=0.1, tempo=100.0),
+            "1": TrackFeatures(track_id="1", energy=0.5, tempo=180.0),
+            "2": TrackFeatures(track_id="2", energy=0.2, tempo=180.0),
+            "3": TrackFeatures(track_id="3", energy=0.15, tempo=100.0),
+        }
+        
+        ordered = SmoothTransitionOrderer().order(tracks, features)
+        
+        assert [track.spotify_id for track in ordered] == ["0", "3", "2", "1"]
+    
+    def test_artist_spacing(self):
+        """Test qu'un artiste n'est pas rejoué dans les morceaux suivants"""
+        tracks, features = self._tracks(200, 20)
+        
+        ordered = SmoothTransitionOrderer(artist_spacing=3).order(tracks, features)
+        
+        assert sorted(track.uri for track in ordered) == sorted(track.uri for track in tracks)
+        for i in range(len(ordered)):
+            window = [track.artist for track in ordered[max(0, i - 3):i]]
+            assert ordered[i].artist is None or ordered[i].artist not in window
+    
+    def test_impossible_spacing_keeps_all_tracks(self):
+        """Test qu'un seul artiste ne bloque pas l'ordonnancement"""
+        tracks = [Track(uri=f"spotify:track:{i}", artist="A") for i in range(5)]
+        tracks.append(Track(uri="spotify:track:x"))
+        features = {str(i): TrackFeatures(track_id=str(i), energy=i / 10, tempo=120.0) for i in range(5)}
+        features["x"] = TrackFeatures(track_id="x", energy=0.9, tempo=120.0)
+        
+        ordered = SmoothTransitionOrderer().order(tracks, features)
+        
+        assert len(ordered) == 6
+        assert ordered[0].spotify_id == "0"
+    
+    def test_without_features(self):
+        """Test sans aucune caractéristique : ordre d'origine"""
+        tracks = [Track(uri="spotify:track:1"), Track(uri="spotify:track:2")]
+        
+        assert SmoothTransitionOrderer().order(tracks, {}) == tracks
+        assert NaiveSmoothTransitionOrderer().order(tracks, {}) == tracks
+
+
+class TestOrderTracksByFeaturesUseCase:
+    """Tests pour OrderTracksByFeaturesUseCase"""
+    
+    def test_execute_orders_tracks(self):
+        """Test que les morceaux sont ordonnés par l'ordonnanceur"""
+        mock_repo = Mock()
+        tracks = [Track(uri="spotify:track:1"), Track(uri="spotify:track:2")]
+        features = {"1": TrackFeatures(track_id="1", energy=0.9, tempo=120.0)}
+        mock_repo.get_tracks_audio_features.return_value = features
+        orderer = Mock()
+        orderer.order.return_value = list(reversed(tracks))
+        
+        use_case = OrderTracksByFeaturesUseCase(mock_repo, orderer)
+        ordered = use_case.execute(tracks)
+        
+        assert ordered == list(reversed(tracks))
+        orderer.order.assert_called_once_with(tracks, features)
+    
+    def test_execute_empty(self):
+        """Test sans morceaux : aucun appel au repository"""
+        mock_repo = Mock()
+        assert OrderTracksByFeaturesUseCase(mock_repo).execute([]) == []
+        mock_repo.get_tracks_audio_features.assert_not_called()
+    
+    def test_execute_keeps_order_on_error(self):
+        """Test que l'ordre d'origine est conservé en cas d'erreur"""
+        mock_repo = Mock()
+        mock_repo.get_tracks_audio_features.side_effect = Exception("API Error")
+        tracks = [Track(uri="spotify:track:1"), Track(uri="spotify:track:2")]
+        
+        assert OrderTracksByFeaturesUseCase(mock_repo).execute(tracks) == tracks
+    
+    def test_execute_keeps_order_without_features(self):
+        """Test que l'ordre d'origine est conservé sans caractéristiques"""
+        mock_repo = Mock()
+        mock_repo.get_tracks_audio_features.return_value = {}
+        tracks = [Track(uri="spotify:track:1")]
+        
+        assert OrderTracksByFeaturesUseCase(mock_repo).execute(tracks) == tracks
+
+
+class TestJobQueue:
+    """Tests pour JobQueue (mode service)"""
+    
+    @staticmethod
+    def wait_finished(queue, jobs, timeout=5.0):
+        """Attend la fin des travaux"""
+        deadline = time.monotonic() + timeout
+        while not all(queue.get(job.job_id).finished for job in jobs):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    
+    def test_jobs_run_and_report(self):
+        """Test de l'exécution d'un travail et de son état final"""
+        def runner(job):
+            report = RunReport(playlist_name=job.playlist_name, started_at='now')
+            report.playlist_url = f"https://open.spotify.com/playlist/{job.playlist_name}"
+            return report
+        
+        queue = JobQueue(runner)
+        queue.start()
+        try:
+            job = queue.submit("A", artists=["Gojira"])
+            self.wait_finished(queue, [job])
+        finally:
+            queue.shutdown()
+        
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.to_dict()['playlist_url'] == "https://open.spotify.com/playlist/A"
+        assert queue.counts()['succeeded'] == 1
+    
+    def test_runner_error_marks_job_failed(self):
+        """Test qu'une exception du travail n'arrête pas la file"""
+        def runner(job):
+            if job.playlist_name == "broken":
+                raise RuntimeError("boom")
+            return RunReport(playlist_name=job.playlist_name, started_at='now', outcome='no_tracks')
+        
+        queue = JobQueue(runner)
+        queue.start()
+        try:
+            jobs = [queue.submit("broken"), queue.submit("empty")]
+            self.wait_finished(queue, jobs)
+        finally:
+            queue.shutdown()
+        
+        assert [job.status for job in jobs] == [JobStatus.FAILED, JobStatus.FAILED]
+        assert jobs[0].error == "boom"
+        assert jobs[1].to_dict(include_report=True)['report']['outcome'] == 'no_tracks'
+    
+    def test_same_playlist_never_runs_concurrently(self):
+        """Test que deux travaux sur la même playlist sont exécutés l'un après l'autre"""
+        lock = threading.Lock()
+        running = {}
+        overlaps = []
+        
+        def runner(job):
+            with lock:
+                running[job.playlist_name] = running.get(job.playlist_name, 0) + 1
+                overlaps.append(running[job.playlist_name])
+            time.sleep(0.02)
+            with lock:
+                running[job.playlist_name] -= 1
+            return RunReport(playlist_name=job.playlist_name, started_at='now')
+        
+        queue = JobQueue(runner, max_concurrent=4)
+        queue.start()
+        try:
+            jobs = [queue.submit(name) for name in ["A", "A", "B", "A", "B"]]
+            self.wait_finished(queue, jobs)
+        finally:
+            queue.shutdown()
+        
+        assert max(overlaps) == 1
+    
+    def test_submit_rejected_when_full(self):
+        """Test de la file bornée"""
+        queue = JobQueue(Mock(), max_pending=2)
+        queue.submit("A")
+        queue.submit("B")
+        
+        with pytest.raises(QueueFullError):
+            queue.submit("C")
+    
+    def test_history_is_bounded(self):
+        """Test que seuls les derniers travaux terminés sont conservés"""
+        queue = JobQueue(lambda job: RunReport(playlist_name=job.playlist_name, started_at='now'), max_history=2)
+        queue.start()
+        try:
+            jobs = [queue.submit(str(i)) for i in range(5)]
+            self.wait_finished(queue, jobs[-1:])
+        finally:
+            queue.shutdown()
+        
+        assert [job.job_id for job in queue.jobs()] == [jobs[4].job_id, jobs[3].job_id]
+
+
+
+class InMemoryMembershipIndexRepository:
+    """Index d'appartenance conservés en mémoire"""
+    
+    def __init__(self):
+        self.entries = {}
+    
+    def load(self, playlist_id):
+        return self.entries.get(playlist_id)
+    
+    def save(self, entry):
+        self.entries[entry.key] = entry
+
+
+class TestPlaylistExclusionFilter:
+    """Tests pour l'exclusion des morceaux présents dans d'autres playlists"""
+    
+    @pytest.fixture
+    def spotify_repo(self):
+        spotify_repo = Mock()
+        spotify_repo.find_playlists.return_value = {
+            'Déjà écoutés': Playlist(name='Déjà écoutés', description='', spotify_id='old', snapshot_id='s1')
+        }
+        spotify_repo.get_playlist_track_uris.return_value = ['spotify:track:A', None]
+        return spotify_repo
+    
+    def test_excludes_known_tracks(self, spotify_repo):
+        """Test que les morceaux de la playlist exclue sont retirés, dans l'ordre"""
+        progress = RecordingProgress()
+        track_filter = PlaylistExclusionFilter(
+            spotify_repo, InMemoryMembershipIndexRepository(), ['Déjà écoutés', 'Inconnue'], progress=progress
+        )
+        tracks = [Track(uri=f"spotify:track:{name}") for name in "BAC"]
+        
+        assert [track.uri for track in track_filter.apply(tracks)] == ["spotify:track:B", "spotify:track:C"]
+        spotify_repo.find_playlists.assert_called_once_with(['Déjà écoutés', 'Inconnue'])
+        assert any('Inconnue' in text for text, _ in progress.messages)
+    
+    def test_shared_filter_builds_index_once(self, spotify_repo):
+        """Test que des travaux simultanés partageant le filtre ne reconstruisent l'index qu'une fois"""
+        def slow_read(playlist_id, snapshot_id=None):
+            time.sleep(0.05)
+            return ['spotify:track:A']
+        
+        spotify_repo.get_playlist_track_uris.side_effect = slow_read
+        track_filter = PlaylistExclusionFilter(spotify_repo, InMemoryMembershipIndexRepository(), ['Déjà écoutés'])
+        tracks = [Track(uri=f"spotify:track:{name}") for name in "AB"]
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(track_filter.apply(tracks))) for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert spotify_repo.get_playlist_track_uris.call_count == 1
+        assert [[track.uri for track in kept] for kept in results] == [["spotify:track:B"]] * 4
+    
+    def test_index_reused_until_snapshot_changes(self, spotify_repo):
+        """Test que la playlist n'est relue que si sa version a changé"""
+        index_repo = InMemoryMembershipIndexRepository()
+        PlaylistExclusionFilter(spotify_repo, index_repo, ['Déjà écoutés']).apply([])
+        
+        # Nouvelle exécution (nouveau filtre) : l'index enregistré est réutilisé
+        track_filter = PlaylistExclusionFilter(spotify_repo, index_repo, ['Déjà écoutés'])
+        track_filter.apply([])
+        assert spotify_repo.get_playlist_track_uris.call_count == 1
+        
+        spotify_repo.find_playlists.return_value['Déjà écoutés'].snapshot_id = 's2'
+        spotify_repo.get_playlist_track_uris.return_value = ['spotify:track:B']
+        kept = track_filter.apply([Track(uri="spotify:track:A"), Track(uri="spotify:track:B")])
+        
+        assert [track.uri for track in kept] == ["spotify:track:A"]
+        assert spotify_repo.get_playlist_track_uris.call_count == 2
+        assert index_repo.load(playlist_set_key(['old'])).snapshots == {'old': 's2'}
+    
+    def test_use_case_reports_filtered_tracks(self, spotify_repo):
+        """Test que le use case applique le filtre avant l'écriture et le compte dans le rapport"""
+        spotify_repo.get_stats.return_value = {}
+        spotify_repo.find_artist.side_effect = lambda name: Artist(name=name, spotify_id=name)
+        spotify_repo.get_artist_top_tracks.side_effect = lambda artist, max_tracks: [
+            Track(uri=f"spotify:track:{artist.spotify_id}")
+        ]
+        spotify_repo.find_playlists_by_name.return_value = {}
+        spotify_repo.create_playlist.return_value = "pl1"
+        file_repo = Mock()
+        file_repo.iter_artists.return_value = iter(["A", "B"])
+        track_filter = PlaylistExclusionFilter(spotify_repo, InMemoryMembershipIndexRepository(), ['Déjà écoutés'])
+        use_case = CreatePlaylistFromArtistsUseCase(
+            spotify_repo, file_repo, sleep=Mock(), track_filters=[track_filter]
+        )
+        
+        report = use_case.run(playlist_name="P", require_confirmation=False)
+        
+        assert report.filtered == {'excluded_playlists': 1}
+        assert report.track_count == 1
+        assert 'filter' in report.phases
+        spotify_repo.replace_playlist_tracks.assert_called_once_with("pl1", ["spotify:track:B"])
+    
+    
+    def test_use_case_builds_bloom_filter_over_combined_playlists(self, spotify_repo):
+        """Test que le filtre de Bloom est atteint dès que les playlists exclues dépassent ensemble la limite"""
+        exact_limit = 500
+        per_playlist = exact_limit // 2 + 1
+        spotify_repo.find_playlists.return_value = {
+            name: Playlist(name=name, description='', spotify_id=name, snapshot_id='s1') for name in ('H1', 'H2')
+        }
+        spotify_repo.get_playlist_track_uris.side_effect = lambda playlist_id, snapshot_id=None: [
+            f"spotify:track:{playlist_id}-{i}" for i in range(per_playlist)
+        ]
+        spotify_repo.get_stats.return_value = {}
+        spotify_repo.find_artist.side_effect = lambda name: Artist(name=name, spotify_id=name)
+        spotify_repo.get_artist_top_tracks.side_effect = lambda artist, max_tracks: [
+            Track(uri=f"spotify:track:{artist.spotify_id}")
+        ]
+        spotify_repo.find_playlists_by_name.return_value = {}
+        spotify_repo.create_playlist.return_value = "pl1"
+        file_repo = Mock()
+        file_repo.iter_artists.return_value = iter(["H1-0", "H2-7", "New"])
+        index_repo = InMemoryMembershipIndexRepository()
+        track_filter = PlaylistExclusionFilter(spotify_repo, index_repo, ['H1', 'H2'], exact_limit=exact_limit)
+        progress = Mock()
+        use_case = CreatePlaylistFromArtistsUseCase(
+            spotify_repo, file_repo, sleep=Mock(), track_filters=[track_filter], progress=progress
+        )
+        
+        report = use_case.run(playlist_name="P", require_confirmation=False)
+        
+        entry = index_repo.load(playlist_set_key(['H1', 'H2']))
+        assert isinstance(entry.index, BloomFilter)
+        assert len(entry.index) == 2 * per_playlist
+        assert report.filtered == {'excluded_playlists': 2}
+        assert 0 < report.false_positive_rates['excluded_playlists'] < 0.01
+        assert any('filtre de Bloom' in call.args[0] for call in progress.warning.call_args_list)
+        spotify_repo.replace_playlist_tracks.assert_called_once_with("pl1", ["spotify:track:New"])
+
+
+class TestSavedTracksFilter:
+    """Tests pour l'exclusion des morceaux enregistrés dans la bibliothèque"""
+    
+    def test_excludes_saved_tracks(self):
+        """Test que seuls les morceaux non enregistrés sont conservés, dans l'ordre"""
+        spotify_repo = Mock()
+        spotify_repo.saved_tracks_contains.return_value = {'A': True, 'B': False, 'C': False}
+        tracks = [Track(uri=f"spotify:track:{name}") for name in "CAB"]
+        
+        kept = SavedTracksFilter(spotify_repo).apply(tracks)
+        
+        assert [track.uri for track in kept] == ["spotify:track:C", "spotify:track:B"]
+        spotify_repo.saved_tracks_contains.assert_called_once_with(['C', 'A', 'B'])
+
+
+
+class TestRelatedArtistExpander:
+    """Tests pour l'extension aux artistes similaires"""
+    
+    GRAPH = {
+        'a': ['b', 'c', 'x', 'd'],
+        'x': ['a', 'e'],
+        'b': ['e', 'f', 'g'],
+        'c': ['f', 'h'],
+        'd': ['i'],
+    }
+    
+    @pytest.fixture
+    def spotify_repo(self):
+        """Graphe simulé d'artistes similaires"""
+        spotify_repo = Mock()
+        spotify_repo.get_related_artists.side_effect = lambda artist: [
+            Artist(name=name.upper(), spotify_id=name) for name in self.GRAPH.get(artist.spotify_id, [])
+        ]
+        return spotify_repo
+    
+    def test_bounded_breadth_first(self, spotify_repo):
+        """Test du parcours par niveaux, sans doublon, avec fan-out et profondeur bornés"""
+        expander = RelatedArtistExpander(spotify_repo, depth=2, fan_out=2, max_workers=4)
+        
+        added = expander.expand([Artist(name="A", spotify_id='a'), Artist(name="X", spotify_id='x'), Artist(name="?")])
+        
+        # Niveau 1 : b, c (a) puis e (x, a déjà visité) ; niveau 2 : f, g (b), h (c), rien pour e
+        assert [artist.spotify_id for artist in added] == ['b', 'c', 'e', 'f', 'g', 'h']
+        assert spotify_repo.get_related_artists.call_count == 5
+    
+    def test_max_artists_and_errors(self, spotify_repo):
+        """Test de la limite globale et d'un artiste inexistant ignoré"""
+        graph = spotify_repo.get_related_artists.side_effect
+        
+        def related(artist):
+            if artist.spotify_id == 'x':
+                raise NotFoundError("absent")
+            return graph(artist)
+        
+        spotify_repo.get_related_artists.side_effect = related
+        expander = RelatedArtistExpander(spotify_repo, depth=3, fan_out=5, max_artists=3)
+        
+        added = expander.expand([Artist(name="X", spotify_id='x'), Artist(name="A", spotify_id='a')])
+        
+        assert [artist.spotify_id for artist in added] == ['b', 'c', 'd']
+    
+    def test_transient_errors_are_retried(self, spotify_repo):
+        """Test qu'un échec passager est relancé après le délai Retry-After"""
+        graph = spotify_repo.get_related_artists.side_effect
+        failures = [RateLimitedError("limite", retry_after=7.0), TransientError("boom")]
+        
+        def related(artist):
+            if artist.spotify_id == 'x' and failures:
+                raise failures.pop(0)
+            return graph(artist)
+        
+        spotify_repo.get_related_artists.side_effect = related
+        sleep = Mock()
+        expander = RelatedArtistExpander(spotify_repo, fan_out=5, sleep=sleep)
+        
+        added = expander.expand([Artist(name="X", spotify_id='x')])
+        
+        assert [artist.spotify_id for artist in added] == ['a', 'e']
+        assert sleep.call_args_list == [call(7.0), call(2.0)]
+    
+    @pytest.mark.parametrize("error", [TransientError("boom"), AuthError("token")])
+    def test_unrecovered_errors_propagate(self, spotify_repo, error):
+        """Test qu'un échec passager persistant ou une erreur non relançable interrompt l'extension"""
+        spotify_repo.get_related_artists.side_effect = error
+        sleep = Mock()
+        expander = RelatedArtistExpander(spotify_repo, retry_rounds=2, sleep=sleep)
+        
+        with pytest.raises(type(error)):
+            expander.expand([Artist(name="X", spotify_id='x')])
+        assert sleep.call_count == (2 if error.retryable else 0)
+    
+    def test_use_case_reports_expansion_failure(self, spotify_repo):
+        """Test qu'une extension en échec fait échouer l'exécution avec son erreur dans le rapport"""
+        spotify_repo.get_stats.return_value = {}
+        spotify_repo.find_artist.side_effect = lambda name: Artist(name=name, spotify_id=name.lower())
+        spotify_repo.get_artist_top_tracks.return_value = [Track(uri="spotify:track:d")]
+        spotify_repo.get_related_artists.side_effect = AuthError("token expiré")
+        file_repo = Mock()
+        file_repo.iter_artists.return_value = iter(["D"])
+        use_case = CreatePlaylistFromArtistsUseCase(
+            spotify_repo, file_repo, sleep=Mock(), expander=RelatedArtistExpander(spotify_repo)
+        )
+        
+        report = use_case.run(playlist_name="P", require_confirmation=False)
+        
+        assert report.outcome == 'failed'
+        assert report.error == "token expiré"
+        assert [artist.artist_name for artist in report.artists] == ["D"]
+        spotify_repo.create_playlist.assert_not_called()
+    
+    def test_use_case_adds_related_artists(self, spotify_repo):
+        """Test que les morceaux des artistes similaires sont ajoutés sans recherche par nom"""
+        spotify_repo.get_stats.return_value = {}
+        spotify_repo.find_artist.side_effect = lambda name: Artist(name=name, spotify_id=name.lower())
+        spotify_repo.get_artist_top_tracks.side_effect = lambda artist, max_tracks: [
+            Track(uri=f"spotify:track:{artist.spotify_id}")
+        ]
+        spotify_repo.find_playlists_by_name.return_value = {}
+        spotify_repo.create_playlist.return_value = "pl1"
+        file_repo = Mock()
+        file_repo.iter_artists.return_value = iter(["D"])
+        use_case = CreatePlaylistFromArtistsUseCase(
+            spotify_repo, file_repo, sleep=Mock(),
+            expander=RelatedArtistExpander(spotify_repo, depth=2, fan_out=1)
+        )
+        
+        report = use_case.run(playlist_name="P", require_confirmation=False, max_workers=2)
+        
+        assert report.expanded == 1
+        assert [artist.artist_name for artist in report.artists] == ["D", "I"]
+        assert 'expand' in report.phases
+        spotify_repo.find_artist.assert_called_once_with("D")
+        spotify_repo.replace_playlist_tracks.assert_called_once_with("pl1", ["spotify:track:d", "spotify:track:i"])
 
+
+
+class TestArtistFilter:
+    """Tests pour la sélection des artistes par genre et popularité"""
+    
+    def test_genres_match_by_substring(self):
+        """Test des genres inclus et exclus, sans tenir compte de la casse"""
+        artist_filter = ArtistFilter(include_genres=['Metal'], exclude_genres=['nu metal'])
+        
+        assert artist_filter.accepts(Artist(name="A", genres=['french death metal']))
+        assert not artist_filter.accepts(Artist(name="B", genres=['nu metal', 'rap metal']))
+        assert not artist_filter.accepts(Artist(name="C", genres=['punk']))
+        assert not artist_filter.accepts(Artist(name="D"))
+    
+    def test_min_popularity(self):
+        """Test de la popularité minimale (inconnue : artiste conservé)"""
+        artist_filter = ArtistFilter(min_popularity=30)
+        
+        assert artist_filter.accepts(Artist(name="A", popularity=30))
+        assert not artist_filter.accepts(Artist(name="B", popularity=29))
+        assert artist_filter.accepts(Artist(name="C"))
+    
+    def test_search_skips_top_tracks(self):
+        """Test qu'un artiste écarté ne coûte aucune demande de top tracks"""
+        spotify_repo = Mock()
+        spotify_repo.find_artist.return_value = Artist(name="Maître Gims", spotify_id="mg", genres=['french pop'])
+        use_case = SearchArtistTracksUseCase(spotify_repo, artist_filter=ArtistFilter(include_genres=['metal']))
+        
+        result = use_case.search("Maître Gims")
+        
+        assert result.status == SearchStatus.FILTERED
+        assert result.reason == 'filtered'
+        assert result.spotify_id == "mg"
+        spotify_repo.get_artist_top_tracks.assert_not_called()
@@ -1,8 +1,22 @@
 """
 Tests pour le domaine (entities)
 """
+import pickle
+import random
 import pytest
-from domain.entities import Artist, Track, Playlist
+from domain.canonical import canonical_artist_key
+from domain.entities import Artist, ArtistSearchResult, Track, TrackFeatures, Playlist, SearchStatus
+from domain.errors import NotFoundError, RateLimitedError, TransientError
+from domain.membership import (
+    BloomFilter,
+    ExactIndex,
+    MembershipIndex,
+    PlaylistIndex,
+    build_membership_index,
+    playlist_set_key,
+)
+from domain.playlist_diff import PlaylistDiff, apply_playlist_diff, compute_playlist_diff
+from domain.playlist_plan import PlaylistPlan, shard_name, split_shards
 
 
 class TestArtist:
@@ -21,6 +35,8 @@ class TestArtist:
         assert artist.name == "Test Artist"
         assert artist.spotify_id is None
         assert artist.found_name is None
+        assert artist.genres == []
+        assert artist.popularity is None
 
 
 class TestTrack:
@@ -39,6 +55,23 @@ class TestTrack:
         assert track.uri == "spotify:track:123"
         assert track.name is None
         assert track.artist is None
+    
+    def test_track_spotify_id(self):
+        """Test de l'extraction de l'ID Spotify depuis l'URI"""
+        track = Track(uri="spotify:track:abc123")
+        assert track.spotify_id == "abc123"
+
+
+class TestTrackFeatures:
+    """Tests pour l'entité TrackFeatures"""
+    
+    def test_track_features_defaults(self):
+        """Test des valeurs par défaut des caractéristiques optionnelles"""
+        features = TrackFeatures(track_id="123", energy=0.8, tempo=140.0)
+        assert features.energy == 0.8
+        assert features.tempo == 140.0
+        assert features.valence == 0.0
+        assert features.danceability == 0.0
 
 
 class TestPlaylist:
@@ -63,3 +96,207 @@ class TestPlaylist:
         playlist = Playlist(name="Test", description="Test")
         assert playlist.tracks == []
 
+
+class TestArtistSearchResult:
+    """Tests pour ArtistSearchResult"""
+    
+    def test_reason_from_status(self):
+        """Test du motif d'un artiste introuvable"""
+        result = ArtistSearchResult("Ghost", SearchStatus.NOT_FOUND)
+        assert result.reason == 'not_found'
+        assert result.retryable is False
+    
+    def test_reason_from_error(self):
+        """Test du motif d'une erreur typée"""
+        result = ArtistSearchResult("Band", SearchStatus.ERROR, error=NotFoundError("404"))
+        assert result.reason == 'resource_not_found'
+        assert result.retryable is False
+    
+    def test_rate_limited_survives_pickle(self):
+        """Test que le délai Retry-After traverse une frontière de processus"""
+        error = pickle.loads(pickle.dumps(RateLimitedError("429", retry_after=2.0)))
+        assert error.retry_after == 2.0
+        assert str(error) == "429"
+    
+    def test_rate_limited_is_transient(self):
+        """Test qu'une limite de requêtes est une erreur passagère"""
+        error = RateLimitedError("429", retry_after=2.0)
+        assert isinstance(error, TransientError)
+        assert ArtistSearchResult("Band", SearchStatus.ERROR, error=error).retryable is True
+
+
+class TestCanonicalArtistKey:
+    """Tests pour canonical_artist_key"""
+    
+    @pytest.mark.parametrize("variant, reference", [
+        ("ULTRA VOMIT ", "Ultra Vomit"),
+        ("Mötley Crüe", "Motley Crue"),
+        ("Sigur Rós", "sigur ros"),
+        ("Mørbid Angel", "Morbid Angel"),
+        ("The Hu", "Hu"),
+        ("Hu, The", "The Hu"),
+        ("AC/DC", "AC-DC"),
+        ("Guns N’ Roses", "Guns N' Roses"),
+        ("Simon & Garfunkel", "Simon and Garfunkel"),
+        ("ＡＢＣ", "abc"),
+    ])
+    def test_equivalent_names(self, variant, reference):
+        """Test que les variantes d'un même nom produisent la même clé"""
+        assert canonical_artist_key(variant) == canonical_artist_key(reference)
+    
+    def test_distinct_names(self):
+        """Test que « the » au milieu d'un nom est conservé"""
+        assert canonical_artist_key("Bring Me the Horizon") == "bring me the horizon"
+        assert canonical_artist_key("Gojira") != canonical_artist_key("Godflesh")
+    
+    @pytest.mark.parametrize("name, key", [
+        ("ガールズ", "ガールズ"),
+        ("Мой Мир", "мой мир"),
+        ("Ανδρέας", "ανδρέασ"),
+        ("Sólstafir", "solstafir"),
+    ])
+    def test_diacritics_stripped_from_latin_letters_only(self, name, key):
+        """Test que seuls les accents des lettres latines sont retirés (が ≠ か, й ≠ и)"""
+        assert canonical_artist_key(name) == key
+        assert canonical_artist_key("が") != canonical_artist_key("か")
+    
+    def test_degenerate_names(self):
+        """Test des noms réduits à un article ou à de la ponctuation"""
+        assert canonical_artist_key("The") == "the"
+        assert canonical_artist_key("!!!") == "!!!"
+
+
+class TestPlaylistDiff:
+    """Tests pour compute_playlist_diff"""
+    
+    def test_identical_lists(self):
+        """Test qu'aucune opération n'est produite sans changement"""
+        diff = compute_playlist_diff(['a', 'b'], ['a', 'b'])
+        assert diff.is_empty
+        assert diff.estimated_calls == 0
+        assert diff.prefer_replace is False
+    
+    def test_small_change(self):
+        """Test qu'un ajout et une suppression ne touchent que les morceaux concernés"""
+        current = ['a', 'b', 'c', 'd']
+        desired = ['a', 'c', 'x', 'd']
+        diff = compute_playlist_diff(current, desired)
+        
+        assert diff.removals == [(1, 'b')]
+        assert diff.insertions == [(2, ['x'])]
+        assert diff.estimated_calls == 2
+        assert apply_playlist_diff(current, diff) == desired
+    
+    def test_prefer_diff_on_large_playlist(self):
+        """Test que la différence est préférée quand elle coûte moins d'appels"""
+        current = [f'u{i}' for i in range(250)]
+        desired = current[:10] + ['x'] + current[11:]
+        diff = compute_playlist_diff(current, desired)
+        
+        assert diff.estimated_calls == 2
+        assert diff.replace_calls == 3
+        assert diff.prefer_replace is False
+    
+    def test_random_edits_reproduce_desired_order(self):
+        """Test que l'application de la différence donne exactement la liste souhaitée"""
+        rng = random.Random(0)
+        for _ in range(200):
+            current = [f'u{rng.randrange(30)}' for _ in range(rng.randrange(0, 40))]
+            desired = [f'u{rng.randrange(30)}' for _ in range(rng.randrange(0, 40))]
+            diff = compute_playlist_diff(current, desired, batch_size=7)
+            
+            assert apply_playlist_diff(current, diff) == desired
+            assert all(len(uris) <= 7 for _, uris in diff.insertions)
+    
+    def test_prefer_replace(self):
+        """Test que le remplacement est préféré quand il coûte moins d'appels"""
+        diff = compute_playlist_diff([f'old{i}' for i in range(300)], ['new'])
+        assert diff.replace_calls == 1
+        assert diff.prefer_replace is True
+    
+    def test_prefer_replace_for_unavailable_items(self):
+        """Test qu'un élément sans URI ne peut être retiré que par remplacement"""
+        diff = compute_playlist_diff(['a', None, 'b'], ['a', 'b'])
+        assert diff.prefer_replace is True
+
+
+class TestPlaylistPlan:
+    """Tests pour PlaylistPlan"""
+    
+    def test_create_plan(self):
+        """Test du plan de création : création puis écriture par lots de 100"""
+        desired = [f'u{i}' for i in range(250)]
+        plan = PlaylistPlan("P", "D", desired=desired, diff=PlaylistDiff(desired=desired))
+        
+        assert plan.creates and plan.replace
+        assert plan.added_count == 250
+        assert plan.estimated_calls == 4
+        assert plan.describe()[0] == "Créer la playlist « P »"
+    
+    def test_incremental_plan(self):
+        """Test du plan incrémental : suppressions, insertions par position et détails"""
+        current = [f'u{i}' for i in range(250)]
+        desired = current[:10] + ['x'] + current[11:]
+        plan = PlaylistPlan(
+            "P", "D", desired=desired, playlist_id='pl1', current_count=250,
+            diff=compute_playlist_diff(current, desired), update_details=True
+        )
+        
+        assert not plan.creates and not plan.replace
+        assert (plan.removed_count, plan.added_count, plan.change_count) == (1, 1, 2)
+        assert plan.estimated_calls == 3
+        assert "Ajouter 1 morceau(x) en position 10" in plan.describe()
+        assert plan.to_dict()['estimated_calls'] == 3
+    
+    def test_unchanged_plan_is_empty(self):
+        """Test qu'un plan sans différence ni détails ne prévoit aucun appel"""
+        plan = PlaylistPlan("P", "D", desired=['a'], playlist_id='pl1', current_count=1,
+                            diff=compute_playlist_diff(['a'], ['a']))
+        assert plan.is_empty
+        assert plan.estimated_calls == 0
+    
+    def test_split_shards(self):
+        """Test du découpage en parties numérotées"""
+        assert split_shards(['a', 'b', 'c'], 2) == [['a', 'b'], ['c']]
+        assert split_shards([], 2) == [[]]
+        assert [shard_name("P", index) for index in range(3)] == ["P", "P (part 2)", "P (part 3)"]
+
+
+class TestMembershipIndex:
+    """Tests pour les index d'appartenance"""
+    
+    def test_exact_index(self):
+        """Test de l'index exact (éléments indisponibles ignorés) et de sa sérialisation"""
+        index = build_membership_index(['a', None, 'b', 'a'])
+        
+        assert isinstance(index, ExactIndex)
+        assert len(index) == 2
+        assert 'a' in index and 'c' not in index
+        restored = MembershipIndex.from_dict(index.to_dict())
+        assert 'b' in restored and 'c' not in restored
+    
+    def test_bloom_filter_above_limit(self):
+        """Test du filtre de Bloom : aucun faux négatif, faux positifs rares"""
+        uris = [f'spotify:track:{i}' for i in range(2000)]
+        index = build_membership_index(uris, exact_limit=100)
+        
+        assert isinstance(index, BloomFilter)
+        assert all(uri in index for uri in uris)
+        false_positives = sum(f'spotify:track:other{i}' in index for i in range(2000))
+        assert false_positives < 20
+        assert 0 < index.false_positive_rate < 0.01
+        assert build_membership_index(uris, exact_limit=5000).false_positive_rate == 0.0
+    
+    def test_playlist_index_round_trip(self):
+        """Test que l'index d'un ensemble de playlists est relu à l'identique"""
+        bloom = BloomFilter.for_capacity(10)
+        bloom.add('a')
+        entry = PlaylistIndex(playlist_set_key(['pl2', 'pl1']), {'pl1': 'snap1', 'pl2': 'snap2'}, bloom)
+        
+        restored = PlaylistIndex.from_dict(entry.to_dict())
+        
+        assert restored.key == playlist_set_key(['pl1', 'pl2'])
+        assert restored.is_current({'pl1': 'snap1', 'pl2': 'snap2'})
+        assert not restored.is_current({'pl1': 'snap1', 'pl2': 'other'})
+        assert not PlaylistIndex('k', {'pl1': None}, bloom).is_current({'pl1': None})
+        assert 'a' in restored.index and len(restored.index) == 1
\ No newline at end of file
@@ -1,13 +1,45 @@
 """
 Tests pour l'infrastructure (repositories, config)
 """
+import gzip
+import json
 import os
+import threading
+import time
+import tracemalloc
+import io
+import logging
 import pytest
+import requests
+import spotipy
 from unittest.mock import Mock, patch, mock_open
-from infrastructure.config import SpotifyConfig
-from infrastructure.file_loader import ArtistFileRepository
-from infrastructure.spotify_repository import SpotifyRepository
-from domain.entities import Artist, Track, Playlist
+from spotipy.exceptions import SpotifyException
+from application.report import RunReport
+from application.use_cases import CreatePlaylistFromArtistsUseCase
+from benchmarks.fake_spotify import FakeSpotifyServer
+from infrastructure.atomic_file import write_atomic, write_json_atomic
+from infrastructure.cache import JsonLinesCache
+from infrastructure.cassette import Cassette, CassetteAdapter, CassetteMissError, request_key
+from infrastructure.client_pool import ClientDispatcher
+from infrastructure.config import SpotifyConfig, parse_client_pairs
+from infrastructure.file_loader import ArtistFileRepository, InlineArtistRepository, BoundedSeenSet
+from infrastructure.single_flight import SingleFlight
+from infrastructure.spotify_repository import SpotifyRepository, translate_error
+from infrastructure.membership_store import JsonMembershipIndexRepository
+from infrastructure.playlist_mirror import PlaylistMirror
+from infrastructure.profiling import PhaseProfiler
+from infrastructure.refresh_state import JsonRefreshStateRepository
+from infrastructure.progress import (
+    LoggingProgressReporter,
+    ProgressBarReporter,
+    create_progress_reporter,
+)
+from infrastructure.transport import build_session
+from domain.entities import Artist, Track, Playlist, RefreshState, ResolvedArtist
+from domain.membership import ExactIndex, PlaylistIndex
+from domain.playlist_diff import compute_playlist_diff
+from domain.progress import NullProgressReporter
+from domain.errors import AuthError, NotFoundError, RateLimitedError, SpotifyError, TransientError
 
 
 class TestSpotifyConfig:
@@ -44,11 +76,738 @@ class TestSpotifyConfig:
         """Test que is_valid retourne False sans credentials"""
         config = SpotifyConfig()
         assert config.is_valid() is False
+    
+    @patch.dict(os.environ, {}, clear=True)
+    @patch('infrastructure.config.load_dotenv')
+    def test_config_transport_defaults(self, mock_load_dotenv):
+        """Test des paramètres de transport par défaut"""
+        config = SpotifyConfig()
+        
+        assert config.api_prefix == 'https://api.spotify.com/v1/'
+        assert config.max_workers == 8
+        assert config.write_workers == 1
+        assert config.pool_size == 9
+        assert config.keep_alive is True
+        assert config.request_timeout == 10.0
+        assert config.max_retries == 3
+        assert config.report_path is None
+        assert config.read_clients == []
+    
+    @patch.dict(os.environ, {'SPOTIFY_EXCLUDE_SAVED': '1'}, clear=True)
+    @patch('infrastructure.config.load_dotenv')
+    def test_config_exclude_saved_scope(self, mock_load_dotenv):
+        """Test que l'exclusion de la bibliothèque demande le scope de lecture"""
+        config = SpotifyConfig()
+        
+        assert config.exclude_saved is True
+        assert config.scope.split() == ['playlist-modify-public', 'playlist-modify-private', 'user-library-read']
+        assert config.saved_tracks_ttl == 86400
+    
+    @patch.dict(os.environ, {
+        'SPOTIFY_INCLUDE_GENRES': 'metal, ,hardcore',
+        'SPOTIFY_MIN_POPULARITY': '30'
+    }, clear=True)
+    @patch('infrastructure.config.load_dotenv')
+    def test_config_artist_criteria(self, mock_load_dotenv):
+        """Test de la lecture des critères de genre et de popularité"""
+        config = SpotifyConfig()
+        
+        assert config.include_genres == ['metal', 'hardcore']
+        assert config.exclude_genres == []
+        assert config.min_popularity == 30
+    
+    def test_parse_client_pairs(self):
+        """Test de la lecture des applications de lecture supplémentaires"""
+        assert parse_client_pairs(" id2:secret2, id3:secret3 ,") == [('id2', 'secret2'), ('id3', 'secret3')]
+        with pytest.raises(ValueError):
+            parse_client_pairs("id2")
+    
+    @patch.dict(os.environ, {
+        'SPOTIFY_MAX_WORKERS': '16',
+        'SPOTIFY_KEEP_ALIVE': '0',
+        'SPOTIFY_REQUEST_TIMEOUT': '2.5'
+    }, clear=True)
+    @patch('infrastructure.config.load_dotenv')
+    def test_config_transport_from_env(self, mock_load_dotenv):
+        """Test que le pool suit le nombre de workers configuré"""
+        config = SpotifyConfig()
+        
+        assert config.max_workers == 16
+        assert config.pool_size == 17
+        assert config.keep_alive is False
+        assert config.request_timeout == 2.5
+
+
+class TestTransport:
+    """Tests pour build_session"""
+    
+    def test_session_pool_and_retries(self):
+        """Test du dimensionnement du pool et des relances de l'adaptateur"""
+        config = SpotifyConfig()
+        config.pool_size = 12
+        config.max_retries = 4
+        
+        session = build_session(config)
+        adapter = session.get_adapter('https://api.spotify.com/v1/search')
+        
+        assert adapter._pool_maxsize == 12
+        assert adapter._pool_block is True
+        assert adapter.max_retries.total == 4
+        assert 429 not in adapter.max_retries.status_forcelist
+        assert adapter._pool_connections == 2
+        assert session.headers['Connection'] == 'keep-alive'
+        assert session.headers['Accept-Encoding'] == 'gzip'
+    
+    def test_writes_are_not_replayed_on_server_error(self):
+        """Test que seules les lectures sont relancées sur 5xx, et aucune requête sur 429"""
+        retry = build_session(SpotifyConfig()).get_adapter('https://api.spotify.com/v1/search').max_retries
+        
+        assert retry.is_retry('GET', 502)
+        assert not retry.is_retry('POST', 502)
+        assert not retry.is_retry('PUT', 500)
+        assert not retry.is_retry('GET', 429)
+        assert not retry.is_retry('POST', 429)
+    
+    @staticmethod
+    def serve(status, headers):
+        """Serveur local qui répond toujours status ; retourne le serveur et la liste des requêtes"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        requests_seen = []
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                requests_seen.append(self.path)
+                body = json.dumps({'error': {'status': status, 'message': 'error'}}).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server, requests_seen
+    
+    @pytest.mark.parametrize("status, headers, attempts, kind, retry_after", [
+        (429, {'Retry-After': '1'}, 1, 'rate_limited', 1.0),
+        (503, {}, 3, 'transient', None),
+    ])
+    def test_real_response_reaches_repository(self, status, headers, attempts, kind, retry_after):
+        """Test qu'un 429 remonte aussitôt avec Retry-After, et qu'un 5xx relancé garde son statut"""
+        config = SpotifyConfig()
+        config.max_retries = 2
+        config.backoff_factor = 0
+        server, requests_seen = self.serve(status, headers)
+        try:
+            client = spotipy.Spotify(auth='token', requests_session=build_session(config))
+            client.prefix = f'http://127.0.0.1:{server.server_port}/v1/'
+            with pytest.raises(SpotifyException) as raised:
+                client.search('artist:x', type='artist')
+        finally:
+            server.shutdown()
+            server.server_close()
+        
+        error = translate_error(raised.value)
+        assert len(requests_seen) == attempts
+        assert (error.kind, getattr(error, 'retry_after', None)) == (kind, retry_after)
+    
+    def test_session_without_keep_alive(self):
+        """Test de la désactivation des connexions persistantes"""
+        config = SpotifyConfig()
+        config.keep_alive = False
+        
+        session = build_session(config)
+        
+        assert session.headers['Connection'] == 'close'
+    
+    def test_session_with_cassette(self, tmp_path):
+        """Test que la cassette enveloppe l'adaptateur réel à l'enregistrement"""
+        config = SpotifyConfig()
+        config.cassette_path = str(tmp_path / "run.cassette.gz")
+        config.cassette_mode = 'record'
+        
+        adapter = build_session(config).get_adapter('https://api.spotify.com/v1/search')
+        
+        assert isinstance(adapter, CassetteAdapter)
+        assert adapter.inner.max_retries.total == config.max_retries
+        assert config.offline is False
+
+
+class TestCassette:
+    """Tests pour l'enregistrement et le rejeu des échanges HTTP"""
+    
+    @staticmethod
+    def config(tmp_path, mode, name, prefix='http://127.0.0.1:9/v1/'):
+        """Configuration d'une exécution enregistrée ou rejouée, sans credentials"""
+        config = SpotifyConfig()
+        config.client_id = config.client_secret = None
+        config.cassette_path = str(tmp_path / "run.cassette.gz")
+        config.cassette_mode = mode
+        config.cassette_latency_scale = 0.0
+        config.api_prefix = prefix
+        config.data_cache_dir = str(tmp_path / name)
+        return config
+    
+    @staticmethod
+    def prepare(method, url, payload=None):
+        return requests.Request(method, url, json=payload).prepare()
+    
+    def test_request_key_is_normalized(self):
+        """Test que la clé ignore l'hôte, l'ordre des paramètres et des clés JSON"""
+        first = request_key(self.prepare('GET', 'https://api.spotify.com/v1/search?type=artist&q=Gojira'))
+        second = request_key(self.prepare('GET', 'http://127.0.0.1:8000/v1/search/?q=Gojira&type=artist'))
+        assert first == second == 'GET /search?q=Gojira&type=artist'
+        
+        put_a = request_key(self.prepare('PUT', 'https://x/v1/playlists/p1', {'name': 'A', 'description': 'B'}))
+        put_b = request_key(self.prepare('PUT', 'https://y/v1/playlists/p1', {'description': 'B', 'name': 'A'}))
+        put_c = request_key(self.prepare('PUT', 'https://y/v1/playlists/p1', {'description': 'C', 'name': 'A'}))
+        assert put_a == put_b != put_c
+    
+    def test_repeated_responses_replayed_in_order(self, tmp_path):
+        """Test que les réponses successives d'une même requête sont rejouées dans l'ordre"""
+        cassette = Cassette(str(tmp_path / "c.gz"))
+        for body in ('A', 'A', 'B'):
+            cassette.record('GET /me', 200, {}, body, 0.01)
+        
+        replayed = Cassette(str(tmp_path / "c.gz"))
+        
+        assert [replayed.next('GET /me')['b'] for _ in range(4)] == ['A', 'A', 'B', 'B']
+        assert replayed.next('GET /other') is None
+    
+    def test_replay_latency_and_miss(self, tmp_path):
+        """Test de la latence mise à l'échelle et d'une requête absente"""
+        cassette = Cassette(str(tmp_path / "c.gz"))
+        cassette.record('GET /me', 200, {'Content-Type': 'application/json'}, '{"id": "u1"}', 0.2)
+        sleep = Mock()
+        session = requests.Session()
+        session.mount('https://', CassetteAdapter(cassette, 'replay', latency_scale=0.5, sleep=sleep))
+        
+        assert session.get('https://api.spotify.com/v1/me').json() == {'id': 'u1'}
+        sleep.assert_called_once_with(0.1)
+        with pytest.raises(CassetteMissError):
+            session.get('https://api.spotify.com/v1/me/playlists')
+    
+    def test_full_flow_replayed_offline(self, tmp_path):
+        """Test qu'une exécution complète enregistrée se rejoue sans réseau ni credentials"""
+        artists = InlineArtistRepository(["Gojira", "Mass Hysteria", "Ultra Vomit"])
+        
+        with FakeSpotifyServer() as server:
+            recording = SpotifyRepository(self.config(tmp_path, 'record', 'recorded', server.prefix))
+            recording._client = spotipy.Spotify(auth='fake-token', requests_session=recording._session)
+            recording._client.prefix = server.prefix
+            recorded = CreatePlaylistFromArtistsUseCase(recording, artists, sleep=Mock()).run(
+                "Hellfest", max_tracks_per_artist=3, require_confirmation=False, order_by_features=True
+            )
+        
+        config = self.config(tmp_path, 'replay', 'replayed')
+        assert config.is_valid()
+        replaying = SpotifyRepository(config)
+        replaying.connect()
+        replayed = CreatePlaylistFromArtistsUseCase(replaying, artists, sleep=Mock()).run(
+            "Hellfest", max_tracks_per_artist=3, require_confirmation=False, order_by_features=True
+        )
+        
+        assert recorded.outcome == replayed.outcome == 'created'
+        assert replayed.playlist_url == recorded.playlist_url
+        assert replayed.track_count == recorded.track_count == 9
+        assert replayed.api == recorded.api
+
+
+class FakeClock:
+    """Horloge contrôlée par le test"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        """Attente simulée : avance l'horloge"""
+        self.now += seconds
+
+
+class TestProgressReporters:
+    """Tests pour les implémentations du suivi de progression"""
+    
+    def test_bar_throttles_renders(self):
+        """Test que l'avancement n'est affiché qu'une fois par intervalle"""
+        stream = io.StringIO()
+        clock = FakeClock()
+        progress = ProgressBarReporter(stream, min_interval=1.0, width=10, clock=clock)
+        
+        progress.start("Recherche", total=100)
+        for i in range(100):
+            clock.now = i * 0.05
+            progress.advance(f"Artist {i}")
+        progress.finish()
+        
+        lines = stream.getvalue().splitlines()
+        # Premier affichage, un rafraîchissement par seconde écoulée, affichage final
+        assert len(lines) == 1 + 4 + 1
+        assert lines[-1] == "Recherche ██████████ 100/100 · Artist 99"
+    
+    def test_bar_filters_by_level(self):
+        """Test que les messages de détail sont masqués au niveau INFO"""
+        stream = io.StringIO()
+        progress = ProgressBarReporter(stream)
+        
+        progress.debug("détail")
+        progress.warning("⚠️  attention")
+        
+        assert stream.getvalue() == "⚠️  attention\n"
+    
+    def test_bar_redraws_in_place_on_terminal(self):
+        """Test que la barre est effacée avant un message sur un terminal"""
+        stream = io.StringIO()
+        stream.isatty = lambda: True
+        progress = ProgressBarReporter(stream, width=4, clock=FakeClock())
+        
+        progress.start("Recherche", total=2)
+        progress.info("message")
+        
+        output = stream.getvalue()
+        assert output.startswith("Recherche ░░░░ 0/2\r")
+        assert "message\n" in output
+        assert "\n" not in output.split("message\n")[1]
+    
+    def test_logging_strips_decoration_and_throttles(self, caplog):
+        """Test que les messages journalisés sont débarrassés des émojis"""
+        clock = FakeClock()
+        progress = LoggingProgressReporter(logging.getLogger('test.progress'), min_interval=5.0, clock=clock)
+        
+        with caplog.at_level(logging.INFO, logger='test.progress'):
+            progress.info("\n🔍 Recherche des morceaux...")
+            progress.debug("détail masqué")
+            progress.start("Recherche", total=10)
+            for i in range(10):
+                clock.now = i
+                progress.advance()
+            progress.finish()
+        
+        messages = [record.getMessage() for record in caplog.records]
+        assert messages[0] == "Recherche des morceaux..."
+        assert messages[1:] == [
+            "Recherche: 0/10 (en cours)",
+            "Recherche: 6/10 (en cours)",
+            "Recherche: 10/10 (terminé)",
+        ]
+    
+    @pytest.mark.parametrize("mode, expected", [
+        ('silent', NullProgressReporter),
+        ('bar', ProgressBarReporter),
+        ('log', LoggingProgressReporter),
+        ('auto', LoggingProgressReporter),
+    ])
+    def test_create_progress_reporter(self, mode, expected):
+        """Test du choix de l'implémentation (auto : journalisation hors terminal)"""
+        assert type(create_progress_reporter(mode, 'warning', stream=io.StringIO())) is expected
+    
+    def test_create_progress_reporter_unknown_mode(self):
+        """Test d'un mode inconnu"""
+        with pytest.raises(ValueError):
+            create_progress_reporter('fancy')
+
+
+class TestClientDispatcher:
+    """Tests pour ClientDispatcher (répartition entre applications)"""
+    
+    def test_spreads_by_remaining_budget(self):
+        """Test que les appels vont au client qui a le plus de budget restant"""
+        dispatcher = ClientDispatcher(budget=10, window=30.0, clock=FakeClock())
+        
+        chosen = [dispatcher.choose(['a', 'b', 'c']) for _ in range(6)]
+        
+        assert chosen == ['a', 'b', 'c', 'a', 'b', 'c']
+        assert dispatcher.remaining('a') == 8
+    
+    def test_budget_recovers_after_window(self):
+        """Test que les appels sortent du budget après la fenêtre glissante"""
+        clock = FakeClock()
+        dispatcher = ClientDispatcher(budget=2, window=30.0, clock=clock)
+        dispatcher.choose(['a'])
+        dispatcher.choose(['a'])
+        assert dispatcher.remaining('a') == 0
+        
+        clock.now += 30.0
+        
+        assert dispatcher.remaining('a') == 2
+    
+    def test_penalized_client_is_skipped(self):
+        """Test qu'un client limité est écarté jusqu'à la fin de Retry-After"""
+        clock = FakeClock()
+        dispatcher = ClientDispatcher(budget=10, clock=clock)
+        dispatcher.penalize('a', retry_after=5.0)
+        
+        assert [dispatcher.choose(['a', 'b']) for _ in range(3)] == ['b', 'b', 'b']
+        clock.now += 5.0
+        assert dispatcher.choose(['a', 'b']) == 'a'
+    
+    def test_penalty_without_retry_after_is_short(self):
+        """Test qu'un 429 sans Retry-After écarte le client brièvement, pas pour toute la fenêtre"""
+        clock = FakeClock()
+        dispatcher = ClientDispatcher(window=30.0, clock=clock)
+        dispatcher.penalize('a')
+        
+        assert dispatcher.choose(['a', 'b']) == 'b'
+        clock.now += ClientDispatcher.DEFAULT_PENALTY
+        assert dispatcher.choose(['a', 'b']) == 'a'
+    
+    def test_all_penalized_waits_for_earliest_unblocked(self):
+        """Test que, tous les clients étant limités, l'appel attend le premier débloqué"""
+        clock = FakeClock()
+        dispatcher = ClientDispatcher(clock=clock, sleep=clock.sleep)
+        dispatcher.penalize('a', retry_after=10.0)
+        dispatcher.penalize('b', retry_after=2.0)
+        
+        assert dispatcher.choose(['a', 'b']) == 'b'
+        assert clock.now == 2.0
+    
+    def test_exhausted_budgets_wait_for_window(self):
+        """Test que, tous les budgets étant épuisés, l'appel attend qu'un appel sorte de la fenêtre"""
+        clock = FakeClock()
+        dispatcher = ClientDispatcher(budget=2, window=30.0, clock=clock, sleep=clock.sleep)
+        dispatcher.choose(['a', 'b'])
+        clock.now = 5.0
+        dispatcher.choose(['a', 'b'])
+        dispatcher.choose(['a', 'b'])
+        dispatcher.choose(['a', 'b'])
+        
+        assert dispatcher.choose(['a', 'b']) == 'a'
+        assert clock.now == 30.0
+        assert dispatcher.remaining('a') == 0
+    
+    def test_zero_budget_only_spreads(self):
+        """Test qu'un budget nul répartit les appels sans jamais attendre"""
+        clock = FakeClock()
+        sleep = Mock()
+        dispatcher = ClientDispatcher(budget=0, clock=clock, sleep=sleep)
+        
+        assert [dispatcher.choose(['a', 'b']) for _ in range(4)] == ['a', 'b', 'a', 'b']
+        sleep.assert_not_called()
+
+
+class TestAtomicFile:
+    """Tests pour l'écriture atomique de fichiers"""
+    
+    def test_concurrent_writers_never_share_a_temporary_file(self, tmp_path):
+        """Test que des écritures simultanées laissent un fichier complet et aucun fichier temporaire"""
+        path = str(tmp_path / "state.json")
+        payloads = [{'writer': i, 'uris': [f'spotify:track:{j}' for j in range(2000)]} for i in range(8)]
+        threads = [threading.Thread(target=write_json_atomic, args=(path, payload)) for payload in payloads]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        with open(path, encoding='utf-8') as f:
+            assert json.load(f) in payloads
+        assert os.listdir(tmp_path) == ["state.json"]
+    
+    def test_failed_write_keeps_previous_content(self, tmp_path):
+        """Test qu'une écriture en échec laisse le fichier d'origine intact"""
+        path = tmp_path / "state.json"
+        write_atomic(str(path), "ancien")
+        
+        with patch('infrastructure.atomic_file.os.replace', side_effect=OSError("disque plein")):
+            with pytest.raises(OSError):
+                write_json_atomic(str(path), {'a': 1})
+        
+        assert path.read_text() == "ancien"
+        assert os.listdir(tmp_path) == ["state.json"]
+
+
+class TestJsonRefreshStateRepository:
+    """Tests pour JsonRefreshStateRepository"""
+    
+    def test_round_trip(self, tmp_path):
+        """Test que l'état enregistré est relu à l'identique"""
+        repo = JsonRefreshStateRepository(str(tmp_path / "refresh"))
+        state = RefreshState(
+            playlist_name="Hellfest / 2026",
+            file_fingerprint="abc",
+            max_tracks_per_artist=5,
+            playlist_id="pl1",
+            track_uris=["spotify:track:1"],
+            artists=[ResolvedArtist("Gojira", "g1", "Gojira", [Track(uri="spotify:track:1", name="Amazonia")], 10.0)],
+            updated_at=10.0,
+            snapshot_ids={"pl1": "snap1"},
+            related=[ResolvedArtist("Mass Hysteria", "m1", genres=["metal"], popularity=40)]
+        )
+        
+        repo.save(state)
+        
+        assert repo.load("Hellfest / 2026") == state
+        assert repo.load("Autre playlist") is None
+    
+    def test_unreadable_state(self, tmp_path):
+        """Test qu'un état illisible est ignoré"""
+        repo = JsonRefreshStateRepository(str(tmp_path))
+        with open(repo.path("Hellfest"), 'w') as f:
+            f.write("{")
+        
+        assert repo.load("Hellfest") is None
+
+
+class TestJsonMembershipIndexRepository:
+    """Tests pour JsonMembershipIndexRepository"""
+    
+    def test_round_trip(self, tmp_path):
+        """Test que l'index enregistré est relu avec sa version"""
+        repo = JsonMembershipIndexRepository(str(tmp_path / "exclusion"))
+        repo.save(PlaylistIndex('set/1', {'pl1': 'snap'}, ExactIndex(['spotify:track:1'])))
+        
+        entry = repo.load('set/1')
+        
+        assert entry.snapshots == {'pl1': 'snap'}
+        assert 'spotify:track:1' in entry.index
+        assert repo.load('pl2') is None
+    
+    def test_unreadable_index(self, tmp_path):
+        """Test qu'un index illisible est ignoré"""
+        repo = JsonMembershipIndexRepository(str(tmp_path))
+        with open(repo.path('pl1'), 'w') as f:
+            f.write('{"key": "pl1"}')
+        
+        assert repo.load('pl1') is None
+
+
+class TestPlaylistMirror:
+    """Tests pour PlaylistMirror"""
+    
+    def test_round_trip_and_discard(self, tmp_path):
+        """Test que la copie locale est relue avec sa version puis supprimée"""
+        mirror = PlaylistMirror(str(tmp_path / "playlists"))
+        mirror.save('pl1', 'snap', ['spotify:track:1', None])
+        
+        assert mirror.load('pl1').snapshot_id == 'snap'
+        assert mirror.load('pl1').uris == ['spotify:track:1', None]
+        mirror.discard('pl1')
+        mirror.discard('pl1')
+        assert mirror.load('pl1') is None
+    
+    def test_unreadable_mirror(self, tmp_path):
+        """Test qu'une copie illisible est ignorée"""
+        mirror = PlaylistMirror(str(tmp_path))
+        with open(mirror.path('pl1'), 'w') as f:
+            f.write('{"uris": []}')
+        
+        assert mirror.load('pl1') is None
+
+
+class TestPhaseProfiler:
+    """Tests pour PhaseProfiler"""
+    
+    @staticmethod
+    def busy(n):
+        return sorted(str(i) for i in range(n))
+    
+    def test_writes_profiles_per_phase(self, tmp_path):
+        """Test des profils CPU (threads compris) et des allocations de chaque phase"""
+        profiler = PhaseProfiler(str(tmp_path / "profiles"), top=5)
+        report = RunReport(playlist_name="P", started_at="now")
+        report.observe(profiler)
+        
+        with report.phase('load'):
+            kept = self.busy(20000)
+        with report.phase('resolve'):
+            with report.phase('write'):
+                workers = [threading.Thread(target=self.busy, args=(20000,)) for _ in range(2)]
+                for worker in workers:
+                    worker.start()
+                for worker in workers:
+                    worker.join()
+        summary = json.loads(open(profiler.close(), encoding='utf-8').read())
+        
+        # La phase imbriquée est comptée dans la phase englobante
+        assert [phase['phase'] for phase in summary['phases']] == ['load', 'resolve']
+        assert summary['phases'][1]['threads'] == 2
+        assert summary['phases'][0]['memory_delta'] > 0 and kept
+        names = sorted(os.listdir(tmp_path / "profiles"))
+        assert names == [
+            '01-load.alloc.txt', '01-load.prof', '01-load.txt',
+            '02-resolve.alloc.txt', '02-resolve.prof', '02-resolve.txt',
+            'summary.json',
+        ]
+        assert 'busy' in (tmp_path / "profiles" / "02-resolve.txt").read_text(encoding='utf-8')
+        assert 'test_infrastructure.py' in (tmp_path / "profiles" / "01-load.alloc.txt").read_text(encoding='utf-8')
+        assert set(report.phases) == {'load', 'resolve', 'write'}
+    
+    def test_disabled_by_default(self):
+        """Test qu'un rapport sans observateur ne démarre aucun suivi"""
+        report = RunReport(playlist_name="P", started_at="now")
+        
+        with report.phase('load'):
+            assert not tracemalloc.is_tracing()
+        assert 'load' in report.phases
+
+
+class TestJsonLinesCache:
+    """Tests pour JsonLinesCache"""
+    
+    def test_set_and_reload(self, tmp_path):
+        """Test que les valeurs sont relues depuis le fichier"""
+        path = str(tmp_path / "sub" / "cache.jsonl")
+        cache = JsonLinesCache(path)
+        cache.set("a", {"x": 1})
+        cache.set_many({"b": None, "a": {"x": 2}})
+        
+        reloaded = JsonLinesCache(path)
+        assert reloaded.get("a") == {"x": 2}
+        assert "b" in reloaded
+        assert reloaded.get("b") is None
+        assert len(reloaded) == 2
+    
+    def test_in_memory_cache(self):
+        """Test d'un cache sans fichier"""
+        cache = JsonLinesCache()
+        cache.set("a", 1)
+        cache.set_many({})
+        assert cache.get("a") == 1
+        assert cache.get("missing", "default") == "default"
+    
+    def test_truncated_line_ignored(self, tmp_path):
+        """Test qu'une ligne tronquée est ignorée au chargement"""
+        path = tmp_path / "cache.jsonl"
+        path.write_text('{"k": "a", "v": 1}\n{"k": "b", "v"')
+        cache = JsonLinesCache(str(path))
+        assert cache.get("a") == 1
+        assert "b" not in cache
+    
+    def test_superseded_lines_are_compacted(self, tmp_path):
+        """Test que le fichier est réécrit au chargement une fois les lignes remplacées majoritaires"""
+        path = tmp_path / "cache.jsonl"
+        cache = JsonLinesCache(str(path), compact_threshold=5)
+        for i in range(6):
+            cache.set_many({"a": i, "b": -i})
+        
+        assert len(JsonLinesCache(str(path), compact_threshold=20)) == 2
+        assert len(path.read_text().splitlines()) == 12
+        
+        compacted = JsonLinesCache(str(path), compact_threshold=5)
+        assert compacted.get("a") == 5
+        assert path.read_text().splitlines() == ['{"k": "a", "v": 5}', '{"k": "b", "v": -5}']
+        compacted.set("c", 1)
+        assert JsonLinesCache(str(path)).get("c") == 1
+    
+    def test_relative_path_without_directory(self, tmp_path, monkeypatch):
+        """Test d'un fichier de cache dans le répertoire courant"""
+        monkeypatch.chdir(tmp_path)
+        cache = JsonLinesCache("cache.jsonl")
+        cache.set("a", 1)
+        assert (tmp_path / "cache.jsonl").exists()
+
+
+def run_concurrently(callers, target, wait_until):
+    """
+    Lance `callers` threads sur `target` et libère l'appel partagé une fois
+    la condition `wait_until` atteinte
+    
+    Returns:
+        Liste des résultats (ou exceptions) de chaque thread
+    """
+    results = [None] * callers
+    
+    def worker(index):
+        try:
+            results[index] = target()
+        except Exception as e:
+            results[index] = e
+    
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while not wait_until() and time.monotonic() < deadline:
+        time.sleep(0.001)
+    return threads, results
+
+
+class TestSingleFlight:
+    """Tests pour SingleFlight"""
+    
+    def test_concurrent_callers_share_one_call(self):
+        """Test que les appelants concurrents d'une même clé partagent l'appel"""
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+        
+        def slow_call():
+            calls.append(1)
+            release.wait(5)
+            return "result"
+        
+        threads, results = run_concurrently(
+            5,
+            lambda: flight.do("key", slow_call),
+            lambda: "key" in flight._calls and flight._calls["key"].followers == 4
+        )
+        release.set()
+        for thread in threads:
+            thread.join()
+        
+        assert calls == [1]
+        assert results == ["result"] * 5
+        assert flight.shared_count == 4
+        assert flight._calls == {}
+    
+    def test_error_shared_with_followers(self):
+        """Test que l'exception est transmise à tous les appelants"""
+        flight = SingleFlight()
+        release = threading.Event()
+        
+        def failing_call():
+            release.wait(5)
+            raise ValueError("boom")
+        
+        threads, results = run_concurrently(
+            3,
+            lambda: flight.do("key", failing_call),
+            lambda: "key" in flight._calls and flight._calls["key"].followers == 2
+        )
+        release.set()
+        for thread in threads:
+            thread.join()
+        
+        assert all(isinstance(result, ValueError) for result in results)
+        
+        # Une fois l'appel terminé, un nouvel appel est exécuté
+        assert flight.do("key", lambda: "retry") == "retry"
+    
+    def test_different_keys_not_shared(self):
+        """Test que des clés différentes ne sont pas regroupées"""
+        flight = SingleFlight()
+        assert flight.do("a", lambda: 1) == 1
+        assert flight.do("b", lambda: 2) == 2
+        assert flight.shared_count == 0
 
 
 class TestArtistFileRepository:
     """Tests pour ArtistFileRepository"""
     
+    def test_inline_repository_normalizes_and_dedupes(self):
+        """Test d'une liste d'artistes fournie directement"""
+        repo = InlineArtistRepository(["  Gojira ", "GOJIRA", "", "Mass  Hysteria"])
+        
+        assert repo.load_artists("ignoré.txt") == ["Gojira", "Mass Hysteria"]
+    
+    def test_fingerprint(self, tmp_path):
+        """Test que l'empreinte du fichier change avec son contenu"""
+        test_file = tmp_path / "test_artists.txt"
+        test_file.write_text("Gojira\n")
+        repo = ArtistFileRepository()
+        
+        first = repo.fingerprint(str(test_file))
+        assert first == repo.fingerprint(str(test_file))
+        test_file.write_text("Gojira\nMass Hysteria\n")
+        assert repo.fingerprint(str(test_file)) != first
+        assert repo.fingerprint(str(tmp_path / "absent.txt")) is None
+    
     def test_load_artists_from_existing_file(self, tmp_path):
         """Test du chargement d'artistes depuis un fichier existant"""
         test_file = tmp_path / "test_artists.txt"
@@ -91,6 +850,132 @@ class TestArtistFileRepository:
         assert "Iron Maiden" in artists
         assert "Metallica" in artists
         mock_file.assert_called()
+    
+    def test_iter_artists_is_lazy(self, tmp_path):
+        """Test que les artistes sont produits au fil de la lecture"""
+        test_file = tmp_path / "test_artists.txt"
+        test_file.write_text("Artist1\nArtist2\n")
+        
+        iterator = ArtistFileRepository().iter_artists(str(test_file))
+        
+        assert next(iterator) == "Artist1"
+        assert list(iterator) == ["Artist2"]
+    
+    def test_load_artists_normalizes_and_deduplicates(self, tmp_path):
+        """Test de la normalisation des espaces et de la déduplication"""
+        test_file = tmp_path / "test_artists.txt"
+        test_file.write_text("Ultra  Vomit\nULTRA VOMIT \nGojira\n  gojira\n")
+        
+        artists = ArtistFileRepository().load_artists(str(test_file))
+        
+        assert artists == ["Ultra Vomit", "Gojira"]
+    
+    def test_load_artists_csv_with_header(self, tmp_path):
+        """Test d'un export CSV avec colonne d'artiste nommée"""
+        test_file = tmp_path / "lineup.csv"
+        test_file.write_text("# export\nday,Artist,stage\nfri,Gojira,Mainstage\nsat,\"Crosby, Stills\",Valley\nsun\n")
+        
+        artists = ArtistFileRepository().load_artists(str(test_file))
+        
+        assert artists == ["Gojira", "Crosby, Stills"]
+    
+    def test_load_artists_csv_without_header(self, tmp_path):
+        """Test d'un CSV sans en-tête : première colonne"""
+        test_file = tmp_path / "lineup.csv"
+        test_file.write_text("Gojira,fri\n\nMastodon,sat\n")
+        
+        artists = ArtistFileRepository().load_artists(str(test_file))
+        
+        assert artists == ["Gojira", "Mastodon"]
+    
+    def test_load_artists_csv_header_without_artist_column(self, tmp_path):
+        """Test qu'un en-tête sans colonne d'artiste est refusé au lieu d'être lu comme un artiste"""
+        test_file = tmp_path / "lineup.csv"
+        test_file.write_text("Performer,Day,Stage\nGojira,fri,Mainstage\n")
+        
+        with pytest.raises(ValueError, match="colonne d'artiste"):
+            ArtistFileRepository().load_artists(str(test_file))
+    
+    def test_load_artists_jsonl_gzip(self, tmp_path):
+        """Test d'un export JSONL compressé"""
+        test_file = tmp_path / "lineup.jsonl.gz"
+        lines = [
+            json.dumps({"name": "Gojira", "festival": "Hellfest"}),
+            "",
+            "not json",
+            json.dumps("Mastodon"),
+            json.dumps({"festival": "Hellfest"}),
+            json.dumps(["list"]),
+            json.dumps({"artist": "gojira"}),
+        ]
+        with gzip.open(test_file, 'wt', encoding='utf-8') as f:
+            f.write("\n".join(lines))
+        
+        artists = ArtistFileRepository().load_artists(str(test_file))
+        
+        assert artists == ["Gojira", "Mastodon"]
+    
+    def test_bounded_seen_set(self):
+        """Test que l'ensemble oublie les entrées les plus anciennes au-delà de sa taille"""
+        seen = BoundedSeenSet(max_size=2)
+        
+        assert seen.add("a") is True
+        assert seen.add("a") is False
+        assert seen.add("b") is True
+        assert seen.add("c") is True
+        assert seen.add("a") is True
+
+
+class InMemoryPlaylistClient:
+    """Client simulant une playlist : une insertion au-delà de la fin est refusée (HTTP 400)"""
+    
+    def __init__(self, reject=(), fail=()):
+        self.items = []
+        self.version = 0
+        self.reads = 0
+        # Positions refusées une fois (HTTP 400), ou en échec après écriture (HTTP 502)
+        self.reject = set(reject)
+        self.fail = set(fail)
+        self._lock = threading.Lock()
+    
+    @property
+    def snapshot_id(self):
+        return f'snapshot-{self.version}'
+    
+    def _changed(self):
+        self.version += 1
+        return {'snapshot_id': self.snapshot_id}
+    
+    def playlist_replace_items(self, playlist_id, uris):
+        with self._lock:
+            self.items[:] = uris
+            return self._changed()
+    
+    def playlist_add_items(self, playlist_id, uris, position=None):
+        with self._lock:
+            position = len(self.items) if position is None else position
+            if position in self.reject or position > len(self.items):
+                self.reject.discard(position)
+                raise SpotifyException(400, -1, 'Index out of bounds')
+            self.items[position:position] = uris
+            if position in self.fail:
+                self.fail.discard(position)
+                raise SpotifyException(502, -1, 'Bad gateway')
+            return self._changed()
+    
+    def playlist_remove_specific_occurrences_of_items(self, playlist_id, tracks):
+        with self._lock:
+            positions = {position for track in tracks for position in track['positions']}
+            self.items[:] = [uri for position, uri in enumerate(self.items) if position not in positions]
+            return self._changed()
+    
+    def playlist_items(self, playlist_id, fields=None, limit=100, offset=0, additional_types=None):
+        with self._lock:
+            self.reads += 1
+            return {
+                'items': [{'track': {'uri': uri}} for uri in self.items[offset:offset + limit]],
+                'next': 'more' if offset + limit < len(self.items) else None,
+            }
 
 
 class TestSpotifyRepository:
@@ -245,6 +1130,193 @@ class TestSpotifyRepository:
         repo.clear_playlist('playlist123')
         
         assert mock_client.playlist_remove_all_occurrences_of_items.called
+        # Seules les URIs des morceaux sont demandées
+        assert mock_client.playlist_items.call_args.kwargs['fields'] == 'items(track(uri)),next'
+        assert mock_client.playlist_items.call_args.kwargs['additional_types'] == ('track',)
+    
+    def test_get_playlist_track_uris_keeps_positions(self):
+        """Test que les éléments indisponibles gardent leur position"""
+        repo = SpotifyRepository(SpotifyConfig())
+        mock_client = Mock()
+        mock_client.playlist_items.return_value = {
+            'items': [{'track': {'uri': 'spotify:track:1'}}, {'track': None}, {'track': {'uri': 'spotify:track:2'}}],
+            'next': None
+        }
+        repo._client = mock_client
+        
+        assert repo.get_playlist_track_uris('playlist123') == ['spotify:track:1', None, 'spotify:track:2']
+    
+    def test_apply_playlist_diff(self):
+        """Test que les suppressions partent de la fin et les insertions sont positionnées"""
+        repo = SpotifyRepository(SpotifyConfig())
+        mock_client = Mock()
+        repo._client = mock_client
+        diff = compute_playlist_diff(['a', 'b', 'c', 'd'], ['x', 'a', 'c'])
+        
+        repo.apply_playlist_diff('playlist123', diff)
+        
+        removed = mock_client.playlist_remove_specific_occurrences_of_items.call_args[0][1]
+        assert removed == [{'uri': 'd', 'positions': [3]}, {'uri': 'b', 'positions': [1]}]
+        mock_client.playlist_add_items.assert_called_once_with('playlist123', ['x'], position=0)
+    
+    def test_replace_playlist_tracks(self):
+        """Test du remplacement complet par lots de 100"""
+        repo = SpotifyRepository(SpotifyConfig())
+        mock_client = Mock()
+        repo._client = mock_client
+        uris = [f'spotify:track:{i}' for i in range(150)]
+        
+        repo.replace_playlist_tracks('playlist123', uris)
+        
+        mock_client.playlist_replace_items.assert_called_once_with('playlist123', uris[:100])
+        assert mock_client.playlist_add_items.call_args[0][1] == uris[100:]
+    
+    def test_replace_playlist_tracks_appends_in_order(self):
+        """Test que les lots suivants sont ajoutés en fin de playlist, dans l'ordre"""
+        client = InMemoryPlaylistClient()
+        repo = SpotifyRepository(SpotifyConfig())
+        repo._client = client
+        uris = [f'spotify:track:{i}' for i in range(450)]
+        
+        repo.replace_playlist_tracks('playlist123', uris)
+        
+        assert client.items == uris
+        assert client.reads == 0
+        assert repo._snapshot_ids['playlist123'] == client.snapshot_id == 'snapshot-5'
+    
+    def test_replace_playlist_tracks_parallel_positions(self):
+        """Test que les lots suivants sont insérés en parallèle à leur position"""
+        mock_client = Mock()
+        mock_client.playlist_add_items.side_effect = lambda playlist_id, uris, position: {
+            'snapshot_id': f'snapshot-{position}'
+        }
+        repo = self.parallel_repository(mock_client)
+        uris = [f'spotify:track:{i}' for i in range(450)]
+        
+        repo.replace_playlist_tracks('playlist123', uris)
+        
+        inserted = sorted((call.kwargs['position'], call[0][1]) for call in mock_client.playlist_add_items.call_args_list)
+        assert inserted == [(position, uris[position:position + 100]) for position in (100, 200, 300, 400)]
+        assert repo._snapshot_ids['playlist123'] == 'snapshot-400'
+    
+    @staticmethod
+    def parallel_repository(client, workers=4):
+        """Repository écrivant les lots d'une playlist en parallèle"""
+        config = SpotifyConfig()
+        config.write_workers = workers
+        repo = SpotifyRepository(config)
+        repo._client = client
+        return repo
+    
+    def test_replace_playlist_tracks_conflict_resent(self):
+        """Test qu'un lot refusé pour conflit de position est renvoyé, sans relecture"""
+        client = InMemoryPlaylistClient(reject={300})
+        repo = self.parallel_repository(client)
+        uris = [f'spotify:track:{i}' for i in range(650)]
+        
+        repo.replace_playlist_tracks('playlist123', uris)
+        
+        assert client.items == uris
+        assert client.reads == 0
+        assert repo.get_stats()['write_conflicts'] >= 1
+        assert repo._snapshot_ids['playlist123'] == client.snapshot_id
+    
+    def test_replace_playlist_tracks_parallel_uncertain_rereads(self):
+        """Test qu'une erreur passagère en parallèle fait relire la playlist puis terminer lot par lot"""
+        client = InMemoryPlaylistClient(fail={200})
+        repo = self.parallel_repository(client)
+        uris = [f'spotify:track:{i}' for i in range(450)]
+        
+        repo.replace_playlist_tracks('playlist123', uris)
+        
+        assert client.items == uris
+        assert client.reads >= 1
+    
+    def test_replace_playlist_tracks_parallel_against_server(self):
+        """Test que l'écriture parallèle respecte l'ordre contre le faux serveur"""
+        uris = [f'spotify:track:{i:05d}' for i in range(2000)]
+        with FakeSpotifyServer(latency=0.002) as server:
+            repo = self.parallel_repository(None, workers=8)
+            repo._client = spotipy.Spotify(auth='fake-token', requests_session=repo._session)
+            repo._client.prefix = server.prefix
+            playlist_id = server.playlists.create('P', '')['id']
+            
+            repo.replace_playlist_tracks(playlist_id, uris)
+            
+            assert server.playlists.playlists[playlist_id]['items'] == uris
+    
+    def test_replace_playlist_tracks_interrupted_rereads(self):
+        """Test qu'une erreur après écriture fait relire la playlist puis écrire la différence restante"""
+        client = InMemoryPlaylistClient(fail={200})
+        repo = SpotifyRepository(SpotifyConfig())
+        repo._client = client
+        uris = [f'spotify:track:{i}' for i in range(450)]
+        
+        repo.replace_playlist_tracks('playlist123', uris)
+        
+        assert client.items == uris
+        assert client.reads >= 1
+    
+    def test_replace_playlist_tracks_against_server(self):
+        """Test de l'ordre final contre le faux serveur"""
+        uris = [f'spotify:track:{i:05d}' for i in range(2000)]
+        with FakeSpotifyServer(latency=0.002) as server:
+            repo = self.server_repository(server)
+            playlist_id = server.playlists.create('P', '')['id']
+            
+            repo.replace_playlist_tracks(playlist_id, uris)
+            
+            assert server.playlists.playlists[playlist_id]['items'] == uris
+            assert server.stats.requests == 20
+    
+    @staticmethod
+    def server_repository(server):
+        """Repository connecté au faux serveur (nouvelle exécution à chaque appel)"""
+        repo = SpotifyRepository(SpotifyConfig())
+        repo._client = spotipy.Spotify(auth='fake-token', requests_session=repo._session)
+        repo._client.prefix = server.prefix
+        return repo
+    
+    def test_playlist_mirror_skips_paged_read(self):
+        """Test qu'une playlist inchangée depuis la dernière écriture est relue en un appel"""
+        uris = [f'spotify:track:{i:05d}' for i in range(450)]
+        with FakeSpotifyServer() as server:
+            playlist_id = server.playlists.create('P', '')['id']
+            self.server_repository(server).replace_playlist_tracks(playlist_id, uris)
+            
+            rerun = self.server_repository(server)
+            assert rerun.get_playlist_track_uris(playlist_id) == uris
+            stats = rerun.get_stats()
+            assert (stats['api_calls'], stats['cache_hits.playlist_mirror']) == (1, 1)
+            
+            # Version déjà connue de l'appelant : aucun appel
+            known = self.server_repository(server)
+            assert known.get_playlist_track_uris(playlist_id, rerun.get_playlist_snapshot_id(playlist_id)) == uris
+            assert known.get_stats().get('api_calls', 0) == 0
+            
+            # Différence écrite : la copie locale suit le nouveau contenu
+            desired = uris[:10] + ['spotify:track:new'] + uris[10:]
+            rerun.apply_playlist_diff(playlist_id, compute_playlist_diff(uris, desired))
+            assert self.server_repository(server).get_playlist_track_uris(playlist_id) == desired
+            
+            # Modification hors de l'application : la playlist est relue entièrement
+            server.playlists.handle('POST', playlist_id, ['tracks'], {}, ['spotify:track:other'])
+            changed = self.server_repository(server)
+            assert changed.get_playlist_track_uris(playlist_id) == desired + ['spotify:track:other']
+            assert changed.get_stats()['cache_misses.playlist_mirror'] == 1
+            assert changed.get_stats()['api_calls.playlist_items'] == 5
+    
+    def test_playlist_mirror_requires_snapshot(self):
+        """Test qu'aucune copie n'est conservée sans version retournée par l'écriture"""
+        mock_client = Mock()
+        mock_client.playlist_replace_items.return_value = None
+        repo = SpotifyRepository(SpotifyConfig())
+        repo._client = mock_client
+        repo._mirror.save('playlist123', 'old', ['spotify:track:old'])
+        
+        repo.replace_playlist_tracks('playlist123', ['spotify:track:1'])
+        
+        assert repo._mirror.load('playlist123') is None
     
     def test_add_tracks_to_playlist(self):
         """Test d'ajout de morceaux à une playlist"""
@@ -301,6 +1373,10 @@ class TestSpotifyRepository:
         repo.connect()
         
         assert repo._client == mock_sp_instance
+        # Une seule session partagée par le client et l'authentification
+        assert mock_spotify_class.call_args.kwargs['requests_session'] is repo._session
+        assert mock_oauth_class.call_args.kwargs['requests_session'] is repo._session
+        assert mock_sp_instance.prefix == config.api_prefix
     
     @patch('infrastructure.spotify_repository.SpotifyOAuth')
     @patch('spotipy.Spotify')
@@ -421,31 +1497,37 @@ class TestSpotifyRepository:
         assert artist.found_name == 'Different Name'
     
     def test_find_artist_with_exception(self):
-        """Test _find_artist avec exception"""
+        """Test find_artist avec erreur réseau : erreur passagère typée"""
         config = SpotifyConfig()
         repo = SpotifyRepository(config)
         
         mock_client = Mock()
-        mock_client.search.side_effect = Exception("API Error")
+        mock_client.search.side_effect = requests.exceptions.ReadTimeout("API Error")
         repo._client = mock_client
         
-        artist = repo.find_artist("Test Artist")
+        with pytest.raises(TransientError):
+            repo.find_artist("Test Artist")
         
-        assert artist is None
+        # Une seule requête : la seconde stratégie n'est pas tentée après une erreur
+        mock_client.search.assert_called_once()
     
     def test_get_artist_top_tracks_exception(self):
-        """Test get_artist_top_tracks avec exception"""
+        """Test get_artist_top_tracks avec limite de requêtes atteinte"""
         config = SpotifyConfig()
         repo = SpotifyRepository(config)
         
         mock_client = Mock()
-        mock_client.artist_top_tracks.side_effect = Exception("API Error")
+        mock_client.artist_top_tracks.side_effect = SpotifyException(
+            429, -1, "API Error", headers={'Retry-After': '7'}
+        )
         repo._client = mock_client
         
         artist = Artist(name="Test Artist", spotify_id="artist_id")
-        tracks = repo.get_artist_top_tracks(artist)
+        with pytest.raises(RateLimitedError) as error:
+            repo.get_artist_top_tracks(artist)
         
-        assert tracks == []
+        assert error.value.retry_after == 7.0
+        assert error.value.retryable is True
     
     def test_get_artist_top_tracks_no_spotify_id(self):
         """Test get_artist_top_tracks sans spotify_id"""
@@ -486,6 +1568,53 @@ class TestSpotifyRepository:
         assert playlist_id == 'playlist2'
         assert mock_client.current_user_playlists.call_count == 2
     
+    def test_find_playlist_by_name_stops_paging_when_found(self):
+        """Test que les pages suivantes ne sont pas lues une fois la playlist trouvée"""
+        config = SpotifyConfig()
+        repo = SpotifyRepository(config)
+        
+        mock_client = Mock()
+        mock_client.current_user_playlists.return_value = {
+            'items': [{'id': 'playlist1', 'name': 'Target Playlist'}],
+            'next': 'https://api.spotify.com/v1/me/playlists?offset=50'
+        }
+        repo._client = mock_client
+        
+        assert repo.find_playlist_by_name("Target Playlist") == 'playlist1'
+        mock_client.current_user_playlists.assert_called_once()
+    
+    def test_find_playlists_by_name_single_pass(self):
+        """Test que plusieurs playlists sont cherchées en un seul parcours"""
+        config = SpotifyConfig()
+        repo = SpotifyRepository(config)
+        
+        mock_client = Mock()
+        mock_client.current_user_playlists.side_effect = [
+            {'items': [{'id': 'p2', 'name': 'P (part 2)'}], 'next': 'next'},
+            {'items': [{'id': 'p1', 'name': 'P'}, {'id': 'dup', 'name': 'P'}], 'next': None},
+        ]
+        repo._client = mock_client
+        
+        found = repo.find_playlists_by_name(["P", "P (part 2)", "P (part 3)"])
+        
+        assert found == {'P': 'p1', 'P (part 2)': 'p2'}
+        assert mock_client.current_user_playlists.call_count == 2
+    
+    def test_find_playlists_with_snapshot(self):
+        """Test que les playlists trouvées portent leur version (snapshot_id)"""
+        repo = SpotifyRepository(SpotifyConfig())
+        
+        mock_client = Mock()
+        mock_client.current_user_playlists.return_value = {
+            'items': [{'id': 'p1', 'name': 'P', 'description': 'D', 'snapshot_id': 's1'}], 'next': None
+        }
+        repo._client = mock_client
+        
+        found = repo.find_playlists(["P", "Q"])
+        
+        assert list(found) == ['P']
+        assert (found['P'].spotify_id, found['P'].snapshot_id, found['P'].description) == ('p1', 's1', 'D')
+    
     def test_clear_playlist_empty(self):
         """Test clear_playlist vide"""
         config = SpotifyConfig()
@@ -596,4 +1725,446 @@ class TestSpotifyRepository:
         
         assert user == mock_user
         mock_client.current_user.assert_called_once()
-
+    
+    def test_get_tracks_audio_features_batches_and_caches(self):
+        """Test que les caractéristiques sont demandées par lots de 100 puis mises en cache"""
+        config = SpotifyConfig()
+        repo = SpotifyRepository(config)
+        
+        mock_client = Mock()
+        mock_client.audio_features.side_effect = lambda ids: [
+            None if track_id == '7' else {'id': track_id, 'energy': 0.5, 'tempo': 120.0}
+            for track_id in ids
+        ]
+        repo._client = mock_client
+        tracks = [Track(uri=f'spotify:track:{i}') for i in range(250)]
+        
+        features = repo.get_tracks_audio_features(tracks)
+        
+        assert mock_client.audio_features.call_count == 3
+        assert len(features) == 249
+        assert '7' not in features
+        assert features['0'].tempo == 120.0
+        
+        # Deuxième passage : tout vient du cache, y compris les morceaux sans caractéristiques
+        repo_rerun = SpotifyRepository(config)
+        repo_rerun._client = mock_client
+        assert len(repo_rerun.get_tracks_audio_features(tracks)) == 249
+        assert mock_client.audio_features.call_count == 3
+    
+    def test_get_related_artists_cached(self):
+        """Test que la liste des artistes similaires est demandée une seule fois puis relue du cache"""
+        config = SpotifyConfig()
+        mock_client = Mock()
+        mock_client.artist_related_artists.return_value = {'artists': [
+            {'id': 'r1', 'name': 'Related', 'genres': ['metal'], 'popularity': 40}
+        ]}
+        repo = SpotifyRepository(config)
+        repo._client = mock_client
+        
+        assert repo.get_related_artists(Artist(name="A", spotify_id='a')) == [
+            Artist(name='Related', spotify_id='r1', found_name='Related', genres=['metal'], popularity=40)
+        ]
+        assert repo.get_related_artists(Artist(name="Inconnu")) == []
+        
+        # Nouvelle exécution : la liste vient du cache persistant
+        rerun = SpotifyRepository(config)
+        rerun._client = mock_client
+        assert rerun.get_related_artists(Artist(name="A", spotify_id='a'))[0].spotify_id == 'r1'
+        mock_client.artist_related_artists.assert_called_once_with('a')
+        assert rerun.get_stats()['cache_hits.related_artists'] == 1
+    
+    def test_saved_tracks_contains_batches_and_caches(self):
+        """Test que 1800 morceaux coûtent 36 appels, puis aucun tant que le cache est valide"""
+        track_ids = [f'{i:022d}' for i in range(1800)]
+        with FakeSpotifyServer() as server:
+            config = SpotifyConfig()
+            repo = SpotifyRepository(config)
+            repo._client = spotipy.Spotify(auth='fake-token', requests_session=repo._session)
+            repo._client.prefix = server.prefix
+            
+            saved = repo.saved_tracks_contains(track_ids)
+            
+            assert repo.get_stats()['api_calls.current_user_saved_tracks_contains'] == 36
+            assert 0 < sum(saved.values()) < len(track_ids)
+            
+            # Nouvelle exécution : réponses positives et négatives viennent du cache
+            rerun = SpotifyRepository(config)
+            rerun._client = repo._client
+            assert rerun.saved_tracks_contains(track_ids) == saved
+            assert rerun.get_stats()['cache_hits.saved_tracks'] == 1800
+            assert 'api_calls.current_user_saved_tracks_contains' not in rerun.get_stats()
+    
+    def test_saved_tracks_contains_expires(self):
+        """Test que les réponses expirées ou d'un autre compte sont redemandées"""
+        config = SpotifyConfig()
+        config.saved_tracks_ttl = 100
+        mock_client = Mock()
+        mock_client.current_user.return_value = {'id': 'user1'}
+        mock_client.current_user_saved_tracks_contains.side_effect = lambda ids: [True] * len(ids)
+        repo = SpotifyRepository(config)
+        repo._client = mock_client
+        
+        with patch('infrastructure.spotify_repository.time.time', return_value=1000.0):
+            assert repo.saved_tracks_contains(['1', '1', '2']) == {'1': True, '2': True}
+        with patch('infrastructure.spotify_repository.time.time', return_value=1050.0):
+            repo.saved_tracks_contains(['1'])
+        assert mock_client.current_user_saved_tracks_contains.call_count == 1
+        
+        with patch('infrastructure.spotify_repository.time.time', return_value=1200.0):
+            repo.saved_tracks_contains(['1'])
+        repo._user_id = 'user2'
+        with patch('infrastructure.spotify_repository.time.time', return_value=1200.0):
+            repo.saved_tracks_contains(['1'])
+        assert mock_client.current_user_saved_tracks_contains.call_count == 3
+    
+    def test_get_tracks_audio_features_deduplicates(self):
+        """Test que les morceaux en double ne sont demandés qu'une fois"""
+        config = SpotifyConfig()
+        repo = SpotifyRepository(config)
+        
+        mock_client = Mock()
+        mock_client.audio_features.return_value = None
+        repo._client = mock_client
+        
+        features = repo.get_tracks_audio_features([Track(uri='spotify:track:1'), Track(uri='spotify:track:1')])
+        
+        assert features == {}
+        mock_client.audio_features.assert_called_once_with(['1'])
+    
+    def test_find_artist_cached_by_canonical_key(self):
+        """Test que les variantes d'un nom ne déclenchent qu'une recherche"""
+        config = SpotifyConfig()
+        repo = SpotifyRepository(config)
+        
+        mock_client = Mock()
+        mock_client.search.return_value = {
+            'artists': {'items': [{'id': 'uv', 'name': 'Ultra Vomit'}]}
+        }
+        repo._client = mock_client
+        
+        first = repo.find_artist("ULTRA VOMIT ")
+        second = repo.find_artist("Ultra Vomit")
+        
+        assert mock_client.search.call_count == 1
+        assert first.spotify_id == second.spotify_id == 'uv'
+        assert second.name == "Ultra Vomit"
+        
+        # Le cache est persistant entre deux exécutions
+        repo_rerun = SpotifyRepository(config)
+        repo_rerun._client = mock_client
+        assert repo_rerun.find_artist("ultra vomit").found_name == 'Ultra Vomit'
+        assert mock_client.search.call_count == 1
+    
+    def test_find_artist_keeps_genres_and_popularity(self):
+        """Test que genres et popularité de la réponse de recherche sont conservés en cache"""
+        config = SpotifyConfig()
+        mock_client = Mock()
+        mock_client.search.return_value = {'artists': {'items': [
+            {'id': 'g', 'name': 'Gojira', 'genres': ['french death metal'], 'popularity': 70}
+        ]}}
+        repo = SpotifyRepository(config)
+        repo._client = mock_client
+        
+        assert repo.find_artist("Gojira").genres == ['french death metal']
+        
+        repo_rerun = SpotifyRepository(config)
+        repo_rerun._client = mock_client
+        artist = repo_rerun.find_artist("gojira")
+        assert (artist.genres, artist.popularity) == (['french death metal'], 70)
+        assert mock_client.search.call_count == 1
+    
+    def test_find_artist_cache_without_genres_refreshed(self):
+        """Test qu'une entrée de cache sans genres est redemandée une seule fois"""
+        config = SpotifyConfig()
+        JsonLinesCache(config.artist_cache_path).set('gojira', {'spotify_id': 'g', 'found_name': 'Gojira'})
+        mock_client = Mock()
+        mock_client.search.return_value = {'artists': {'items': [
+            {'id': 'g', 'name': 'Gojira', 'genres': ['metal'], 'popularity': 70}
+        ]}}
+        repo = SpotifyRepository(config)
+        repo._client = mock_client
+        
+        assert repo.find_artist("Gojira").genres == ['metal']
+        assert repo.find_artist("Gojira").popularity == 70
+        assert mock_client.search.call_count == 1
+    
+    def test_get_stats_counts_calls_and_cache(self):
+        """Test des compteurs d'appels à l'API et d'utilisation du cache"""
+        config = SpotifyConfig()
+        repo = SpotifyRepository(config)
+        
+        mock_client = Mock()
+        mock_client.search.return_value = {
+            'artists': {'items': [{'id': 'a1', 'name': 'Gojira'}]}
+        }
+        mock_client.search.__name__ = 'search'
+        repo._client = mock_client
+        
+        repo.find_artist("Gojira")
+        repo.find_artist("gojira")
+        
+        stats = repo.get_stats()
+        assert stats['api_calls'] == 1
+        assert stats['api_calls.search'] == 1
+        assert stats['cache_misses.artists'] == 1
+        assert stats['cache_hits.artists'] == 1
+        assert stats['coalesced'] == 0
+    
+    def test_reads_are_spread_and_writes_stay_on_owner(self):
+        """Test que les lectures sont réparties entre les applications et les écritures restent sur le compte"""
+        repo = SpotifyRepository(SpotifyConfig())
+        owner, reader = Mock(), Mock()
+        for client in (owner, reader):
+            client.artist_top_tracks.return_value = {'tracks': []}
+        repo._client = owner
+        repo._read_clients = {'app2': reader}
+        
+        for i in range(4):
+            repo.get_artist_top_tracks(Artist(name=f"A{i}", spotify_id=f"a{i}"))
+        repo.update_playlist('playlist123', Playlist(name="P", description="D"))
+        
+        assert owner.artist_top_tracks.call_count == 2
+        assert reader.artist_top_tracks.call_count == 2
+        owner.playlist_change_details.assert_called_once()
+        reader.playlist_change_details.assert_not_called()
+        assert repo.get_stats()['api_calls.client.app2'] == 2
+    
+    def test_rate_limited_reader_is_set_aside(self):
+        """Test qu'une application limitée (429) n'est plus choisie pendant Retry-After"""
+        repo = SpotifyRepository(SpotifyConfig())
+        owner, reader = Mock(), Mock()
+        owner.artist_top_tracks.return_value = {'tracks': []}
+        reader.artist_top_tracks.side_effect = SpotifyException(429, -1, "rate limited", headers={'Retry-After': '30'})
+        repo._client = owner
+        repo._read_clients = {'app2': reader}
+        # Le compte a déjà consommé une partie de son budget : l'application de lecture est choisie
+        repo._dispatcher.choose([SpotifyRepository.OWNER])
+        
+        # Le premier 429 fait aussitôt passer la lecture au compte
+        assert repo.get_artist_top_tracks(Artist(name="A", spotify_id="a1")) == []
+        for i in range(3):
+            repo.get_artist_top_tracks(Artist(name=f"B{i}", spotify_id=f"b{i}"))
+        
+        assert reader.artist_top_tracks.call_count == 1
+        assert owner.artist_top_tracks.call_count == 4
+    
+    def test_all_readers_rate_limited(self):
+        """Test que le 429 est propagé une fois chaque client limité, avec une courte mise à l'écart par défaut"""
+        repo = SpotifyRepository(SpotifyConfig())
+        owner, reader = Mock(), Mock()
+        owner.artist_top_tracks.side_effect = SpotifyException(429, -1, "rate limited", headers={'Retry-After': '3'})
+        reader.artist_top_tracks.side_effect = SpotifyException(429, -1, "rate limited")
+        repo._client = owner
+        repo._read_clients = {'app2': reader}
+        
+        with pytest.raises(RateLimitedError):
+            repo.get_artist_top_tracks(Artist(name="A", spotify_id="a1"))
+        
+        budgets = repo._dispatcher._budgets
+        now = time.monotonic()
+        assert budgets[SpotifyRepository.OWNER].blocked_until - now <= 3.0
+        assert budgets['app2'].blocked_until - now <= ClientDispatcher.DEFAULT_PENALTY
+    
+    @patch('infrastructure.spotify_repository.SpotifyClientCredentials')
+    @patch('infrastructure.spotify_repository.SpotifyOAuth')
+    @patch('spotipy.Spotify')
+    def test_connect_read_clients(self, mock_spotify_class, mock_oauth_class, mock_credentials_class):
+        """Test que chaque application de lecture a son client et son cache de token"""
+        config = SpotifyConfig()
+        config.read_clients = [('id2', 'secret2'), ('id3', 'secret3')]
+        repo = SpotifyRepository(config)
+        mock_oauth_class.return_value.get_cached_token.return_value = None
+        
+        repo.connect()
+        
+        assert list(repo._read_clients) == ['id2', 'id3']
+        assert mock_credentials_class.call_args.kwargs['client_id'] == 'id3'
+        assert mock_credentials_class.call_args.kwargs['cache_handler'].cache_path == '.spotify_cache-id3'
+    
+    def test_find_artist_exact_match_ignores_accents(self):
+        """Test que la correspondance exacte se fait à la clé canonique près"""
+        config = SpotifyConfig()
+        repo = SpotifyRepository(config)
+        
+        mock_client = Mock()
+        mock_client.search.return_value = {
+            'artists': {'items': [
+                {'id': 'other', 'name': 'Motley Crue Tribute'},
+                {'id': 'crue', 'name': 'Mötley Crüe'}
+            ]}
+        }
+        repo._client = mock_client
+        
+        assert repo.find_artist("Motley Crue").spotify_id == 'crue'
+    
+    def test_find_artist_not_found_is_cached(self):
+        """Test qu'un artiste introuvable n'est recherché qu'une fois"""
+        config = SpotifyConfig()
+        repo = SpotifyRepository(config)
+        
+        mock_client = Mock()
+        mock_client.search.return_value = {'artists': {'items': []}}
+        repo._client = mock_client
+        
+        assert repo.find_artist("Unknown Artist") is None
+        assert repo.find_artist("unknown artist") is None
+        assert mock_client.search.call_count == 2  # deux requêtes pour la première recherche seulement
+    
+    def test_find_artist_not_found_expires(self):
+        """Test qu'un artiste introuvable est recherché de nouveau après artist_not_found_ttl"""
+        config = SpotifyConfig()
+        config.artist_not_found_ttl = 60.0
+        repo = SpotifyRepository(config)
+        
+        mock_client = Mock()
+        mock_client.search.side_effect = [
+            {'artists': {'items': []}},
+            {'artists': {'items': []}},
+            {'artists': {'items': [{'id': 'n1', 'name': 'New Band'}]}}
+        ]
+        repo._client = mock_client
+        
+        with patch('infrastructure.spotify_repository.time.time', return_value=1000.0):
+            assert repo.find_artist("New Band") is None
+        with patch('infrastructure.spotify_repository.time.time', return_value=1030.0):
+            assert repo.find_artist("New Band") is None
+        assert mock_client.search.call_count == 2
+        with patch('infrastructure.spotify_repository.time.time', return_value=1061.0):
+            assert repo.find_artist("New Band").spotify_id == 'n1'
+    
+    def test_find_artist_error_not_cached(self):
+        """Test qu'une recherche en erreur n'est pas mise en cache"""
+        config = SpotifyConfig()
+        repo = SpotifyRepository(config)
+        
+        mock_client = Mock()
+        mock_client.search.side_effect = [
+            requests.exceptions.ConnectionError("Timeout"),
+            {'artists': {'items': [{'id': 'a1', 'name': 'Test Artist'}]}}
+        ]
+        repo._client = mock_client
+        
+        with pytest.raises(TransientError):
+            repo.find_artist("Test Artist")
+        assert repo.find_artist("Test Artist").spotify_id == 'a1'
+    
+    @pytest.mark.parametrize("status, expected", [
+        (429, RateLimitedError),
+        (401, AuthError),
+        (403, AuthError),
+        (404, NotFoundError),
+        (500, TransientError),
+        (503, TransientError),
+        (None, TransientError),
+        (400, SpotifyError),
+    ])
+    def test_translate_spotify_exception(self, status, expected):
+        """Test de la traduction des statuts HTTP en erreurs typées"""
+        error = translate_error(SpotifyException(status, -1, "error"))
+        assert type(error) is expected
+    
+    def test_translate_exhausted_adapter_retries(self):
+        """Test que le « Max Retries » sans en-têtes de spotipy est une erreur passagère"""
+        error = translate_error(SpotifyException(429, -1, "/v1/search:\n Max Retries"))
+        assert type(error) is TransientError
+    
+    def test_owner_call_resent_after_rate_limit(self):
+        """Test qu'un appel du compte limité (429) est renvoyé après Retry-After"""
+        repo = SpotifyRepository(SpotifyConfig())
+        mock_client = Mock()
+        mock_client.playlist_add_items.side_effect = [
+            SpotifyException(429, -1, "rate limited", headers={'Retry-After': '2'}),
+            {'snapshot_id': 's1'}
+        ]
+        
+        with patch('infrastructure.spotify_repository.time.sleep') as sleep:
+            assert repo._call(mock_client.playlist_add_items, 'pl1', ['spotify:track:1']) == {'snapshot_id': 's1'}
+        
+        sleep.assert_called_once_with(2.0)
+        assert mock_client.playlist_add_items.call_count == 2
+    
+    def test_translate_rate_limit_without_retry_after(self):
+        """Test d'un 429 sans en-tête Retry-After"""
+        error = translate_error(SpotifyException(429, -1, "error"))
+        assert error.retry_after is None
+        assert error.kind == 'rate_limited'
+    
+    def test_unexpected_exception_not_translated(self):
+        """Test qu'une erreur de programmation n'est pas masquée"""
+        config = SpotifyConfig()
+        repo = SpotifyRepository(config)
+        
+        mock_client = Mock()
+        mock_client.search.side_effect = KeyError("artists")
+        repo._client = mock_client
+        
+        with pytest.raises(KeyError):
+            repo.find_artist("Test Artist")
+    
+    def test_concurrent_find_artist_single_request(self):
+        """Test que des recherches concurrentes du même artiste ne font qu'une requête"""
+        config = SpotifyConfig()
+        repo = SpotifyRepository(config)
+        release = threading.Event()
+        
+        def search(q, type, limit):
+            release.wait(5)
+            return {'artists': {'items': [{'id': 'uv', 'name': 'Ultra Vomit'}]}}
+        
+        mock_client = Mock()
+        mock_client.search.side_effect = search
+        repo._client = mock_client
+        names = iter(["Ultra Vomit", "ULTRA VOMIT", "ultra vomit"])
+        
+        threads, results = run_concurrently(
+            3,
+            lambda: repo.find_artist(next(names)),
+            lambda: mock_client.search.call_count == 1 and repo._single_flight.shared_count == 2
+        )
+        release.set()
+        for thread in threads:
+            thread.join()
+        
+        assert mock_client.search.call_count == 1
+        assert all(result.spotify_id == 'uv' for result in results)
+    
+    def test_find_artist_shared_result_keeps_caller_name(self):
+        """Test qu'un résultat partagé porte le nom demandé par chaque appelant"""
+        config = SpotifyConfig()
+        repo = SpotifyRepository(config)
+        repo._single_flight = Mock()
+        repo._single_flight.do.return_value = Artist(name="ULTRA VOMIT", spotify_id="uv", found_name="Ultra Vomit")
+        
+        artist = repo.find_artist("Ultra Vomit")
+        
+        assert artist.name == "Ultra Vomit"
+        assert artist.spotify_id == "uv"
+    
+    def test_concurrent_top_tracks_single_request(self):
+        """Test que des demandes concurrentes de top tracks ne font qu'une requête"""
+        config = SpotifyConfig()
+        repo = SpotifyRepository(config)
+        release = threading.Event()
+        
+        def artist_top_tracks(artist_id):
+            release.wait(5)
+            return {'tracks': [{'uri': 'spotify:track:1', 'name': 'T', 'artists': []}]}
+        
+        mock_client = Mock()
+        mock_client.artist_top_tracks.side_effect = artist_top_tracks
+        repo._client = mock_client
+        artist = Artist(name="A", spotify_id="a1")
+        
+        threads, results = run_concurrently(
+            4,
+            lambda: repo.get_artist_top_tracks(artist, 5),
+            lambda: repo._single_flight.shared_count == 3
+        )
+        release.set()
+        for thread in threads:
+            thread.join()
+        
+        assert mock_client.artist_top_tracks.call_count == 1
+        assert all(result[0].uri == 'spotify:track:1' and result[0].artist is None for result in results)
+        assert results[0] is not results[1]
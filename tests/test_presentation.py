@@ -1,10 +1,57 @@
 """
 Tests pour la couche présentation (main)
 """
+import http.client
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
 import pytest
 from unittest.mock import Mock, patch
 import spotipy.exceptions
-from presentation.main import main
+from application.jobs import JobQueue, PlaylistJob
+from application.report import RunReport
+from domain.progress import NullProgressReporter
+from application.sharding import ShardedArtistResolver
+from application.filters import PlaylistExclusionFilter, SavedTracksFilter
+from application.expansion import RelatedArtistExpander
+from application.filters import ArtistFilter
+from presentation.main import (
+    create_artist_expander,
+    create_artist_filter,
+    create_artist_resolver,
+    create_track_filters,
+    main,
+)
+from presentation.service import PlaylistJobRunner, PlaylistService, parse_job_request
+from presentation.service import main as service_main
+from presentation.refresh import main as refresh_main
+
+
+@pytest.fixture(autouse=True)
+def mock_progress_factory():
+    """Le suivi de progression est construit à partir d'une configuration simulée"""
+    with patch('presentation.main.create_progress_reporter') as factory:
+        yield factory
+
+
+@pytest.fixture(autouse=True)
+def single_process_resolution():
+    """Les configurations simulées ne demandent pas de résolution multi-processus"""
+    with patch('presentation.main.create_artist_resolver', return_value=None) as factory, \
+            patch('presentation.refresh.create_artist_resolver', return_value=None):
+        yield factory
+
+
+@pytest.fixture(autouse=True)
+def no_related_artists():
+    """Les configurations simulées ne demandent pas d'artistes similaires"""
+    with patch('presentation.main.create_artist_expander', return_value=None) as main_factory, \
+            patch('presentation.service.create_artist_expander', return_value=None), \
+            patch('presentation.refresh.create_artist_expander', return_value=None):
+        yield main_factory
 
 
 class TestMain:
@@ -30,13 +77,32 @@ class TestMain:
         mock_file_repo_class.return_value = mock_file_repo
         
         mock_use_case = Mock()
-        mock_use_case.execute.return_value = 'https://open.spotify.com/playlist/123'
         mock_use_case_class.return_value = mock_use_case
         
         main()
         
         mock_spotify_repo.connect.assert_called_once()
-        mock_use_case.execute.assert_called_once()
+        mock_use_case.run.assert_called_once()
+        assert mock_use_case.run.call_args.kwargs['report_path'] is mock_config.report_path
+        # Le même suivi de progression est injecté dans le repository et le use case
+        progress = mock_spotify_repo_class.call_args.kwargs['progress']
+        assert mock_use_case_class.call_args.kwargs['progress'] is progress
+    
+    @patch('presentation.main.SpotifyConfig')
+    @patch('presentation.main.SpotifyRepository')
+    @patch('presentation.main.CreatePlaylistFromArtistsUseCase')
+    def test_main_profile(self, mock_use_case_class, mock_repo_class, mock_config_class, tmp_path):
+        """Test de l'option --profile : profileur injecté dans le use case puis fermé"""
+        mock_repo_class.return_value.get_current_user.return_value = {'display_name': 'Test User'}
+        
+        main(['--profile', str(tmp_path / "profiles")])
+        
+        profiler = mock_use_case_class.call_args.kwargs['profiler']
+        assert profiler.output_dir == str(tmp_path / "profiles")
+        assert json.loads((tmp_path / "profiles" / "summary.json").read_text(encoding='utf-8')) == {'phases': []}
+        
+        main()
+        assert mock_use_case_class.call_args.kwargs['profiler'] is None
     
     @patch('presentation.main.SpotifyConfig')
     def test_main_invalid_config(self, mock_config_class):
@@ -136,3 +202,341 @@ class TestMain:
         
         mock_spotify_repo.connect.assert_called_once()
 
+
+def request_json(url, method='GET', body=None):
+    """Requête HTTP JSON, retourne (statut, corps décodé)"""
+    data = None if body is None else json.dumps(body).encode('utf-8')
+    request = urllib.request.Request(url, data=data, method=method, headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+class TestPlaylistService:
+    """Tests pour le mode service (API HTTP locale)"""
+    
+    @pytest.fixture
+    def runner(self):
+        """Exécuteur de travaux simulé"""
+        def run(job):
+            report = RunReport(playlist_name=job.playlist_name, started_at='now', outcome='created')
+            report.playlist_url = 'https://open.spotify.com/playlist/p1'
+            return report
+        return Mock(side_effect=run)
+    
+    def test_submit_and_poll_job(self, runner):
+        """Test de la soumission d'un travail puis de la consultation de son état"""
+        queue = JobQueue(runner)
+        with PlaylistService(queue, NullProgressReporter(), ('127.0.0.1', 0)) as service:
+            thread = threading.Thread(target=service.serve_forever, daemon=True)
+            thread.start()
+            try:
+                status, job = request_json(
+                    f"{service.url}/jobs", 'POST',
+                    {'playlist_name': 'Hellfest', 'artists': ['Gojira', 'Mastodon'], 'max_tracks_per_artist': 3}
+                )
+                assert status == 202
+                assert job['status'] in ('queued', 'running', 'succeeded')
+                
+                deadline = time.monotonic() + 5
+                while True:
+                    status, state = request_json(f"{service.url}/jobs/{job['job_id']}")
+                    if state['status'] == 'succeeded' or time.monotonic() > deadline:
+                        break
+                    time.sleep(0.01)
+                
+                assert state['playlist_url'] == 'https://open.spotify.com/playlist/p1'
+                assert state['report']['outcome'] == 'created'
+                assert request_json(f"{service.url}/jobs")[1]['jobs'][0]['job_id'] == job['job_id']
+                assert request_json(f"{service.url}/health")[1]['jobs']['succeeded'] == 1
+            finally:
+                service.shutdown()
+        
+        submitted = runner.call_args[0][0]
+        assert submitted.artists == ['Gojira', 'Mastodon']
+        assert submitted.max_tracks_per_artist == 3
+    
+    def test_errors(self, tmp_path):
+        """Test des réponses d'erreur (demande invalide, inconnue, file pleine)"""
+        (tmp_path / "artists.txt").write_text("Gojira\n", encoding='utf-8')
+        queue = JobQueue(Mock(), max_concurrent=0, max_pending=1)
+        with PlaylistService(queue, NullProgressReporter(), ('127.0.0.1', 0), str(tmp_path)) as service:
+            thread = threading.Thread(target=service.serve_forever, daemon=True)
+            thread.start()
+            try:
+                assert request_json(f"{service.url}/jobs", 'POST', {'artists': []})[0] == 400
+                assert request_json(f"{service.url}/jobs/unknown")[0] == 404
+                assert request_json(f"{service.url}/other")[0] == 404
+                assert request_json(f"{service.url}/other", 'POST', {})[0] == 404
+                missing = {'playlist_name': 'A', 'artists_file': 'typo.txt'}
+                assert request_json(f"{service.url}/jobs", 'POST', missing)[0] == 400
+                assert not (tmp_path / "typo.txt").exists()
+                job = {'playlist_name': 'A', 'artists_file': 'artists.txt'}
+                assert request_json(f"{service.url}/jobs", 'POST', job)[0] == 202
+                assert request_json(f"{service.url}/jobs", 'POST', job)[0] == 429
+            finally:
+                service.shutdown()
+    
+    def test_submission_requires_json_content_type(self, runner):
+        """Test qu'une soumission sans Content-Type JSON (formulaire d'une page web) est refusée"""
+        queue = JobQueue(runner)
+        with PlaylistService(queue, NullProgressReporter(), ('127.0.0.1', 0)) as service:
+            thread = threading.Thread(target=service.serve_forever, daemon=True)
+            thread.start()
+            try:
+                body = json.dumps({'playlist_name': 'A', 'artists': ['Gojira']}).encode('utf-8')
+                request = urllib.request.Request(
+                    f"{service.url}/jobs", data=body, method='POST',
+                    headers={'Content-Type': 'text/plain'}
+                )
+                with pytest.raises(urllib.error.HTTPError) as error:
+                    urllib.request.urlopen(request, timeout=5)
+                assert error.value.code == 415
+            finally:
+                service.shutdown()
+        
+        runner.assert_not_called()
+    
+    @pytest.mark.parametrize("length, status", [('abc', 400), ('-1', 400), (str(11 * 1024 * 1024), 413)])
+    def test_invalid_content_length(self, runner, length, status):
+        """Test qu'un Content-Length non numérique, négatif ou trop grand est refusé sans lire le corps"""
+        queue = JobQueue(runner)
+        with PlaylistService(queue, NullProgressReporter(), ('127.0.0.1', 0)) as service:
+            thread = threading.Thread(target=service.serve_forever, daemon=True)
+            thread.start()
+            try:
+                connection = http.client.HTTPConnection(service.url.split('//')[1], timeout=5)
+                connection.putrequest('POST', '/jobs')
+                connection.putheader('Content-Type', 'application/json')
+                connection.putheader('Content-Length', length)
+                connection.endheaders()
+                response = connection.getresponse()
+                assert response.status == status
+                assert 'error' in json.loads(response.read())
+                connection.close()
+            finally:
+                service.shutdown()
+        
+        runner.assert_not_called()
+    
+    def test_artists_file_confined_to_directory(self, tmp_path):
+        """Test que seuls les fichiers existants du répertoire autorisé sont acceptés"""
+        (tmp_path / "artists.txt").write_text("Gojira\n", encoding='utf-8')
+        (tmp_path.parent / "outside.txt").write_text("Gojira\n", encoding='utf-8')
+        
+        options = parse_job_request({'playlist_name': 'A', 'artists_file': 'artists.txt'}, str(tmp_path))
+        assert options['artists_file'] == os.path.realpath(tmp_path / "artists.txt")
+        with pytest.raises(ValueError, match="introuvable"):
+            parse_job_request({'playlist_name': 'A', 'artists_file': 'typo.txt'}, str(tmp_path))
+        with pytest.raises(ValueError, match="doit se trouver"):
+            parse_job_request({'playlist_name': 'A', 'artists_file': '../outside.txt'}, str(tmp_path))
+        with pytest.raises(ValueError, match="doit se trouver"):
+            parse_job_request({'playlist_name': 'A', 'artists_file': str(tmp_path.parent / "outside.txt")}, str(tmp_path))
+    
+    @pytest.mark.parametrize("body, message", [
+        ([], "objet JSON"),
+        ({'playlist_name': ' '}, "playlist_name"),
+        ({'playlist_name': 'A'}, "soit artists_file"),
+        ({'playlist_name': 'A', 'artists_file': 'a.txt', 'artists': []}, "soit artists_file"),
+        ({'playlist_name': 'A', 'artists_file': 3}, "chemin"),
+        ({'playlist_name': 'A', 'artists': 'Gojira'}, "liste"),
+        ({'playlist_name': 'A', 'artists': [], 'max_tracks_per_artist': 20}, "entre 1 et 10"),
+    ])
+    def test_parse_job_request_invalid(self, body, message):
+        """Test de la validation des demandes"""
+        with pytest.raises(ValueError, match=message):
+            parse_job_request(body)
+    
+    def test_runner_uses_inline_artists(self):
+        """Test que l'exécuteur lit la liste fournie avec la demande"""
+        spotify_repo = Mock()
+        spotify_repo.get_stats.return_value = {}
+        spotify_repo.find_artist.return_value = None
+        runner = PlaylistJobRunner(spotify_repo, NullProgressReporter())
+        job = PlaylistJob(job_id='j1', playlist_name='A', artists=['Gojira', 'gojira'])
+        
+        report = runner(job)
+        
+        assert [artist.artist_name for artist in report.artists] == ['Gojira']
+        assert report.outcome == 'no_tracks'
+    
+    def test_runner_progress_per_job(self, tmp_path):
+        """Test que chaque travail a son propre suivi de progression, sans fichier d'exemple"""
+        spotify_repo = Mock()
+        spotify_repo.get_stats.return_value = {}
+        spotify_repo.find_artist.return_value = None
+        reporters = []
+        
+        def factory():
+            reporters.append(Mock())
+            return reporters[-1]
+        
+        runner = PlaylistJobRunner(spotify_repo, NullProgressReporter(), progress_factory=factory)
+        runner(PlaylistJob(job_id='j1', playlist_name='A', artists=['Gojira']))
+        runner(PlaylistJob(job_id='j2', playlist_name='B', artists=['Mastodon']))
+        
+        assert len(reporters) == 2
+        reporters[0].info.assert_any_call("▶️  Travail j1: A")
+        reporters[1].info.assert_any_call("▶️  Travail j2: B")
+        missing = str(tmp_path / "typo.txt")
+        with pytest.raises(FileNotFoundError):
+            runner(PlaylistJob(job_id='j3', playlist_name='C', artists_file=missing))
+        assert not os.path.exists(missing)
+    
+    @patch('presentation.service.SpotifyConfig')
+    def test_main_invalid_config(self, mock_config_class):
+        """Test du démarrage sans credentials"""
+        mock_config_class.return_value.is_valid.return_value = False
+        service_main()
+    
+    @patch('presentation.service.SpotifyConfig')
+    @patch('presentation.service.SpotifyRepository')
+    @patch('presentation.service.PlaylistService')
+    @patch('presentation.service.create_progress_reporter')
+    def test_main_authenticates_once_and_serves(self, mock_progress, mock_service_class, mock_repo_class, mock_config_class):
+        """Test que le service s'authentifie au démarrage puis sert les requêtes"""
+        mock_repo_class.return_value.get_current_user.return_value = {'display_name': 'Test User'}
+        service = mock_service_class.return_value.__enter__.return_value
+        service.serve_forever.side_effect = KeyboardInterrupt
+        
+        service_main()
+        
+        mock_repo_class.return_value.connect.assert_called_once()
+        service.serve_forever.assert_called_once()
+
+
+class TestCreateArtistResolver:
+    """Tests pour la construction du résolveur multi-processus"""
+    
+    def test_single_process_by_default(self):
+        """Test qu'aucun pool de processus n'est créé avec SPOTIFY_PROCESSES=1"""
+        assert create_artist_resolver(Mock(processes=1)) is None
+    
+    def test_sharded_resolver(self):
+        """Test du résolveur construit pour plusieurs processus"""
+        resolver = create_artist_resolver(Mock(
+            processes=4, shard_size=50, max_workers=8, include_genres=['metal'], exclude_genres=[], min_popularity=None
+        ))
+        
+        assert isinstance(resolver, ShardedArtistResolver)
+        assert (resolver.processes, resolver.shard_size, resolver.threads) == (4, 50, 8)
+        assert resolver.artist_filter == ArtistFilter(include_genres=['metal'])
+    
+    def test_artist_filter(self):
+        """Test des critères de sélection construits depuis la configuration"""
+        assert create_artist_filter(Mock(include_genres=[], exclude_genres=[], min_popularity=None)) is None
+        assert create_artist_filter(Mock(include_genres=[], exclude_genres=['pop'], min_popularity=0)) == ArtistFilter(
+            exclude_genres=['pop'], min_popularity=0
+        )
+    
+    @patch('presentation.main.SpotifyConfig')
+    @patch('presentation.main.SpotifyRepository')
+    @patch('presentation.main.CreatePlaylistFromArtistsUseCase')
+    def test_main_closes_resolver(self, mock_use_case_class, mock_repo_class, mock_config_class, single_process_resolution):
+        """Test que les processus de résolution sont arrêtés même en cas d'erreur"""
+        mock_repo_class.return_value.get_current_user.return_value = {'display_name': 'Test User'}
+        mock_use_case_class.return_value.run.side_effect = RuntimeError("boom")
+        resolver = single_process_resolution.return_value = Mock()
+        
+        with pytest.raises(RuntimeError):
+            main()
+        
+        assert mock_use_case_class.call_args.kwargs['resolver'] is resolver
+        resolver.close.assert_called_once()
+
+
+class TestCreateTrackFilters:
+    """Tests pour la construction des étapes de filtrage"""
+    
+    def test_no_filter_by_default(self):
+        """Test qu'aucun filtre n'est créé sans playlist à exclure"""
+        assert create_track_filters(Mock(exclude_playlists=[], exclude_saved=False), Mock(), NullProgressReporter()) == []
+    
+    def test_playlist_exclusion(self, tmp_path):
+        """Test du filtre construit avec SPOTIFY_EXCLUDE_PLAYLISTS"""
+        config = Mock(exclude_playlists=['Déjà écoutés'], exclusion_index_dir=str(tmp_path), exclude_saved=False)
+        
+        filters = create_track_filters(config, Mock(), NullProgressReporter())
+        
+        assert len(filters) == 1
+        assert isinstance(filters[0], PlaylistExclusionFilter)
+        assert filters[0].playlist_names == ['Déjà écoutés']
+    
+    def test_saved_tracks_exclusion(self):
+        """Test du filtre construit avec SPOTIFY_EXCLUDE_SAVED, après les playlists exclues"""
+        config = Mock(exclude_playlists=['Déjà écoutés'], exclude_saved=True)
+        
+        filters = create_track_filters(config, Mock(), NullProgressReporter())
+        
+        assert [type(f) for f in filters] == [PlaylistExclusionFilter, SavedTracksFilter]
+
+
+class TestCreateArtistExpander:
+    """Tests pour la construction de l'extension aux artistes similaires"""
+    
+    def test_disabled_by_default(self):
+        """Test qu'aucune extension n'est créée avec SPOTIFY_RELATED_DEPTH=0"""
+        assert create_artist_expander(Mock(related_depth=0), Mock(), NullProgressReporter()) is None
+    
+    def test_bounded_expander(self):
+        """Test de l'extension construite avec les limites configurées"""
+        config = Mock(related_depth=2, related_fan_out=4, related_max_artists=50, max_workers=8)
+        
+        expander = create_artist_expander(config, Mock(), NullProgressReporter())
+        
+        assert isinstance(expander, RelatedArtistExpander)
+        assert (expander.depth, expander.fan_out, expander.max_artists, expander.max_workers) == (2, 4, 50, 8)
+
+
+class TestRefreshMain:
+    """Tests pour le point d'entrée du rafraîchissement incrémental"""
+    
+    @patch('presentation.refresh.SpotifyConfig')
+    def test_main_invalid_config(self, mock_config_class):
+        """Test du rafraîchissement sans credentials"""
+        mock_config_class.return_value.is_valid.return_value = False
+        refresh_main()
+    
+    @patch('presentation.refresh.SpotifyConfig')
+    @patch('presentation.refresh.SpotifyRepository')
+    @patch('presentation.refresh.RefreshPlaylistUseCase')
+    @patch('presentation.refresh.create_progress_reporter')
+    def test_main_runs_without_confirmation(self, mock_progress, mock_use_case_class, mock_repo_class, mock_config_class):
+        """Test que le rafraîchissement s'exécute sans interaction"""
+        config = mock_config_class.return_value
+        config.refresh_state_dir = '/tmp/refresh'
+        
+        refresh_main()
+        
+        mock_repo_class.return_value.connect.assert_called_once()
+        mock_repo_class.return_value.get_current_user.assert_called_once()
+        assert mock_use_case_class.call_args.kwargs['max_age'] is config.refresh_max_age
+        run_options = mock_use_case_class.return_value.run.call_args.kwargs
+        assert run_options['require_confirmation'] is False
+    
+    @patch('presentation.refresh.SpotifyConfig')
+    @patch('presentation.refresh.SpotifyRepository')
+    @patch('presentation.refresh.RefreshPlaylistUseCase')
+    @patch('presentation.refresh.create_progress_reporter')
+    @patch('presentation.refresh.create_artist_filter')
+    @patch('presentation.refresh.create_artist_expander')
+    @patch('presentation.refresh.create_artist_resolver')
+    def test_main_builds_same_pipeline_as_full_run(
+        self, mock_resolver, mock_expander, mock_filter, mock_progress,
+        mock_use_case_class, mock_repo_class, mock_config_class
+    ):
+        """Test que le rafraîchissement reçoit le résolveur, l'extension et les critères de la configuration"""
+        mock_config_class.return_value.refresh_state_dir = '/tmp/refresh'
+        mock_use_case_class.return_value.run.side_effect = RuntimeError("échec")
+        
+        with pytest.raises(RuntimeError):
+            refresh_main()
+        
+        options = mock_use_case_class.call_args.kwargs
+        assert options['resolver'] is mock_resolver.return_value
+        assert options['expander'] is mock_expander.return_value
+        assert options['artist_filter'] is mock_filter.return_value
+        # Le résolveur est fermé même si l'exécution échoue
+        mock_resolver.return_value.close.assert_called_once()